@@ -0,0 +1,91 @@
+# benchmarks/bench_automatas.py
+"""
+Expresión maestra (`re`) frente a las tablas AFD generadas por `automata_lexico`.
+
+Para cada lenguaje cuyas especificaciones son regulares mide:
+  - el arranque en frío en un proceso nuevo: compilar la expresión maestra frente a leer
+    el archivo `.afd` (la tabla se genera antes si no existe);
+  - el rendimiento de `tokenizar()` con cada motor sobre el archivo de ejemplo repetido
+    hasta --kb kilobytes.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_automatas [--kb 1024] [--lexer pascal]
+"""
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.bench_lexers import DIRECTORIO_EJEMPLOS, LEXERS, entrada_de_tamanio
+from src.nucleo_compilador.automata_lexico import TablaNoRegular
+from src.nucleo_compilador.motor_lexico import MOTORES_LEXICOS
+
+REPETICIONES_ARRANQUE = 5
+
+# Se ejecuta en un proceso nuevo: solo importa el motor ya construido por el lexer, de modo
+# que el tiempo medido es el de compilar la expresión o el de leer la tabla.
+PROGRAMA_ARRANQUE = """
+import sys, time
+from src.analizador_lexico import lexer_{nombre}
+from src.nucleo_compilador.motor_lexico import MOTORES_LEXICOS
+motor = MOTORES_LEXICOS[{nombre!r}]
+inicio = time.perf_counter()
+if sys.argv[1] == 'afd':
+    motor.usar_automata()
+else:
+    motor.regex
+print(time.perf_counter() - inicio)
+"""
+
+
+def arranque_en_frio(nombre, modo):
+    """Mejor tiempo (s) de REPETICIONES_ARRANQUE procesos nuevos."""
+    programa = PROGRAMA_ARRANQUE.format(nombre=nombre)
+    tiempos = []
+    for _ in range(REPETICIONES_ARRANQUE):
+        salida = subprocess.run([sys.executable, "-c", programa, modo], capture_output=True, text=True, check=True)
+        tiempos.append(float(salida.stdout))
+    return min(tiempos)
+
+
+def medir(clase_lexer, codigo):
+    inicio = time.perf_counter()
+    tokens = clase_lexer(codigo).tokenizar()
+    return time.perf_counter() - inicio, len(tokens)
+
+
+def main():
+    kb = 1024
+    if "--kb" in sys.argv:
+        kb = int(sys.argv[sys.argv.index("--kb") + 1])
+    seleccion = list(LEXERS)
+    if "--lexer" in sys.argv:
+        seleccion = [sys.argv[sys.argv.index("--lexer") + 1]]
+
+    print(f"{'lexer':<11} {'estados':>8} {'clases':>7} {'re (ms)':>8} {'afd (ms)':>9} {'tokens':>9} {'re MB/s':>8} {'afd MB/s':>9}")
+    for nombre in seleccion:
+        clase_lexer, archivo = LEXERS[nombre]
+        motor = MOTORES_LEXICOS[nombre]
+        try:
+            motor.usar_automata() # Genera el archivo .afd si no existe
+        except TablaNoRegular as e:
+            print(f"{nombre:<11} sin AFD: {e}")
+            continue
+        automata = motor.automata
+        frio_re = arranque_en_frio(nombre, 're')
+        frio_afd = arranque_en_frio(nombre, 'afd')
+
+        with open(os.path.join(DIRECTORIO_EJEMPLOS, archivo), 'r', encoding='utf-8') as f:
+            codigo = entrada_de_tamanio(f.read(), kb * 1024)
+        mb = len(codigo) / 1024 / 1024
+        motor.usar_automata(False)
+        segundos_re, n_tokens = medir(clase_lexer, codigo)
+        motor.usar_automata()
+        segundos_afd, _ = medir(clase_lexer, codigo)
+        motor.usar_automata(False)
+        print(f"{nombre:<11} {automata.num_estados:>8} {automata.num_clases:>7} {frio_re * 1e3:>8.2f} {frio_afd * 1e3:>9.2f} "
+              f"{n_tokens:>9} {mb / segundos_re:>8.2f} {mb / segundos_afd:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# benchmarks/bench_cache_ast.py
+"""
+Análisis léxico y sintáctico frente a la carga desde la caché de AST.
+
+Para cada lenguaje se genera un archivo con --lineas líneas (las de bench_pratt y
+memoria_ast), se tokeniza y analiza (mejor de 3), se guarda en una caché en un directorio
+temporal y se mide cuánto tarda `CacheAST.obtener` en devolver el mismo análisis, además
+del tamaño del archivo de la entrada.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_cache_ast [--lineas 2000]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_pratt import LENGUAJES
+from benchmarks.memoria_ast import HTML
+from src.nucleo_compilador.cache_ast import AnalisisGuardado, CacheAST
+
+
+def mejor_de_3(funcion):
+    mejor, resultado = None, None
+    for _ in range(3):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        segundos = time.perf_counter() - inicio
+        mejor = segundos if mejor is None else min(mejor, segundos)
+    return mejor, resultado
+
+
+def main():
+    lineas = 2000
+    if "--lineas" in sys.argv:
+        lineas = int(sys.argv[sys.argv.index("--lineas") + 1])
+
+    cache = CacheAST(tempfile.mkdtemp(prefix="cache_ast_"))
+    print(f"{'lenguaje':<11} {'léx+sint (s)':>13} {'caché (s)':>10} {'aceleración':>12} {'archivo (KB)':>13}")
+    for nombre, (clase_lexer, clase_parser, cabecera, linea, final) in {**LENGUAJES, "html": HTML}.items():
+        codigo = cabecera + linea * lineas + final
+        clases = (clase_lexer, clase_parser)
+
+        def analizar():
+            tokens = clase_lexer(codigo).tokenizar()
+            parser = clase_parser(tokens)
+            return tokens, parser, parser.parse()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            segundos_analisis, (tokens, parser, ast) = mejor_de_3(analizar)
+        if ast is None or parser.errores_sintacticos:
+            print(f"{nombre:<11} {'(error de análisis)':>20}")
+            continue
+        cache.guardar(codigo, clases, AnalisisGuardado(tokens, ast, getattr(parser, "tabla_simbolos", None)))
+        segundos_cache, analisis = mejor_de_3(lambda: cache.obtener(codigo, clases))
+        tamanio = os.path.getsize(cache.ruta(cache.clave(codigo, clases)))
+        print(f"{nombre:<11} {segundos_analisis:>13.3f} {segundos_cache:>10.3f} "
+              f"{segundos_analisis / segundos_cache:>11.1f}x {tamanio / 1024:>13.0f}")
+    cache.vaciar()
+    os.rmdir(cache.directorio)
+
+
+if __name__ == "__main__":
+    main()
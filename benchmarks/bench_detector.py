@@ -0,0 +1,63 @@
+# benchmarks/bench_detector.py
+"""
+Benchmark del detector de lenguaje: llamadas por segundo de `detectar_lenguaje`
+sobre entradas de 1 KB, 100 KB y 10 MB construidas a partir de `ejemplos_Codigo`,
+en modo completo y en modo escalonado (con el número medio de pistas evaluadas).
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_detector
+"""
+import os
+import time
+
+from src.detector_lenguaje.detector import (
+    detectar_lenguaje, DETECTOR_POR_DEFECTO, MODO_COMPLETO, MODO_ESCALONADO
+)
+
+DIRECTORIO_EJEMPLOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ejemplos_Codigo")
+ARCHIVOS_BASE = ["prueba_python.py", "prueba_cpp.cpp", "prueba_tsql.sql", "prueba_plsql.sql", "prueba_javascript.js"]
+TAMANIOS = [("1 KB", 1024), ("100 KB", 100 * 1024), ("10 MB", 10 * 1024 * 1024)]
+TIEMPO_MINIMO_POR_CASO = 1.0 # segundos
+
+
+def construir_entrada(nombre_archivo, tamanio_bytes):
+    """Repite el archivo de ejemplo hasta alcanzar (aprox.) el tamaño pedido."""
+    with open(os.path.join(DIRECTORIO_EJEMPLOS, nombre_archivo), 'r', encoding='utf-8') as archivo:
+        base = archivo.read()
+    repeticiones = max(1, tamanio_bytes // len(base) + 1)
+    return (base * repeticiones)[:tamanio_bytes]
+
+
+def medir_llamadas_por_segundo(funcion, entrada):
+    """Ejecuta `funcion(entrada)` durante al menos TIEMPO_MINIMO_POR_CASO y devuelve llamadas/s."""
+    llamadas = 0
+    inicio = time.perf_counter()
+    transcurrido = 0.0
+    while transcurrido < TIEMPO_MINIMO_POR_CASO or llamadas < 3:
+        funcion(entrada)
+        llamadas += 1
+        transcurrido = time.perf_counter() - inicio
+    return llamadas / transcurrido
+
+
+def main():
+    print(f"{'archivo':<20} {'tamaño':>8} {'modo':>11} {'llamadas/s':>12} {'MB/s':>10} {'pistas':>8}  resultado")
+    for nombre_archivo in ARCHIVOS_BASE:
+        for etiqueta, tamanio in TAMANIOS:
+            entrada = construir_entrada(nombre_archivo, tamanio)
+            for modo in (MODO_COMPLETO, MODO_ESCALONADO):
+                detectar = lambda texto: detectar_lenguaje(texto, modo=modo)
+                estadisticas = DETECTOR_POR_DEFECTO.estadisticas_cascada
+                consideradas_antes, llamadas_antes = estadisticas["pistas_consideradas"], estadisticas["llamadas"]
+                llamadas_s = medir_llamadas_por_segundo(detectar, entrada)
+                if modo == MODO_ESCALONADO and estadisticas["llamadas"] > llamadas_antes:
+                    pistas = (estadisticas["pistas_consideradas"] - consideradas_antes) / (estadisticas["llamadas"] - llamadas_antes)
+                else:
+                    pistas = len(DETECTOR_POR_DEFECTO.pistas)
+                lenguaje = detectar(entrada)[0]
+                print(f"{nombre_archivo:<20} {etiqueta:>8} {modo:>11} {llamadas_s:>12.1f} "
+                      f"{llamadas_s * len(entrada) / 1e6:>10.1f} {pistas:>8.1f}  {lenguaje}")
+
+
+if __name__ == "__main__":
+    main()
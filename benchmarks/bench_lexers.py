@@ -0,0 +1,75 @@
+# benchmarks/bench_lexers.py
+"""
+Escalado de los lexers con el tamaño de la entrada.
+
+Cada lexer tokeniza su archivo de `ejemplos_Codigo` repetido hasta alcanzar tamaños
+crecientes (por defecto de 1 KB a 10 MB). Con el motor léxico común el coste por
+carácter debe mantenerse (aproximadamente) constante: la columna "µs/KB" no debe crecer
+con el tamaño. Un lexer que copie el resto del código en cada token (`codigo[pos:]`)
+sería cuadrático y esa columna crecería en proporción al tamaño.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_lexers [--max-mb 10] [--lexer cpp]
+"""
+import os
+import sys
+import time
+
+from src.analizador_lexico.lexer_cpp import LexerCPP
+from src.analizador_lexico.lexer_html import LexerHTML
+from src.analizador_lexico.lexer_javascript import LexerJavaScript
+from src.analizador_lexico.lexer_pascal import LexerPascal
+from src.analizador_lexico.lexer_plsql import LexerPLSQL
+from src.analizador_lexico.lexer_python import LexerPython
+from src.analizador_lexico.lexer_tsql import LexerTSQL
+
+DIRECTORIO_EJEMPLOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ejemplos_Codigo")
+
+# Nombre corto -> (clase del lexer, archivo de ejemplo)
+LEXERS = {
+    "cpp": (LexerCPP, "prueba_cpp.cpp"),
+    "html": (LexerHTML, "prueba_html.html"),
+    "javascript": (LexerJavaScript, "prueba_javascript.js"),
+    "pascal": (LexerPascal, "prueba_pascal.pas"),
+    "plsql": (LexerPLSQL, "prueba_plsql.sql"),
+    "python": (LexerPython, "prueba_python.py"),
+    "tsql": (LexerTSQL, "prueba_tsql.sql"),
+}
+TAMANIOS_KB = [1, 10, 100, 1024, 10 * 1024]
+
+
+def entrada_de_tamanio(texto, tamanio):
+    """`texto` repetido (por líneas completas) hasta tener al menos `tamanio` caracteres."""
+    bloque = texto if texto.endswith('\n') else texto + '\n'
+    return bloque * max(1, -(-tamanio // len(bloque)))
+
+
+def medir(clase_lexer, codigo):
+    """Devuelve (segundos, numero_de_tokens) de una tokenización completa."""
+    inicio = time.perf_counter()
+    tokens = clase_lexer(codigo).tokenizar()
+    return time.perf_counter() - inicio, len(tokens)
+
+
+def main():
+    max_kb = TAMANIOS_KB[-1]
+    if "--max-mb" in sys.argv:
+        max_kb = int(float(sys.argv[sys.argv.index("--max-mb") + 1]) * 1024)
+    seleccion = list(LEXERS)
+    if "--lexer" in sys.argv:
+        seleccion = [sys.argv[sys.argv.index("--lexer") + 1]]
+
+    print(f"{'lexer':<11} {'tamaño':>9} {'tokens':>10} {'tiempo (s)':>11} {'MB/s':>7} {'µs/KB':>8}")
+    for nombre in seleccion:
+        clase_lexer, archivo = LEXERS[nombre]
+        with open(os.path.join(DIRECTORIO_EJEMPLOS, archivo), 'r', encoding='utf-8') as f:
+            texto = f.read()
+        for tamanio_kb in [t for t in TAMANIOS_KB if t <= max_kb]:
+            codigo = entrada_de_tamanio(texto, tamanio_kb * 1024)
+            segundos, n_tokens = medir(clase_lexer, codigo)
+            kb = len(codigo) / 1024
+            print(f"{nombre:<11} {kb:>7.0f}KB {n_tokens:>10} {segundos:>11.3f} {kb / 1024 / segundos:>7.2f} {segundos * 1e6 / kb:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/bench_lexico_paralelo.py
+"""
+Tokenización en serie frente a tokenización por tramos en varios procesos
+(ver nucleo_compilador/lexico_paralelo.py) de un único archivo grande.
+
+Cada lexer tokeniza su archivo de `ejemplos_Codigo` repetido hasta --mb megabytes; la
+versión en paralelo se llama directamente (sin depender de UMBRAL_LEXICO_PARALELO) con
+--procesos procesos. Se comprueba que los dos resultados son iguales. La aceleración
+depende de los núcleos disponibles: con uno solo, el paralelo solo añade el coste de
+crear los procesos y de enviar los tokens.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_lexico_paralelo [--mb 64] [--procesos 4] [--lexer tsql]
+"""
+import os
+import sys
+import time
+
+from benchmarks.bench_lexers import DIRECTORIO_EJEMPLOS, LEXERS, entrada_de_tamanio
+from src.analizador_lexico import lexer_cpp, lexer_pascal, lexer_plsql, lexer_tsql
+from src.nucleo_compilador.almacen_tokens import AlmacenTokens
+from src.nucleo_compilador.lexico_paralelo import tokenizar_en_paralelo
+from src.nucleo_compilador.motor_lexico import TramoEscaneo
+
+# Nombre corto -> (módulo del lexer, motor, tipos del pre-escaneo)
+PARALELIZABLES = {
+    "cpp": (lexer_cpp, lexer_cpp.MOTOR_LEXICO_CPP, lexer_cpp.TIPOS_PRECORTE_CPP),
+    "pascal": (lexer_pascal, lexer_pascal.MOTOR_LEXICO_PASCAL, lexer_pascal.TIPOS_PRECORTE_PASCAL),
+    "plsql": (lexer_plsql, lexer_plsql.MOTOR_LEXICO_PLSQL, lexer_plsql.TIPOS_PRECORTE_PLSQL),
+    "tsql": (lexer_tsql, lexer_tsql.MOTOR_LEXICO_SQL, lexer_tsql.TIPOS_PRECORTE_SQL),
+}
+
+
+def firma(tokens):
+    """Contenido comparable de un AlmacenTokens (sin crear una vista por token)."""
+    return (tokens.tipos, tokens.inicios, tokens.fines, [tokens.simbolo(i) for i in range(len(tokens))],
+            {i: repr(v) for i, v in tokens._valores.items()})
+
+
+def main():
+    mb = 64
+    if "--mb" in sys.argv:
+        mb = float(sys.argv[sys.argv.index("--mb") + 1])
+    procesos = os.cpu_count() or 1
+    if "--procesos" in sys.argv:
+        procesos = int(sys.argv[sys.argv.index("--procesos") + 1])
+    seleccion = list(PARALELIZABLES)
+    if "--lexer" in sys.argv:
+        seleccion = [sys.argv[sys.argv.index("--lexer") + 1]]
+
+    print(f"CPUs: {os.cpu_count()} | procesos: {procesos}")
+    print(f"{'lexer':<8} {'tamaño':>9} {'tokens':>10} {'serie (s)':>10} {'paralelo (s)':>13} {'aceleración':>12} {'iguales':>8}")
+    for nombre in seleccion:
+        modulo, motor, tipos_precorte = PARALELIZABLES[nombre]
+        clase_lexer, archivo = LEXERS[nombre]
+        with open(os.path.join(DIRECTORIO_EJEMPLOS, archivo), 'r', encoding='utf-8') as f:
+            codigo = entrada_de_tamanio(f.read(), int(mb * 1024 * 1024))
+
+        # En serie: un único tramo con todo el código (así no entra en juego el umbral)
+        inicio = time.perf_counter()
+        tokens_serie = clase_lexer(codigo).tokenizar(TramoEscaneo(len(codigo)))
+        segundos_serie = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        tokens_paralelo = AlmacenTokens(codigo, modulo.Token)
+        if not tokenizar_en_paralelo(clase_lexer(codigo), tokens_paralelo, motor, tipos_precorte, procesos):
+            print(f"{nombre:<8} no se reparte (--procesos {procesos} o código demasiado pequeño)")
+            continue
+        segundos_paralelo = time.perf_counter() - inicio
+
+        kb = len(codigo) / 1024
+        print(f"{nombre:<8} {kb:>7.0f}KB {len(tokens_serie):>10} {segundos_serie:>10.2f} {segundos_paralelo:>13.2f} "
+              f"{segundos_serie / segundos_paralelo:>11.2f}x {'sí' if firma(tokens_serie) == firma(tokens_paralelo) else 'NO':>8}")
+
+
+if __name__ == "__main__":
+    main()
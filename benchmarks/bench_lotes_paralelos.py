@@ -0,0 +1,88 @@
+# benchmarks/bench_lotes_paralelos.py
+"""
+Análisis sintáctico y semántico en serie frente al análisis por lotes en varios procesos
+(ver nucleo_compilador/lotes_paralelos.py) de un script T-SQL o PL/SQL con muchos lotes.
+
+El script de `ejemplos_Codigo` de cada lenguaje se repite --repeticiones veces (en PL/SQL
+se le añade la barra '/' que termina el bloque). Se mide el parser y el analizador
+semántico sobre el script completo frente a `analizar_por_lotes` (sin depender de
+UMBRAL_LOTES_PARALELOS) más la unión de los resultados semánticos, y se comprueba que el
+AST y los errores semánticos son iguales. La salida de depuración de los parsers se
+descarta en los dos casos. La aceleración depende de los núcleos disponibles: con uno
+solo, repartir los lotes solo añade el coste de crear los procesos y de enviar los AST.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_lotes_paralelos [--repeticiones 500] [--procesos 4] [--lenguaje tsql]
+"""
+import contextlib
+import os
+import sys
+import time
+
+# Los parsers y los analizadores semánticos importan `analizador_lexico.*` (igual que main.py).
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+from analizador_lexico.lexer_plsql import LexerPLSQL
+from analizador_lexico.lexer_tsql import LexerTSQL
+from analizador_sintactico.parser_plsql import ParserPLSQL
+from analizador_sintactico.parser_tsql import ParserTSQL
+from analizador_semantico.semantico_plsql import AnalizadorSemanticoPLSQL
+from analizador_semantico.semantico_tsql import AnalizadorSemanticoTSQL
+from src.nucleo_compilador.lotes_paralelos import analizar_por_lotes
+
+DIRECTORIO_EJEMPLOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ejemplos_Codigo")
+
+# Nombre corto -> (lexer, parser, analizador semántico, archivo de ejemplo, final de cada repetición)
+LENGUAJES = {
+    "tsql": (LexerTSQL, ParserTSQL, AnalizadorSemanticoTSQL, "prueba_tsql.sql", "\n"),
+    "plsql": (LexerPLSQL, ParserPLSQL, AnalizadorSemanticoPLSQL, "prueba_plsql.sql", "\n/\n"),
+}
+
+
+def main():
+    repeticiones = 500
+    if "--repeticiones" in sys.argv:
+        repeticiones = int(sys.argv[sys.argv.index("--repeticiones") + 1])
+    procesos = os.cpu_count() or 1
+    if "--procesos" in sys.argv:
+        procesos = int(sys.argv[sys.argv.index("--procesos") + 1])
+    seleccion = list(LENGUAJES)
+    if "--lenguaje" in sys.argv:
+        seleccion = [sys.argv[sys.argv.index("--lenguaje") + 1]]
+
+    print(f"CPUs: {os.cpu_count()} | procesos: {procesos}")
+    print(f"{'lenguaje':<9} {'lotes':>7} {'reanalizados':>13} {'tokens':>9} {'serie (s)':>10} {'lotes (s)':>10} "
+          f"{'aceleración':>12} {'iguales':>8}")
+    with open(os.devnull, 'w', encoding='utf-8') as salida_nula:
+        for nombre in seleccion:
+            clase_lexer, clase_parser, clase_semantico, archivo, final = LENGUAJES[nombre]
+            with open(os.path.join(DIRECTORIO_EJEMPLOS, archivo), 'r', encoding='utf-8') as f:
+                codigo = (f.read() + final) * repeticiones
+            with contextlib.redirect_stdout(salida_nula):
+                tokens = clase_lexer(codigo).tokenizar()
+
+                inicio = time.perf_counter()
+                ast = clase_parser(tokens).parse()
+                semantico = clase_semantico()
+                semantico.analizar(ast)
+                segundos_serie = time.perf_counter() - inicio
+
+                inicio = time.perf_counter()
+                analisis = analizar_por_lotes(tokens, clase_parser, clase_semantico, procesos, umbral=2,
+                                              minimo_por_trabajador=0)
+                if analisis is None:
+                    segundos_lotes = None
+                else:
+                    por_lotes = analisis.analizador_semantico()
+                    segundos_lotes = time.perf_counter() - inicio
+
+            if segundos_lotes is None:
+                print(f"{nombre:<9} no se reparte (--procesos {procesos} o un solo lote)")
+                continue
+            iguales = repr(analisis.ast) == repr(ast) and por_lotes.errores == semantico.errores
+            print(f"{nombre:<9} {analisis.lotes:>7} {analisis.lotes_reanalizados:>13} {len(tokens):>9} "
+                  f"{segundos_serie:>10.2f} {segundos_lotes:>10.2f} {segundos_serie / segundos_lotes:>11.2f}x "
+                  f"{'sí' if iguales else 'NO':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/bench_motores.py
+"""
+Comparación lado a lado de los motores de detección: pistas (modo completo y escalonado)
+frente al motor estadístico de n-gramas.
+
+Para no evaluar el motor estadístico con el mismo texto con el que se entrenó, cada archivo
+de `ejemplos_Codigo` se parte por la mitad: la primera mitad entrena una tabla de pesos y
+la segunda se corta en fragmentos de LINEAS_POR_FRAGMENTO líneas que se clasifican con los
+tres modos. Con --pesos se usa una tabla entrenada aparte (p. ej. con un corpus mayor).
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_motores [--pesos tabla.json]
+"""
+import sys
+import time
+
+from src.detector_lenguaje.detector import DetectorLenguaje, MODO_COMPLETO, MODO_ESCALONADO, MODO_ESTADISTICO
+from src.detector_lenguaje.motor_estadistico import MotorEstadistico, muestras_de_ejemplos, np
+
+LINEAS_POR_FRAGMENTO = 12
+MODOS = [MODO_COMPLETO, MODO_ESCALONADO, MODO_ESTADISTICO]
+
+
+def mitades_de_ejemplos():
+    """
+    Devuelve (muestras_entrenamiento, muestras_prueba): la primera y la segunda mitad de las
+    líneas no vacías de cada archivo de ejemplos_Codigo, como pares (texto, lenguaje).
+    """
+    entrenamiento, prueba = [], []
+    for texto, lenguaje in muestras_de_ejemplos():
+        lineas = [l for l in texto.splitlines() if l.strip()]
+        mitad = len(lineas) // 2
+        entrenamiento.append(("\n".join(lineas[:mitad]), lenguaje))
+        prueba.append(("\n".join(lineas[mitad:]), lenguaje))
+    return entrenamiento, prueba
+
+
+def partir_ejemplos():
+    """Devuelve (muestras_entrenamiento, fragmentos_prueba) a partir de ejemplos_Codigo."""
+    entrenamiento, mitades = mitades_de_ejemplos()
+    prueba = []
+    for texto, lenguaje in mitades:
+        lineas = texto.splitlines()
+        for i in range(0, len(lineas), LINEAS_POR_FRAGMENTO):
+            prueba.append(("\n".join(lineas[i:i + LINEAS_POR_FRAGMENTO]), lenguaje))
+    return entrenamiento, prueba
+
+
+def main():
+    entrenamiento, prueba = partir_ejemplos()
+    if "--pesos" in sys.argv:
+        motor = MotorEstadistico.desde_archivo(sys.argv[sys.argv.index("--pesos") + 1])
+    else:
+        motor = MotorEstadistico.entrenar(entrenamiento)
+    detector = DetectorLenguaje(motor_estadistico=motor)
+
+    print(f"Fragmentos de prueba: {len(prueba)} ({LINEAS_POR_FRAGMENTO} líneas) | NumPy: {'sí' if np is not None else 'no'}")
+    print(f"{'modo':<12} {'aciertos':>9} {'precisión':>10} {'llamadas/s':>12}")
+    for modo in MODOS:
+        aciertos = sum(1 for texto, lenguaje in prueba if detector.detectar(texto, modo=modo)[0] == lenguaje)
+        repeticiones = 0
+        inicio = time.perf_counter()
+        while time.perf_counter() - inicio < 1.0:
+            for texto, _ in prueba:
+                detector.detectar(texto, modo=modo)
+            repeticiones += 1
+        llamadas_s = repeticiones * len(prueba) / (time.perf_counter() - inicio)
+        print(f"{modo:<12} {aciertos:>9} {aciertos / len(prueba) * 100:>9.1f}% {llamadas_s:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
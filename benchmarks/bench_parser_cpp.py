@@ -0,0 +1,60 @@
+# benchmarks/bench_parser_cpp.py
+"""
+Escalado del parser de C++ con el número de declaraciones de un archivo.
+
+Genera un espacio de nombres con --declaraciones grupos de declaraciones (prototipos,
+variables globales, clases con métodos, definiciones con nombre calificado) y lo analiza
+con tamaños crecientes. Para un análisis lineal el tiempo por token se mantiene; también se
+muestran las comprobaciones especulativas (declaración o función), los aciertos del memo
+y los retrocesos del cursor.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_parser_cpp [--declaraciones 2000]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+# El parser importa los tipos de token como `analizador_lexico.*` (igual que main.py).
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+from analizador_lexico.lexer_cpp import LexerCPP
+from analizador_sintactico.parser_cpp import ParserCPP
+
+
+def generar(declaraciones):
+    lineas = ["namespace ns {"]
+    for i in range(declaraciones):
+        lineas.append(f"int f{i}(int a, const char* b);")
+        lineas.append(f"int v{i} = {i} + 1;")
+        lineas.append(f"class C{i} {{ public: int m{i}; void g{i}(int x) {{ x = x + 1; "
+                      f"for (int k = 0; k < x; k = k + 1) {{ x = x - k; }} }} }};")
+        lineas.append(f"lib::Tabla s{i};")
+        lineas.append(f"ns::Tipo* ns::Clase::metodo{i}(ns::Tipo& t) const {{ return &t; }}")
+    lineas.append("}")
+    return "\n".join(lineas) + "\n"
+
+
+def main():
+    declaraciones = 2000
+    if "--declaraciones" in sys.argv:
+        declaraciones = int(sys.argv[sys.argv.index("--declaraciones") + 1])
+
+    print(f"{'grupos':>7} {'tokens':>8} {'parse (s)':>10} {'µs/token':>9} {'especul.':>9} "
+          f"{'memo':>6} {'retroc.':>8}")
+    for divisor in (8, 4, 2, 1):
+        grupos = max(1, declaraciones // divisor)
+        tokens = LexerCPP(generar(grupos)).tokenizar()
+        parser = ParserCPP(tokens)
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            parser.parse()
+            segundos = time.perf_counter() - inicio
+        consultas = parser.memo_aciertos + parser.memo_fallos
+        print(f"{grupos:>7} {len(tokens):>8} {segundos:>10.3f} {segundos / len(tokens) * 1e6:>9.2f} "
+              f"{consultas:>9} {parser.memo_aciertos:>6} {parser.retrocesos:>8}")
+
+
+if __name__ == "__main__":
+    main()
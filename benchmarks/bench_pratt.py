@@ -0,0 +1,100 @@
+# benchmarks/bench_pratt.py
+"""
+Análisis sintáctico de archivos con muchas expresiones en los seis parsers que usan la
+tabla de precedencias de `nucleo_compilador.pratt`.
+
+Para cada lenguaje se genera un archivo con --lineas líneas llenas de operadores y se mide:
+  - el mejor de tres tiempos de `parse()` (los tokens se obtienen antes y no se cuentan);
+  - la profundidad máxima de la pila de Python al analizar una sola de esas líneas, que
+    con la cadena de un método por nivel crecía con los niveles de la gramática.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_pratt [--lineas 2000]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+# Los parsers importan los tipos de token como `analizador_lexico.*` (igual que main.py).
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+from analizador_lexico.lexer_cpp import LexerCPP
+from analizador_lexico.lexer_javascript import LexerJavaScript
+from analizador_lexico.lexer_pascal import LexerPascal
+from analizador_lexico.lexer_plsql import LexerPLSQL
+from analizador_lexico.lexer_python import LexerPython
+from analizador_lexico.lexer_tsql import LexerTSQL
+from analizador_sintactico.parser_cpp import ParserCPP
+from analizador_sintactico.parser_javascript import ParserJavaScript
+from analizador_sintactico.parser_pascal import ParserPascal
+from analizador_sintactico.parser_plsql import ParserPLSQL
+from analizador_sintactico.parser_python import ParserPython
+from analizador_sintactico.parser_tsql import ParserTSQL
+
+# Nombre -> (lexer, parser, cabecera, línea que se repite, final)
+LENGUAJES = {
+    "cpp": (LexerCPP, ParserCPP, "int main() {\n",
+            "  x = a + b * c - d / 2 % 3 << 1 >= e && f || !g & h | i ^ j == k;\n", "  return 0;\n}\n"),
+    "javascript": (LexerJavaScript, ParserJavaScript, "",
+                   "x = a + b * c - d / 2 % 3 >= e && f || !g & h | i ^ j === k;\n", ""),
+    "python": (LexerPython, ParserPython, "",
+               "x = a + b * c - d // 2 % 3 >= e and f or not g == h ** 2\n", ""),
+    "pascal": (LexerPascal, ParserPascal, "program Expresiones;\nvar x: integer;\nbegin\n",
+               "  x := a + b * c - d div 2 mod 3 >= e and f or not g;\n", "  writeln(x)\nend.\n"),
+    "tsql": (LexerTSQL, ParserTSQL, "",
+             "UPDATE t SET a = a + b * c - d / 2 % 3 WHERE a >= e AND f = 1 OR NOT g < h;\n", ""),
+    "plsql": (LexerPLSQL, ParserPLSQL, "BEGIN\n",
+              "  x := a + b * c - d / 2 ** 3 || e;\n  IF a >= e AND NOT f = 1 OR g < h THEN x := -a; END IF;\n", "END;\n"),
+}
+
+
+def analizar(clase_lexer, clase_parser, codigo, repeticiones=3):
+    """Mejor tiempo en segundos de `parse()` sobre los tokens de `codigo`."""
+    mejor = None
+    for _ in range(repeticiones):
+        parser = clase_parser(clase_lexer(codigo).tokenizar())
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            parser.parse()
+            segundos = time.perf_counter() - inicio
+        mejor = segundos if mejor is None else min(mejor, segundos)
+    return mejor
+
+
+def profundidad_maxima(clase_lexer, clase_parser, codigo):
+    """Máximo de marcos de Python anidados durante el análisis de `codigo`."""
+    tokens = clase_lexer(codigo).tokenizar()
+    parser = clase_parser(tokens)
+    estado = {"actual": 0, "maximo": 0}
+
+    def perfil(marco, evento, argumento):
+        if evento == "call":
+            estado["actual"] += 1
+            estado["maximo"] = max(estado["maximo"], estado["actual"])
+        elif evento == "return":
+            estado["actual"] -= 1
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        sys.setprofile(perfil)
+        try:
+            parser.parse()
+        finally:
+            sys.setprofile(None)
+    return estado["maximo"]
+
+
+def main():
+    lineas = 2000
+    if "--lineas" in sys.argv:
+        lineas = int(sys.argv[sys.argv.index("--lineas") + 1])
+
+    print(f"{'lenguaje':<11} {'parse (s)':>10} {'pila máx.':>10}")
+    for nombre, (clase_lexer, clase_parser, cabecera, linea, final) in LENGUAJES.items():
+        segundos = analizar(clase_lexer, clase_parser, cabecera + linea * lineas + final)
+        pila = profundidad_maxima(clase_lexer, clase_parser, cabecera + linea + final)
+        print(f"{nombre:<11} {segundos:>10.3f} {pila:>10}")
+
+
+if __name__ == "__main__":
+    main()
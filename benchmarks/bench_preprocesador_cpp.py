@@ -0,0 +1,72 @@
+# benchmarks/bench_preprocesador_cpp.py
+"""
+Preprocesado de muchas unidades de traducción que incluyen la misma cabecera.
+
+Genera en un directorio temporal una cabecera con --macros macros y --unidades archivos
+`.cpp` que la incluyen, y mide el preprocesado de todos ellos con la caché de cabeceras
+compartida frente a una caché nueva por unidad (la cabecera se vuelve a tokenizar cada vez).
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_preprocesador_cpp [--unidades 500] [--macros 200]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from src.analizador_lexico.lexer_cpp import LexerCPP
+from src.analizador_lexico.preprocesador_cpp import PreprocesadorCPP, CacheCabecerasCPP
+
+
+def generar(directorio, unidades, macros):
+    lineas = ["#pragma once"]
+    lineas += [f"#define CONST_{i} ({i} * 2 + 1)" for i in range(macros)]
+    lineas += [f"#define SUMA_{i}(a, b) ((a) + (b) + CONST_{i})" for i in range(macros)]
+    lineas += [f"int funcion_{i}(int x) {{ return SUMA_{i}(x, {i}); }}" for i in range(macros)]
+    with open(os.path.join(directorio, "comun.h"), "w", encoding="utf-8") as f:
+        f.write("\n".join(lineas) + "\n")
+    rutas = []
+    for u in range(unidades):
+        ruta = os.path.join(directorio, f"unidad_{u}.cpp")
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(f'#include "comun.h"\nint main() {{ return SUMA_{u % macros}(CONST_0, {u}); }}\n')
+        rutas.append(ruta)
+    return rutas
+
+
+def preprocesar_todas(rutas, cache_compartida):
+    """(segundos en total, segundos expandiendo, aciertos, fallos) de la caché."""
+    expansion = 0.0
+    aciertos = fallos = 0
+    inicio = time.perf_counter()
+    for ruta in rutas:
+        with open(ruta, "r", encoding="utf-8") as f:
+            tokens = LexerCPP(f.read()).tokenizar()
+        cache = cache_compartida or CacheCabecerasCPP()
+        preprocesador = PreprocesadorCPP(cache=cache)
+        preprocesador.procesar(tokens, ruta)
+        expansion += preprocesador.segundos_expansion
+        if cache is not cache_compartida:
+            aciertos, fallos = aciertos + cache.aciertos, fallos + cache.fallos
+    if cache_compartida is not None:
+        aciertos, fallos = cache_compartida.aciertos, cache_compartida.fallos
+    return time.perf_counter() - inicio, expansion, aciertos, fallos
+
+
+def main():
+    unidades, macros = 500, 200
+    if "--unidades" in sys.argv:
+        unidades = int(sys.argv[sys.argv.index("--unidades") + 1])
+    if "--macros" in sys.argv:
+        macros = int(sys.argv[sys.argv.index("--macros") + 1])
+
+    with tempfile.TemporaryDirectory() as directorio:
+        rutas = generar(directorio, unidades, macros)
+        print(f"{'caché':<11} {'total (s)':>10} {'expansión (s)':>14} {'aciertos':>9} {'fallos':>7}")
+        for nombre, cache in (("por unidad", None), ("compartida", CacheCabecerasCPP())):
+            segundos, expansion, aciertos, fallos = preprocesar_todas(rutas, cache)
+            print(f"{nombre:<11} {segundos:>10.3f} {expansion:>14.3f} {aciertos:>9} {fallos:>7}")
+
+
+if __name__ == "__main__":
+    main()
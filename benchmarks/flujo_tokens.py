@@ -0,0 +1,103 @@
+# benchmarks/flujo_tokens.py
+"""
+Pico de memoria con tokens en lista (`tokenizar()`) frente a tokens en flujo
+(`generar_tokens()` leído a través de un FlujoTokens).
+
+Para cada lexer que admite flujo se mide con tracemalloc el pico de memoria de:
+  - "tokens": recorrer todos los tokens como lo hace un parser (`hay(i)` / `tokens[i]`);
+    en modo flujo no debe crecer con el tamaño de la entrada.
+  - "parser": el análisis sintáctico completo; aquí el AST sí crece con la entrada.
+
+El código fuente no se cuenta en ninguno de los dos modos.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.flujo_tokens [--mb 1]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+from benchmarks.bench_lexers import DIRECTORIO_EJEMPLOS, LEXERS, entrada_de_tamanio
+
+# Los parsers importan los tipos de token como `analizador_lexico.*` (igual que main.py).
+sys.path.insert(0, os.path.join(os.path.dirname(DIRECTORIO_EJEMPLOS), "src"))
+from analizador_lexico.lexer_pascal import LexerPascal
+from analizador_lexico.lexer_plsql import LexerPLSQL
+from analizador_lexico.lexer_tsql import LexerTSQL
+from analizador_sintactico.parser_pascal import ParserPascal
+from analizador_sintactico.parser_plsql import ParserPLSQL
+from analizador_sintactico.parser_tsql import ParserTSQL
+from src.nucleo_compilador.flujo_tokens import FlujoTokens
+
+# Nombre corto (como en bench_lexers.LEXERS) -> (clase del lexer, clase del parser)
+PARSERS = {
+    "pascal": (LexerPascal, ParserPascal),
+    "plsql": (LexerPLSQL, ParserPLSQL),
+    "tsql": (LexerTSQL, ParserTSQL),
+}
+
+# Un programa Pascal repetido no es válido (solo puede haber un `program ... end.`), así que
+# para Pascal se genera un programa con el cuerpo repetido.
+CABECERA_PASCAL = "program Grande;\nvar x, y: integer;\nbegin\n  x := 0;\n  y := 0;\n"
+CUERPO_PASCAL = "  x := (x + 1) * 2 - y;\n  if x > 10 then y := y + 1 else y := y - 1;\n"
+FINAL_PASCAL = "  writeln(x)\nend.\n"
+
+
+def entrada(nombre, tamanio):
+    """Código de al menos `tamanio` caracteres para el lexer `nombre`."""
+    if nombre == "pascal":
+        return CABECERA_PASCAL + entrada_de_tamanio(CUERPO_PASCAL, tamanio) + FINAL_PASCAL
+    with open(os.path.join(DIRECTORIO_EJEMPLOS, LEXERS[nombre][1]), 'r', encoding='utf-8') as f:
+        return entrada_de_tamanio(f.read(), tamanio)
+
+
+def recorrer(tokens):
+    """Lee todos los tokens por índice, como el `_avanzar` de los parsers."""
+    flujo = FlujoTokens(tokens)
+    i = 0
+    while flujo.hay(i):
+        flujo[i]
+        i += 1
+    return i
+
+
+def analizar(clase_parser, tokens):
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser = clase_parser(tokens)
+        try:
+            parser.parse()
+        except SyntaxError:
+            pass
+    return parser.posicion_actual
+
+
+def pico(funcion):
+    """(segundos, bytes de pico) de llamar a `funcion()`."""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    maximo = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return segundos, maximo
+
+
+def main():
+    megabytes = 1.0
+    if "--mb" in sys.argv:
+        megabytes = float(sys.argv[sys.argv.index("--mb") + 1])
+
+    print(f"{'lexer':<8} {'fase':<7} {'lista (MB)':>11} {'flujo (MB)':>11} {'lista (s)':>10} {'flujo (s)':>10}")
+    for nombre, (clase_lexer, clase_parser) in PARSERS.items():
+        codigo = entrada(nombre, int(megabytes * 1024 * 1024))
+        for fase, funcion, argumentos in (("tokens", recorrer, ()), ("parser", analizar, (clase_parser,))):
+            s_lista, b_lista = pico(lambda: funcion(*argumentos, clase_lexer(codigo).tokenizar()))
+            s_flujo, b_flujo = pico(lambda: funcion(*argumentos, clase_lexer(codigo).generar_tokens()))
+            print(f"{nombre:<8} {fase:<7} {b_lista / 1e6:>11.1f} {b_flujo / 1e6:>11.2f} {s_lista:>10.2f} {s_flujo:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
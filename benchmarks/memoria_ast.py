@@ -0,0 +1,46 @@
+# benchmarks/memoria_ast.py
+"""
+Memoria retenida por el AST de cada parser.
+
+Para cada lenguaje se genera un archivo con --lineas líneas (las de bench_pratt, más un
+documento HTML), se tokeniza y se mide con tracemalloc la memoria que queda retenida por
+el AST que devuelve `parse()`. Los tokens se crean antes de medir, así que no se cuentan:
+solo los nodos, sus listas, las vistas de token que guardan y las cadenas que crean.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.memoria_ast [--lineas 5000]
+"""
+import contextlib
+import io
+import sys
+
+from benchmarks.bench_pratt import LENGUAJES
+from benchmarks.memoria_tokens import memoria_retenida
+from analizador_lexico.lexer_html import LexerHTML
+from analizador_sintactico.parser_html import ParserHTML
+
+HTML = (LexerHTML, ParserHTML, "<html>\n<body>\n",
+        "<div class=\"fila\" id=\"f\"><p>Texto <b>negrita</b> y <i>cursiva</i></p><!-- nota --></div>\n",
+        "</body>\n</html>\n")
+
+
+def main():
+    lineas = 5000
+    if "--lineas" in sys.argv:
+        lineas = int(sys.argv[sys.argv.index("--lineas") + 1])
+
+    print(f"{'lenguaje':<11} {'AST (KB)':>10} {'B/línea':>9}")
+    for nombre, (clase_lexer, clase_parser, cabecera, linea, final) in {**LENGUAJES, "html": HTML}.items():
+        tokens = clase_lexer(cabecera + linea * lineas + final).tokenizar()
+        parser = clase_parser(tokens)
+        with contextlib.redirect_stdout(io.StringIO()):
+            ast, retenidos = memoria_retenida(parser.parse)
+        if ast is None:
+            print(f"{nombre:<11} {'(error de análisis)':>20}")
+            continue
+        print(f"{nombre:<11} {retenidos / 1024:>10.0f} {retenidos / lineas:>9.0f}")
+        del ast, parser, tokens
+
+
+if __name__ == "__main__":
+    main()
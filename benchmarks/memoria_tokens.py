@@ -0,0 +1,51 @@
+# benchmarks/memoria_tokens.py
+"""
+Memoria por token: almacén compacto (`AlmacenTokens`) frente a una lista de objetos
+`Token` con el mismo contenido (la representación anterior).
+
+Cada lexer tokeniza su archivo de `ejemplos_Codigo` repetido hasta el tamaño pedido y se
+mide con tracemalloc la memoria que queda retenida por el resultado (sin contar el
+código fuente, que ambas representaciones necesitan).
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.memoria_tokens [--mb 1]
+"""
+import gc
+import os
+import sys
+import tracemalloc
+
+from benchmarks.bench_lexers import DIRECTORIO_EJEMPLOS, LEXERS, entrada_de_tamanio
+
+
+def memoria_retenida(funcion):
+    """(resultado, bytes retenidos por el resultado) de llamar a `funcion`."""
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    resultado = funcion()
+    gc.collect()
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return resultado, despues - antes
+
+
+def main():
+    megabytes = 1.0
+    if "--mb" in sys.argv:
+        megabytes = float(sys.argv[sys.argv.index("--mb") + 1])
+
+    print(f"{'lexer':<11} {'tokens':>9} {'Token (B/token)':>16} {'almacén (B/token)':>18} {'reducción':>10}")
+    for nombre, (clase_lexer, archivo) in LEXERS.items():
+        with open(os.path.join(DIRECTORIO_EJEMPLOS, archivo), 'r', encoding='utf-8') as f:
+            codigo = entrada_de_tamanio(f.read(), int(megabytes * 1024 * 1024))
+        lexer = clase_lexer(codigo)
+        almacen, bytes_almacen = memoria_retenida(lexer.tokenizar)
+        lista, bytes_lista = memoria_retenida(almacen.materializar)
+        n = len(almacen)
+        print(f"{nombre:<11} {n:>9} {bytes_lista / n:>16.1f} {bytes_almacen / n:>18.1f} {bytes_lista / bytes_almacen:>9.1f}x")
+        del lista, almacen, lexer
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+# benchmarks/regresion_detector.py
+"""
+Banco de pruebas y de regresión del detector de lenguaje.
+
+Genera un corpus etiquetado mutando los archivos de `ejemplos_Codigo` (renombrar
+identificadores, barajar sentencias, quitar comentarios, concatenar y escalar el tamaño),
+lo clasifica y muestra la precisión/exhaustividad por lenguaje, la matriz de confusión y
+los archivos por segundo. Si la precisión global empeora respecto a la línea base
+(`linea_base_detector.json`) más allá de la tolerancia, termina con código 1.
+
+Los archivos/s son absolutos y dependen de la máquina, así que la comprobación del
+rendimiento contra la línea base solo se hace si se pide: con la variable de entorno
+COMPROBAR_RENDIMIENTO_DETECTOR=1 o con --comprobar-rendimiento (en la misma máquina en la
+que se grabó la línea base).
+
+En el modo estadístico el motor no se evalúa con el texto con el que se entrenó (la
+precisión mediría memoria, no detección): como en bench_motores.py, se entrena con la
+primera mitad de cada archivo (y sus variantes, como la tabla distribuida) y el corpus se
+genera a partir de la segunda.
+
+Con --exportar-corpus DIR se escriben las variantes mutadas de los ejemplos en DIR con un
+subdirectorio por lenguaje, el formato de corpus del entrenamiento de motor_estadistico.py.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.regresion_detector [--modo completo] [--variantes 12] [--semilla 0]
+                                            [--comprobar-rendimiento] [--actualizar-linea-base]
+    python -m benchmarks.regresion_detector --exportar-corpus DIR
+"""
+import json
+import os
+import random
+import re
+import sys
+import time
+
+from benchmarks.bench_motores import mitades_de_ejemplos
+from src.detector_lenguaje.detector import DetectorLenguaje, MODO_COMPLETO, MODO_ESTADISTICO
+from src.detector_lenguaje.motor_estadistico import DIRECTORIOS_CORPUS, MotorEstadistico, muestras_de_ejemplos
+from src.detector_lenguaje.pistas_lenguaje import LENGUAJES_SOPORTADOS, PISTAS_LENGUAJE
+from src.analizador_lexico.lexer_cpp import PALABRAS_CLAVE_CPP
+from src.analizador_lexico.lexer_javascript import PALABRAS_CLAVE_JS
+from src.analizador_lexico.lexer_pascal import PALABRAS_RESERVADAS_PASCAL
+from src.analizador_lexico.lexer_plsql import PALABRAS_CLAVE_PLSQL
+from src.analizador_lexico.lexer_python import PALABRAS_CLAVE_PYTHON
+from src.analizador_lexico.lexer_tsql import PALABRAS_CLAVE_SQL
+
+RUTA_LINEA_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "linea_base_detector.json")
+TOLERANCIA_PRECISION = 1.0    # Puntos porcentuales de precisión global que se pueden perder
+TOLERANCIA_RENDIMIENTO = 0.25 # Fracción de archivos/s que se puede perder (solo si se comprueba el rendimiento)
+VARIABLE_COMPROBAR_RENDIMIENTO = "COMPROBAR_RENDIMIENTO_DETECTOR"
+TAMANIOS_ESCALADO = [4 * 1024, 64 * 1024] # Tamaños a los que se escalan las variantes impares
+ETIQUETA_DESCONOCIDO = "Desconocido"
+# Variantes por archivo con las que se entrena el motor estadístico (semilla distinta de la
+# del corpus de evaluación para no evaluar con las mismas mutaciones).
+VARIANTES_ENTRENAMIENTO = 40
+SEMILLA_ENTRENAMIENTO = 99
+
+# Marcadores de comentario de línea completa por lenguaje: (inicio, fin obligatorio o "").
+COMENTARIOS_LINEA = {
+    "Python": [("#", "")],
+    "C++": [("//", ""), ("/*", "*/")],
+    "JavaScript": [("//", ""), ("/*", "*/")],
+    "Pascal": [("//", ""), ("{", "}"), ("(*", "*)")],
+    "PL/SQL": [("--", ""), ("/*", "*/")],
+    "T-SQL": [("--", ""), ("/*", "*/")],
+    "HTML": [("<!--", "-->")],
+}
+REGEX_IDENTIFICADOR = re.compile(r'\b[A-Za-z_][A-Za-z0-9_]{2,}\b')
+
+
+def _palabras_protegidas():
+    """Palabras clave de los lexers y palabras que aparecen en las pistas: no se renombran."""
+    protegidas = set()
+    for palabras in (PALABRAS_CLAVE_CPP, PALABRAS_CLAVE_JS, PALABRAS_RESERVADAS_PASCAL,
+                     PALABRAS_CLAVE_PLSQL, PALABRAS_CLAVE_PYTHON, PALABRAS_CLAVE_SQL):
+        protegidas.update(p.lower() for p in palabras)
+    for patron in PISTAS_LENGUAJE:
+        # Se quitan los escapes (\b, \s, \w...) antes de extraer las palabras del patrón
+        protegidas.update(p.lower() for p in re.findall(r'[A-Za-z_]\w+', re.sub(r'\\.', ' ', patron)))
+    return protegidas
+
+
+PALABRAS_PROTEGIDAS = _palabras_protegidas()
+
+
+# --- Mutaciones: cada una recibe (lineas, lenguaje, rng) y devuelve las nuevas líneas ---
+
+def renombrar_identificadores(lineas, lenguaje, rng):
+    if lenguaje == "HTML": # En HTML los "identificadores" son etiquetas y texto
+        return lineas
+    nombres = {}
+    def renombrar(coincidencia):
+        palabra = coincidencia.group(0)
+        if palabra.lower() in PALABRAS_PROTEGIDAS or palabra.isupper():
+            return palabra
+        if palabra not in nombres:
+            nombres[palabra] = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 8))) + f"_{len(nombres)}"
+        return nombres[palabra]
+    return [REGEX_IDENTIFICADOR.sub(renombrar, linea) for linea in lineas]
+
+
+def barajar_sentencias(lineas, lenguaje, rng):
+    """Intercambia bloques de hasta 3 líneas contiguas (se conserva el contenido de cada línea)."""
+    bloques = [lineas[i:i + rng.randint(1, 3)] for i in range(0, len(lineas), 3)]
+    rng.shuffle(bloques)
+    return [linea for bloque in bloques for linea in bloque]
+
+
+def quitar_comentarios(lineas, lenguaje, rng):
+    marcadores = COMENTARIOS_LINEA.get(lenguaje, [])
+    resultado = []
+    for linea in lineas:
+        limpia = linea.strip()
+        if any(limpia.startswith(inicio) and limpia.endswith(fin) for inicio, fin in marcadores):
+            continue
+        resultado.append(linea)
+    return resultado
+
+
+def concatenar(lineas, lenguaje, rng):
+    """Concatena el archivo con una versión suya mutada (mismo lenguaje)."""
+    return lineas + [""] + barajar_sentencias(renombrar_identificadores(lineas, lenguaje, rng), lenguaje, rng)
+
+
+MUTACIONES = [renombrar_identificadores, barajar_sentencias, quitar_comentarios, concatenar]
+
+
+def escalar(texto, tamanio_bytes):
+    """Repite el texto hasta (aprox.) el tamaño pedido, cortando en un salto de línea."""
+    repetido = (texto + "\n") * (tamanio_bytes // (len(texto) + 1) + 1)
+    corte = repetido.rfind("\n", 0, tamanio_bytes)
+    return repetido[:corte if corte > 0 else tamanio_bytes]
+
+
+def generar_corpus(variantes_por_archivo=12, semilla=0, tamanios=TAMANIOS_ESCALADO, muestras=None):
+    """
+    Devuelve una lista de (nombre, texto, lenguaje_esperado). Incluye los originales y, por
+    cada archivo, `variantes_por_archivo` variantes con 1 a 3 mutaciones aleatorias; las
+    variantes impares se escalan además a uno de `tamanios`. Es determinista dada la semilla.
+    `muestras` son los pares (texto, lenguaje) de partida (por defecto, ejemplos_Codigo).
+    """
+    rng = random.Random(semilla)
+    corpus = []
+    if muestras is None:
+        muestras = muestras_de_ejemplos()
+    for indice, (texto, lenguaje) in enumerate(muestras):
+        corpus.append((f"{lenguaje}#{indice}/original", texto, lenguaje))
+        lineas = texto.splitlines()
+        for v in range(variantes_por_archivo):
+            mutaciones = rng.sample(MUTACIONES, rng.randint(1, 3))
+            mutadas = lineas
+            for mutacion in mutaciones:
+                mutadas = mutacion(mutadas, lenguaje, rng)
+            variante = "\n".join(mutadas)
+            nombre = "+".join(m.__name__ for m in mutaciones)
+            if v % 2 and tamanios:
+                tamanio = rng.choice(tamanios)
+                variante = escalar(variante, tamanio)
+                nombre += f"+escalar({tamanio})"
+            corpus.append((f"{lenguaje}#{indice}/{v}:{nombre}", variante, lenguaje))
+    return corpus
+
+
+def exportar_corpus(directorio, variantes_por_archivo=VARIANTES_ENTRENAMIENTO, semilla=SEMILLA_ENTRENAMIENTO):
+    """
+    Escribe las variantes mutadas (sin los originales, que el entrenamiento ya incluye) en
+    `directorio`/<subdirectorio del lenguaje>/. Devuelve el número de archivos escritos.
+    """
+    subdirectorios = {lenguaje: nombre for nombre, lenguaje in DIRECTORIOS_CORPUS.items()}
+    escritos = 0
+    for nombre, texto, lenguaje in generar_corpus(variantes_por_archivo, semilla, tamanios=[]):
+        if nombre.endswith("/original"):
+            continue
+        carpeta = os.path.join(directorio, subdirectorios[lenguaje])
+        os.makedirs(carpeta, exist_ok=True)
+        with open(os.path.join(carpeta, f"variante_{escritos:05d}.txt"), 'w', encoding='utf-8') as archivo:
+            archivo.write(texto)
+        escritos += 1
+    return escritos
+
+
+def evaluar(corpus, detector=None, modo=MODO_COMPLETO, tiempo_minimo=None):
+    """
+    Clasifica el corpus y devuelve un diccionario con la matriz de confusión
+    ({esperado: {predicho: n}}), precisión/exhaustividad por lenguaje, precisión global,
+    archivos por segundo y la lista de fallos. El rendimiento se mide en pasadas
+    adicionales sobre el corpus hasta sumar `tiempo_minimo` segundos (al menos una); con
+    `tiempo_minimo=None` no se mide y "archivos_por_segundo" es None.
+    """
+    detector = detector if detector is not None else DetectorLenguaje()
+    # La primera pasada da las predicciones (y calienta cachés y el motor estadístico).
+    predicciones = [detector.detectar(texto, modo=modo)[0] for _, texto, _ in corpus]
+    archivos_por_segundo = None
+    if tiempo_minimo is not None:
+        pasadas = 0
+        inicio = time.perf_counter()
+        transcurrido = 0.0
+        while pasadas == 0 or transcurrido < tiempo_minimo:
+            for _, texto, _ in corpus:
+                detector.detectar(texto, modo=modo)
+            pasadas += 1
+            transcurrido = time.perf_counter() - inicio
+        archivos_por_segundo = pasadas * len(corpus) / transcurrido if transcurrido > 0 else float("inf")
+
+    etiquetas = list(LENGUAJES_SOPORTADOS) + [ETIQUETA_DESCONOCIDO]
+    confusion = {esperado: {predicho: 0 for predicho in etiquetas} for esperado in LENGUAJES_SOPORTADOS}
+    fallos = []
+    for (nombre, _, esperado), predicho in zip(corpus, predicciones):
+        predicho_etiqueta = predicho if predicho in confusion else ETIQUETA_DESCONOCIDO
+        confusion[esperado][predicho_etiqueta] += 1
+        if predicho_etiqueta != esperado:
+            fallos.append((nombre, esperado, predicho))
+
+    por_lenguaje = {}
+    for lenguaje in LENGUAJES_SOPORTADOS:
+        verdaderos = confusion[lenguaje][lenguaje]
+        predichos = sum(confusion[esperado][lenguaje] for esperado in LENGUAJES_SOPORTADOS)
+        reales = sum(confusion[lenguaje].values())
+        por_lenguaje[lenguaje] = {
+            "precision": verdaderos / predichos if predichos else 0.0,
+            "exhaustividad": verdaderos / reales if reales else 0.0,
+            "soporte": reales,
+        }
+    aciertos = len(corpus) - len(fallos)
+    return {
+        "confusion": confusion,
+        "por_lenguaje": por_lenguaje,
+        "precision_global": aciertos / len(corpus) * 100 if corpus else 0.0,
+        "archivos_por_segundo": archivos_por_segundo,
+        "fallos": fallos,
+    }
+
+
+def imprimir_informe(resultado):
+    print(f"{'lenguaje':<12} {'precisión':>10} {'exhaust.':>10} {'soporte':>8}")
+    for lenguaje, metricas in resultado["por_lenguaje"].items():
+        print(f"{lenguaje:<12} {metricas['precision']:>10.3f} {metricas['exhaustividad']:>10.3f} {metricas['soporte']:>8}")
+    etiquetas = list(LENGUAJES_SOPORTADOS) + [ETIQUETA_DESCONOCIDO]
+    print("\nMatriz de confusión (filas: esperado, columnas: predicho)")
+    print(" " * 12 + "".join(f"{e[:7]:>8}" for e in etiquetas))
+    for esperado, fila in resultado["confusion"].items():
+        print(f"{esperado:<12}" + "".join(f"{fila[e]:>8}" for e in etiquetas))
+    rendimiento = resultado["archivos_por_segundo"]
+    print(f"\nPrecisión global: {resultado['precision_global']:.2f}%" + (f" | Archivos/s: {rendimiento:.1f}" if rendimiento is not None else ""))
+    for nombre, esperado, predicho in resultado["fallos"][:10]:
+        print(f"  FALLO {nombre}: esperado {esperado}, predicho {predicho}")
+
+
+def comprobacion_de_rendimiento_pedida():
+    """True si se ha pedido comparar los archivos/s con la línea base (variable de entorno)."""
+    return os.environ.get(VARIABLE_COMPROBAR_RENDIMIENTO, "").strip() not in ("", "0")
+
+
+def comprobar_regresion(resultado, linea_base, comprobar_rendimiento=False):
+    """
+    Devuelve la lista de regresiones (vacía si no hay) respecto a la línea base. Los
+    archivos/s solo se comparan con `comprobar_rendimiento` y si el resultado los midió.
+    """
+    regresiones = []
+    if resultado["precision_global"] < linea_base["precision_global"] - TOLERANCIA_PRECISION:
+        regresiones.append(f"precisión global {resultado['precision_global']:.2f}% < línea base {linea_base['precision_global']:.2f}%")
+    if not comprobar_rendimiento or resultado["archivos_por_segundo"] is None:
+        return regresiones
+    minimo = linea_base["archivos_por_segundo"] * (1 - TOLERANCIA_RENDIMIENTO)
+    if resultado["archivos_por_segundo"] < minimo:
+        regresiones.append(f"rendimiento {resultado['archivos_por_segundo']:.1f} archivos/s < mínimo {minimo:.1f}")
+    return regresiones
+
+
+def _argumento(nombre, por_defecto):
+    return sys.argv[sys.argv.index(nombre) + 1] if nombre in sys.argv else por_defecto
+
+
+def main():
+    if "--exportar-corpus" in sys.argv:
+        directorio = _argumento("--exportar-corpus", None)
+        print(f"{exportar_corpus(directorio)} variantes escritas en '{directorio}'.")
+        return 0
+    modo = _argumento("--modo", MODO_COMPLETO)
+    variantes = int(_argumento("--variantes", 12))
+    semilla = int(_argumento("--semilla", 0))
+    detector = muestras = None
+    if modo == MODO_ESTADISTICO:
+        entrenamiento, muestras = mitades_de_ejemplos()
+        variantes_entrenamiento = generar_corpus(VARIANTES_ENTRENAMIENTO, SEMILLA_ENTRENAMIENTO, tamanios=[], muestras=entrenamiento)
+        detector = DetectorLenguaje(motor_estadistico=MotorEstadistico.entrenar((t, l) for _, t, l in variantes_entrenamiento))
+    corpus = generar_corpus(variantes, semilla, muestras=muestras)
+    print(f"Corpus: {len(corpus)} archivos ({sum(len(t) for _, t, _ in corpus) / 1e6:.1f} MB) | modo: {modo}\n")
+    resultado = evaluar(corpus, detector, modo=modo, tiempo_minimo=1.0)
+    imprimir_informe(resultado)
+
+    clave = f"{modo}/variantes={variantes}/semilla={semilla}"
+    lineas_base = {}
+    if os.path.exists(RUTA_LINEA_BASE):
+        with open(RUTA_LINEA_BASE, 'r', encoding='utf-8') as archivo:
+            lineas_base = json.load(archivo)
+    if "--actualizar-linea-base" in sys.argv:
+        lineas_base[clave] = {k: round(resultado[k], 2) for k in ("precision_global", "archivos_por_segundo")}
+        with open(RUTA_LINEA_BASE, 'w', encoding='utf-8') as archivo:
+            json.dump(lineas_base, archivo, indent=2, sort_keys=True)
+        print(f"\nLínea base '{clave}' actualizada.")
+        return 0
+    if clave not in lineas_base:
+        print(f"\nNo hay línea base para '{clave}' (use --actualizar-linea-base).")
+        return 0
+    comprobar_rendimiento = "--comprobar-rendimiento" in sys.argv or comprobacion_de_rendimiento_pedida()
+    regresiones = comprobar_regresion(resultado, lineas_base[clave], comprobar_rendimiento)
+    for regresion in regresiones:
+        print(f"REGRESIÓN: {regresion}")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,19 @@
 # src/analizador_lexico/lexer_cpp.py
 import re
 
+from src.nucleo_compilador.almacen_tokens import AlmacenTokens
+from src.nucleo_compilador.internado import internar
+from src.nucleo_compilador.lexico_paralelo import UMBRAL_LEXICO_PARALELO, tokenizar_en_paralelo
+from src.nucleo_compilador.motor_lexico import MotorLexico, avanzar_posicion, tabla_palabras_clave
+
 # Reutilizamos la definición de la clase Token.
 class Token:
     """
     Representa un token léxico con su tipo, lexema (texto),
     número de línea y columna donde aparece, y un valor opcional.
     """
+    simbolo = None # Nombre canónico (internado) si el token es un identificador
+
     def __init__(self, tipo, lexema, linea, columna, valor=None):
         self.tipo = tipo
         self.lexema = lexema
@@ -146,6 +153,26 @@ ESPECIFICACIONES_TOKEN_CPP = [
     (r'\s+', TT_WHITESPACE_CPP),
 ]
 
+# La directiva se prueba antes que el resto de la tabla y admite espacios/tabs delante del
+# '#' (se consumen, pero no forman parte del lexema: el grupo 1 es la directiva en sí).
+ESPECIFICACIONES_MOTOR_CPP = [
+    (rf'[ \t]*({patron})', tipo) if tipo == TT_DIRECTIVA_PREPROCESADOR else (patron, tipo)
+    for patron, tipo in ESPECIFICACIONES_TOKEN_CPP
+]
+
+MOTOR_LEXICO_CPP = MotorLexico(
+    ESPECIFICACIONES_MOTOR_CPP,
+    ignorar=(TT_WHITESPACE_CPP, TT_COMENTARIO_LINEA, TT_COMENTARIO_BLOQUE),
+    tipo_identificador=TT_IDENTIFICADOR,
+    palabras_clave=tabla_palabras_clave(PALABRAS_CLAVE_CPP, TT_PALABRA_CLAVE),
+    nombre="cpp",
+)
+
+# Tokens que pueden contener un salto de línea o esconder el comienzo de otro token: el
+# pre-escaneo de la tokenización en paralelo no corta dentro de ellos.
+TIPOS_PRECORTE_CPP = (TT_DIRECTIVA_PREPROCESADOR, TT_COMENTARIO_LINEA, TT_COMENTARIO_BLOQUE,
+                      TT_LITERAL_CADENA, TT_LITERAL_CARACTER)
+
 
 class LexerCPP:
     """
@@ -170,10 +197,9 @@ class LexerCPP:
                 break 
 
     def _procesar_directiva_preprocesador(self, match_directiva):
-        """Procesa una directiva de preprocesador."""
-        lexema_completo = match_directiva.group(0)
-        nombre_directiva = match_directiva.group(1).lower() # ej. 'include', 'define'
-        resto_linea = match_directiva.group(2).strip()
+        """Procesa una directiva de preprocesador (coincidencia del motor léxico). Devuelve (tipo, valor)."""
+        nombre_directiva = MotorLexico.grupo(match_directiva, 2).lower() # ej. 'include', 'define'
+        resto_linea = MotorLexico.grupo(match_directiva, 3).strip()
         
         # print(f"DEBUG Preproc: '{nombre_directiva}', Resto: '{resto_linea}'")
 
@@ -184,117 +210,90 @@ class LexerCPP:
                 match_cabecera_usr = re.match(r'"\s*([^"]+)\s*"', resto_linea)
                 if match_cabecera_std:
                     nombre_archivo = match_cabecera_std.group(1).strip()
-                    return Token(TT_DIRECTIVA_PREPROCESADOR, lexema_completo, self.linea_actual, self.columna_actual, 
-                                 valor={'directiva': nombre_directiva, 'archivo': nombre_archivo, 'tipo_cabecera': TT_CABECERA_ESTANDAR})
+                    return TT_DIRECTIVA_PREPROCESADOR, {'directiva': nombre_directiva, 'archivo': nombre_archivo, 'tipo_cabecera': TT_CABECERA_ESTANDAR}
                 elif match_cabecera_usr:
                     nombre_archivo = match_cabecera_usr.group(1).strip()
-                    return Token(TT_DIRECTIVA_PREPROCESADOR, lexema_completo, self.linea_actual, self.columna_actual,
-                                 valor={'directiva': nombre_directiva, 'archivo': nombre_archivo, 'tipo_cabecera': TT_CABECERA_USUARIO})
+                    return TT_DIRECTIVA_PREPROCESADOR, {'directiva': nombre_directiva, 'archivo': nombre_archivo, 'tipo_cabecera': TT_CABECERA_USUARIO}
                 else: # No se pudo parsear el archivo de cabecera correctamente
-                    return Token(TT_DIRECTIVA_PREPROCESADOR, lexema_completo, self.linea_actual, self.columna_actual,
-                                 valor={'directiva': nombre_directiva, 'argumentos': resto_linea, 'error_cabecera': True})
+                    return TT_DIRECTIVA_PREPROCESADOR, {'directiva': nombre_directiva, 'argumentos': resto_linea, 'error_cabecera': True}
             else: # Otras directivas
-                return Token(TT_DIRECTIVA_PREPROCESADOR, lexema_completo, self.linea_actual, self.columna_actual,
-                             valor={'directiva': nombre_directiva, 'argumentos': resto_linea})
+                return TT_DIRECTIVA_PREPROCESADOR, {'directiva': nombre_directiva, 'argumentos': resto_linea}
         else: # No es una directiva conocida, pero empieza con #
-            return Token(TT_ERROR_CPP, lexema_completo, self.linea_actual, self.columna_actual,
-                         valor=f"Directiva de preprocesador desconocida: '{nombre_directiva}'")
+            return TT_ERROR_CPP, f"Directiva de preprocesador desconocida: '{nombre_directiva}'"
 
 
-    def tokenizar(self):
-        tokens = []
-        while self.posicion_actual < len(self.codigo):
-            match_encontrado_en_iteracion = False
-            linea_inicio_token = self.linea_actual
-            col_inicio_token = self.columna_actual
-            subcadena_actual = self.codigo[self.posicion_actual:]
-            match_espacios_inicio_linea = re.match(r'^[ \t]*', subcadena_actual)
-            pos_despues_espacios = self.posicion_actual + len(match_espacios_inicio_linea.group(0))
+    def tokenizar(self, tramo=None):
+        """
+        AlmacenTokens con todos los tokens. Un código de más de UMBRAL_LEXICO_PARALELO
+        caracteres se tokeniza por tramos en varios procesos (ver lexico_paralelo); con
+        `tramo` (un TramoEscaneo) solo se tokeniza ese tramo, sin EOF.
+        """
+        tokens = AlmacenTokens(self.codigo, Token)
+        if tramo is None and len(self.codigo) - self.posicion_actual >= UMBRAL_LEXICO_PARALELO:
+            tokenizar_en_paralelo(self, tokens, MOTOR_LEXICO_CPP, TIPOS_PRECORTE_CPP)
+        # La línea y la columna de cada token las calcula el almacén a partir de `inicio`.
+        escaneo = MOTOR_LEXICO_CPP.escanear(self.codigo, self.posicion_actual, posiciones=False)
+        if tramo is not None:
+            escaneo = tramo.limitar(escaneo, len(self.codigo))
+        for tipo_token, lexema, _, _, inicio, match in escaneo:
+            if tipo_token is None:
+                tokens.agregar(TT_ERROR_CPP, lexema, valor=f"Carácter no reconocido: '{lexema}'", inicio=inicio)
+                continue
+            if tipo_token == TT_DIRECTIVA_PREPROCESADOR:
+                # Los espacios/tabs previos al '#' se consumen, pero el token empieza en el '#'.
+                inicio_directiva = match.start(match.lastindex + 1)
+                tipo_token, valor_final = self._procesar_directiva_preprocesador(match)
+                tokens.agregar(tipo_token, MotorLexico.grupo(match, 1), None, None, valor_final, inicio_directiva)
+                continue
+
+            valor_final = lexema
+            if tipo_token == TT_PALABRA_CLAVE:
+                if lexema == 'true': valor_final = True
+                elif lexema == 'false': valor_final = False
+                elif lexema == 'nullptr': valor_final = None
+            elif tipo_token == TT_LITERAL_CADENA:
+                if lexema.startswith('R"'):
+                    match_raw = re.match(r'R"([^\s()\\\t\n\r]*)\(([\s\S]*?)\)\1"', lexema)
+                    if match_raw: valor_final = match_raw.group(2)
+                else:
+                    prefijo_match = re.match(r'^(L|u8|u|U)?(".*")', lexema)
+                    cadena_real = prefijo_match.group(2) if prefijo_match else lexema
+                    valor_final = cadena_real[1:-1]
+                    valor_final = valor_final.replace('\\n', '\n').replace('\\t', '\t').replace('\\"', '"').replace("\\'", "'").replace('\\\\', '\\')
+            elif tipo_token == TT_LITERAL_CARACTER:
+                valor_final = lexema[1:-1]
+                if valor_final.startswith('\\'):
+                    if valor_final == '\\n': valor_final = '\n'
+                    elif valor_final == '\\t': valor_final = '\t'
+            elif tipo_token == TT_LITERAL_ENTERO:
+                try:
+                    temp_lexema = lexema
+                    for suffix in ['ull', 'Ull', 'uLL', 'ULL', 'ul', 'Ul', 'uL', 'UL', 'll', 'LL', 'l', 'L', 'u', 'U']:
+                        if temp_lexema.lower().endswith(suffix.lower()):
+                            temp_lexema = temp_lexema[:-len(suffix)]
+                            break
+                    if temp_lexema.lower().startswith('0x'): valor_final = int(temp_lexema, 16)
+                    elif temp_lexema.lower().startswith('0b'): valor_final = int(temp_lexema, 2)
+                    elif temp_lexema.startswith('0') and len(temp_lexema) > 1 and temp_lexema[1] in '01234567': valor_final = int(temp_lexema, 8)
+                    else: valor_final = int(temp_lexema)
+                except ValueError:
+                    tipo_token = TT_ERROR_CPP
+                    valor_final = f"Literal entero inválido: {lexema}"
+            elif tipo_token == TT_LITERAL_FLOTANTE:
+                try:
+                    valor_final = float(lexema.rstrip('fFlL'))
+                except ValueError:
+                    tipo_token = TT_ERROR_CPP
+                    valor_final = f"Literal flotante inválido: {lexema}"
 
-            if pos_despues_espacios < len(self.codigo) and self.codigo[pos_despues_espacios] == '#':
-                patron_directiva_regex, tipo_directiva = ESPECIFICACIONES_TOKEN_CPP[0] 
-                if tipo_directiva == TT_DIRECTIVA_PREPROCESADOR:
-                    match_dir = re.match(patron_directiva_regex, self.codigo[pos_despues_espacios:])
-                    if match_dir:
-                        self._avanzar(len(match_espacios_inicio_linea.group(0))) 
-                        token_directiva = self._procesar_directiva_preprocesador(match_dir)
-                        tokens.append(token_directiva)
-                        self._avanzar(len(match_dir.group(0))) 
-                        match_encontrado_en_iteracion = True
-                        continue 
+            simbolo = internar(lexema) if tipo_token == TT_IDENTIFICADOR else None
+            tokens.agregar(tipo_token, lexema, None, None, valor_final, inicio, simbolo)
 
-            for patron_regex, tipo_token_base in ESPECIFICACIONES_TOKEN_CPP:
-                if tipo_token_base == TT_DIRECTIVA_PREPROCESADOR: 
-                    continue
-                match = re.match(patron_regex, self.codigo[self.posicion_actual:])
-                if match:
-                    lexema = match.group(0)
-                    match_encontrado_en_iteracion = True
-                    if tipo_token_base == TT_WHITESPACE_CPP or \
-                       tipo_token_base == TT_COMENTARIO_LINEA or \
-                       tipo_token_base == TT_COMENTARIO_BLOQUE:
-                        self._avanzar(len(lexema))
-                        break 
-                    tipo_token_final = tipo_token_base
-                    valor_final = lexema 
-                    if tipo_token_base == TT_IDENTIFICADOR:
-                        if lexema in PALABRAS_CLAVE_CPP: 
-                            tipo_token_final = TT_PALABRA_CLAVE
-                            if lexema == 'true': valor_final = True
-                            elif lexema == 'false': valor_final = False
-                            elif lexema == 'nullptr': valor_final = None 
-                        elif lexema.startswith('[') and lexema.endswith(']'): 
-                            valor_final = lexema[1:-1]
-                        elif lexema.startswith('"') and lexema.endswith('"'):
-                             valor_final = lexema[1:-1]
-                    elif tipo_token_base == TT_LITERAL_CADENA:
-                        if lexema.startswith('R"'): 
-                            match_raw = re.match(r'R"([^\s()\\\t\n\r]*)\(([\s\S]*?)\)\1"', lexema)
-                            if match_raw: valor_final = match_raw.group(2)
-                        else: 
-                            prefijo_match = re.match(r'^(L|u8|u|U)?(".*")', lexema)
-                            cadena_real = prefijo_match.group(2) if prefijo_match else lexema
-                            valor_final = cadena_real[1:-1] 
-                            valor_final = valor_final.replace('\\n', '\n').replace('\\t', '\t').replace('\\"', '"').replace("\\'", "'").replace('\\\\', '\\')
-                    elif tipo_token_base == TT_LITERAL_CARACTER:
-                        valor_final = lexema[1:-1] 
-                        if valor_final.startswith('\\'):
-                            if valor_final == '\\n': valor_final = '\n'
-                            elif valor_final == '\\t': valor_final = '\t'
-                    elif tipo_token_base == TT_LITERAL_ENTERO:
-                        try:
-                            temp_lexema = lexema
-                            for suffix in ['ull', 'Ull', 'uLL', 'ULL', 'ul', 'Ul', 'uL', 'UL', 'll', 'LL', 'l', 'L', 'u', 'U']:
-                                if temp_lexema.lower().endswith(suffix.lower()):
-                                    temp_lexema = temp_lexema[:-len(suffix)]
-                                    break
-                            if temp_lexema.lower().startswith('0x'): valor_final = int(temp_lexema, 16)
-                            elif temp_lexema.lower().startswith('0b'): valor_final = int(temp_lexema, 2)
-                            elif temp_lexema.startswith('0') and len(temp_lexema) > 1 and temp_lexema[1] in '01234567': valor_final = int(temp_lexema, 8)
-                            else: valor_final = int(temp_lexema)
-                        except ValueError:
-                            tipo_token_final = TT_ERROR_CPP
-                            valor_final = f"Literal entero inválido: {lexema}"
-                    elif tipo_token_base == TT_LITERAL_FLOTANTE:
-                        try:
-                            valor_final = float(lexema.rstrip('fFlL')) 
-                        except ValueError:
-                            tipo_token_final = TT_ERROR_CPP
-                            valor_final = f"Literal flotante inválido: {lexema}"
-                    
-                    # El refinamiento de operadores basado en el lexema ya no es necesario aquí
-                    # si las regex en ESPECIFICACIONES_TOKEN_CPP están bien ordenadas y son específicas.
-                    # Por ejemplo, '<<' será TT_OPERADOR_BITWISE, '=' será TT_OPERADOR_ASIGNACION.
-                    
-                    tokens.append(Token(tipo_token_final, lexema, linea_inicio_token, col_inicio_token, valor_final))
-                    self._avanzar(len(lexema))
-                    break 
-            if not match_encontrado_en_iteracion and self.posicion_actual < len(self.codigo):
-                caracter_erroneo = self.codigo[self.posicion_actual]
-                tokens.append(Token(TT_ERROR_CPP, caracter_erroneo, linea_inicio_token, col_inicio_token,
-                                    valor=f"Carácter no reconocido: '{caracter_erroneo}'"))
-                self._avanzar() 
-        tokens.append(Token(TT_EOF_CPP, "EOF", self.linea_actual, self.columna_actual))
+        if tramo is not None:
+            return tokens
+        self.linea_actual, self.columna_actual = avanzar_posicion(self.codigo[self.posicion_actual:], self.linea_actual, self.columna_actual)
+        self.posicion_actual = len(self.codigo)
+        tokens.agregar(TT_EOF_CPP, "EOF", self.linea_actual, self.columna_actual)
         return tokens
 
 # (Fin de la clase LexerCPP)
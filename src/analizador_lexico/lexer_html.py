@@ -1,6 +1,9 @@
 # src/analizador_lexico/lexer_html.py
 import re
 
+from src.nucleo_compilador.almacen_tokens import AlmacenTokens
+from src.nucleo_compilador.motor_lexico import MotorLexico, avanzar_posicion
+
 # Definición de la clase Token (reutilizada)
 class Token:
     def __init__(self, tipo, lexema, linea, columna, valor=None):
@@ -62,6 +65,14 @@ ESPECIFICACIONES_TOKEN_HTML = [
     (r'[a-zA-Z_][a-zA-Z0-9_:-]+', TT_IDENTIFICADOR),
 ]
 
+# No se generan tokens de WHITESPACE; solo DOCTYPE se reconoce sin distinguir mayúsculas.
+MOTOR_LEXICO_HTML = MotorLexico(
+    ESPECIFICACIONES_TOKEN_HTML,
+    ignorar=(TT_WHITESPACE,),
+    flags_por_tipo={TT_DOCTYPE: re.IGNORECASE},
+    nombre="html",
+)
+
 
 class LexerHTML:
     def __init__(self, codigo_fuente):
@@ -69,54 +80,26 @@ class LexerHTML:
         self.posicion_actual = 0
         self.linea_actual = 1
         self.columna_actual = 1
-        self.regex_compilado = []
-        for patron, tipo in ESPECIFICACIONES_TOKEN_HTML:
-            flags = re.IGNORECASE if tipo == TT_DOCTYPE else 0
-            self.regex_compilado.append((re.compile(patron, flags), tipo))
 
     def _avanzar_posicion(self, texto_consumido):
-        for char in texto_consumido:
-            if char == '\n':
-                self.linea_actual += 1
-                self.columna_actual = 1
-            else:
-                self.columna_actual += 1
+        self.linea_actual, self.columna_actual = avanzar_posicion(texto_consumido, self.linea_actual, self.columna_actual)
         self.posicion_actual += len(texto_consumido)
 
     def tokenizar(self):
-        tokens = []
-        while self.posicion_actual < len(self.codigo):
-            match_encontrado_en_iteracion = False
-            linea_inicio_token = self.linea_actual
-            col_inicio_token = self.columna_actual
+        tokens = AlmacenTokens(self.codigo, Token)
+        # La línea y la columna de cada token las calcula el almacén a partir de `inicio`.
+        for tipo_token, lexema, _, _, inicio, _ in MOTOR_LEXICO_HTML.escanear(self.codigo, self.posicion_actual,
+                                                                    posiciones=False):
+            if tipo_token is None:
+                tokens.agregar(TT_ERROR_HTML, lexema, valor=f"Carácter no reconocido: '{lexema}'", inicio=inicio)
+                continue
+            valor_token = lexema
+            if tipo_token == TT_ATRIBUTO_VALOR:
+                valor_token = lexema[1:-1]
+            tokens.agregar(tipo_token, lexema, None, None, valor_token, inicio)
 
-            for regex, tipo_token_base in self.regex_compilado:
-                match = regex.match(self.codigo, self.posicion_actual)
-                if match:
-                    lexema = match.group(0)
-                    match_encontrado_en_iteracion = True
-                    
-                    valor_token = lexema 
-                    if tipo_token_base == TT_ATRIBUTO_VALOR:
-                        valor_token = lexema[1:-1]
-                    
-                    if tipo_token_base == TT_WHITESPACE: # No añadir tokens de WHITESPACE
-                         self._avanzar_posicion(lexema)
-                         break 
+        self._avanzar_posicion(self.codigo[self.posicion_actual:])
 
-                    token = Token(tipo_token_base, lexema, linea_inicio_token, col_inicio_token, valor_token)
-                    tokens.append(token)
-                    
-                    self._avanzar_posicion(lexema)
-                    break 
-            
-            if not match_encontrado_en_iteracion:
-                if self.posicion_actual < len(self.codigo):
-                    caracter_erroneo = self.codigo[self.posicion_actual]
-                    tokens.append(Token(TT_ERROR_HTML, caracter_erroneo, linea_inicio_token, col_inicio_token,
-                                        valor=f"Carácter no reconocido: '{caracter_erroneo}'"))
-                    self._avanzar_posicion(caracter_erroneo) 
-        
-        tokens.append(Token(TT_EOF_HTML, "EOF", self.linea_actual, self.columna_actual))
+        tokens.agregar(TT_EOF_HTML, "EOF", self.linea_actual, self.columna_actual)
         return tokens
 
@@ -1,6 +1,10 @@
 # src/analizador_lexico/lexer_javascript.py
 import re
 
+from src.nucleo_compilador.almacen_tokens import AlmacenTokens
+from src.nucleo_compilador.internado import internar
+from src.nucleo_compilador.motor_lexico import MotorLexico, avanzar_posicion, tabla_palabras_clave
+
 # Reutilizamos la definición de la clase Token.
 # En un proyecto más grande, esta clase estaría en un módulo común.
 class Token:
@@ -8,6 +12,8 @@ class Token:
     Representa un token léxico con su tipo, lexema (texto),
     número de línea y columna donde aparece, y un valor opcional (ej. para números).
     """
+    simbolo = None # Nombre canónico (internado) si el token es un identificador
+
     def __init__(self, tipo, lexema, linea, columna, valor=None):
         self.tipo = tipo          # Tipo de token (ej: PALABRA_CLAVE, IDENTIFICADOR)
         self.lexema = lexema      # El texto actual del token (ej: "function", "miVariable")
@@ -41,7 +47,8 @@ TT_CORCHETE_DER = 'CORCHETE_DER_JS'   # ]
 
 # Literales
 TT_LITERAL_NUMERICO = 'LITERAL_NUMERICO_JS' # 123, 45.67, 0xFF, 1e5, NaN, Infinity
-TT_LITERAL_CADENA = 'LITERAL_CADENA_JS'   # "cadena", 'cadena', `plantilla ${expr}` (plantillas son más complejas)
+TT_LITERAL_CADENA = 'LITERAL_CADENA_JS'   # "cadena", 'cadena'
+TT_LITERAL_PLANTILLA = 'LITERAL_PLANTILLA_JS' # `plantilla ${expr}`; valor: (textos, expresiones), ver dividir_plantilla
 TT_LITERAL_BOOLEANO = 'LITERAL_BOOLEANO_JS' # true, false (son palabras clave)
 TT_LITERAL_NULL = 'LITERAL_NULL_JS'       # null (palabra clave)
 TT_LITERAL_UNDEFINED = 'LITERAL_UNDEFINED_JS' # undefined (identificador global, no palabra clave estricta pero se trata especial)
@@ -97,7 +104,7 @@ ESPECIFICACIONES_TOKEN_JS = [
     # El \` se maneja para escapar backticks dentro de la plantilla.
     # El [^`] captura cualquier carácter que no sea un backtick.
     # El [\s\S] dentro de ${} es para permitir cualquier carácter, incluyendo saltos de línea.
-    (r'`(?:\\`|\\\$|\$\{[\s\S]*?\}|[^`])*`', TT_LITERAL_CADENA), # Plantilla literal
+    (r'`(?:\\`|\\\$|\$\{[\s\S]*?\}|[^`])*`', TT_LITERAL_PLANTILLA), # Plantilla literal
 
     # Cadenas con comillas dobles. Permite caracteres Unicode (incluyendo acentuados)
     # y secuencias de escape comunes.
@@ -110,8 +117,6 @@ ESPECIFICACIONES_TOKEN_JS = [
     # Este regex es simplificado y no maneja todos los escapes de JS.
     (r'"(?:\\.|[^"\\])*"', TT_LITERAL_CADENA),  # Comillas dobles
     (r"' (?:\\.|[^'\\])*'", TT_LITERAL_CADENA),  # Comillas simples
-    # Plantillas literales (``) son más complejas debido a las expresiones ${...}
-    # (r'`(?:\\.|[^`\\])*`', TT_LITERAL_CADENA_PLANTILLA), # Simplificado, sin interpolación
 
     # Números: hexadecimales, binarios, octales (nuevos), decimales, y con exponente.
     (r'0[xX][0-9a-fA-F]+', TT_LITERAL_NUMERICO), # Hexadecimal
@@ -171,6 +176,78 @@ ESPECIFICACIONES_TOKEN_JS = [
     (r'\s+', TT_WHITESPACE_JS), 
 ]
 
+MOTOR_LEXICO_JS = MotorLexico(
+    ESPECIFICACIONES_TOKEN_JS,
+    ignorar=(TT_WHITESPACE_JS, TT_COMENTARIO_LINEA, TT_COMENTARIO_BLOQUE),
+    tipo_identificador=TT_IDENTIFICADOR,
+    palabras_clave=tabla_palabras_clave(PALABRAS_CLAVE_JS, TT_PALABRA_CLAVE),
+    nombre="javascript",
+)
+
+# Escapes de un carácter dentro de plantillas; cualquier otro carácter escapado es él mismo
+ESCAPES_PLANTILLA_JS = {'n': '\n', 'r': '\r', 't': '\t', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+
+def _fin_expresion_plantilla(contenido, desde):
+    """Posición del `}` que cierra el `${` anterior a `desde` (saltando llaves y cadenas), o -1."""
+    profundidad = 0
+    comilla = None
+    i, n = desde, len(contenido)
+    while i < n:
+        caracter = contenido[i]
+        if comilla:
+            if caracter == '\\':
+                i += 1
+            elif caracter == comilla:
+                comilla = None
+        elif caracter in '"\'':
+            comilla = caracter
+        elif caracter == '{':
+            profundidad += 1
+        elif caracter == '}':
+            if profundidad == 0:
+                return i
+            profundidad -= 1
+        i += 1
+    return -1
+
+def dividir_plantilla(lexema):
+    """
+    Divide una plantilla literal (con sus acentos graves) en sus textos y sus expresiones `${...}`.
+
+    Returns:
+        tuple: (textos, expresiones), tuplas con len(textos) == len(expresiones) + 1. Los
+               textos tienen los escapes ya resueltos; las expresiones son su código fuente.
+               Un `${` sin cierre se queda en el texto.
+    """
+    contenido = lexema[1:-1]
+    textos, expresiones = [], []
+    texto = []
+    i, n = 0, len(contenido)
+    while i < n:
+        caracter = contenido[i]
+        if caracter == '\\' and i + 1 < n:
+            siguiente = contenido[i + 1]
+            codigo_hex = contenido[i + 2:i + 6] if siguiente == 'u' else contenido[i + 2:i + 4]
+            if siguiente in 'ux' and len(codigo_hex) == (4 if siguiente == 'u' else 2) and \
+               all(c in '0123456789abcdefABCDEF' for c in codigo_hex):
+                texto.append(chr(int(codigo_hex, 16)))
+                i += 2 + len(codigo_hex)
+            else:
+                texto.append(ESCAPES_PLANTILLA_JS.get(siguiente, siguiente))
+                i += 2
+        else:
+            fin = _fin_expresion_plantilla(contenido, i + 2) if contenido.startswith('${', i) else -1
+            if fin == -1:
+                texto.append(caracter)
+                i += 1
+            else:
+                textos.append("".join(texto))
+                texto = []
+                expresiones.append(contenido[i + 2:fin])
+                i = fin + 1
+    textos.append("".join(texto))
+    return tuple(textos), tuple(expresiones)
+
 class LexerJavaScript:
     """
     Analizador Léxico para un subconjunto de JavaScript.
@@ -199,15 +276,7 @@ class LexerJavaScript:
         manejando escapes básicos y quitando las comillas/acentos graves.
         """
         if lexema.startswith('`') and lexema.endswith('`'):
-            # Para plantillas literales, por ahora devolvemos el contenido interno tal cual,
-            # incluyendo las interpolaciones ${...} sin procesar.
-            # Un manejo más avanzado podría parsear las interpolaciones.
-            contenido = lexema[1:-1]
-            # Simplificación de escapes comunes dentro de plantillas
-            contenido = contenido.replace('\\`', '`')
-            contenido = contenido.replace('\\\\', '\\')
-            # No procesamos ${} aquí, se queda como parte de la cadena.
-            return contenido
+            return dividir_plantilla(lexema)
         elif (lexema.startswith('"') and lexema.endswith('"')) or \
              (lexema.startswith("'") and lexema.endswith("'")):
             contenido = lexema[1:-1]
@@ -234,64 +303,46 @@ class LexerJavaScript:
         """
         Procesa el código fuente completo y devuelve una lista de tokens.
         """
-        tokens = []
-        while self.posicion_actual < len(self.codigo):
-            match_encontrado_en_iteracion = False
-            linea_inicio_token = self.linea_actual
-            col_inicio_token = self.columna_actual
-
-            for patron_regex, tipo_token_base in ESPECIFICACIONES_TOKEN_JS:
-                match = re.match(patron_regex, self.codigo[self.posicion_actual:])
-                
-                if match:
-                    lexema = match.group(0)
-                    match_encontrado_en_iteracion = True
-                    
-                    if tipo_token_base == TT_WHITESPACE_JS or \
-                       tipo_token_base == TT_COMENTARIO_LINEA or \
-                       tipo_token_base == TT_COMENTARIO_BLOQUE:
-                        self._avanzar(len(lexema))
-                        break 
-
-                    tipo_token_final = tipo_token_base
-                    valor_final = lexema 
-
-                    if tipo_token_base == TT_IDENTIFICADOR:
-                        if lexema in PALABRAS_CLAVE_JS:
-                            tipo_token_final = TT_PALABRA_CLAVE
-                            if lexema == 'true': valor_final = True
-                            elif lexema == 'false': valor_final = False
-                            elif lexema == 'null': valor_final = None
-                        elif lexema == 'undefined':
-                            valor_final = None # Representando undefined como None
-                        elif lexema == 'NaN':
-                            valor_final = float('nan')
-                        elif lexema == 'Infinity':
-                            valor_final = float('inf')
-                    
-                    elif tipo_token_base == TT_LITERAL_CADENA:
-                        valor_final = self._procesar_valor_cadena(lexema)
-                    
-                    elif tipo_token_base == TT_LITERAL_NUMERICO:
-                        try:
-                            if lexema.lower().startswith('0x'): valor_final = int(lexema, 16)
-                            elif lexema.lower().startswith('0b'): valor_final = int(lexema, 2)
-                            elif lexema.lower().startswith('0o'): valor_final = int(lexema, 8)
-                            elif '.' in lexema or 'e' in lexema.lower(): valor_final = float(lexema)
-                            else: valor_final = int(lexema)
-                        except ValueError:
-                            tipo_token_final = TT_ERROR_JS
-                            valor_final = f"Literal numérico inválido: {lexema}"
-                    
-                    tokens.append(Token(tipo_token_final, lexema, linea_inicio_token, col_inicio_token, valor_final))
-                    self._avanzar(len(lexema))
-                    break 
-            
-            if not match_encontrado_en_iteracion and self.posicion_actual < len(self.codigo):
-                caracter_erroneo = self.codigo[self.posicion_actual]
-                tokens.append(Token(TT_ERROR_JS, caracter_erroneo, linea_inicio_token, col_inicio_token,
-                                    valor=f"Carácter no reconocido: '{caracter_erroneo}'"))
-                self._avanzar() 
-
-        tokens.append(Token(TT_EOF_JS, "EOF", self.linea_actual, self.columna_actual))
+        tokens = AlmacenTokens(self.codigo, Token)
+        # La línea y la columna de cada token las calcula el almacén a partir de `inicio`.
+        for tipo_token, lexema, _, _, inicio, _ in MOTOR_LEXICO_JS.escanear(self.codigo, self.posicion_actual,
+                                                                  posiciones=False):
+            if tipo_token is None:
+                tokens.agregar(TT_ERROR_JS, lexema, valor=f"Carácter no reconocido: '{lexema}'", inicio=inicio)
+                continue
+
+            valor_final = lexema
+            if tipo_token == TT_PALABRA_CLAVE:
+                if lexema == 'true': valor_final = True
+                elif lexema == 'false': valor_final = False
+                elif lexema == 'null': valor_final = None
+            elif tipo_token == TT_IDENTIFICADOR:
+                if lexema == 'undefined':
+                    valor_final = None # Representando undefined como None
+                elif lexema == 'NaN':
+                    valor_final = float('nan')
+                elif lexema == 'Infinity':
+                    valor_final = float('inf')
+
+            elif tipo_token in (TT_LITERAL_CADENA, TT_LITERAL_PLANTILLA):
+                valor_final = self._procesar_valor_cadena(lexema)
+
+            elif tipo_token == TT_LITERAL_NUMERICO:
+                try:
+                    if lexema.lower().startswith('0x'): valor_final = int(lexema, 16)
+                    elif lexema.lower().startswith('0b'): valor_final = int(lexema, 2)
+                    elif lexema.lower().startswith('0o'): valor_final = int(lexema, 8)
+                    elif '.' in lexema or 'e' in lexema.lower(): valor_final = float(lexema)
+                    else: valor_final = int(lexema)
+                except ValueError:
+                    tipo_token = TT_ERROR_JS
+                    valor_final = f"Literal numérico inválido: {lexema}"
+
+            simbolo = internar(lexema) if tipo_token == TT_IDENTIFICADOR else None
+            tokens.agregar(tipo_token, lexema, None, None, valor_final, inicio, simbolo)
+
+        self.linea_actual, self.columna_actual = avanzar_posicion(self.codigo[self.posicion_actual:], self.linea_actual, self.columna_actual)
+        self.posicion_actual = len(self.codigo)
+
+        tokens.agregar(TT_EOF_JS, "EOF", self.linea_actual, self.columna_actual)
         return tokens
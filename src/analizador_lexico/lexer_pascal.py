@@ -1,7 +1,14 @@
 # src/analizador_lexico/lexer_pascal.py
 import re
 
+from src.nucleo_compilador.almacen_tokens import AlmacenTokens
+from src.nucleo_compilador.internado import plegar
+from src.nucleo_compilador.lexico_paralelo import UMBRAL_LEXICO_PARALELO, tokenizar_en_paralelo
+from src.nucleo_compilador.motor_lexico import MotorLexico, avanzar_posicion, tabla_palabras_clave
+
 class Token: # Definición local de Token para este lexer
+    simbolo = None # Nombre canónico (internado) si el token es un identificador
+
     def __init__(self, tipo, lexema, linea, columna, valor=None):
         self.tipo = tipo
         self.lexema = lexema
@@ -121,9 +128,18 @@ ESPECIFICACIONES_TOKEN_PASCAL = [
     (r'[a-zA-Z][a-zA-Z0-9_]*',   TT_IDENTIFICADOR),
 ]
 
-# La clase LexerPascal vendrá después.
+MOTOR_LEXICO_PASCAL = MotorLexico(
+    ESPECIFICACIONES_TOKEN_PASCAL,
+    ignorar=(TT_WHITESPACE_PASCAL, TT_COMENTARIO),
+    tipo_identificador=TT_IDENTIFICADOR,
+    palabras_clave=tabla_palabras_clave(PALABRAS_RESERVADAS_PASCAL, TT_PALABRA_RESERVADA),
+    sin_mayusculas=True,
+    nombre="pascal",
+)
 
-# (Continuación, después de ESPECIFICACIONES_TOKEN_PASCAL)
+# Tokens que pueden contener un salto de línea o esconder el comienzo de otro token: el
+# pre-escaneo de la tokenización en paralelo no corta dentro de ellos.
+TIPOS_PRECORTE_PASCAL = (TT_COMENTARIO, TT_CADENA_LITERAL)
 
 class LexerPascal:
     def __init__(self, codigo_fuente):
@@ -151,84 +167,69 @@ class LexerPascal:
             return self.codigo[self.posicion_actual:]
         return None
 
-    def tokenizar(self):
-        tokens = []
-        while self.posicion_actual < len(self.codigo):
-            match_encontrado = None
-            token_generado_esta_iteracion = False
-
-            # Guardar posición de inicio para el token actual
-            linea_inicio_token = self.linea_actual
-            col_inicio_token = self.columna_actual
-
-            for patron_regex, tipo_token_base in ESPECIFICACIONES_TOKEN_PASCAL:
-                # Compilar el regex para la opción de insensibilidad a mayúsculas/minúsculas si es necesario
-                # Para Pascal, las palabras clave e identificadores son insensibles.
-                # Los literales de cadena SÍ son sensibles.
-                # Los regex para símbolos y números son inherentemente insensibles o no aplica.
-                
-                # La insensibilidad para palabras clave se manejará después de identificar un IDENTIFICADOR.
-                # El regex para IDENTIFICADOR ([a-zA-Z]...) ya captura ambas cajas.
-                
-                regex_compilado = re.compile(patron_regex) # No necesitamos re.IGNORECASE para la mayoría aquí
-                match = regex_compilado.match(self.codigo, self.posicion_actual)
-
-                if match:
-                    lexema = match.group(0)
-                    match_encontrado = True # Marcamos que algo coincidió
-                    token_generado_esta_iteracion = True # Un token (o whitespace/comentario) se procesó
-
-                    # Si el token es WHITESPACE o COMENTARIO, lo omitimos y continuamos
-                    if tipo_token_base == TT_WHITESPACE_PASCAL or tipo_token_base == TT_COMENTARIO:
-                        self._avanzar(len(lexema)) # Avanzar la posición
-                        # Reiniciar el bucle interno para buscar el siguiente token desde la nueva posición
-                        break # Sale del for de ESPECIFICACIONES_TOKEN, vuelve al while
-
-                    tipo_token_final = tipo_token_base
-                    valor_final = lexema # Valor por defecto es el lexema
-
-                    if tipo_token_base == TT_IDENTIFICADOR:
-                        # Pascal es insensible a mayúsculas/minúsculas para palabras reservadas e identificadores
-                        if lexema.lower() in PALABRAS_RESERVADAS_PASCAL:
-                            tipo_token_final = TT_PALABRA_RESERVADA
-                        # El lexema se guarda tal como está en el código, pero el valor podría normalizarse
-                        # o simplemente usar el lexema. Para identificadores, el lexema es el valor.
-                    
-                    elif tipo_token_base == TT_NUMERO_ENTERO:
-                        valor_final = int(lexema)
-                    
-                    elif tipo_token_base == TT_NUMERO_REAL:
-                        # Pascal puede usar 'E' o 'e'. El float() de Python maneja esto.
-                        valor_final = float(lexema)
-                    
-                    elif tipo_token_base == TT_CADENA_LITERAL:
-                        # Quitar comillas simples de inicio/fin y reemplazar '' por '
-                        valor_final = lexema[1:-1].replace("''", "'")
-                    
-                    tokens.append(Token(tipo_token_final, lexema, linea_inicio_token, col_inicio_token, valor_final))
-                    self._avanzar(len(lexema))
-                    break # Sale del for de ESPECIFICACIONES_TOKEN, vuelve al while
-            
-            if not match_encontrado and self.posicion_actual < len(self.codigo):
-                # Si no hubo coincidencia y no hemos llegado al final, es un error léxico.
-                caracter_erroneo = self.codigo[self.posicion_actual]
-                tokens.append(Token(TT_ERROR_PASCAL, caracter_erroneo, linea_inicio_token, col_inicio_token, 
-                                    valor=f"Carácter no reconocido: '{caracter_erroneo}'"))
-                self._avanzar() # Avanzar para evitar bucle infinito
-                token_generado_esta_iteracion = True # Se generó un token de error
-            
-            # Si en una iteración del while no se generó ningún token ni se avanzó (ej. error no avanzó),
-            # podríamos tener un bucle infinito.
-            # La lógica actual con 'break' en el for y el manejo de error con _avanzar() debería prevenirlo.
-            if not token_generado_esta_iteracion and self.posicion_actual < len(self.codigo):
-                # Esto no debería ocurrir si la lógica de error avanza.
-                # Como salvaguarda, avanzar para evitar bucles si algo muy raro pasa.
-                print(f"Advertencia: LexerPascal en posible bucle, carácter: '{self.codigo[self.posicion_actual]}'. Avanzando forzosamente.")
-                self._avanzar()
-
+    def _filas_tokens(self, posiciones=True, tramo=None):
+        """
+        Genera (tipo, lexema, linea, columna, valor, inicio, simbolo) por token, terminando en EOF.
+        Con `posiciones=False` la línea y la columna son None (salvo en EOF): el AlmacenTokens
+        las calcula a partir de `inicio`. Con un TramoEscaneo solo se genera ese tramo, sin EOF.
+        """
+        # El motor recorre la tabla ESPECIFICACIONES_TOKEN_PASCAL con una sola expresión maestra;
+        # los identificadores ya llegan reclasificados (Pascal es insensible a mayúsculas).
+        escaneo = MOTOR_LEXICO_PASCAL.escanear(self.codigo, self.posicion_actual,
+                                               linea=self.linea_actual, columna=self.columna_actual,
+                                               posiciones=posiciones)
+        if tramo is not None:
+            escaneo = tramo.limitar(escaneo, len(self.codigo))
+        for tipo_token, lexema, linea, columna, inicio, _ in escaneo:
+            if tipo_token is None:
+                # Si no hubo coincidencia, es un error léxico.
+                yield TT_ERROR_PASCAL, lexema, linea, columna, f"Carácter no reconocido: '{lexema}'", inicio, None
+                continue
+
+            valor_final = lexema # Valor por defecto es el lexema
+            simbolo = None
+            if tipo_token == TT_IDENTIFICADOR:
+                simbolo = plegar(lexema)
+            elif tipo_token == TT_NUMERO_ENTERO:
+                valor_final = int(lexema)
+            elif tipo_token == TT_NUMERO_REAL:
+                # Pascal puede usar 'E' o 'e'. El float() de Python maneja esto.
+                valor_final = float(lexema)
+            elif tipo_token == TT_CADENA_LITERAL:
+                # Quitar comillas simples de inicio/fin y reemplazar '' por '
+                valor_final = lexema[1:-1].replace("''", "'")
+            yield tipo_token, lexema, linea, columna, valor_final, inicio, simbolo
+
+        if tramo is not None:
+            return
+        self.linea_actual, self.columna_actual = avanzar_posicion(self.codigo[self.posicion_actual:], self.linea_actual, self.columna_actual)
+        self.posicion_actual = len(self.codigo)
 
         # Añadir token EOF al final de la lista de tokens
-        tokens.append(Token(TT_EOF_PASCAL, "EOF", self.linea_actual, self.columna_actual))
+        yield TT_EOF_PASCAL, "EOF", self.linea_actual, self.columna_actual, None, None, None
+
+    def tokenizar(self, tramo=None):
+        """
+        AlmacenTokens con todos los tokens. Un código de más de UMBRAL_LEXICO_PARALELO
+        caracteres se tokeniza por tramos en varios procesos (ver lexico_paralelo); con
+        `tramo` (un TramoEscaneo) solo se tokeniza ese tramo, sin EOF.
+        """
+        tokens = AlmacenTokens(self.codigo, Token)
+        if tramo is None and len(self.codigo) - self.posicion_actual >= UMBRAL_LEXICO_PARALELO:
+            tokenizar_en_paralelo(self, tokens, MOTOR_LEXICO_PASCAL, TIPOS_PRECORTE_PASCAL)
+        for tipo_token, lexema, linea, columna, valor, inicio, simbolo in self._filas_tokens(posiciones=False, tramo=tramo):
+            tokens.agregar(tipo_token, lexema, linea, columna, valor, inicio, simbolo)
         return tokens
 
+    def generar_tokens(self):
+        """
+        Versión perezosa de `tokenizar`: genera los tokens de uno en uno, sin guardarlos.
+        El parser los lee a través de un FlujoTokens que solo conserva una ventana.
+        """
+        for tipo_token, lexema, linea, columna, valor, _, simbolo in self._filas_tokens():
+            token = Token(tipo_token, lexema, linea, columna, valor)
+            if simbolo is not None:
+                token.simbolo = simbolo
+            yield token
+
 # Fin de la clase LexerPascal
\ No newline at end of file
@@ -1,8 +1,15 @@
 # src/analizador_lexico/lexer_plsql.py
 import re
 
+from src.nucleo_compilador.almacen_tokens import AlmacenTokens
+from src.nucleo_compilador.internado import internar, plegar
+from src.nucleo_compilador.lexico_paralelo import UMBRAL_LEXICO_PARALELO, tokenizar_en_paralelo
+from src.nucleo_compilador.motor_lexico import MotorLexico, avanzar_posicion, tabla_palabras_clave
+
 # Reutilizamos la definición de la clase Token.
 class Token:
+    simbolo = None # Nombre canónico (internado) si el token es un identificador
+
     def __init__(self, tipo, lexema, linea, columna, valor=None):
         self.tipo = tipo
         self.lexema = lexema
@@ -126,15 +133,35 @@ ESPECIFICACIONES_TOKEN_PLSQL = [
     (r'\s+', TT_WHITESPACE_PLSQL), # Espacios en blanco al final para que no interfieran con otros patrones
 ]
 
+# Tipo con el que se reclasifica cada palabra clave. Los literales TRUE/FALSE/NULL tienen
+# prioridad sobre los operadores con forma de palabra, y estos sobre la palabra clave genérica.
+PALABRAS_POR_TIPO_PLSQL = tabla_palabras_clave(PALABRAS_CLAVE_PLSQL, TT_PALABRA_CLAVE_PLSQL)
+PALABRAS_POR_TIPO_PLSQL.update(tabla_palabras_clave(('and', 'or', 'not'), TT_OPERADOR_LOGICO_PLSQL))
+# 'in' y 'is' son palabras clave, el parser determinará su rol (operador o parte de sintaxis)
+PALABRAS_POR_TIPO_PLSQL.update(tabla_palabras_clave(('like', 'between'), TT_OPERADOR_COMPARACION_PLSQL))
+PALABRAS_POR_TIPO_PLSQL.update(LITERALES_PALABRA_CLAVE_PLSQL)
+
+MOTOR_LEXICO_PLSQL = MotorLexico(
+    ESPECIFICACIONES_TOKEN_PLSQL,
+    ignorar=(TT_WHITESPACE_PLSQL, TT_COMENTARIO_LINEA_PLSQL, TT_COMENTARIO_BLOQUE_PLSQL),
+    tipo_identificador=TT_IDENTIFICADOR_PLSQL,
+    palabras_clave=PALABRAS_POR_TIPO_PLSQL,
+    sin_mayusculas=True,
+    flags=re.IGNORECASE,
+    nombre="plsql",
+)
+
+# Tokens que pueden contener un salto de línea o esconder el comienzo de otro token: el
+# pre-escaneo de la tokenización en paralelo no corta dentro de ellos.
+TIPOS_PRECORTE_PLSQL = (TT_COMENTARIO_LINEA_PLSQL, TT_COMENTARIO_BLOQUE_PLSQL, TT_LITERAL_CADENA_PLSQL,
+                        TT_LITERAL_FECHA_PLSQL, TT_IDENTIFICADOR_ENTRECOMILLADO_PLSQL)
+
 class LexerPLSQL:
     def __init__(self, codigo_fuente):
         self.codigo = codigo_fuente
         self.posicion_actual = 0
         self.linea_actual = 1
         self.columna_actual = 1
-        self.regex_compilado = []
-        for patron, tipo in ESPECIFICACIONES_TOKEN_PLSQL:
-            self.regex_compilado.append((re.compile(patron, re.IGNORECASE), tipo))
 
     def _avanzar(self, cantidad=1):
         for _ in range(cantidad):
@@ -148,80 +175,80 @@ class LexerPLSQL:
             else:
                 break 
 
-    def _procesar_identificador(self, lexema, linea, columna):
-        lexema_lower = lexema.lower()
-        if lexema_lower in LITERALES_PALABRA_CLAVE_PLSQL:
-            tipo_token = LITERALES_PALABRA_CLAVE_PLSQL[lexema_lower]
-            valor = None
-            if lexema_lower == 'true': valor = True
-            elif lexema_lower == 'false': valor = False
-            return Token(tipo_token, lexema, linea, columna, valor)
-        elif lexema_lower in PALABRAS_CLAVE_PLSQL:
-            if lexema_lower in ['and', 'or', 'not']:
-                return Token(TT_OPERADOR_LOGICO_PLSQL, lexema, linea, columna)
-            # 'in' y 'is' son palabras clave, el parser determinará su rol (operador o parte de sintaxis)
-            elif lexema_lower in ['like', 'between']: 
-                return Token(TT_OPERADOR_COMPARACION_PLSQL, lexema, linea, columna)
-            return Token(TT_PALABRA_CLAVE_PLSQL, lexema, linea, columna)
-        return Token(TT_IDENTIFICADOR_PLSQL, lexema, linea, columna)
-
-    def tokenizar(self):
-        tokens = []
-        while self.posicion_actual < len(self.codigo):
-            match_encontrado_en_iteracion = False
-            linea_inicio_token = self.linea_actual
-            col_inicio_token = self.columna_actual
-
-            for regex, tipo_token_base in self.regex_compilado:
-                match = regex.match(self.codigo, self.posicion_actual)
-                if match:
-                    lexema = match.group(0)
-                    match_encontrado_en_iteracion = True
-                    
-                    if tipo_token_base == TT_WHITESPACE_PLSQL or \
-                       tipo_token_base == TT_COMENTARIO_LINEA_PLSQL or \
-                       tipo_token_base == TT_COMENTARIO_BLOQUE_PLSQL:
-                        self._avanzar(len(lexema))
-                        break 
-
-                    token_final = None
-                    if tipo_token_base == TT_IDENTIFICADOR_PLSQL:
-                        token_final = self._procesar_identificador(lexema, linea_inicio_token, col_inicio_token)
-                    elif tipo_token_base == TT_IDENTIFICADOR_ENTRECOMILLADO_PLSQL:
-                        valor_real = lexema[1:-1] 
-                        token_final = Token(TT_IDENTIFICADOR_ENTRECOMILLADO_PLSQL, valor_real, linea_inicio_token, col_inicio_token, valor_real)
-                    elif tipo_token_base == TT_LITERAL_CADENA_PLSQL:
-                        valor_real = lexema[1:-1].replace("''", "'") 
-                        if lexema.lower().startswith("q'["): 
-                             valor_real = match.group(1) 
-                        token_final = Token(TT_LITERAL_CADENA_PLSQL, lexema, linea_inicio_token, col_inicio_token, valor_real)
-                    elif tipo_token_base == TT_LITERAL_FECHA_PLSQL:
-                        valor_fecha = match.group(1) 
-                        token_final = Token(TT_LITERAL_FECHA_PLSQL, lexema, linea_inicio_token, col_inicio_token, valor_fecha)
-                    elif tipo_token_base == TT_LITERAL_NUMERICO_PLSQL:
-                        try:
-                            if '.' in lexema or 'e' in lexema.lower(): valor_num = float(lexema)
-                            else: valor_num = int(lexema)
-                            token_final = Token(TT_LITERAL_NUMERICO_PLSQL, lexema, linea_inicio_token, col_inicio_token, valor_num)
-                        except ValueError:
-                            token_final = Token(TT_ERROR_PLSQL, lexema, linea_inicio_token, col_inicio_token, "Número inválido")
-                    else: 
-                        token_final = Token(tipo_token_base, lexema, linea_inicio_token, col_inicio_token)
-                    
-                    if token_final:
-                        tokens.append(token_final)
-                    self._avanzar(len(lexema))
-                    break 
-            
-            if not match_encontrado_en_iteracion and self.posicion_actual < len(self.codigo):
-                caracter_erroneo = self.codigo[self.posicion_actual]
-                tokens.append(Token(TT_ERROR_PLSQL, caracter_erroneo, linea_inicio_token, col_inicio_token,
-                                    valor=f"Carácter no reconocido: '{caracter_erroneo}'"))
-                self._avanzar() 
-
-        tokens.append(Token(TT_EOF_PLSQL, "EOF", self.linea_actual, self.columna_actual))
+    def _filas_tokens(self, mapa=None, tramo=None):
+        """
+        Genera (tipo, lexema, linea, columna, valor, inicio, simbolo) por token, terminando en EOF.
+        Si se pasa el MapaFuente del código, la línea y la columna son None (el AlmacenTokens
+        las calcula a partir de `inicio`) salvo cuando no corresponden a `inicio`. Con un
+        TramoEscaneo solo se genera ese tramo, sin EOF.
+        """
+        escaneo = MOTOR_LEXICO_PLSQL.escanear(self.codigo, self.posicion_actual,
+                                              linea=self.linea_actual, columna=self.columna_actual,
+                                              posiciones=mapa is None)
+        if tramo is not None:
+            escaneo = tramo.limitar(escaneo, len(self.codigo))
+        for tipo_token, lexema, linea, columna, inicio, match in escaneo:
+            if tipo_token is None:
+                yield TT_ERROR_PLSQL, lexema, linea, columna, f"Carácter no reconocido: '{lexema}'", inicio, None
+                continue
+
+            # Los identificadores ya llegan reclasificados por el motor (ver PALABRAS_POR_TIPO_PLSQL).
+            valor = simbolo = None
+            if tipo_token == TT_IDENTIFICADOR_PLSQL:
+                simbolo = plegar(lexema)
+            elif tipo_token == TT_LITERAL_BOOLEANO_PLSQL:
+                valor = lexema.lower() == 'true'
+            elif tipo_token == TT_IDENTIFICADOR_ENTRECOMILLADO_PLSQL:
+                # El lexema del token es el nombre sin comillas, pero su posición es la de la comilla
+                if mapa is not None:
+                    linea, columna = mapa.posicion(inicio)
+                lexema, inicio = lexema[1:-1], inicio + 1
+                simbolo = internar(lexema) # Entrecomillado: distingue mayúsculas
+            elif tipo_token == TT_LITERAL_CADENA_PLSQL:
+                valor = lexema[1:-1].replace("''", "'")
+                if lexema.lower().startswith("q'["):
+                    valor = MotorLexico.grupo(match, 1)
+            elif tipo_token == TT_LITERAL_FECHA_PLSQL:
+                valor = MotorLexico.grupo(match, 1)
+            elif tipo_token == TT_LITERAL_NUMERICO_PLSQL:
+                try:
+                    if '.' in lexema or 'e' in lexema.lower(): valor = float(lexema)
+                    else: valor = int(lexema)
+                except ValueError:
+                    tipo_token, valor = TT_ERROR_PLSQL, "Número inválido"
+            yield tipo_token, lexema, linea, columna, valor, inicio, simbolo
+
+        if tramo is not None:
+            return
+        self.linea_actual, self.columna_actual = avanzar_posicion(self.codigo[self.posicion_actual:], self.linea_actual, self.columna_actual)
+        self.posicion_actual = len(self.codigo)
+
+        yield TT_EOF_PLSQL, "EOF", self.linea_actual, self.columna_actual, None, None, None
+
+    def tokenizar(self, tramo=None):
+        """
+        AlmacenTokens con todos los tokens. Un código de más de UMBRAL_LEXICO_PARALELO
+        caracteres se tokeniza por tramos en varios procesos (ver lexico_paralelo); con
+        `tramo` (un TramoEscaneo) solo se tokeniza ese tramo, sin EOF.
+        """
+        tokens = AlmacenTokens(self.codigo, Token)
+        if tramo is None and len(self.codigo) - self.posicion_actual >= UMBRAL_LEXICO_PARALELO:
+            tokenizar_en_paralelo(self, tokens, MOTOR_LEXICO_PLSQL, TIPOS_PRECORTE_PLSQL)
+        for tipo_token, lexema, linea, columna, valor, inicio, simbolo in self._filas_tokens(tokens.mapa, tramo):
+            tokens.agregar(tipo_token, lexema, linea, columna, valor, inicio, simbolo)
         return tokens
 
+    def generar_tokens(self):
+        """
+        Versión perezosa de `tokenizar`: genera los tokens de uno en uno, sin guardarlos.
+        El parser los lee a través de un FlujoTokens que solo conserva una ventana.
+        """
+        for tipo_token, lexema, linea, columna, valor, _, simbolo in self._filas_tokens():
+            token = Token(tipo_token, lexema, linea, columna, valor)
+            if simbolo is not None:
+                token.simbolo = simbolo
+            yield token
+
 if __name__ == "__main__":
     codigo = "1..3"
     lexer = LexerPLSQL(codigo)
@@ -1,8 +1,15 @@
 # src/analizador_lexico/lexer_python.py
 import re
+from array import array
+
+from src.nucleo_compilador.almacen_tokens import AlmacenTokens
+from src.nucleo_compilador.internado import internar
+from src.nucleo_compilador.motor_lexico import MotorLexico, tabla_palabras_clave
 
 # Definición de la clase Token (reutilizada)
 class Token:
+    simbolo = None # Nombre canónico (internado) si el token es un identificador
+
     def __init__(self, tipo, lexema, linea, columna, valor=None):
         self.tipo = tipo
         self.lexema = lexema
@@ -99,18 +106,27 @@ ESPECIFICACIONES_TOKEN_PYTHON = [
     (r'[ \t]+', None), # Ignorar espacios y tabs que no sean indentación al inicio de línea
 ]
 
+# El patrón de nueva línea nunca coincide: el lexer recorre el código línea a línea y
+# emite NUEVA_LINEA al final de cada una.
+MOTOR_LEXICO_PYTHON = MotorLexico(
+    ESPECIFICACIONES_TOKEN_PYTHON,
+    ignorar=(None, TT_COMENTARIO),
+    tipo_identificador=TT_IDENTIFICADOR,
+    palabras_clave=tabla_palabras_clave(PALABRAS_CLAVE_PYTHON, TT_PALABRA_CLAVE),
+    nombre="python",
+)
+
 
 class LexerPython:
     def __init__(self, codigo_fuente):
         self.codigo = codigo_fuente.replace('\r\n', '\n').replace('\r', '\n') 
-        self.tokens_generados = []
+        self.tokens_generados = AlmacenTokens(self.codigo, Token)
         # self.posicion_actual = 0 # No se usa directamente en el enfoque línea por línea
         self.linea_actual = 1      # Usado para el token EOF y potencialmente por _avanzar
         self.columna_actual = 1    # Usado para el token EOF y potencialmente por _avanzar
         self.pila_indentacion = [0] 
-        self.regex_compilado = []
-        for patron, tipo in ESPECIFICACIONES_TOKEN_PYTHON:
-            self.regex_compilado.append((re.compile(patron), tipo))
+        self._lineas = None # Líneas de la última tokenización (ver retokenizar)
+        self.lineas_reescaneadas = 0
 
     def _avanzar(self, cantidad=1): # Este método existe pero no es llamado por el tokenizador actual
         for _ in range(cantidad):
@@ -124,16 +140,6 @@ class LexerPython:
             else:
                 break 
 
-    def _procesar_identificador_o_palabra_clave(self, lexema, linea, col):
-        if lexema in PALABRAS_CLAVE_PYTHON:
-            if lexema in LITERALES_PALABRA_CLAVE_PYTHON:
-                valor_real = None
-                if lexema == 'True': valor_real = True
-                elif lexema == 'False': valor_real = False
-                return Token(TT_PALABRA_CLAVE, lexema, linea, col, valor_real) 
-            return Token(TT_PALABRA_CLAVE, lexema, linea, col)
-        return Token(TT_IDENTIFICADOR, lexema, linea, col)
-
     def _manejar_indentacion(self, linea_str, linea_num, columna_inicio_linea):
         espacios_inicio = 0
         linea_contenido_real = linea_str.lstrip() # Para ignorar espacios al inicio para la lógica de "vacía"
@@ -156,115 +162,187 @@ class LexerPython:
 
         if nivel_actual_indentacion > self.pila_indentacion[-1]:
             self.pila_indentacion.append(nivel_actual_indentacion)
-            self.tokens_generados.append(Token(TT_INDENT, "<INDENT>", linea_num, columna_inicio_linea))
+            self.tokens_generados.agregar(TT_INDENT, "<INDENT>", linea_num, columna_inicio_linea)
         elif nivel_actual_indentacion < self.pila_indentacion[-1]:
             while nivel_actual_indentacion < self.pila_indentacion[-1]:
                 self.pila_indentacion.pop()
-                self.tokens_generados.append(Token(TT_DEDENT, "<DEDENT>", linea_num, columna_inicio_linea))
+                self.tokens_generados.agregar(TT_DEDENT, "<DEDENT>", linea_num, columna_inicio_linea)
             if nivel_actual_indentacion != self.pila_indentacion[-1]:
                 # Error de indentación: nivel no coincide con ninguno anterior
                 # El lexema del error podría ser la línea entera o la parte indentada.
                 # Usamos la línea desde la indentación para el lexema del error.
                 lexema_error = linea_str[espacios_inicio:] if espacios_inicio < len(linea_str) else "<FIN_LINEA_INDENT_ERR>"
-                self.tokens_generados.append(Token(TT_ERROR_LEXICO, lexema_error, linea_num, columna_inicio_linea + espacios_inicio, "Error de indentación inconsistente"))
+                self.tokens_generados.agregar(TT_ERROR_LEXICO, lexema_error, linea_num, columna_inicio_linea + espacios_inicio, "Error de indentación inconsistente")
 
 
-    def tokenizar(self):
-        lineas = self.codigo.split('\n')
+    def _tokenizar_linea(self, linea_str, linea_num, inicio_linea):
+        """Añade los tokens de una línea física (`inicio_linea` es su desplazamiento en self.codigo)."""
+        columna_actual_en_linea = 1 # Columna es 1-based
+        
+        # Manejar indentación al inicio de cada línea física
+        self._manejar_indentacion(linea_str, linea_num, 1) # Columna 1 para INDENT/DEDENT
+
+        pos_en_linea = 0
+        # Saltar espacios iniciales que ya fueron contados por _manejar_indentacion
+        while pos_en_linea < len(linea_str) and linea_str[pos_en_linea].isspace():
+            pos_en_linea += 1
+        
+        # El motor recorre la línea por posición; los espacios internos y los comentarios
+        # se consumen sin token y los identificadores llegan ya reclasificados. La línea y la
+        # columna de estos tokens las calcula el almacén a partir de `inicio`.
+        for tipo_token, lexema, _, _, inicio, _ in MOTOR_LEXICO_PYTHON.escanear(linea_str, pos_en_linea, posiciones=False):
+            inicio += inicio_linea # Desplazamiento en el código completo
+            if tipo_token is None:
+                self.tokens_generados.agregar(TT_ERROR_LEXICO, lexema, valor=f"Carácter no reconocido: '{lexema}'", inicio=inicio)
+            elif tipo_token == TT_PALABRA_CLAVE:
+                valor_real = None
+                if lexema == 'True': valor_real = True
+                elif lexema == 'False': valor_real = False
+                self.tokens_generados.agregar(TT_PALABRA_CLAVE, lexema, None, None, valor_real, inicio)
+            elif tipo_token == TT_CADENA:
+                valor_cadena = lexema 
+                prefijo_f = ""
+                if lexema.lower().startswith(('f"', "f'", 'rf"', "rf'", 'fr"', "fr'")):
+                    prefijo_f = lexema[0].lower()
+                    if lexema.lower().startswith(('rf', 'fr')): valor_cadena = lexema[3:-1]
+                    else: valor_cadena = lexema[2:-1] 
+                elif lexema.startswith(('"""', "'''")): valor_cadena = lexema[3:-3]
+                else: valor_cadena = lexema[1:-1]
+                valor_cadena = valor_cadena.replace('\\n', '\n').replace('\\t', '\t').replace("\\'", "'").replace('\\"', '"').replace('\\\\', '\\')
+                # Para f-strings, el valor es la cadena interna. La 'f' es parte del lexema.
+                self.tokens_generados.agregar(TT_CADENA, lexema, None, None, valor_cadena, inicio)
+            elif tipo_token == TT_ENTERO:
+                self.tokens_generados.agregar(TT_ENTERO, lexema, None, None, int(lexema), inicio)
+            elif tipo_token == TT_FLOTANTE:
+                self.tokens_generados.agregar(TT_FLOTANTE, lexema, None, None, float(lexema), inicio)
+            elif tipo_token == TT_IDENTIFICADOR:
+                self.tokens_generados.agregar(tipo_token, lexema, inicio=inicio,
+                                              simbolo=internar(lexema))
+            else: 
+                self.tokens_generados.agregar(tipo_token, lexema, inicio=inicio)
         
-        for num_linea_enum, linea_str_original in enumerate(lineas):
-            linea_num_real = num_linea_enum + 1
-            columna_actual_en_linea = 1 # Columna es 1-based
-            
-            # Manejar indentación al inicio de cada línea física
-            self._manejar_indentacion(linea_str_original, linea_num_real, 1) # Columna 1 para INDENT/DEDENT
-
-            pos_en_linea = 0
-            # Saltar espacios iniciales que ya fueron contados por _manejar_indentacion
-            while pos_en_linea < len(linea_str_original) and linea_str_original[pos_en_linea].isspace():
-                pos_en_linea += 1
-            
-            linea_tuvo_tokens_significativos = False
-
-            while pos_en_linea < len(linea_str_original):
-                col_actual_real = pos_en_linea + 1
-                match_encontrado_en_iteracion = False
-                subcadena_linea = linea_str_original[pos_en_linea:]
-
-                for regex, tipo_token_base in self.regex_compilado:
-                    if tipo_token_base == TT_NUEVA_LINEA: continue # Los TT_NUEVA_LINEA se manejan al final de la línea
-
-                    match = regex.match(subcadena_linea)
-                    if match:
-                        lexema = match.group(0)
-                        match_encontrado_en_iteracion = True
-                        
-                        if tipo_token_base is None: # Ignorar (ej. espacios dentro de la línea)
-                            pos_en_linea += len(lexema)
-                            break 
-                        
-                        if tipo_token_base == TT_COMENTARIO:
-                            pos_en_linea += len(lexema) 
-                            # El comentario consume el resto de la línea, así que salimos del bucle interno
-                            match_encontrado_en_iteracion = True # Asegura que no se marque error
-                            break # Salir del bucle de regex, ir a la siguiente línea
-
-                        token_final = None
-                        if tipo_token_base == TT_IDENTIFICADOR:
-                            token_final = self._procesar_identificador_o_palabra_clave(lexema, linea_num_real, col_actual_real)
-                        elif tipo_token_base == TT_CADENA:
-                            valor_cadena = lexema 
-                            prefijo_f = ""
-                            if lexema.lower().startswith(('f"', "f'", 'rf"', "rf'", 'fr"', "fr'")):
-                                prefijo_f = lexema[0].lower()
-                                if lexema.lower().startswith(('rf', 'fr')): valor_cadena = lexema[3:-1]
-                                else: valor_cadena = lexema[2:-1] 
-                            elif lexema.startswith(('"""', "'''")): valor_cadena = lexema[3:-3]
-                            else: valor_cadena = lexema[1:-1]
-                            valor_cadena = valor_cadena.replace('\\n', '\n').replace('\\t', '\t').replace("\\'", "'").replace('\\"', '"').replace('\\\\', '\\')
-                            # Para f-strings, el valor es la cadena interna. La 'f' es parte del lexema.
-                            token_final = Token(TT_CADENA, lexema, linea_num_real, col_actual_real, valor_cadena)
-                        elif tipo_token_base == TT_ENTERO:
-                            token_final = Token(TT_ENTERO, lexema, linea_num_real, col_actual_real, int(lexema))
-                        elif tipo_token_base == TT_FLOTANTE:
-                            token_final = Token(TT_FLOTANTE, lexema, linea_num_real, col_actual_real, float(lexema))
-                        else: 
-                            token_final = Token(tipo_token_base, lexema, linea_num_real, col_actual_real)
-                        
-                        if token_final:
-                            self.tokens_generados.append(token_final)
-                            linea_tuvo_tokens_significativos = True
-
-                        pos_en_linea += len(lexema)
-                        break 
-                
-                if not match_encontrado_en_iteracion:
-                    if pos_en_linea < len(linea_str_original): 
-                        caracter_erroneo = linea_str_original[pos_en_linea]
-                        self.tokens_generados.append(Token(TT_ERROR_LEXICO, caracter_erroneo, linea_num_real, col_actual_real,
-                                                    valor=f"Carácter no reconocido: '{caracter_erroneo}'"))
-                        pos_en_linea += 1 
-                        linea_tuvo_tokens_significativos = True # Un error también es significativo
-            
-            # Añadir TT_NUEVA_LINEA después de procesar cada línea física,
-            # si la línea no estaba vacía (después de quitar espacios iniciales y comentarios)
-            # o si la última cosa que se añadió no fue un DEDENT (porque DEDENT ya implica fin de bloque).
-            if linea_str_original.strip() and not linea_str_original.lstrip().startswith('#'):
-                 self.tokens_generados.append(Token(TT_NUEVA_LINEA, "\\n", linea_num_real, len(linea_str_original) + 1))
-            elif not linea_str_original.strip() and self.tokens_generados and self.tokens_generados[-1].tipo == TT_DEDENT:
-                 # Si la línea está vacía pero acabamos de hacer DEDENT, aún necesitamos un NUEVA_LINEA
-                 # para separar el DEDENT de la siguiente línea de código.
-                 self.tokens_generados.append(Token(TT_NUEVA_LINEA, "\\n", linea_num_real, 1))
+        # Añadir TT_NUEVA_LINEA después de procesar cada línea física,
+        # si la línea no estaba vacía (después de quitar espacios iniciales y comentarios)
+        # o si la última cosa que se añadió no fue un DEDENT (porque DEDENT ya implica fin de bloque).
+        if linea_str.strip() and not linea_str.lstrip().startswith('#'):
+             self.tokens_generados.agregar(TT_NUEVA_LINEA, "\\n", linea_num, len(linea_str) + 1)
+        elif not linea_str.strip() and self.tokens_generados and self.tokens_generados[-1].tipo == TT_DEDENT:
+             # Si la línea está vacía pero acabamos de hacer DEDENT, aún necesitamos un NUEVA_LINEA
+             # para separar el DEDENT de la siguiente línea de código.
+             self.tokens_generados.agregar(TT_NUEVA_LINEA, "\\n", linea_num, 1)
+
+    def _estado_linea(self):
+        """
+        Estado del que depende la tokenización de la línea siguiente: la pila de indentación
+        y el tipo del último token emitido. Se reutiliza la tupla anterior si no cambió.
+        """
+        tipos = self.tokens_generados.tipos
+        estado = (tuple(self.pila_indentacion), tipos[-1] if tipos else None)
+        if self._estados_linea and self._estados_linea[-1] == estado:
+            return self._estados_linea[-1]
+        return estado
 
+    def _registrar_punto_control(self, inicio_linea):
+        """Guarda dónde empieza la línea siguiente (en el código y en los tokens) y su estado."""
+        self._inicios_linea.append(inicio_linea)
+        self._primer_token_linea.append(len(self.tokens_generados))
+        self._estados_linea.append(self._estado_linea())
 
+    def _cerrar_tokens(self):
         # Al final del archivo, generar los DEDENTs necesarios y un NUEVA_LINEA final si es necesario
         if self.tokens_generados and self.tokens_generados[-1].tipo != TT_NUEVA_LINEA:
-             self.tokens_generados.append(Token(TT_NUEVA_LINEA, "\\n", self.linea_actual, self.columna_actual))
+             self.tokens_generados.agregar(TT_NUEVA_LINEA, "\\n", self.linea_actual, self.columna_actual)
 
         while len(self.pila_indentacion) > 1:
             self.pila_indentacion.pop()
-            self.tokens_generados.append(Token(TT_DEDENT, "<DEDENT>", self.linea_actual, 1)) # Columna podría ser la de la última línea
+            self.tokens_generados.agregar(TT_DEDENT, "<DEDENT>", self.linea_actual, 1) # Columna podría ser la de la última línea
+
+        self.tokens_generados.agregar(TT_EOF, "EOF", self.linea_actual, self.columna_actual )
+
+    def tokenizar(self):
+        self._lineas = self.codigo.split('\n')
+        # Puntos de control por línea (uno más que líneas: el último es el del cierre)
+        self._inicios_linea = array('I')
+        self._primer_token_linea = array('I')
+        self._estados_linea = []
+        inicio_linea = 0
+        for num_linea_enum, linea_str_original in enumerate(self._lineas):
+            self._registrar_punto_control(inicio_linea)
+            self._tokenizar_linea(linea_str_original, num_linea_enum + 1, inicio_linea)
+            inicio_linea += len(linea_str_original) + 1
+        self._registrar_punto_control(inicio_linea)
+        self.lineas_reescaneadas = len(self._lineas)
+        self._cerrar_tokens()
+        return self.tokens_generados
+
+    def retokenizar(self, codigo_fuente):
+        """
+        Tokeniza `codigo_fuente` (una versión editada del código de este lexer) reutilizando
+        la tokenización anterior. Se vuelve a escanear desde la primera línea cambiada hasta
+        que, ya en el tramo final sin cambios, el estado al empezar una línea coincide con el
+        de la ejecución anterior; a partir de ahí los tokens anteriores se copian desplazados.
+        El resultado es el mismo que el de `LexerPython(codigo_fuente).tokenizar()`.
+        `lineas_reescaneadas` indica cuántas líneas se escanearon.
+        """
+        codigo = codigo_fuente.replace('\r\n', '\n').replace('\r', '\n')
+        if self._lineas is None:
+            self.codigo = codigo
+            self.tokens_generados = AlmacenTokens(self.codigo, Token)
+            return self.tokenizar()
+
+        anteriores, nuevas = self._lineas, codigo.split('\n')
+        limite = min(len(anteriores), len(nuevas))
+        inicio = 0
+        while inicio < limite and anteriores[inicio] == nuevas[inicio]:
+            inicio += 1
+        sufijo = 0
+        while sufijo < limite - inicio and anteriores[-1 - sufijo] == nuevas[-1 - sufijo]:
+            sufijo += 1
+        if inicio == len(anteriores) == len(nuevas):
+            self.lineas_reescaneadas = 0
+            return self.tokens_generados
+
+        almacen_anterior = self.tokens_generados
+        inicios_anteriores = self._inicios_linea
+        primeros_anteriores = self._primer_token_linea
+        estados_anteriores = self._estados_linea
+        delta_lineas = len(nuevas) - len(anteriores)
+
+        # Las líneas anteriores a `inicio` no cambian: sus tokens y puntos de control se copian tal cual.
+        self.codigo = codigo
+        self._lineas = nuevas
+        self.tokens_generados = almacen_anterior.derivar(codigo)
+        self.tokens_generados.copiar_tramo(almacen_anterior, 0, primeros_anteriores[inicio])
+        self._inicios_linea = inicios_anteriores[:inicio]
+        self._primer_token_linea = primeros_anteriores[:inicio]
+        self._estados_linea = estados_anteriores[:inicio]
+        self.pila_indentacion = list(estados_anteriores[inicio][0])
+
+        inicio_linea = inicios_anteriores[inicio]
+        fin_cambio = len(nuevas) - sufijo # Desde aquí, la línea k es la k - delta_lineas anterior
+        k = inicio
+        while k < len(nuevas):
+            if k >= fin_cambio and self._estado_linea() == estados_anteriores[k - delta_lineas]:
+                break
+            self._registrar_punto_control(inicio_linea)
+            self._tokenizar_linea(nuevas[k], k + 1, inicio_linea)
+            inicio_linea += len(nuevas[k]) + 1
+            k += 1
+        self.lineas_reescaneadas = k - inicio
 
-        self.tokens_generados.append(Token(TT_EOF, "EOF", self.linea_actual, self.columna_actual ))
+        if k < len(nuevas):
+            # El estado convergió: el resto de líneas da los mismos tokens, desplazados.
+            k_anterior = k - delta_lineas
+            delta_inicio = inicio_linea - inicios_anteriores[k_anterior]
+            delta_tokens = len(self.tokens_generados) - primeros_anteriores[k_anterior]
+            self.tokens_generados.copiar_tramo(almacen_anterior, primeros_anteriores[k_anterior], primeros_anteriores[-1],
+                                               delta_lineas, delta_inicio)
+            self._inicios_linea.extend(map(delta_inicio.__add__, inicios_anteriores[k_anterior:]))
+            self._primer_token_linea.extend(map(delta_tokens.__add__, primeros_anteriores[k_anterior:]))
+            self._estados_linea.extend(estados_anteriores[k_anterior:])
+            self.pila_indentacion = list(estados_anteriores[-1][0])
+        else:
+            self._registrar_punto_control(inicio_linea)
+        self._cerrar_tokens()
         return self.tokens_generados
 
@@ -1,6 +1,11 @@
 # src/analizador_lexico/lexer_tsql.py
 import re
 
+from src.nucleo_compilador.almacen_tokens import AlmacenTokens
+from src.nucleo_compilador.internado import plegar
+from src.nucleo_compilador.lexico_paralelo import UMBRAL_LEXICO_PARALELO, tokenizar_en_paralelo
+from src.nucleo_compilador.motor_lexico import MotorLexico, avanzar_posicion, tabla_palabras_clave
+
 # Reutilizamos la definición de la clase Token.
 # En un proyecto más grande, esta clase estaría en un módulo común.
 class Token:
@@ -8,6 +13,8 @@ class Token:
     Representa un token léxico con su tipo, lexema (texto),
     número de línea y columna donde aparece, y un valor opcional (ej. para números).
     """
+    simbolo = None # Nombre canónico (internado) si el token es un identificador
+
     def __init__(self, tipo, lexema, linea, columna, valor=None):
         self.tipo = tipo          # Tipo de token (ej: PALABRA_CLAVE, IDENTIFICADOR)
         self.lexema = lexema      # El texto actual del token (ej: "CREATE", "nombre_tabla")
@@ -112,6 +119,19 @@ ESPECIFICACIONES_TOKEN_SQL = [
     (r'\s+', TT_WHITESPACE_SQL), 
 ]
 
+MOTOR_LEXICO_SQL = MotorLexico(
+    ESPECIFICACIONES_TOKEN_SQL,
+    ignorar=(TT_WHITESPACE_SQL, TT_COMENTARIO_LINEA, TT_COMENTARIO_BLOQUE),
+    tipo_identificador=TT_IDENTIFICADOR,
+    palabras_clave=tabla_palabras_clave(PALABRAS_CLAVE_SQL, TT_PALABRA_CLAVE),
+    sin_mayusculas=True,
+    nombre="tsql",
+)
+
+# Tokens que pueden contener un salto de línea o esconder el comienzo de otro token: el
+# pre-escaneo de la tokenización en paralelo no corta dentro de ellos.
+TIPOS_PRECORTE_SQL = (TT_COMENTARIO_LINEA, TT_COMENTARIO_BLOQUE, TT_LITERAL_CADENA)
+
 class LexerTSQL:
     """
     Analizador Léxico para un subconjunto de T-SQL.
@@ -147,60 +167,76 @@ class LexerTSQL:
             else:
                 break # No se puede avanzar más allá del final del código
 
-    def tokenizar(self):
-        tokens = []
-        while self.posicion_actual < len(self.codigo):
-            match_encontrado_en_iteracion = False
-            linea_inicio_token = self.linea_actual
-            col_inicio_token = self.columna_actual
-
-            for patron_regex, tipo_token_base in ESPECIFICACIONES_TOKEN_SQL:
-                match = re.match(patron_regex, self.codigo[self.posicion_actual:])
-                if match:
-                    lexema = match.group(0)
-                    match_encontrado_en_iteracion = True
-                    
-                    if tipo_token_base == TT_WHITESPACE_SQL or \
-                       tipo_token_base == TT_COMENTARIO_LINEA or \
-                       tipo_token_base == TT_COMENTARIO_BLOQUE:
-                        self._avanzar(len(lexema))
-                        break 
-
-                    tipo_token_final = tipo_token_base
-                    valor_final = lexema 
-
-                    if tipo_token_base == TT_IDENTIFICADOR:
-                        # Reclasificar si es una palabra clave
-                        if lexema.lower() in PALABRAS_CLAVE_SQL:
-                            tipo_token_final = TT_PALABRA_CLAVE
-                        # Extraer valor para identificadores delimitados
-                        elif lexema.startswith('[') and lexema.endswith(']'):
-                            valor_final = lexema[1:-1]
-                        elif lexema.startswith('"') and lexema.endswith('"'):
-                            valor_final = lexema[1:-1]
-                        # Para variables como @nombre, el lexema es el valor
-                    
-                    elif tipo_token_base == TT_LITERAL_CADENA:
-                        valor_final = lexema[1:-1].replace("''", "'")
-                    
-                    elif tipo_token_base == TT_LITERAL_NUMERICO:
-                        if '.' in lexema or 'e' in lexema.lower():
-                            try: valor_final = float(lexema)
-                            except ValueError: valor_final = lexema 
-                        else:
-                            try: valor_final = int(lexema)
-                            except ValueError: valor_final = lexema 
-                    
-                    tokens.append(Token(tipo_token_final, lexema, linea_inicio_token, col_inicio_token, valor_final))
-                    self._avanzar(len(lexema))
-                    break 
-            
-            if not match_encontrado_en_iteracion and self.posicion_actual < len(self.codigo):
-                caracter_erroneo = self.codigo[self.posicion_actual]
-                tokens.append(Token(TT_ERROR_SQL, caracter_erroneo, linea_inicio_token, col_inicio_token,
-                                    valor=f"Carácter no reconocido: '{caracter_erroneo}'"))
-                self._avanzar() 
-        tokens.append(Token(TT_EOF_SQL, "EOF", self.linea_actual, self.columna_actual))
+    def _filas_tokens(self, posiciones=True, tramo=None):
+        """
+        Genera (tipo, lexema, linea, columna, valor, inicio, simbolo) por token, terminando en EOF.
+        Con `posiciones=False` la línea y la columna son None (salvo en EOF): el AlmacenTokens
+        las calcula a partir de `inicio`. Con un TramoEscaneo solo se genera ese tramo, sin EOF.
+        """
+        # Una sola expresión maestra para toda la tabla; las palabras clave se reclasifican
+        # en el motor (sin distinguir mayúsculas).
+        escaneo = MOTOR_LEXICO_SQL.escanear(self.codigo, self.posicion_actual,
+                                            linea=self.linea_actual, columna=self.columna_actual,
+                                            posiciones=posiciones)
+        if tramo is not None:
+            escaneo = tramo.limitar(escaneo, len(self.codigo))
+        for tipo_token, lexema, linea, columna, inicio, _ in escaneo:
+            if tipo_token is None:
+                yield TT_ERROR_SQL, lexema, linea, columna, f"Carácter no reconocido: '{lexema}'", inicio, None
+                continue
+
+            valor_final = lexema
+            simbolo = None
+            if tipo_token == TT_IDENTIFICADOR:
+                # Extraer valor para identificadores delimitados
+                if lexema.startswith('[') and lexema.endswith(']'):
+                    valor_final = lexema[1:-1]
+                elif lexema.startswith('"') and lexema.endswith('"'):
+                    valor_final = lexema[1:-1]
+                # Para variables como @nombre, el lexema es el valor
+                simbolo = plegar(valor_final)
+
+            elif tipo_token == TT_LITERAL_CADENA:
+                valor_final = lexema[1:-1].replace("''", "'")
+
+            elif tipo_token == TT_LITERAL_NUMERICO:
+                if '.' in lexema or 'e' in lexema.lower():
+                    try: valor_final = float(lexema)
+                    except ValueError: valor_final = lexema
+                else:
+                    try: valor_final = int(lexema)
+                    except ValueError: valor_final = lexema
+
+            yield tipo_token, lexema, linea, columna, valor_final, inicio, simbolo
+
+        if tramo is not None:
+            return
+        self.linea_actual, self.columna_actual = avanzar_posicion(self.codigo[self.posicion_actual:], self.linea_actual, self.columna_actual)
+        self.posicion_actual = len(self.codigo)
+        yield TT_EOF_SQL, "EOF", self.linea_actual, self.columna_actual, None, None, None
+
+    def tokenizar(self, tramo=None):
+        """
+        AlmacenTokens con todos los tokens. Un código de más de UMBRAL_LEXICO_PARALELO
+        caracteres se tokeniza por tramos en varios procesos (ver lexico_paralelo); con
+        `tramo` (un TramoEscaneo) solo se tokeniza ese tramo, sin EOF.
+        """
+        tokens = AlmacenTokens(self.codigo, Token)
+        if tramo is None and len(self.codigo) - self.posicion_actual >= UMBRAL_LEXICO_PARALELO:
+            tokenizar_en_paralelo(self, tokens, MOTOR_LEXICO_SQL, TIPOS_PRECORTE_SQL)
+        for tipo_token, lexema, linea, columna, valor, inicio, simbolo in self._filas_tokens(posiciones=False, tramo=tramo):
+            tokens.agregar(tipo_token, lexema, linea, columna, valor, inicio, simbolo)
         return tokens
 
+    def generar_tokens(self):
+        """
+        Versión perezosa de `tokenizar`: genera los tokens de uno en uno, sin guardarlos.
+        El parser los lee a través de un FlujoTokens que solo conserva una ventana.
+        """
+        for tipo_token, lexema, linea, columna, valor, _, simbolo in self._filas_tokens():
+            token = Token(tipo_token, lexema, linea, columna, valor)
+            if simbolo is not None:
+                token.simbolo = simbolo
+            yield token
+
 # (Fin de la clase LexerTSQL)
@@ -0,0 +1,544 @@
+# src/analizador_lexico/preprocesador_cpp.py
+"""
+Preprocesador de C++ sobre los tokens de LexerCPP.
+
+Recibe el AlmacenTokens de una unidad de traducción y devuelve la lista de tokens que ve
+el parser:
+  - `#define`/`#undef` de macros objeto (`#define N 10`) y función (`#define MAX(a, b) ...`);
+    los usos se expanden y el resultado se vuelve a examinar sin reexpandir la misma macro.
+  - `#if`/`#ifdef`/`#ifndef`/`#elif`/`#else`/`#endif`: los tokens de las ramas inactivas se
+    descartan. Las condiciones de `#if` admiten `defined`, enteros, caracteres y los
+    operadores de C (sin `eval`).
+  - `#include "cabecera.h"` (CABECERA_USUARIO_CPP): la cabecera se busca en el directorio del
+    archivo que la incluye y después en `rutas_busqueda`, y sus tokens se insertan tras la
+    directiva. `#pragma once` se respeta. Una cabecera que vuelve a incluirse a sí misma
+    (directa o indirectamente) es un error de inclusión circular, salvo que esté protegida
+    por una guarda `#ifndef X` ... `#endif` cuya macro ya esté definida. Las cabeceras
+    estándar (`<iostream>`) no se resuelven: el simulador las trata como hasta ahora.
+
+Las directivas que el preprocesador consume (definiciones y condicionales) no pasan al
+parser; `#include`, `#pragma` y las demás se conservan, porque el parser las admite y el
+simulador las muestra.
+
+Los tokens de cada cabecera se guardan en un CacheCabecerasCPP por ruta y fecha de
+modificación: una cabecera incluida desde muchas unidades de traducción se tokeniza una
+sola vez por ejecución (se vuelve a preprocesar en cada una, porque el resultado depende
+de las macros definidas). No se implementan `#` / `##` en los cuerpos de las macros ni las
+macros variádicas.
+"""
+import os
+import re
+import time
+
+try:
+    from .lexer_cpp import (
+        LexerCPP, Token, TT_DIRECTIVA_PREPROCESADOR, TT_CABECERA_USUARIO, TT_IDENTIFICADOR,
+        TT_PALABRA_CLAVE, TT_LITERAL_ENTERO, TT_LITERAL_CARACTER, TT_LITERAL_BOOLEANO, TT_PARENTESIS_IZQ,
+        TT_PARENTESIS_DER, TT_COMA, TT_EOF_CPP,
+    )
+except ImportError:
+    from analizador_lexico.lexer_cpp import (
+        LexerCPP, Token, TT_DIRECTIVA_PREPROCESADOR, TT_CABECERA_USUARIO, TT_IDENTIFICADOR,
+        TT_PALABRA_CLAVE, TT_LITERAL_ENTERO, TT_LITERAL_CARACTER, TT_LITERAL_BOOLEANO, TT_PARENTESIS_IZQ,
+        TT_PARENTESIS_DER, TT_COMA, TT_EOF_CPP,
+    )
+from src.nucleo_compilador.motor_lexico import TramoEscaneo
+
+# Profundidad máxima de `#include` anidados (evita la recursión infinita sin guardas)
+PROFUNDIDAD_MAXIMA_INCLUDE = 200
+
+# Nombre y parámetros de `#define`; el cuerpo empieza donde termina la coincidencia
+_PATRON_DEFINE = re.compile(r'#\s*define\s+([A-Za-z_]\w*)(\(([^)]*)\))?')
+# Directiva con su argumento: el argumento empieza donde termina la coincidencia
+_PATRON_DIRECTIVA = re.compile(r'#\s*[A-Za-z_]\w*')
+
+# Precedencia de los operadores binarios en las condiciones de `#if`
+_PRECEDENCIA_BINARIOS = {
+    '||': 1, '&&': 2, '|': 3, '^': 4, '&': 5, '==': 6, '!=': 6,
+    '<': 7, '>': 7, '<=': 7, '>=': 7, '<<': 8, '>>': 8, '+': 9, '-': 9, '*': 10, '/': 10, '%': 10,
+}
+
+
+class ErrorPreprocesador(Exception):
+    """Error en una directiva (se registra en `PreprocesadorCPP.errores`)."""
+    pass
+
+
+class MacroCPP:
+    """Macro definida con `#define`. `parametros` es None para las macros objeto."""
+    __slots__ = ("nombre", "parametros", "cuerpo")
+
+    def __init__(self, nombre, parametros, cuerpo):
+        self.nombre = nombre
+        self.parametros = parametros
+        self.cuerpo = cuerpo
+
+
+class CacheCabecerasCPP:
+    """
+    Tokens de las cabeceras ya leídas, por ruta (absoluta) y fecha de modificación. Guarda
+    también los tokens de los cuerpos de sus directivas, que solo dependen del archivo.
+    """
+
+    def __init__(self):
+        self._entradas = {} # ruta -> (mtime_ns, AlmacenTokens, tramos de directivas)
+        self.aciertos = 0
+        self.fallos = 0
+        self.segundos_lexico = 0.0
+
+    def obtener(self, ruta):
+        """(AlmacenTokens, tramos) de la cabecera; solo se tokeniza si no está o cambió."""
+        mtime = os.stat(ruta).st_mtime_ns
+        entrada = self._entradas.get(ruta)
+        if entrada is not None and entrada[0] == mtime:
+            self.aciertos += 1
+            return entrada[1], entrada[2]
+        self.fallos += 1
+        inicio = time.perf_counter()
+        with open(ruta, 'r', encoding='utf-8', errors='replace') as archivo:
+            tokens = LexerCPP(archivo.read()).tokenizar()
+        self.segundos_lexico += time.perf_counter() - inicio
+        self._entradas[ruta] = (mtime, tokens, {})
+        return tokens, self._entradas[ruta][2]
+
+    def tasa_aciertos(self):
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas else 0.0
+
+    def vaciar(self):
+        self._entradas.clear()
+        self.aciertos = self.fallos = 0
+        self.segundos_lexico = 0.0
+
+
+# Caché compartida por todos los preprocesadores de la ejecución
+CACHE_CABECERAS_CPP = CacheCabecerasCPP()
+
+
+class PreprocesadorCPP:
+    """
+    Args:
+        rutas_busqueda (list): Directorios donde buscar las cabeceras de usuario.
+        cache (CacheCabecerasCPP): Caché de cabeceras (por defecto, la compartida).
+        macros (dict): Macros predefinidas, nombre -> texto del cuerpo.
+    """
+
+    def __init__(self, rutas_busqueda=(), cache=None, macros=None):
+        self.rutas_busqueda = list(rutas_busqueda)
+        self.cache = CACHE_CABECERAS_CPP if cache is None else cache
+        self.macros = {}
+        self.errores = []
+        self.avisos = []
+        self.cabeceras_incluidas = 0
+        self.rutas_incluidas = [] # Rutas absolutas de las cabeceras leídas, sin repetir
+        self.expansiones = 0
+        self.segundos_expansion = 0.0
+        self._una_vez = set() # Cabeceras con `#pragma once` ya incluidas
+        self._pila_include = [] # Rutas de los archivos en proceso, del principal a la cabecera actual
+        for nombre, texto in (macros or {}).items():
+            self.definir(nombre, texto)
+
+    def definir(self, nombre, texto="1"):
+        """Define una macro objeto desde fuera (como `-DNOMBRE=texto`)."""
+        tokens = LexerCPP(texto).tokenizar()
+        self.macros[nombre] = MacroCPP(nombre, None, list(tokens)[:-1])
+
+    def procesar(self, tokens, ruta_archivo=None):
+        """
+        Preprocesa los tokens (AlmacenTokens de LexerCPP) de una unidad de traducción.
+
+        Returns:
+            list: Tokens para el parser, terminados en el EOF del archivo principal.
+        """
+        salida = []
+        self._procesar_archivo(tokens, ruta_archivo, {}, salida, 0)
+        if tokens and tokens.tipo(len(tokens) - 1) == TT_EOF_CPP:
+            salida.append(tokens[len(tokens) - 1])
+        return salida
+
+    def resumen(self):
+        """Línea con las cabeceras incluidas, la tasa de aciertos de la caché y el tiempo de expansión."""
+        return (f"Preprocesador C++: {self.cabeceras_incluidas} cabecera(s) incluida(s), "
+                f"caché {self.cache.aciertos} acierto(s) / {self.cache.fallos} fallo(s) "
+                f"({self.cache.tasa_aciertos() * 100:.1f}%), {self.expansiones} expansión(es) de macro "
+                f"en {self.segundos_expansion * 1000:.2f} ms.")
+
+    # --- Recorrido de un archivo ---
+    def _procesar_archivo(self, tokens, ruta, tramos, salida, profundidad):
+        self._pila_include.append(os.path.abspath(ruta) if ruta else None)
+        try:
+            self._recorrer_archivo(tokens, ruta, tramos, salida, profundidad)
+        finally:
+            self._pila_include.pop()
+
+    def _recorrer_archivo(self, tokens, ruta, tramos, salida, profundidad):
+        # Pila de condicionales: (región exterior activa, alguna rama ya tomada)
+        pila = []
+        activo = True
+        pendientes = [] # Tokens normales desde la última directiva, aún sin expandir
+        for indice in range(len(tokens)):
+            tipo = tokens.tipo(indice)
+            if tipo == TT_EOF_CPP:
+                break
+            if tipo != TT_DIRECTIVA_PREPROCESADOR:
+                if activo:
+                    pendientes.append(tokens[indice])
+                continue
+            token = tokens[indice]
+            directiva = token.valor.get('directiva') if isinstance(token.valor, dict) else None
+            if directiva in ('if', 'ifdef', 'ifndef', 'elif', 'else', 'endif'):
+                if directiva in ('if', 'ifdef', 'ifndef'):
+                    condicion = activo and self._condicion(tokens, indice, directiva, ruta, tramos)
+                    pila.append((activo, condicion or not activo))
+                    activo = condicion
+                elif not pila:
+                    self._error(f"#{directiva} sin #if", token, ruta)
+                elif directiva == 'elif':
+                    exterior, tomada = pila[-1]
+                    activo = exterior and not tomada and self._condicion(tokens, indice, directiva, ruta, tramos)
+                    pila[-1] = (exterior, tomada or activo)
+                elif directiva == 'else':
+                    exterior, tomada = pila[-1]
+                    activo = exterior and not tomada
+                    pila[-1] = (exterior, True)
+                else:
+                    activo = pila.pop()[0]
+                continue
+            if not activo:
+                continue
+            self._vaciar_pendientes(pendientes, salida)
+            if directiva == 'define':
+                self._definir_desde_directiva(tokens, indice, ruta, tramos)
+            elif directiva == 'undef':
+                self.macros.pop(token.valor.get('argumentos', '').split('//')[0].strip(), None)
+            else:
+                salida.append(token)
+                if directiva == 'include' and token.valor.get('tipo_cabecera') == TT_CABECERA_USUARIO:
+                    self._incluir(token, ruta, salida, profundidad)
+                elif directiva == 'pragma' and token.valor.get('argumentos', '').startswith('once') and ruta:
+                    self._una_vez.add(ruta)
+                elif directiva == 'error':
+                    self._error(f"#error {token.valor.get('argumentos', '')}", token, ruta)
+        self._vaciar_pendientes(pendientes, salida)
+        if pila:
+            self._error(f"{len(pila)} #if sin #endif al final del archivo", tokens[len(tokens) - 1], ruta)
+
+    def _vaciar_pendientes(self, pendientes, salida):
+        if not pendientes:
+            return
+        inicio = time.perf_counter()
+        salida.extend(self._expandir(pendientes, frozenset()))
+        self.segundos_expansion += time.perf_counter() - inicio
+        pendientes.clear()
+
+    def _tokens_directiva(self, tokens, indice, patron, tramos):
+        """
+        Tokens del argumento de la directiva `indice` (lo que sigue a `patron`), tokenizados
+        sobre el código del archivo para que conserven su posición.
+        """
+        token = tokens[indice]
+        coincidencia = patron.match(token.lexema)
+        if coincidencia is None:
+            return None, []
+        desde = token.inicio + coincidencia.end()
+        hasta = token.inicio + len(token.lexema)
+        cuerpo = tramos.get((desde, hasta))
+        if cuerpo is None:
+            lexer = LexerCPP(tokens.codigo)
+            lexer.posicion_actual = desde
+            cuerpo = tramos[(desde, hasta)] = list(lexer.tokenizar(TramoEscaneo(hasta)))
+        return coincidencia, cuerpo
+
+    def _definir_desde_directiva(self, tokens, indice, ruta, tramos):
+        coincidencia, cuerpo = self._tokens_directiva(tokens, indice, _PATRON_DEFINE, tramos)
+        if coincidencia is None:
+            self._error("#define sin nombre de macro válido", tokens[indice], ruta)
+            return
+        parametros = None
+        if coincidencia.group(2) is not None:
+            parametros = [p.strip() for p in coincidencia.group(3).split(',')] if coincidencia.group(3).strip() else []
+            if not all(re.fullmatch(r'[A-Za-z_]\w*', p) for p in parametros):
+                self._error(f"parámetros no válidos en la macro '{coincidencia.group(1)}'", tokens[indice], ruta)
+                return
+        self.macros[coincidencia.group(1)] = MacroCPP(coincidencia.group(1), parametros, cuerpo)
+
+    def _incluir(self, token, ruta, salida, profundidad):
+        nombre = token.valor['archivo']
+        ruta_cabecera = self._buscar_cabecera(nombre, ruta)
+        if ruta_cabecera is None:
+            self.avisos.append(f"Aviso de Preprocesador C++ en L{token.linea}:C{token.columna}: "
+                               f"no se encontró la cabecera \"{nombre}\".")
+            return
+        if ruta_cabecera in self._una_vez:
+            return
+        if profundidad >= PROFUNDIDAD_MAXIMA_INCLUDE:
+            self._error(f"demasiados #include anidados al incluir \"{nombre}\"", token, ruta)
+            return
+        tokens_cabecera, tramos = self.cache.obtener(ruta_cabecera)
+        if ruta_cabecera in self._pila_include:
+            if self._guarda_definida(tokens_cabecera, tramos):
+                return # La guarda deja la cabecera vacía: no hay nada que volver a incluir
+            ciclo = self._pila_include[self._pila_include.index(ruta_cabecera):] + [ruta_cabecera]
+            self._error("inclusión circular: " + " -> ".join(os.path.basename(r) for r in ciclo), token, ruta)
+            return
+        self.cabeceras_incluidas += 1
+        if ruta_cabecera not in self.rutas_incluidas:
+            self.rutas_incluidas.append(ruta_cabecera)
+        self._procesar_archivo(tokens_cabecera, ruta_cabecera, tramos, salida, profundidad + 1)
+
+    def _guarda_definida(self, tokens, tramos):
+        """
+        True si todo el archivo está dentro de un `#ifndef X` ... `#endif` y X ya está definida
+        (incluirlo otra vez no produce tokens).
+        """
+        if not len(tokens) or tokens.tipo(0) != TT_DIRECTIVA_PREPROCESADOR:
+            return False
+        primera = tokens[0]
+        if not isinstance(primera.valor, dict) or primera.valor.get('directiva') != 'ifndef':
+            return False
+        _, argumento = self._tokens_directiva(tokens, 0, _PATRON_DIRECTIVA, tramos)
+        if not argumento or argumento[0].lexema not in self.macros:
+            return False
+        anidamiento = 0
+        for indice in range(len(tokens)):
+            tipo = tokens.tipo(indice)
+            if tipo == TT_EOF_CPP:
+                return False
+            if tipo != TT_DIRECTIVA_PREPROCESADOR:
+                continue
+            directiva = tokens[indice].valor.get('directiva') if isinstance(tokens[indice].valor, dict) else None
+            if directiva in ('if', 'ifdef', 'ifndef'):
+                anidamiento += 1
+            elif directiva == 'endif':
+                anidamiento -= 1
+                if anidamiento == 0: # El #endif de la guarda debe ser lo último del archivo
+                    return indice + 1 >= len(tokens) or tokens.tipo(indice + 1) == TT_EOF_CPP
+        return False
+
+    def _buscar_cabecera(self, nombre, ruta_incluye):
+        directorios = ([os.path.dirname(ruta_incluye)] if ruta_incluye else []) + self.rutas_busqueda
+        for directorio in directorios:
+            candidata = os.path.abspath(os.path.join(directorio, nombre))
+            if os.path.isfile(candidata):
+                return candidata
+        return None
+
+    def _error(self, mensaje, token, ruta):
+        donde = f" ({os.path.basename(ruta)})" if ruta else ""
+        self.errores.append(f"Error de Preprocesador C++ en L{token.linea}:C{token.columna}{donde}: {mensaje}")
+
+    # --- Expansión de macros ---
+    def _expandir(self, tokens, prohibidas):
+        """
+        Expande las macros de `tokens`. `prohibidas` son las macros en expansión, que no se
+        vuelven a expandir dentro de su propio resultado.
+        """
+        salida = []
+        i, n = 0, len(tokens)
+        while i < n:
+            token = tokens[i]
+            macro = None
+            if token.tipo in (TT_IDENTIFICADOR, TT_PALABRA_CLAVE) and token.lexema not in prohibidas:
+                macro = self.macros.get(token.lexema)
+            if macro is None:
+                salida.append(token)
+                i += 1
+                continue
+            if macro.parametros is None:
+                self.expansiones += 1
+                salida.extend(self._expandir(macro.cuerpo, prohibidas | {macro.nombre}))
+                i += 1
+                continue
+            # Macro función: solo se expande si le sigue una lista de argumentos
+            argumentos, siguiente = None, i + 1
+            if i + 1 < n and tokens[i + 1].tipo == TT_PARENTESIS_IZQ:
+                argumentos, siguiente = self._argumentos(tokens, i + 2)
+            if argumentos is None:
+                salida.append(token)
+                i += 1
+                continue
+            if argumentos == [[]] and not macro.parametros:
+                argumentos = []
+            if len(argumentos) != len(macro.parametros):
+                ruta = self._pila_include[-1] if self._pila_include else None
+                self._error(f"la macro '{macro.nombre}' espera {len(macro.parametros)} argumento(s) "
+                            f"y recibió {len(argumentos)}", token, ruta)
+                salida.append(token)
+                i += 1
+                continue
+            self.expansiones += 1
+            # Los argumentos se expanden antes de sustituirlos (no hay `#` ni `##`)
+            valores = {parametro: self._expandir(argumento, prohibidas)
+                       for parametro, argumento in zip(macro.parametros, argumentos)}
+            sustituido = []
+            for token_cuerpo in macro.cuerpo:
+                valor = valores.get(token_cuerpo.lexema) if token_cuerpo.tipo in (TT_IDENTIFICADOR, TT_PALABRA_CLAVE) else None
+                if valor is None:
+                    sustituido.append(token_cuerpo)
+                else:
+                    sustituido.extend(valor)
+            salida.extend(self._expandir(sustituido, prohibidas | {macro.nombre}))
+            i = siguiente
+        return salida
+
+    @staticmethod
+    def _argumentos(tokens, desde):
+        """Argumentos (listas de tokens) hasta el `)` que cierra la llamada y la posición siguiente."""
+        argumentos, actual = [], []
+        profundidad = 0
+        for i in range(desde, len(tokens)):
+            token = tokens[i]
+            if token.tipo == TT_PARENTESIS_IZQ:
+                profundidad += 1
+            elif token.tipo == TT_PARENTESIS_DER:
+                if profundidad == 0:
+                    argumentos.append(actual)
+                    return argumentos, i + 1
+                profundidad -= 1
+            elif token.tipo == TT_COMA and profundidad == 0:
+                argumentos.append(actual)
+                actual = []
+                continue
+            actual.append(token)
+        return None, desde
+
+    # --- Condiciones ---
+    def _condicion(self, tokens, indice, directiva, ruta, tramos):
+        token = tokens[indice]
+        _, argumento = self._tokens_directiva(tokens, indice, _PATRON_DIRECTIVA, tramos)
+        if directiva in ('ifdef', 'ifndef'):
+            if not argumento or argumento[0].tipo not in (TT_IDENTIFICADOR, TT_PALABRA_CLAVE):
+                self._error(f"#{directiva} sin nombre de macro", token, ruta)
+                return False
+            return (argumento[0].lexema in self.macros) == (directiva == 'ifdef')
+        inicio = time.perf_counter()
+        try:
+            return _EvaluadorCondicion(self._expandir(self._sustituir_defined(argumento), frozenset())).evaluar() != 0
+        except ErrorPreprocesador as e:
+            self._error(f"condición de #{directiva} no válida: {e}", token, ruta)
+            return False
+        finally:
+            self.segundos_expansion += time.perf_counter() - inicio
+
+    def _sustituir_defined(self, tokens):
+        """Cambia `defined X` y `defined(X)` por 1 o 0 antes de expandir las macros."""
+        salida = []
+        i, n = 0, len(tokens)
+        while i < n:
+            token = tokens[i]
+            if token.tipo == TT_IDENTIFICADOR and token.lexema == 'defined':
+                if i + 1 < n and tokens[i + 1].tipo == TT_PARENTESIS_IZQ:
+                    if i + 3 >= n or tokens[i + 3].tipo != TT_PARENTESIS_DER:
+                        raise ErrorPreprocesador("se esperaba defined(NOMBRE)")
+                    nombre, i = tokens[i + 2].lexema, i + 4
+                elif i + 1 < n:
+                    nombre, i = tokens[i + 1].lexema, i + 2
+                else:
+                    raise ErrorPreprocesador("'defined' sin nombre")
+                definida = nombre in self.macros
+                salida.append(Token(TT_LITERAL_ENTERO, str(int(definida)), token.linea, token.columna, int(definida)))
+                continue
+            salida.append(token)
+            i += 1
+        return salida
+
+
+class _EvaluadorCondicion:
+    """Evalúa por precedencia de operadores la condición (ya expandida) de `#if`/`#elif`."""
+
+    def __init__(self, tokens):
+        self.elementos = []
+        for token in tokens:
+            lexema = token.lexema
+            if token.tipo == TT_LITERAL_ENTERO and lexema[0] in '+-' and self.elementos and \
+               (isinstance(self.elementos[-1], int) or self.elementos[-1] == ')'):
+                # El lexer une el signo al número ("A -1"): aquí es un operador binario
+                self.elementos.append(lexema[0])
+                self.elementos.append(abs(token.valor))
+            elif token.tipo == TT_LITERAL_ENTERO:
+                self.elementos.append(token.valor)
+            elif token.tipo == TT_LITERAL_CARACTER:
+                self.elementos.append(ord(token.valor[0]) if token.valor else 0)
+            elif token.tipo in (TT_IDENTIFICADOR, TT_PALABRA_CLAVE, TT_LITERAL_BOOLEANO):
+                # Los nombres que quedan tras expandir valen 0 (y `true`, 1)
+                self.elementos.append(1 if lexema == 'true' else 0)
+            else:
+                self.elementos.append(lexema)
+        self.posicion = 0
+
+    def evaluar(self):
+        if not self.elementos:
+            raise ErrorPreprocesador("condición vacía")
+        valor = self._ternario()
+        if self.posicion != len(self.elementos):
+            raise ErrorPreprocesador(f"'{self.elementos[self.posicion]}' inesperado")
+        return valor
+
+    def _siguiente(self):
+        return self.elementos[self.posicion] if self.posicion < len(self.elementos) else None
+
+    def _esperar(self, lexema):
+        if self._siguiente() != lexema:
+            raise ErrorPreprocesador(f"se esperaba '{lexema}'")
+        self.posicion += 1
+
+    def _ternario(self):
+        condicion = self._binario(1)
+        if self._siguiente() != '?':
+            return condicion
+        self.posicion += 1
+        si_verdadero = self._ternario()
+        self._esperar(':')
+        si_falso = self._ternario()
+        return si_verdadero if condicion else si_falso
+
+    def _binario(self, precedencia_minima):
+        izquierda = self._unario()
+        while True:
+            operador = self._siguiente()
+            precedencia = _PRECEDENCIA_BINARIOS.get(operador) if isinstance(operador, str) else None
+            if precedencia is None or precedencia < precedencia_minima:
+                return izquierda
+            self.posicion += 1
+            derecha = self._binario(precedencia + 1)
+            izquierda = self._aplicar(operador, izquierda, derecha)
+
+    def _unario(self):
+        elemento = self._siguiente()
+        if elemento is None:
+            raise ErrorPreprocesador("final inesperado")
+        self.posicion += 1
+        if isinstance(elemento, int):
+            return elemento
+        if elemento == '(':
+            valor = self._ternario()
+            self._esperar(')')
+            return valor
+        if elemento == '!': return int(not self._unario())
+        if elemento == '-': return -self._unario()
+        if elemento == '+': return self._unario()
+        if elemento == '~': return ~self._unario()
+        raise ErrorPreprocesador(f"'{elemento}' inesperado")
+
+    @staticmethod
+    def _aplicar(operador, a, b):
+        if operador in ('/', '%') and b == 0:
+            raise ErrorPreprocesador("división por cero")
+        if operador == '||': return int(bool(a or b))
+        if operador == '&&': return int(bool(a and b))
+        if operador == '|': return a | b
+        if operador == '^': return a ^ b
+        if operador == '&': return a & b
+        if operador == '==': return int(a == b)
+        if operador == '!=': return int(a != b)
+        if operador == '<': return int(a < b)
+        if operador == '>': return int(a > b)
+        if operador == '<=': return int(a <= b)
+        if operador == '>=': return int(a >= b)
+        if operador == '<<': return a << b
+        if operador == '>>': return a >> b
+        if operador == '+': return a + b
+        if operador == '-': return a - b
+        if operador == '*': return a * b
+        if operador == '/': return int(a / b) # División entera de C (trunca hacia cero)
+        return a - b * int(a / b) # '%'
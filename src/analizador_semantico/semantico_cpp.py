@@ -41,6 +41,8 @@ except ImportError as e:
     class NodoMiembroExpresion: pass
     class Token: pass
 
+from src.nucleo_compilador.nodos_ast import atributos_nodo
+
 class SimboloCPP:
     def __init__(self, nombre, tipo, tipo_dato=None, nodo_def=None, info_extra=None):
         self.nombre = nombre
@@ -109,7 +111,7 @@ class AnalizadorSemanticoCPP:
         visitador = getattr(self, nombre_metodo, self._visitador_no_encontrado)
         return visitador(nodo)
     def _visitador_no_encontrado(self, nodo):
-        for nombre_attr, valor_attr in vars(nodo).items():
+        for nombre_attr, valor_attr in atributos_nodo(nodo):
             if isinstance(valor_attr, (NodoDeclaracion, NodoSentencia, NodoExpresion)):
                 self.visitar(valor_attr)
             elif isinstance(valor_attr, list):
@@ -11,7 +11,8 @@ try:
         NodoSentenciaExpresion, NodoSentenciaIf, NodoSentenciaReturn, NodoBucleFor,
         NodoIdentificadorJS, NodoLiteralJS, NodoAsignacionExpresion,
         NodoExpresionBinariaJS, NodoLlamadaExpresion, NodoMiembroExpresion,
-        NodoExpresionActualizacion, NodoArrayLiteralJS, NodoObjetoLiteralJS, NodoPropiedadObjetoJS
+        NodoExpresionActualizacion, NodoArrayLiteralJS, NodoObjetoLiteralJS, NodoPropiedadObjetoJS,
+        NodoPlantillaJS, NodoInterpolacionJS
     )
     from analizador_lexico.lexer_javascript import Token
 except ImportError as e:
@@ -37,8 +38,12 @@ except ImportError as e:
     class NodoArrayLiteralJS: pass
     class NodoObjetoLiteralJS: pass
     class NodoPropiedadObjetoJS: pass
+    class NodoPlantillaJS: pass
+    class NodoInterpolacionJS: pass
     class Token: pass
 
+from src.nucleo_compilador.nodos_ast import atributos_nodo
+
 class SimboloJS:
     def __init__(self, nombre, tipo, tipo_dato=None, nodo_def=None, info_extra=None):
         self.nombre = nombre
@@ -116,7 +121,7 @@ class AnalizadorSemanticoJS:
             NodoIdentificadorJS, NodoLiteralJS, NodoAsignacionExpresion, NodoExpresionBinariaJS, NodoLlamadaExpresion, NodoMiembroExpresion,
             NodoExpresionActualizacion, NodoArrayLiteralJS, NodoObjetoLiteralJS, NodoPropiedadObjetoJS
         )
-        for nombre_attr, valor_attr in vars(nodo).items():
+        for nombre_attr, valor_attr in atributos_nodo(nodo):
             if isinstance(valor_attr, AST_NODE_CLASSES):
                 self.visitar(valor_attr)
             elif isinstance(valor_attr, list):
@@ -181,6 +186,11 @@ class AnalizadorSemanticoJS:
             simbolo.usado = True
     def visitar_NodoLiteralJS(self, nodo):
         return type(nodo.valor).__name__
+    def visitar_NodoPlantillaJS(self, nodo):
+        for parte in nodo.partes:
+            if isinstance(parte, NodoInterpolacionJS):
+                self.visitar(parte.expresion_nodo)
+        return 'str'
     def visitar_NodoAsignacionExpresion(self, nodo):
         self.visitar(nodo.izquierda_nodo)
         self.visitar(nodo.derecha_nodo)
@@ -22,6 +22,10 @@ class ErrorSemanticoPLSQL(Exception):
     pass
 
 class AnalizadorSemanticoPLSQL:
+    # Cada bloque abre y cierra su propio ámbito: nada pasa de un lote al siguiente
+    # (ver nucleo_compilador/lotes_paralelos.py).
+    TABLAS_ENTRE_LOTES = ()
+
     def __init__(self):
         self.errores = []
         self.tabla_simbolos = [{}]  # pila de scopes
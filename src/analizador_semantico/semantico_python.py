@@ -7,7 +7,8 @@ try:
         NodoBloque, NodoSentenciaExpresion, NodoAsignacion, NodoLlamadaFuncion,
         NodoIdentificador, NodoLiteral, NodoExpresionBinaria, NodoSentenciaIf,
         NodoSentenciaReturn, NodoSentenciaWhile, NodoSentenciaFor,
-        NodoExpresionUnaria, NodoSentenciaBreak, NodoSentenciaContinue
+        NodoExpresionUnaria, NodoSentenciaBreak, NodoSentenciaContinue,
+        NodoCadenaFormateada, NodoInterpolacion
     )
     from analizador_lexico.lexer_python import Token 
     from analizador_lexico.lexer_python import PALABRAS_CLAVE_PYTHON
@@ -31,8 +32,12 @@ except ImportError as e_sem_py_import:
     class NodoExpresionUnaria: pass; 
     class NodoSentenciaBreak: pass; 
     class NodoSentenciaContinue: pass
+    class NodoCadenaFormateada: pass
+    class NodoInterpolacion: pass
     class Token: pass
 
+from src.nucleo_compilador.nodos_ast import atributos_nodo
+
 import builtins
 
 BUILTIN_NAMES = set(dir(builtins))
@@ -144,7 +149,7 @@ class AnalizadorSemanticoPython:
             NodoSentenciaReturn, NodoSentenciaWhile, NodoSentenciaFor,
             NodoExpresionUnaria, NodoSentenciaBreak, NodoSentenciaContinue
         )
-        for nombre_attr, valor_attr in vars(nodo).items():
+        for nombre_attr, valor_attr in atributos_nodo(nodo):
             if isinstance(valor_attr, AST_NODE_CLASSES):
                 self.visitar(valor_attr)
             elif isinstance(valor_attr, list):
@@ -234,6 +239,19 @@ class AnalizadorSemanticoPython:
         if nodo_literal.valor is None: return "NoneType"
         return "tipo_desconocido_literal"
 
+    def visitar_NodoCadenaFormateada(self, nodo_cadena):
+        for parte in nodo_cadena.partes:
+            if isinstance(parte, NodoInterpolacion):
+                self.visitar(parte)
+        return "str"
+
+    def visitar_NodoInterpolacion(self, nodo_interpolacion):
+        self.visitar(nodo_interpolacion.expresion_nodo)
+        for parte in nodo_interpolacion.formato:
+            if isinstance(parte, NodoInterpolacion):
+                self.visitar(parte)
+        return "str"
+
     def visitar_NodoLlamadaFuncion(self, nodo_llamada):
         nombre_funcion = None
         if isinstance(nodo_llamada.callee_nodo, NodoIdentificador):
@@ -22,6 +22,9 @@ class ErrorSemanticoTSQL(Exception):
     pass
 
 class AnalizadorSemanticoTSQL:
+    # Diccionarios que pasan información de un lote (GO) al siguiente, ver nucleo_compilador/lotes_paralelos.py
+    TABLAS_ENTRE_LOTES = ("tabla_variables", "tabla_tablas")
+
     def __init__(self):
         self.errores = []
         self.tabla_variables = {}  # Variables @var
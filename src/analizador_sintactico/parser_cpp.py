@@ -30,12 +30,17 @@ except ImportError:
     class Token: pass
     pass
 
+from src.nucleo_compilador.pratt import TablaPratt, analizar_expresion, DERECHA
+from src.nucleo_compilador.nodos_ast import atributos_nodo
+from src.nucleo_compilador.internado import internar
+
 # --- Definiciones de Nodos del AST para C++ ---
 class NodoAST_CPP:
     """Clase base para todos los nodos del AST de C++."""
+    __slots__ = ()
     def __repr__(self, indent=0):
         indent_str = "  " * indent
-        attrs = {k: v for k, v in self.__dict__.items() if not k.startswith('_') and not isinstance(v, list) and not isinstance(v, NodoAST_CPP) and v is not None}
+        attrs = {k: v for k, v in atributos_nodo(self) if not k.startswith('_') and not isinstance(v, list) and not isinstance(v, NodoAST_CPP) and v is not None}
         attr_str_parts = []
         for k,v_item in attrs.items(): 
             if isinstance(v_item, Token): attr_str_parts.append(f"{k}='{v_item.lexema}'")
@@ -44,7 +49,7 @@ class NodoAST_CPP:
         attr_str = ", ".join(attr_str_parts)
         
         children_repr_list = []
-        for k, v_child in self.__dict__.items(): 
+        for k, v_child in atributos_nodo(self): 
             if isinstance(v_child, NodoAST_CPP):
                 children_repr_list.append(f"\n{v_child.__repr__(indent + 1)}")
             elif isinstance(v_child, list) and all(isinstance(item, (NodoAST_CPP, Token)) for item in v_child): 
@@ -62,61 +67,86 @@ class NodoAST_CPP:
         return base_repr
 
 class NodoTraduccionUnidad(NodoAST_CPP):
+    __slots__ = ("declaraciones_globales",)
     def __init__(self, declaraciones_globales): self.declaraciones_globales = declaraciones_globales
-class NodoDeclaracion(NodoAST_CPP): pass
-class NodoSentencia(NodoAST_CPP): pass
-class NodoExpresion(NodoAST_CPP): pass
+class NodoDeclaracion(NodoAST_CPP):
+    __slots__ = ()
+class NodoSentencia(NodoAST_CPP):
+    __slots__ = ()
+class NodoExpresion(NodoAST_CPP):
+    __slots__ = ()
 class NodoDirectivaPreprocesador(NodoDeclaracion):
+    __slots__ = ("token_directiva", "directiva", "argumentos", "archivo_cabecera", "tipo_cabecera")
     def __init__(self, token_directiva):
         self.token_directiva = token_directiva; self.directiva = ''; self.argumentos = ''; self.archivo_cabecera = None; self.tipo_cabecera = None
         if isinstance(token_directiva.valor, dict):
             self.directiva = token_directiva.valor.get('directiva', ''); self.argumentos = token_directiva.valor.get('argumentos', '')
             if 'archivo' in token_directiva.valor: self.archivo_cabecera = token_directiva.valor['archivo']; self.tipo_cabecera = token_directiva.valor.get('tipo_cabecera')
 class NodoUsingNamespace(NodoDeclaracion):
-    def __init__(self, tokens_qname_namespace): self.tokens_qname_namespace = tokens_qname_namespace; self.nombre_namespace_str = "".join([t.lexema for t in tokens_qname_namespace])
+    __slots__ = ("tokens_qname_namespace", "nombre_namespace_str")
+    def __init__(self, tokens_qname_namespace): self.tokens_qname_namespace = tokens_qname_namespace; self.nombre_namespace_str = internar("".join([t.lexema for t in tokens_qname_namespace]))
 class NodoNamespaceDefinicion(NodoDeclaracion):
+    __slots__ = ("nombre_namespace_token", "declaraciones_internas", "nombre")
     def __init__(self, nombre_namespace_token, declaraciones_internas):
-        self.nombre_namespace_token = nombre_namespace_token; self.declaraciones_internas = declaraciones_internas; self.nombre = nombre_namespace_token.lexema if nombre_namespace_token else None 
+        self.nombre_namespace_token = nombre_namespace_token; self.declaraciones_internas = declaraciones_internas; self.nombre = internar(nombre_namespace_token.lexema) if nombre_namespace_token else None 
 class NodoDefinicionClase(NodoDeclaracion):
+    __slots__ = ("token_clase_o_struct", "nombre_clase_token", "miembros_nodos", "nombre")
     def __init__(self, token_clase_o_struct, nombre_clase_token, miembros_nodos):
-        self.token_clase_o_struct = token_clase_o_struct; self.nombre_clase_token = nombre_clase_token; self.miembros_nodos = miembros_nodos; self.nombre = nombre_clase_token.lexema if nombre_clase_token else "ClaseAnónima"
+        self.token_clase_o_struct = token_clase_o_struct; self.nombre_clase_token = nombre_clase_token; self.miembros_nodos = miembros_nodos; self.nombre = internar(nombre_clase_token.lexema) if nombre_clase_token else "ClaseAnónima"
 class NodoDefinicionFuncion(NodoDeclaracion): # También usado para métodos de clase
+    __slots__ = ("tipo_retorno_nodo", "nombre_funcion_qname_tokens", "parametros_nodos", "cuerpo_nodo_bloque",
+                 "nombre", "es_const", "es_extern_c", "es_metodo_clase")
     def __init__(self, tipo_retorno_nodo, nombre_funcion_qname_tokens, parametros_nodos, cuerpo_nodo_bloque, es_const=False, es_extern_c=False, es_metodo_clase=False):
-        self.tipo_retorno_nodo = tipo_retorno_nodo; self.nombre_funcion_qname_tokens = nombre_funcion_qname_tokens; self.parametros_nodos = parametros_nodos; self.cuerpo_nodo_bloque = cuerpo_nodo_bloque; self.nombre = "".join([t.lexema for t in nombre_funcion_qname_tokens]); self.es_const = es_const; self.es_extern_c = es_extern_c; self.es_metodo_clase = es_metodo_clase
+        self.tipo_retorno_nodo = tipo_retorno_nodo; self.nombre_funcion_qname_tokens = nombre_funcion_qname_tokens; self.parametros_nodos = parametros_nodos; self.cuerpo_nodo_bloque = cuerpo_nodo_bloque; self.nombre = internar("".join([t.lexema for t in nombre_funcion_qname_tokens])); self.es_const = es_const; self.es_extern_c = es_extern_c; self.es_metodo_clase = es_metodo_clase
 class NodoParametroFuncion(NodoAST_CPP):
+    __slots__ = ("tipo_param_nodo", "nombre_param_token", "valor_defecto_nodo")
     def __init__(self, tipo_param_nodo, nombre_param_token=None, valor_defecto_nodo=None):
         self.tipo_param_nodo = tipo_param_nodo; self.nombre_param_token = nombre_param_token; self.valor_defecto_nodo = valor_defecto_nodo 
 class NodoTipoCPP(NodoAST_CPP):
+    __slots__ = ("tokens_tipo", "es_puntero", "es_referencia", "es_const_qualifier", "es_volatile_qualifier",
+                 "nombre_tipo_str")
     def __init__(self, tokens_tipo, es_puntero=0, es_referencia=False, es_const_qualifier=False, es_volatile_qualifier=False): 
         self.tokens_tipo = tokens_tipo; self.es_puntero = es_puntero; self.es_referencia = es_referencia; self.es_const_qualifier = es_const_qualifier; self.es_volatile_qualifier = es_volatile_qualifier
         nombre_base = "".join([t.lexema for t in tokens_tipo]); 
-        self.nombre_tipo_str = ("const " if es_const_qualifier and not any(t.lexema=='const' for t in tokens_tipo) else "") + ("volatile " if es_volatile_qualifier and not any(t.lexema=='volatile' for t in tokens_tipo) else "") + nombre_base + "*"*es_puntero + ("&" if es_referencia else "")
+        self.nombre_tipo_str = internar(("const " if es_const_qualifier and not any(t.lexema=='const' for t in tokens_tipo) else "") + ("volatile " if es_volatile_qualifier and not any(t.lexema=='volatile' for t in tokens_tipo) else "") + nombre_base + "*"*es_puntero + ("&" if es_referencia else ""))
 class NodoBloqueSentenciasCPP(NodoSentencia):
+    __slots__ = ("sentencias",)
     def __init__(self, sentencias): self.sentencias = sentencias 
 class NodoDeclaracionVariableCPP(NodoSentencia): 
+    __slots__ = ("tipo_nodo", "declaradores")
     def __init__(self, tipo_nodo, declaradores): self.tipo_nodo = tipo_nodo; self.declaradores = declaradores 
 class NodoDeclaradorVariableCPP(NodoAST_CPP):
+    __slots__ = ("nombre_variable_qname_tokens", "inicializador_nodo", "nombre", "es_puntero", "es_referencia",
+                 "es_array_dims")
     def __init__(self, nombre_variable_qname_tokens, inicializador_nodo=None, es_puntero=0, es_referencia=False, es_array_dims=None):
-        self.nombre_variable_qname_tokens = nombre_variable_qname_tokens; self.inicializador_nodo = inicializador_nodo; self.nombre = "".join([t.lexema for t in nombre_variable_qname_tokens]); self.es_puntero = es_puntero; self.es_referencia = es_referencia; self.es_array_dims = es_array_dims if es_array_dims is not None else [] 
+        self.nombre_variable_qname_tokens = nombre_variable_qname_tokens; self.inicializador_nodo = inicializador_nodo; self.nombre = internar("".join([t.lexema for t in nombre_variable_qname_tokens])); self.es_puntero = es_puntero; self.es_referencia = es_referencia; self.es_array_dims = es_array_dims if es_array_dims is not None else [] 
 class NodoSentenciaExpresionCPP(NodoSentencia):
+    __slots__ = ("expresion_nodo",)
     def __init__(self, expresion_nodo): self.expresion_nodo = expresion_nodo
 class NodoSentenciaReturnCPP(NodoSentencia):
+    __slots__ = ("expresion_nodo",)
     def __init__(self, expresion_nodo=None): self.expresion_nodo = expresion_nodo
 class NodoSentenciaIfCPP(NodoSentencia):
+    __slots__ = ("condicion_nodo", "cuerpo_then_nodo", "cuerpo_else_nodo")
     def __init__(self, condicion_nodo, cuerpo_then_nodo, cuerpo_else_nodo=None):
         self.condicion_nodo = condicion_nodo; self.cuerpo_then_nodo = cuerpo_then_nodo; self.cuerpo_else_nodo = cuerpo_else_nodo
 class NodoIdentificadorCPP(NodoExpresion):
+    __slots__ = ("qname_tokens", "nombre_completo", "nombre_simple", "es_calificado")
     def __init__(self, qname_tokens): 
-        self.qname_tokens = qname_tokens; self.nombre_completo = "".join([t.lexema for t in qname_tokens]); self.nombre_simple = qname_tokens[-1].lexema; self.es_calificado = len(qname_tokens) > 1 and any(t.lexema == "::" for t in qname_tokens)
+        self.qname_tokens = qname_tokens; self.nombre_completo = internar("".join([t.lexema for t in qname_tokens])); self.nombre_simple = internar(qname_tokens[-1].lexema); self.es_calificado = len(qname_tokens) > 1 and any(t.lexema == "::" for t in qname_tokens)
 class NodoLiteralCPP(NodoExpresion):
+    __slots__ = ("token_literal", "valor", "tipo_literal_original")
     def __init__(self, token_literal):
         self.token_literal = token_literal; self.valor = token_literal.valor; self.tipo_literal_original = token_literal.tipo 
 class NodoExpresionBinariaCPP(NodoExpresion):
+    __slots__ = ("operador_token", "izquierda_nodo", "derecha_nodo", "operador")
     def __init__(self, operador_token, izquierda_nodo, derecha_nodo):
-        self.operador_token = operador_token; self.izquierda_nodo = izquierda_nodo; self.derecha_nodo = derecha_nodo; self.operador = operador_token.lexema
+        self.operador_token = operador_token; self.izquierda_nodo = izquierda_nodo; self.derecha_nodo = derecha_nodo; self.operador = internar(operador_token.lexema)
 class NodoLlamadaFuncionCPP(NodoExpresion): 
+    __slots__ = ("callee_nodo", "argumentos_nodos")
     def __init__(self, callee_nodo, argumentos_nodos): self.callee_nodo = callee_nodo; self.argumentos_nodos = argumentos_nodos 
 class NodoMiembroExpresion(NodoExpresion): 
+    __slots__ = ("objeto_nodo", "propiedad_token_o_nodo", "es_arrow", "es_calculado", "nombre_propiedad")
     def __init__(self, objeto_nodo, propiedad_token_o_nodo, es_arrow=False, es_calculado=False):
         self.objeto_nodo = objeto_nodo
         self.propiedad_token_o_nodo = propiedad_token_o_nodo 
@@ -131,12 +161,14 @@ class NodoMiembroExpresion(NodoExpresion):
 
 class NodoSentenciaWhileCPP(NodoSentencia):
     """Representa una sentencia while en C++: while (condicion) cuerpo;"""
+    __slots__ = ("condicion_nodo", "cuerpo_nodo")
     def __init__(self, condicion_nodo, cuerpo_nodo):
         self.condicion_nodo = condicion_nodo # NodoExpresion
         self.cuerpo_nodo = cuerpo_nodo       # NodoSentencia (puede ser NodoBloqueSentenciasCPP) 
 
 class NodoSentenciaForCPP(NodoSentencia):
     """Representa una sentencia for en C++: for (init; cond; update) cuerpo;"""
+    __slots__ = ("inicializacion_nodo", "condicion_nodo", "actualizacion_nodo", "cuerpo_nodo")
     def __init__(self, inicializacion_nodo, condicion_nodo, actualizacion_nodo, cuerpo_nodo):
         self.inicializacion_nodo = inicializacion_nodo # Puede ser NodoDeclaracionVariableCPP o NodoExpresionSQL
         self.condicion_nodo = condicion_nodo         # NodoExpresionSQL o None
@@ -146,17 +178,80 @@ class NodoSentenciaForCPP(NodoSentencia):
 
 class ParserCPP:
     def __init__(self, tokens):
+        # Lista filtrada y no un FlujoTokens: el parser retrocede a posiciones arbitrarias
+        # (ver _retroceder), así que necesita todos los tokens, y leer una lista es más rápido.
         self.tokens = [token for token in tokens if token.tipo != 'WHITESPACE_CPP']
+        # Token en el que se queda el cursor al pasar del final (el EOF, si el lexer lo emitió)
+        # y último token con contenido, para situar los errores de fin de entrada.
+        ultimo = self.tokens[-1] if self.tokens else None
+        self.token_final = ultimo if ultimo and ultimo.tipo == TT_EOF_CPP else None
+        self.ultimo_token_con_contenido = self.tokens[-2] if self.token_final and len(self.tokens) > 1 else ultimo
         self.posicion_actual = 0
         self.token_actual = self.tokens[self.posicion_actual] if self.tokens else None
         self.errores_sintacticos = []
+        # Memo de las comprobaciones especulativas: (regla, posición) -> resultado. Los tokens
+        # no cambian durante el análisis, así que un resultado vale para toda la pasada.
+        self._memo_especulacion = {}
+        self.memo_aciertos = 0
+        self.memo_fallos = 0
+        self.retrocesos = 0
+        self.tokens_retrocedidos = 0
 
     def _avanzar(self):
         self.posicion_actual += 1
         if self.posicion_actual < len(self.tokens):
             self.token_actual = self.tokens[self.posicion_actual]
         else:
-            self.token_actual = self.tokens[-1] if self.tokens and self.tokens[-1].tipo == TT_EOF_CPP else None
+            self.token_actual = self.token_final
+
+    # --- Cursor: marcas y retroceso ---
+    def _ir_a(self, posicion):
+        """Coloca el cursor en `posicion` (con el mismo tratamiento del final que `_avanzar`)."""
+        self.posicion_actual = posicion
+        if posicion < len(self.tokens):
+            self.token_actual = self.tokens[posicion]
+        else:
+            self.token_actual = self.token_final
+
+    def _marcar(self):
+        """Marca la posición actual para volver a ella con `_retroceder`."""
+        return self.posicion_actual
+
+    def _retroceder(self, marca):
+        """Vuelve a `marca` y cuenta el retroceso y los tokens que se vuelven a leer."""
+        self.retrocesos += 1
+        self.tokens_retrocedidos += self.posicion_actual - marca
+        self._ir_a(marca)
+
+    def _especular(self, regla, prueba):
+        """
+        Resultado de `prueba()` (que puede avanzar tokens) desde la posición actual, sin
+        moverla. Se guarda por (regla, posición): la misma comprobación en el mismo sitio
+        no vuelve a recorrer los tokens. Un SyntaxError durante la prueba cuenta como False.
+        """
+        clave = (regla, self.posicion_actual)
+        resultado = self._memo_especulacion.get(clave)
+        if resultado is not None:
+            self.memo_aciertos += 1
+            return resultado
+        self.memo_fallos += 1
+        marca = self._marcar()
+        try:
+            resultado = prueba()
+        except SyntaxError:
+            resultado = False
+        finally:
+            self._retroceder(marca)
+        self._memo_especulacion[clave] = resultado
+        return resultado
+
+    def resumen_especulacion(self):
+        """Línea con el uso del memo de comprobaciones especulativas y los retrocesos."""
+        consultas = self.memo_aciertos + self.memo_fallos
+        tasa = self.memo_aciertos / consultas * 100 if consultas else 0.0
+        return (f"Parser C++: {consultas} comprobación(es) especulativa(s), memo {self.memo_aciertos} "
+                f"acierto(s) ({tasa:.1f}%), {self.retrocesos} retroceso(s) con "
+                f"{self.tokens_retrocedidos} token(s) releídos.")
 
     def _error_sintactico(self, mensaje_esperado):
         mensaje = "Error Sintáctico Desconocido en C++"
@@ -167,8 +262,7 @@ class ParserCPP:
             mensaje = (f"Error Sintáctico C++: Final inesperado del archivo (L{self.token_actual.linea}:C{self.token_actual.columna}). "
                        f"Se esperaba {mensaje_esperado}.")
         else: 
-            last_token_info = self.tokens[-2] if len(self.tokens) > 1 and self.tokens[-1].tipo == TT_EOF_CPP else \
-                              (self.tokens[-1] if self.tokens else None)
+            last_token_info = self.ultimo_token_con_contenido
             linea_aprox = last_token_info.linea if last_token_info else 'desconocida'
             col_aprox = last_token_info.columna if last_token_info else 'desconocida'
             mensaje = (f"Error Sintáctico C++: Final inesperado de la entrada (cerca de L{linea_aprox}:C{col_aprox}). "
@@ -402,55 +496,32 @@ class ParserCPP:
         if profundidad != 0: self._error_sintactico("llave de cierre '}' para el bloque")
 
     def _es_definicion_funcion_probable(self):
-        # print(f"[DEBUG _es_func_probable] Inicio. Token actual: {self.token_actual}") 
-        pos_original = self.posicion_actual; token_original = self.token_actual
-        es_probable = False
-        try:
-            # print(f"[DEBUG _es_func_probable] Antes de _parse_tipo_simple_cpp. Token: {self.token_actual}") 
-            if not self._parse_tipo_simple_cpp(avanzar_tokens=False): 
-                # print(f"[DEBUG _es_func_probable] _parse_tipo_simple_cpp (peek) devolvió False.") 
-                return False 
-            
-            self._parse_tipo_simple_cpp(avanzar_tokens=True) 
-            # print(f"[DEBUG _es_func_probable] Después de _parse_tipo_simple_cpp(avanzar=True). Token actual: {self.token_actual}") 
+        return self._especular('definicion_funcion', self._probar_definicion_funcion)
+
+    def _probar_definicion_funcion(self):
+        # tipo, nombre (o 'operator' y su símbolo), partes '::' del nombre y '('.
+        token_original = self.token_actual
+        if not self._parse_tipo_simple_cpp(avanzar_tokens=True):
+            return False
+
+        if self.token_actual and (self.token_actual.tipo == TT_IDENTIFICADOR or \
+           (self.token_actual.tipo == TT_PALABRA_CLAVE and self.token_actual.lexema == 'operator')):
+            self._avanzar() 
             
-            if self.token_actual and (self.token_actual.tipo == TT_IDENTIFICADOR or \
-               (self.token_actual.tipo == TT_PALABRA_CLAVE and self.token_actual.lexema == 'operator')):
-                # print(f"[DEBUG _es_func_probable] Potencial nombre/operator: {self.token_actual.lexema}") 
-                self._avanzar() 
-                
-                if token_original.lexema == 'operator' and self.token_actual and \
-                   self.token_actual.tipo in [TT_OPERADOR_ARITMETICO, TT_OPERADOR_COMPARACION, TT_PARENTESIS_IZQ, TT_CORCHETE_IZQ]:
-                    # print(f"[DEBUG _es_func_probable] Consumiendo símbolo de operador: {self.token_actual.lexema}") 
-                    self._avanzar()
+            if token_original.lexema == 'operator' and self.token_actual and \
+               self.token_actual.tipo in [TT_OPERADOR_ARITMETICO, TT_OPERADOR_COMPARACION, TT_PARENTESIS_IZQ, TT_CORCHETE_IZQ]:
+                self._avanzar()
 
-                while self.token_actual and self.token_actual.tipo == TT_OPERADOR_MIEMBRO and self.token_actual.lexema == '::':
-                    # print(f"[DEBUG _es_func_probable] Consumiendo ::") 
+            while self.token_actual and self.token_actual.tipo == TT_OPERADOR_MIEMBRO and self.token_actual.lexema == '::':
+                self._avanzar() 
+                if self.token_actual and self.token_actual.tipo == TT_IDENTIFICADOR:
                     self._avanzar() 
-                    if self.token_actual and self.token_actual.tipo == TT_IDENTIFICADOR:
-                        # print(f"[DEBUG _es_func_probable] Consumiendo parte del nombre calificado: {self.token_actual.lexema}") 
-                        self._avanzar() 
-                    else: 
-                        # print(f"[DEBUG _es_func_probable] Se esperaba ID después de :: pero se encontró {self.token_actual}") 
-                        break 
-            else: 
-                # print(f"[DEBUG _es_func_probable] No es ID u operator después del tipo. Token: {self.token_actual}") 
-                return False 
-
-            if self.token_actual and self.token_actual.tipo == TT_PARENTESIS_IZQ:
-                # print(f"[DEBUG _es_func_probable] Encontrado '('. Es probable función.") 
-                es_probable = True 
-            # else:
-                # print(f"[DEBUG _es_func_probable] No se encontró '('. Token: {self.token_actual}") 
+                else: 
+                    break 
+        else: 
+            return False 
 
-        except SyntaxError: 
-            # print(f"[DEBUG _es_func_probable] SyntaxError durante el lookahead.") 
-            pass 
-        finally:
-            self.posicion_actual = pos_original 
-            self.token_actual = token_original
-            # print(f"[DEBUG _es_func_probable] Restaurado. Token actual: {self.token_actual}. Retornando: {es_probable}") 
-        return es_probable
+        return bool(self.token_actual and self.token_actual.tipo == TT_PARENTESIS_IZQ)
 
     def _parse_definicion_funcion(self):
         # print(f"[DEBUG CPP Parser] _parse_definicion_funcion. Token: {self.token_actual}") # DEBUG
@@ -536,62 +607,52 @@ class ParserCPP:
         return NodoTipoCPP(tokens_del_tipo, es_puntero=nivel_puntero, es_referencia=es_referencia, es_const_qualifier=es_const, es_volatile_qualifier=es_volatile)
 
     def _parse_tipo_simple_cpp(self, avanzar_tokens=False):
-        # print(f"[DEBUG _parse_tipo_simple_cpp] (avanzar={avanzar_tokens}) Inicio. Token: {self.token_actual if avanzar_tokens else self.tokens[self.posicion_actual] if self.posicion_actual < len(self.tokens) else None}") 
-        pos_guardada = self.posicion_actual; token_guardado = self.token_actual
-        tipo_consumido_lexemas = [] 
+        """
+        Reconoce un tipo simple (calificadores, nombre con '::' y '*'/'&') desde el token
+        actual. Con `avanzar_tokens` deja el cursor detrás de lo reconocido (también si el
+        tipo queda incompleto); si no, el cursor no se mueve.
+        """
+        clave = ('tipo_simple', self.posicion_actual)
+        resultado = self._memo_especulacion.get(clave)
+        if resultado is None:
+            self.memo_fallos += 1
+            resultado = self._memo_especulacion[clave] = self._recorrer_tipo_simple_cpp(self.posicion_actual)
+        else:
+            self.memo_aciertos += 1
+        es_tipo, posicion_final = resultado
+        if avanzar_tokens:
+            self._ir_a(posicion_final)
+        return es_tipo
+
+    def _recorrer_tipo_simple_cpp(self, posicion):
+        """(es un tipo, posición tras los tokens recorridos) sin mover el cursor."""
+        tokens = self.tokens
+        n = len(tokens)
+        def token_en(i):
+            return tokens[i] if i < n else None
+
+        consumido = False
+        while token_en(posicion) and token_en(posicion).tipo == TT_PALABRA_CLAVE and \
+              token_en(posicion).lexema in ['const', 'unsigned', 'signed', 'long', 'short', 'static', 'extern', 'volatile']:
+            posicion += 1; consumido = True
         
-        current_pos_temp = pos_guardada 
-        current_token_temp = token_guardado
-
-        def _avanzar_effective():
-            nonlocal current_pos_temp, current_token_temp
-            if avanzar_tokens:
-                self._avanzar()
-            else:
-                current_pos_temp += 1
-                if current_pos_temp < len(self.tokens): current_token_temp = self.tokens[current_pos_temp]
-                else: current_token_temp = None
+        if token_en(posicion) and (token_en(posicion).tipo == TT_PALABRA_CLAVE or token_en(posicion).tipo == TT_IDENTIFICADOR):
+            posicion += 1
+        elif not consumido: 
+            return False, posicion
+
+        while token_en(posicion) and token_en(posicion).tipo == TT_OPERADOR_MIEMBRO and token_en(posicion).lexema == '::':
+            posicion += 1
+            if token_en(posicion) and token_en(posicion).tipo == TT_IDENTIFICADOR:
+                posicion += 1
+            else: 
+                return False, posicion
         
-        def _get_token_effective():
-            return self.token_actual if avanzar_tokens else current_token_temp
-
-        try:
-            while _get_token_effective() and _get_token_effective().tipo == TT_PALABRA_CLAVE and \
-                  _get_token_effective().lexema in ['const', 'unsigned', 'signed', 'long', 'short', 'static', 'extern', 'volatile']:
-                tipo_consumido_lexemas.append(_get_token_effective().lexema); _avanzar_effective()
-            
-            if _get_token_effective() and (_get_token_effective().tipo == TT_PALABRA_CLAVE or _get_token_effective().tipo == TT_IDENTIFICADOR):
-                tipo_consumido_lexemas.append(_get_token_effective().lexema); _avanzar_effective()
-            elif not tipo_consumido_lexemas: 
-                # print(f"[DEBUG _parse_tipo_simple_cpp] (avanzar={avanzar_tokens}) No se consumió nada, retornando False.") 
-                if not avanzar_tokens: self.posicion_actual = pos_guardada; self.token_actual = token_guardado
-                return False 
-
-            while _get_token_effective() and _get_token_effective().tipo == TT_OPERADOR_MIEMBRO and _get_token_effective().lexema == '::':
-                tipo_consumido_lexemas.append("::"); _avanzar_effective() 
-                if _get_token_effective() and _get_token_effective().tipo == TT_IDENTIFICADOR:
-                    tipo_consumido_lexemas.append(_get_token_effective().lexema); _avanzar_effective() 
-                else: 
-                    # print(f"[DEBUG _parse_tipo_simple_cpp] (avanzar={avanzar_tokens}) Se esperaba ID después de ::. Retornando False.") 
-                    if not avanzar_tokens: self.posicion_actual = pos_guardada; self.token_actual = token_guardado
-                    return False 
-            
-            while _get_token_effective() and _get_token_effective().lexema in ['*', '&'] and \
-                  ( (_get_token_effective().lexema == '*' and _get_token_effective().tipo in [TT_OPERADOR_ARITMETICO, TT_ASTERISCO]) or \
-                    (_get_token_effective().lexema == '&' and _get_token_effective().tipo == TT_OPERADOR_BITWISE) ):
-                 tipo_consumido_lexemas.append(_get_token_effective().lexema); _avanzar_effective()
-            
-            # print(f"[DEBUG _parse_tipo_simple_cpp] (avanzar={avanzar_tokens}) Consumido: {tipo_consumido_lexemas}, Próximo token para _es_func_probable: {_get_token_effective()}") 
-            return True
-            
-        except Exception: 
-            # print(f"[DEBUG _parse_tipo_simple_cpp] (avanzar={avanzar_tokens}) Excepción. Retornando False.") 
-            if not avanzar_tokens: self.posicion_actual = pos_guardada; self.token_actual = token_guardado
-            return False
-        finally:
-            if not avanzar_tokens: 
-                self.posicion_actual = pos_guardada
-                self.token_actual = token_guardado
+        while token_en(posicion) and token_en(posicion).lexema in ['*', '&'] and \
+              ( (token_en(posicion).lexema == '*' and token_en(posicion).tipo in [TT_OPERADOR_ARITMETICO, TT_ASTERISCO]) or \
+                (token_en(posicion).lexema == '&' and token_en(posicion).tipo == TT_OPERADOR_BITWISE) ):
+            posicion += 1
+        return True, posicion
 
     def _parse_lista_parametros_funcion_cpp(self):
         
@@ -633,21 +694,9 @@ class ParserCPP:
         if self.token_actual.tipo == TT_DIRECTIVA_PREPROCESADOR:
             token_directiva = self._consumir(TT_DIRECTIVA_PREPROCESADOR)
             return NodoDirectivaPreprocesador(token_directiva)
-        if self._es_potencial_inicio_de_declaracion_o_definicion_tipo():
-            pos_guardada = self.posicion_actual; token_guardado = self.token_actual
-            es_decl_var_probable = False
-            try:
-                self._parse_tipo_simple_cpp(avanzar_tokens=True) 
-                if self.token_actual and self.token_actual.tipo == TT_IDENTIFICADOR:
-                    self._avanzar() 
-                    if self.token_actual and self.token_actual.tipo in [TT_PUNTO_Y_COMA, TT_OPERADOR_ASIGNACION, TT_PARENTESIS_IZQ, TT_CORCHETE_IZQ, TT_COMA]:
-                        es_decl_var_probable = True
-                elif self.token_actual and self.token_actual.tipo == TT_PUNTO_Y_COMA: 
-                    es_decl_var_probable = True 
-            except SyntaxError: pass 
-            finally: self.posicion_actual = pos_guardada; self.token_actual = token_guardado
-            if es_decl_var_probable:
-                return self._parse_declaracion_variable_cpp_local()
+        if self._es_potencial_inicio_de_declaracion_o_definicion_tipo() and \
+           self._especular('declaracion_variable', self._probar_declaracion_variable):
+            return self._parse_declaracion_variable_cpp_local()
         if self.token_actual.tipo == TT_PALABRA_CLAVE:
             lexema = self.token_actual.lexema
             if lexema == 'return':
@@ -662,6 +711,14 @@ class ParserCPP:
         self._consumir(TT_PUNTO_Y_COMA) 
         return NodoSentenciaExpresionCPP(nodo_expr)
 
+    def _probar_declaracion_variable(self):
+        # tipo, nombre y uno de ';' '=' '(' '[' ',' (o el tipo solo y ';').
+        self._parse_tipo_simple_cpp(avanzar_tokens=True) 
+        if self.token_actual and self.token_actual.tipo == TT_IDENTIFICADOR:
+            self._avanzar() 
+            return bool(self.token_actual and self.token_actual.tipo in [TT_PUNTO_Y_COMA, TT_OPERADOR_ASIGNACION, TT_PARENTESIS_IZQ, TT_CORCHETE_IZQ, TT_COMA])
+        return bool(self.token_actual and self.token_actual.tipo == TT_PUNTO_Y_COMA)
+
     def _parse_declaracion_variable_cpp_local(self):
         # print(f"[DEBUG CPP Parser] _parse_declaracion_variable_cpp_local. Token: {self.token_actual}") # DEBUG
         tipo_nodo = self._parse_tipo_cpp()
@@ -671,14 +728,14 @@ class ParserCPP:
 
     def _parse_declaracion_variable_cpp_global_o_sentencia(self):
         # print(f"[DEBUG CPP Parser] _parse_declaracion_variable_cpp_global_o_sentencia. Token: {self.token_actual}") # DEBUG
-        pos_guardada = self.posicion_actual; token_guardado = self.token_actual
+        marca = self._marcar()
         try:
             tipo_nodo = self._parse_tipo_cpp()
             declaradores = self._parse_declarador_variable_cpp_lista()
             self._consumir(TT_PUNTO_Y_COMA)
             return NodoDeclaracionVariableCPP(tipo_nodo, declaradores)
         except SyntaxError:
-            self.posicion_actual = pos_guardada; self.token_actual = token_guardado
+            self._retroceder(marca)
             if self._es_potencial_inicio_de_declaracion_o_definicion_tipo() or \
                (self.token_actual and (self.token_actual.tipo == TT_IDENTIFICADOR or \
                 self.token_actual.tipo == TT_LITERAL_ENTERO) ): 
@@ -796,8 +853,7 @@ class ParserCPP:
                 # _parse_declaracion_simple_sin_semicolon()
                 
                 # Guardar estado para retroceder si no es una declaración válida aquí
-                pos_guardada_init = self.posicion_actual
-                token_guardado_init = self.token_actual
+                marca_init = self._marcar()
                 try:
                     # Intentar parsear como una declaración de variable, pero sin consumir el ; final
                     # Esto es complicado porque _parse_declaracion_variable_cpp_local espera un ;
@@ -811,8 +867,7 @@ class ParserCPP:
                     # No consumir el ';' aquí, lo hace el for.
                 except SyntaxError:
                     # Si falla como declaración, restaurar e intentar como expresión
-                    self.posicion_actual = pos_guardada_init
-                    self.token_actual = token_guardado_init
+                    self._retroceder(marca_init)
                     if self.token_actual.tipo != TT_PUNTO_Y_COMA: # Solo si no es una inicialización vacía
                         inicializacion_nodo = self._parse_expresion_cpp() 
             elif self.token_actual.tipo != TT_PUNTO_Y_COMA: # No es tipo, pero no es ; -> es expresión
@@ -850,127 +905,8 @@ class ParserCPP:
         return self._parse_expresion_asignacion_cpp()
 
     def _parse_expresion_asignacion_cpp(self):
-        # print(f"[DEBUG CPP Parser] _parse_expresion_asignacion_cpp. Token: {self.token_actual}") # DEBUG
-        nodo_izq = self._parse_expresion_logica_or_cpp() 
-        if self.token_actual and self.token_actual.tipo == TT_OPERADOR_ASIGNACION:
-            op_token = self._consumir(TT_OPERADOR_ASIGNACION)
-            nodo_der = self._parse_expresion_asignacion_cpp() 
-            return NodoExpresionBinariaCPP(op_token, nodo_izq, nodo_der) 
-        return nodo_izq
-
-    def _parse_expresion_logica_or_cpp(self):
-        # print(f"[DEBUG CPP Parser] _parse_expresion_logica_or_cpp. Token: {self.token_actual}") # DEBUG
-        nodo = self._parse_expresion_logica_and_cpp()
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR_LOGICO and self.token_actual.lexema == '||':
-            op_token = self._consumir(TT_OPERADOR_LOGICO)
-            nodo_der = self._parse_expresion_logica_and_cpp()
-            nodo = NodoExpresionBinariaCPP(op_token, nodo, nodo_der)
-        return nodo
-
-    def _parse_expresion_logica_and_cpp(self):
-        # print(f"[DEBUG CPP Parser] _parse_expresion_logica_and_cpp. Token: {self.token_actual}") # DEBUG
-        nodo = self._parse_expresion_bitwise_or_cpp()
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR_LOGICO and self.token_actual.lexema == '&&':
-            op_token = self._consumir(TT_OPERADOR_LOGICO)
-            nodo_der = self._parse_expresion_bitwise_or_cpp()
-            nodo = NodoExpresionBinariaCPP(op_token, nodo, nodo_der)
-        return nodo
-
-    def _parse_expresion_bitwise_or_cpp(self):
-        # print(f"[DEBUG CPP Parser] _parse_expresion_bitwise_or_cpp. Token: {self.token_actual}") # DEBUG
-        nodo = self._parse_expresion_bitwise_xor_cpp()
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR_BITWISE and self.token_actual.lexema == '|':
-            op_token = self._consumir(TT_OPERADOR_BITWISE)
-            nodo_der = self._parse_expresion_bitwise_xor_cpp()
-            nodo = NodoExpresionBinariaCPP(op_token, nodo, nodo_der)
-        return nodo
-
-    def _parse_expresion_bitwise_xor_cpp(self):
-        # print(f"[DEBUG CPP Parser] _parse_expresion_bitwise_xor_cpp. Token: {self.token_actual}") # DEBUG
-        nodo = self._parse_expresion_bitwise_and_cpp()
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR_BITWISE and self.token_actual.lexema == '^':
-            op_token = self._consumir(TT_OPERADOR_BITWISE)
-            nodo_der = self._parse_expresion_bitwise_and_cpp()
-            nodo = NodoExpresionBinariaCPP(op_token, nodo, nodo_der)
-        return nodo
-
-    def _parse_expresion_bitwise_and_cpp(self):
-        # print(f"[DEBUG CPP Parser] _parse_expresion_bitwise_and_cpp. Token: {self.token_actual}") # DEBUG
-        nodo = self._parse_expresion_igualdad_cpp()
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR_BITWISE and self.token_actual.lexema == '&':
-            op_token = self._consumir(TT_OPERADOR_BITWISE)
-            nodo_der = self._parse_expresion_igualdad_cpp()
-            nodo = NodoExpresionBinariaCPP(op_token, nodo, nodo_der)
-        return nodo
-
-    def _parse_expresion_igualdad_cpp(self):
-        # print(f"[DEBUG CPP Parser] _parse_expresion_igualdad_cpp. Token: {self.token_actual}") # DEBUG
-        nodo = self._parse_expresion_relacional_cpp()
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR_COMPARACION and \
-              self.token_actual.lexema in ['==', '!=']:
-            op_token = self._consumir(TT_OPERADOR_COMPARACION)
-            nodo_der = self._parse_expresion_relacional_cpp()
-            nodo = NodoExpresionBinariaCPP(op_token, nodo, nodo_der)
-        return nodo
-
-    def _parse_expresion_relacional_cpp(self):
-        # print(f"[DEBUG CPP Parser] _parse_expresion_relacional_cpp. Token: {self.token_actual}") # DEBUG
-        nodo = self._parse_expresion_shift_cpp()
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR_COMPARACION and \
-              self.token_actual.lexema in ['<', '<=', '>', '>=']:
-            op_token = self._consumir(TT_OPERADOR_COMPARACION)
-            nodo_der = self._parse_expresion_shift_cpp()
-            nodo = NodoExpresionBinariaCPP(op_token, nodo, nodo_der)
-        return nodo
-
-    def _parse_expresion_shift_cpp(self): 
-        # print(f"[DEBUG CPP Parser] _parse_expresion_shift_cpp. Token: {self.token_actual}") # DEBUG
-        nodo = self._parse_expresion_aditiva_cpp()
-        while self.token_actual and \
-              self.token_actual.tipo == TT_OPERADOR_BITWISE and \
-              self.token_actual.lexema in ['<<', '>>']:
-            operador_token = self._consumir(TT_OPERADOR_BITWISE)
-            nodo_derecho = self._parse_expresion_aditiva_cpp()
-            nodo = NodoExpresionBinariaCPP(operador_token, nodo, nodo_derecho)
-        return nodo
-        
-    def _parse_expresion_aditiva_cpp(self): 
-        # print(f"[DEBUG CPP Parser] _parse_expresion_aditiva_cpp. Token: {self.token_actual}") # DEBUG
-        nodo = self._parse_expresion_multiplicativa_cpp()
-        while self.token_actual and \
-              self.token_actual.tipo == TT_OPERADOR_ARITMETICO and \
-              self.token_actual.lexema in ['+', '-']:
-            operador_token = self._consumir(TT_OPERADOR_ARITMETICO)
-            nodo_derecho = self._parse_expresion_multiplicativa_cpp()
-            nodo = NodoExpresionBinariaCPP(operador_token, nodo, nodo_derecho)
-        return nodo
-
-    def _parse_expresion_multiplicativa_cpp(self): 
-        # print(f"[DEBUG CPP Parser] _parse_expresion_multiplicativa_cpp. Token: {self.token_actual}") # DEBUG
-        nodo = self._parse_expresion_prefijo_unario_cpp() 
-        while self.token_actual and \
-              self.token_actual.tipo == TT_OPERADOR_ARITMETICO and \
-              self.token_actual.lexema in ['*', '/', '%']: 
-            operador_token = self._consumir(TT_OPERADOR_ARITMETICO) 
-            nodo_derecho = self._parse_expresion_prefijo_unario_cpp()
-            nodo = NodoExpresionBinariaCPP(operador_token, nodo, nodo_derecho)
-        return nodo
-
-    def _parse_expresion_prefijo_unario_cpp(self):
-        # print(f"[DEBUG CPP Parser] _parse_expresion_prefijo_unario_cpp. Token: {self.token_actual}") # DEBUG
-        if self.token_actual and (
-            (self.token_actual.tipo == TT_OPERADOR_ARITMETICO and self.token_actual.lexema in ['++', '--', '+', '-']) or \
-            (self.token_actual.tipo == TT_OPERADOR_LOGICO and self.token_actual.lexema == '!') or \
-            (self.token_actual.tipo == TT_OPERADOR_BITWISE and self.token_actual.lexema == '~') or \
-            (self.token_actual.tipo == TT_ASTERISCO and self.token_actual.lexema == '*') or 
-            (self.token_actual.tipo == TT_OPERADOR_BITWISE and self.token_actual.lexema == '&') or 
-            (self.token_actual.tipo == TT_PALABRA_CLAVE and self.token_actual.lexema in ['sizeof', 'new', 'delete'])
-            ):
-            op_token = self._consumir(self.token_actual.tipo) 
-            operando_nodo = self._parse_expresion_prefijo_unario_cpp() 
-            # print(f"INFO (ParserCPP): Operador unario PREFIJO '{op_token.lexema}' parseado.")
-            return operando_nodo 
-        return self._parse_expresion_postfija_cpp()
+        # Asignación, operadores binarios y prefijos (ver TABLA_EXPRESIONES_CPP)
+        return analizar_expresion(self, TABLA_EXPRESIONES_CPP, self._parse_expresion_postfija_cpp)
 
     def _parse_expresion_postfija_cpp(self): 
         # print(f"[DEBUG CPP Parser] _parse_expresion_postfija_cpp. Token: {self.token_actual}") # DEBUG
@@ -1061,3 +997,27 @@ class ParserCPP:
         if self.token_actual and self.token_actual.tipo == TT_PUNTO_Y_COMA:
             self._avanzar()
 # Fin de la clase ParserCPP
+
+
+def _prefijo_sin_nodo_cpp(operador_token, operando_nodo):
+    # Los operadores unarios prefijos aún no tienen nodo propio: se conserva el operando
+    return operando_nodo
+
+# Operadores de las expresiones C++ por nivel de precedencia (mayor = se agrupa antes)
+TABLA_EXPRESIONES_CPP = TablaPratt()
+TABLA_EXPRESIONES_CPP.infijo(1, TT_OPERADOR_ASIGNACION, None, NodoExpresionBinariaCPP, asociatividad=DERECHA)
+TABLA_EXPRESIONES_CPP.infijo(2, TT_OPERADOR_LOGICO, ['||'], NodoExpresionBinariaCPP)
+TABLA_EXPRESIONES_CPP.infijo(3, TT_OPERADOR_LOGICO, ['&&'], NodoExpresionBinariaCPP)
+TABLA_EXPRESIONES_CPP.infijo(4, TT_OPERADOR_BITWISE, ['|'], NodoExpresionBinariaCPP)
+TABLA_EXPRESIONES_CPP.infijo(5, TT_OPERADOR_BITWISE, ['^'], NodoExpresionBinariaCPP)
+TABLA_EXPRESIONES_CPP.infijo(6, TT_OPERADOR_BITWISE, ['&'], NodoExpresionBinariaCPP)
+TABLA_EXPRESIONES_CPP.infijo(7, TT_OPERADOR_COMPARACION, ['==', '!='], NodoExpresionBinariaCPP)
+TABLA_EXPRESIONES_CPP.infijo(8, TT_OPERADOR_COMPARACION, ['<', '<=', '>', '>='], NodoExpresionBinariaCPP)
+TABLA_EXPRESIONES_CPP.infijo(9, TT_OPERADOR_BITWISE, ['<<', '>>'], NodoExpresionBinariaCPP)
+TABLA_EXPRESIONES_CPP.infijo(10, TT_OPERADOR_ARITMETICO, ['+', '-'], NodoExpresionBinariaCPP)
+TABLA_EXPRESIONES_CPP.infijo(11, TT_OPERADOR_ARITMETICO, ['*', '/', '%'], NodoExpresionBinariaCPP)
+TABLA_EXPRESIONES_CPP.prefijo(12, TT_OPERADOR_ARITMETICO, ['++', '--', '+', '-'], _prefijo_sin_nodo_cpp)
+TABLA_EXPRESIONES_CPP.prefijo(12, TT_OPERADOR_LOGICO, ['!'], _prefijo_sin_nodo_cpp)
+TABLA_EXPRESIONES_CPP.prefijo(12, TT_OPERADOR_BITWISE, ['~', '&'], _prefijo_sin_nodo_cpp)
+TABLA_EXPRESIONES_CPP.prefijo(12, TT_ASTERISCO, ['*'], _prefijo_sin_nodo_cpp)
+TABLA_EXPRESIONES_CPP.prefijo(12, TT_PALABRA_CLAVE, ['sizeof', 'new', 'delete'], _prefijo_sin_nodo_cpp)
@@ -21,12 +21,15 @@ except ImportError as e_import_html_parser:
     TT_IDENTIFICADOR = "IDENTIFICADOR" # Placeholder para nombres de etiqueta/atributo si el lexer los da así
     class Token: pass
 
+from src.nucleo_compilador.nodos_ast import atributos_nodo
+
 # --- Definiciones de Nodos del AST para HTML ---
 class NodoAST_HTML:
     """Clase base para todos los nodos del AST de HTML."""
+    __slots__ = ()
     def __repr__(self, indent=0):
         indent_str = "  " * indent
-        attrs = {k: v for k, v in self.__dict__.items() if not k.startswith('_') and not isinstance(v, list) and not isinstance(v, NodoAST_HTML) and v is not None}
+        attrs = {k: v for k, v in atributos_nodo(self) if not k.startswith('_') and not isinstance(v, list) and not isinstance(v, NodoAST_HTML) and v is not None}
         attr_str_parts = []
         for k,v_item in attrs.items(): 
             if isinstance(v_item, Token): attr_str_parts.append(f"{k}='{v_item.lexema}'")
@@ -35,7 +38,7 @@ class NodoAST_HTML:
         attr_str = ", ".join(attr_str_parts)
         
         children_repr_list = []
-        for k, v_child in self.__dict__.items(): 
+        for k, v_child in atributos_nodo(self): 
             if isinstance(v_child, NodoAST_HTML):
                 children_repr_list.append(f"\n{v_child.__repr__(indent + 1)}")
             elif isinstance(v_child, list) and all(isinstance(item, (NodoAST_HTML, Token, str)) for item in v_child): 
@@ -53,10 +56,12 @@ class NodoAST_HTML:
         return base_repr
 
 class NodoDocumentoHTML(NodoAST_HTML):
+    __slots__ = ("hijos",)
     def __init__(self, hijos):
         self.hijos = hijos 
 
 class NodoEtiquetaHTML(NodoAST_HTML):
+    __slots__ = ("nombre_etiqueta", "atributos", "hijos", "es_autocierre")
     def __init__(self, nombre_etiqueta_str, atributos_lista, hijos_lista, es_autocierre=False):
         self.nombre_etiqueta = nombre_etiqueta_str 
         self.atributos = atributos_lista         
@@ -64,21 +69,25 @@ class NodoEtiquetaHTML(NodoAST_HTML):
         self.es_autocierre = es_autocierre       
 
 class NodoAtributoHTML(NodoAST_HTML):
+    __slots__ = ("nombre_token", "valor_token")
     def __init__(self, nombre_token, valor_token=None): 
         self.nombre_token = nombre_token 
         self.valor_token = valor_token   
 
 class NodoTextoHTML(NodoAST_HTML):
+    __slots__ = ("texto_token", "contenido")
     def __init__(self, texto_token):
         self.texto_token = texto_token 
         self.contenido = texto_token.lexema
 
 class NodoComentarioHTML(NodoAST_HTML):
+    __slots__ = ("comentario_token", "contenido")
     def __init__(self, comentario_token):
         self.comentario_token = comentario_token 
         self.contenido = comentario_token.lexema 
 
 class NodoDoctypeHTML(NodoAST_HTML):
+    __slots__ = ("doctype_token", "contenido")
     def __init__(self, doctype_token):
         self.doctype_token = doctype_token 
         self.contenido = doctype_token.lexema
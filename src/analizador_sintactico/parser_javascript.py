@@ -8,10 +8,12 @@ try:
         TT_PUNTO_Y_COMA, TT_COMA, TT_PUNTO,
         TT_PARENTESIS_IZQ, TT_PARENTESIS_DER, TT_LLAVE_IZQ, TT_LLAVE_DER,
         TT_CORCHETE_IZQ, TT_CORCHETE_DER, TT_EOF_JS, TT_OPERADOR_BITWISE, TT_DOS_PUNTOS_TERNARIO,
-        TT_ERROR_JS # <-- Importar el token de error léxico
+        TT_ERROR_JS, # <-- Importar el token de error léxico
+        TT_LITERAL_PLANTILLA
         # Añadir más tipos de token según se necesiten.
     )
     from analizador_lexico.lexer_javascript import Token # Si se necesita la clase Token
+    from analizador_lexico.lexer_javascript import LexerJavaScript # Para las expresiones de las plantillas
 except ImportError:
     print("ADVERTENCIA CRÍTICA (ParserJavaScript): No se pudieron importar los tipos de token de LexerJavaScript.")
     TT_PALABRA_CLAVE, TT_IDENTIFICADOR, TT_EOF_JS = "PALABRA_CLAVE_JS", "IDENTIFICADOR_JS", "EOF_JS"
@@ -23,21 +25,29 @@ except ImportError:
     TT_LLAVE_IZQ, TT_LLAVE_DER = "LLAVE_IZQ_JS", "LLAVE_DER_JS"
     TT_CORCHETE_IZQ, TT_CORCHETE_DER = "CORCHETE_IZQ_JS", "CORCHETE_DER_JS"
     TT_FLECHA = "FLECHA_JS"
+    TT_LITERAL_PLANTILLA = "LITERAL_PLANTILLA_JS"
+    TT_OPERADOR_BITWISE = "OPERADOR_BITWISE_JS"
     class Token: pass
+    LexerJavaScript = None
     # (Añadir más placeholders si son referenciados antes de su uso real)
     pass
 
+from src.nucleo_compilador.pratt import TablaPratt, analizar_expresion, DERECHA
+from src.nucleo_compilador.nodos_ast import atributos_nodo
+from src.nucleo_compilador.internado import internar
+
 # --- Definiciones de Nodos del AST para JavaScript ---
 
 class NodoAST_JS:
     """Clase base para todos los nodos del AST de JavaScript."""
+    __slots__ = ()
     def __repr__(self, indent=0):
         indent_str = "  " * indent
-        attrs = {k: v for k, v in self.__dict__.items() if not k.startswith('_') and not isinstance(v, list) and not isinstance(v, NodoAST_JS) and v is not None}
+        attrs = {k: v for k, v in atributos_nodo(self) if not k.startswith('_') and not isinstance(v, list) and not isinstance(v, NodoAST_JS) and v is not None}
         attr_str = ", ".join([f"{k}='{v}'" if isinstance(v, str) else f"{k}={v}" for k,v in attrs.items()])
         
         children_repr_list = []
-        for k, v in self.__dict__.items():
+        for k, v in atributos_nodo(self):
             if isinstance(v, NodoAST_JS):
                 children_repr_list.append(f"\n{v.__repr__(indent + 1)}")
             elif isinstance(v, list) and all(isinstance(item, NodoAST_JS) for item in v): # Solo listas de Nodos AST
@@ -69,54 +79,61 @@ class NodoAST_JS:
 
 class NodoProgramaJS(NodoAST_JS):
     """Representa un script de JavaScript completo (una secuencia de sentencias/declaraciones)."""
+    __slots__ = ("cuerpo",)
     def __init__(self, cuerpo):
         self.cuerpo = cuerpo # Lista de nodos de sentencia o declaración.
 
 class NodoSentencia(NodoAST_JS):
     """Clase base para todas las sentencias."""
-    pass
+    __slots__ = ()
 
 class NodoExpresion(NodoAST_JS):
     """Clase base para todas las expresiones."""
-    pass
+    __slots__ = ()
 
 # Declaraciones
 class NodoDeclaracionVariable(NodoSentencia):
     """Representa una declaración de variable (var, let, const)."""
+    __slots__ = ("tipo_declaracion", "declaraciones")
     def __init__(self, tipo_declaracion_token, declaraciones):
         # tipo_declaracion_token: Token para 'var', 'let', o 'const'.
         # declaraciones: Lista de NodoDeclaradorVariable.
-        self.tipo_declaracion = tipo_declaracion_token.lexema 
+        self.tipo_declaracion = internar(tipo_declaracion_token.lexema) 
         self.declaraciones = declaraciones
 
 class NodoDeclaradorVariable(NodoAST_JS):
     """Representa un único declarador en una declaración de variable (ej: nombre = valor_inicial)."""
+    __slots__ = ("identificador_token", "valor_inicial_nodo", "nombre")
     def __init__(self, identificador_token, valor_inicial_nodo=None):
         self.identificador_token = identificador_token # Token IDENTIFICADOR_JS.
         self.valor_inicial_nodo = valor_inicial_nodo   # NodoExpresion (opcional).
-        self.nombre = identificador_token.lexema
+        self.nombre = internar(identificador_token.lexema)
 
 class NodoDeclaracionFuncion(NodoSentencia):
+    __slots__ = ("nombre_funcion_token", "parametros_tokens", "cuerpo_nodo_bloque", "nombre", "es_async")
     def __init__(self, nombre_funcion_token, parametros_tokens, cuerpo_nodo_bloque, es_async=False):
         self.nombre_funcion_token = nombre_funcion_token 
         self.parametros_tokens = parametros_tokens     
         self.cuerpo_nodo_bloque = cuerpo_nodo_bloque   
-        self.nombre = nombre_funcion_token.lexema if nombre_funcion_token else None 
+        self.nombre = internar(nombre_funcion_token.lexema) if nombre_funcion_token else None 
         self.es_async = es_async
 
 # Sentencias
 class NodoBloqueSentencias(NodoSentencia):
     """Representa un bloque de sentencias: { sentencia1; sentencia2; ... }."""
+    __slots__ = ("cuerpo_sentencias",)
     def __init__(self, cuerpo_sentencias):
         self.cuerpo_sentencias = cuerpo_sentencias # Lista de nodos de sentencia.
 
 class NodoSentenciaExpresion(NodoSentencia):
     """Representa una sentencia que consiste únicamente en una expresión (ej: una asignación, una llamada a función)."""
+    __slots__ = ("expresion_nodo",)
     def __init__(self, expresion_nodo):
         self.expresion_nodo = expresion_nodo # NodoExpresion.
 
 class NodoSentenciaIf(NodoSentencia):
     """Representa una sentencia if-else."""
+    __slots__ = ("prueba_nodo", "consecuente_nodo", "alternativo_nodo")
     def __init__(self, prueba_nodo, consecuente_nodo, alternativo_nodo=None):
         self.prueba_nodo = prueba_nodo             # NodoExpresion (la condición).
         self.consecuente_nodo = consecuente_nodo   # NodoSentencia (el bloque 'then').
@@ -124,11 +141,13 @@ class NodoSentenciaIf(NodoSentencia):
 
 class NodoSentenciaReturn(NodoSentencia):
     """Representa una sentencia return."""
+    __slots__ = ("argumento_nodo",)
     def __init__(self, argumento_nodo=None):
         self.argumento_nodo = argumento_nodo # NodoExpresion (opcional).
 
 class NodoBucleFor(NodoSentencia):
     """Representa un bucle for de estilo C: for (inicializacion; condicion; actualizacion) cuerpo."""
+    __slots__ = ("inicializacion_nodo", "condicion_nodo", "actualizacion_nodo", "cuerpo_nodo")
     def __init__(self, inicializacion_nodo, condicion_nodo, actualizacion_nodo, cuerpo_nodo):
         # inicializacion_nodo puede ser NodoDeclaracionVariable o NodoSentenciaExpresion o None.
         self.inicializacion_nodo = inicializacion_nodo
@@ -142,39 +161,65 @@ class NodoBucleFor(NodoSentencia):
 # Expresiones
 class NodoIdentificadorJS(NodoExpresion):
     """Representa un identificador usado en una expresión."""
+    __slots__ = ("token_id", "nombre")
     def __init__(self, token_id):
         self.token_id = token_id
-        self.nombre = token_id.lexema
+        self.nombre = internar(token_id.lexema)
+
+# Valor de las palabras que el parser convierte en NodoLiteralJS. Se pasa al nodo, porque los
+# tokens del AlmacenTokens son vistas de solo lectura.
+VALORES_LITERALES_JS = {'true': True, 'false': False, 'null': None, 'undefined': None}
+_VALOR_DEL_TOKEN = object()
 
 class NodoLiteralJS(NodoExpresion):
-    def __init__(self, token_literal):
+    __slots__ = ("token_literal", "valor", "tipo_literal_lexema")
+    def __init__(self, token_literal, valor=_VALOR_DEL_TOKEN):
         self.token_literal = token_literal
-        self.valor = token_literal.valor 
+        self.valor = token_literal.valor if valor is _VALOR_DEL_TOKEN else valor
         self.tipo_literal_lexema = token_literal.lexema
 
+class NodoPlantillaJS(NodoExpresion):
+    """Representa una plantilla literal: `texto ${expresion} texto`."""
+    __slots__ = ("token_plantilla", "partes")
+    def __init__(self, token_plantilla, partes):
+        self.token_plantilla = token_plantilla
+        # partes: textos (str) y NodoInterpolacionJS en orden; los textos vacíos se omiten.
+        self.partes = partes
+
+class NodoInterpolacionJS(NodoExpresion):
+    """Un `${expresion}` de una plantilla literal."""
+    __slots__ = ("expresion_nodo", "texto")
+    def __init__(self, expresion_nodo, texto):
+        self.expresion_nodo = expresion_nodo # NodoExpresion ya analizado.
+        self.texto = texto                   # `${...}` original; se muestra si la evaluación falla.
+
 class NodoAsignacionExpresion(NodoExpresion): # También puede ser una sentencia
     """Representa una operación de asignación (ej: variable = valor)."""
+    __slots__ = ("operador_token", "izquierda_nodo", "derecha_nodo", "operador")
     def __init__(self, operador_token, izquierda_nodo, derecha_nodo):
         self.operador_token = operador_token # Token del operador de asignación (ej: '=').
         self.izquierda_nodo = izquierda_nodo # NodoExpresion (usualmente NodoIdentificadorJS).
         self.derecha_nodo = derecha_nodo   # NodoExpresion.
-        self.operador = operador_token.lexema
+        self.operador = internar(operador_token.lexema)
 
 class NodoExpresionBinariaJS(NodoExpresion):
     """Representa una expresión binaria (ej: a + b, x > y)."""
+    __slots__ = ("operador_token", "izquierda_nodo", "derecha_nodo", "operador")
     def __init__(self, operador_token, izquierda_nodo, derecha_nodo):
         self.operador_token = operador_token
         self.izquierda_nodo = izquierda_nodo
         self.derecha_nodo = derecha_nodo
-        self.operador = operador_token.lexema
+        self.operador = internar(operador_token.lexema)
 
 class NodoLlamadaExpresion(NodoExpresion): # También puede ser una sentencia
     """Representa una llamada a función o método (ej: miFuncion(arg1, arg2))."""
+    __slots__ = ("callee_nodo", "argumentos_nodos")
     def __init__(self, callee_nodo, argumentos_nodos):
         self.callee_nodo = callee_nodo           # NodoExpresion (usualmente NodoIdentificadorJS o NodoMiembroExpresion).
         self.argumentos_nodos = argumentos_nodos # Lista de nodos de expresión.
 
 class NodoExpresionFlecha(NodoExpresion):
+    __slots__ = ("parametros_tokens", "cuerpo_nodo", "es_async")
     def __init__(self, parametros_tokens, cuerpo_nodo, es_async=False):
         self.parametros_tokens = parametros_tokens 
         self.cuerpo_nodo = cuerpo_nodo          
@@ -182,6 +227,7 @@ class NodoExpresionFlecha(NodoExpresion):
 
 class NodoMiembroExpresion(NodoExpresion):
     """Representa el acceso a un miembro de un objeto (ej: objeto.propiedad o objeto['propiedad'])."""
+    __slots__ = ("objeto_nodo", "propiedad_nodo", "es_calculado")
     def __init__(self, objeto_nodo, propiedad_nodo, es_calculado=False):
         # objeto_nodo: NodoExpresion que representa el objeto.
         # propiedad_nodo: NodoIdentificadorJS (para .propiedad) o NodoExpresion (para ['propiedad']).
@@ -193,14 +239,16 @@ class NodoMiembroExpresion(NodoExpresion):
 
 class NodoExpresionActualizacion(NodoExpresion): # ej. i++, i--
     """Representa una expresión de actualización postfija (ej: i++, i--)."""
+    __slots__ = ("operador_token", "argumento_nodo", "es_prefijo", "operador")
     def __init__(self, operador_token, argumento_nodo, es_prefijo=False): # es_prefijo sería para ++i
         self.operador_token = operador_token # Token del operador (ej: '++' o '--')
         self.argumento_nodo = argumento_nodo # El nodo que se incrementa/decrementa (ej: NodoIdentificadorJS para 'i')
         self.es_prefijo = es_prefijo # Booleano, True si es ++i, False si es i++
-        self.operador = operador_token.lexema
+        self.operador = internar(operador_token.lexema)
 
 class NodoArrayLiteralJS(NodoExpresion):
     """Representa un literal de array: [elemento1, elemento2, ...]."""
+    __slots__ = ("elementos_nodos",)
     def __init__(self, elementos_nodos):
         # elementos_nodos: Lista de nodos de expresión que son los elementos del array.
         self.elementos_nodos = elementos_nodos
@@ -208,16 +256,18 @@ class NodoArrayLiteralJS(NodoExpresion):
 
 class NodoObjetoLiteralJS(NodoExpresion):
     """Representa un literal de objeto: { propiedad1: valor1, propiedad2: valor2, ... }."""
+    __slots__ = ("propiedades_nodos",)
     def __init__(self, propiedades_nodos):
         # propiedades_nodos: Lista de nodos NodoPropiedadObjetoJS.
         self.propiedades_nodos = propiedades_nodos
 
 class NodoPropiedadObjetoJS(NodoAST_JS):
     """Representa una única propiedad en un literal de objeto (clave: valor)."""
+    __slots__ = ("clave_token", "valor_nodo", "nombre_clave")
     def __init__(self, clave_token, valor_nodo): # clave_token puede ser IDENTIFICADOR o LITERAL_CADENA
         self.clave_token = clave_token # Token para la clave de la propiedad.
         self.valor_nodo = valor_nodo   # NodoExpresion para el valor de la propiedad.
-        self.nombre_clave = clave_token.lexema # El lexema de la clave
+        self.nombre_clave = internar(clave_token.lexema) # El lexema de la clave
 
         
 # (Más nodos se añadirán según sea necesario, como NodoMiembroExpresion para obj.propiedad, 
@@ -538,123 +588,8 @@ class ParserJavaScript:
         return self._parse_expresion_asignacion_js()
 
     def _parse_expresion_asignacion_js(self):
-        nodo_izq = self._parse_expresion_logica_or_js() 
-        if self.token_actual and self.token_actual.tipo == TT_OPERADOR_ASIGNACION:
-            operador_token = self._consumir(TT_OPERADOR_ASIGNACION) 
-            nodo_der = self._parse_expresion_asignacion_js() 
-            return NodoAsignacionExpresion(operador_token, nodo_izq, nodo_der)
-        return nodo_izq
-
-    def _parse_expresion_logica_or_js(self): 
-        nodo = self._parse_expresion_logica_and_js()
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR_LOGICO and self.token_actual.lexema == '||':
-            op_token = self._consumir(TT_OPERADOR_LOGICO, '||')
-            nodo_der = self._parse_expresion_logica_and_js()
-            nodo = NodoExpresionBinariaJS(op_token, nodo, nodo_der)
-        return nodo
-
-    def _parse_expresion_logica_and_js(self): 
-        nodo = self._parse_expresion_bitwise_or_js() 
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR_LOGICO and self.token_actual.lexema == '&&':
-            op_token = self._consumir(TT_OPERADOR_LOGICO, '&&')
-            nodo_der = self._parse_expresion_bitwise_or_js()
-            nodo = NodoExpresionBinariaJS(op_token, nodo, nodo_der)
-        return nodo
-
-    def _parse_expresion_bitwise_or_js(self): 
-        nodo = self._parse_expresion_bitwise_xor_js()
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR_BITWISE and self.token_actual.lexema == '|':
-            op_token = self._consumir(TT_OPERADOR_BITWISE, '|')
-            nodo_der = self._parse_expresion_bitwise_xor_js()
-            nodo = NodoExpresionBinariaJS(op_token, nodo, nodo_der)
-        return nodo
-
-    def _parse_expresion_bitwise_xor_js(self): 
-        nodo = self._parse_expresion_bitwise_and_js()
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR_BITWISE and self.token_actual.lexema == '^':
-            op_token = self._consumir(TT_OPERADOR_BITWISE, '^')
-            nodo_der = self._parse_expresion_bitwise_and_js()
-            nodo = NodoExpresionBinariaJS(op_token, nodo, nodo_der)
-        return nodo
-
-    def _parse_expresion_bitwise_and_js(self): 
-        nodo = self._parse_expresion_igualdad_js()
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR_BITWISE and self.token_actual.lexema == '&':
-            op_token = self._consumir(TT_OPERADOR_BITWISE, '&')
-            nodo_der = self._parse_expresion_igualdad_js()
-            nodo = NodoExpresionBinariaJS(op_token, nodo, nodo_der)
-        return nodo
-
-    def _parse_expresion_igualdad_js(self): 
-        nodo = self._parse_expresion_relacional_js()
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR_COMPARACION and \
-              self.token_actual.lexema in ['==', '!=', '===', '!==']:
-            op_token = self._consumir(TT_OPERADOR_COMPARACION, self.token_actual.lexema)
-            nodo_der = self._parse_expresion_relacional_js()
-            nodo = NodoExpresionBinariaJS(op_token, nodo, nodo_der)
-        return nodo
-        
-    def _parse_expresion_relacional_js(self): 
-        nodo = self._parse_expresion_aditiva_js() 
-        while self.token_actual and (
-              (self.token_actual.tipo == TT_OPERADOR_COMPARACION and self.token_actual.lexema in ['<', '<=', '>', '>=']) or \
-              (self.token_actual.tipo == TT_PALABRA_CLAVE and self.token_actual.lexema in ['in', 'instanceof'])
-              ):
-            op_token = self._consumir(self.token_actual.tipo, self.token_actual.lexema)
-            nodo_der = self._parse_expresion_aditiva_js()
-            nodo = NodoExpresionBinariaJS(op_token, nodo, nodo_der)
-        return nodo
-
-    def _parse_expresion_aditiva_js(self): 
-        # print(f"[DEBUG JS Parser] Entrando a _parse_expresion_aditiva_js. Token: {self.token_actual}")
-        nodo = self._parse_expresion_multiplicativa_js()
-        # print(f"[DEBUG JS Parser] _parse_exp_aditiva: después de multiplicativa, nodo: {type(nodo).__name__ if nodo else 'None'}, token: {self.token_actual}")
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR_ARITMETICO and \
-              self.token_actual.lexema in ['+', '-']:
-            # print(f"[DEBUG JS Parser] _parse_exp_aditiva: Encontrado operador '{self.token_actual.lexema}'")
-            op_token = self._consumir(TT_OPERADOR_ARITMETICO, self.token_actual.lexema)
-            nodo_der = self._parse_expresion_multiplicativa_js()
-            # print(f"[DEBUG JS Parser] _parse_exp_aditiva: después de multiplicativa (der), nodo_der: {type(nodo_der).__name__ if nodo_der else 'None'}, token: {self.token_actual}")
-            nodo = NodoExpresionBinariaJS(op_token, nodo, nodo_der)
-        # print(f"[DEBUG JS Parser] Saliendo de _parse_expresion_aditiva_js. Nodo: {type(nodo).__name__ if nodo else 'None'}, Token: {self.token_actual}")
-        return nodo
-
-    def _parse_expresion_multiplicativa_js(self): 
-        # print(f"[DEBUG JS Parser] Entrando a _parse_expresion_multiplicativa_js. Token: {self.token_actual}")
-        nodo = self._parse_expresion_unaria_js() 
-        # print(f"[DEBUG JS Parser] _parse_exp_mult: después de unaria, nodo: {type(nodo).__name__ if nodo else 'None'}, token: {self.token_actual}")
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR_ARITMETICO and \
-              self.token_actual.lexema in ['*', '/', '%']:
-            # print(f"[DEBUG JS Parser] _parse_exp_mult: Encontrado operador '{self.token_actual.lexema}'")
-            op_token = self._consumir(TT_OPERADOR_ARITMETICO, self.token_actual.lexema)
-            nodo_der = self._parse_expresion_unaria_js()
-            # print(f"[DEBUG JS Parser] _parse_exp_mult: después de unaria (der), nodo_der: {type(nodo_der).__name__ if nodo_der else 'None'}, token: {self.token_actual}")
-            nodo = NodoExpresionBinariaJS(op_token, nodo, nodo_der)
-        # print(f"[DEBUG JS Parser] Saliendo de _parse_expresion_multiplicativa_js. Nodo: {type(nodo).__name__ if nodo else 'None'}, Token: {self.token_actual}")
-        return nodo
-
-    def _parse_expresion_unaria_js(self):
-        # print(f"[DEBUG JS Parser] Entrando a _parse_expresion_unaria_js. Token: {self.token_actual}")
-        if self.token_actual and (
-            (self.token_actual.tipo == TT_OPERADOR_LOGICO and self.token_actual.lexema == '!') or \
-            (self.token_actual.tipo == TT_OPERADOR_ARITMETICO and self.token_actual.lexema in ['+', '-', '++', '--']) or \
-            (self.token_actual.tipo == TT_PALABRA_CLAVE and self.token_actual.lexema in ['typeof', 'void', 'delete'])
-            ):
-            op_token = self._consumir(self.token_actual.tipo, self.token_actual.lexema)
-            # Para ++ y -- prefijos, el operando es una expresión unaria (o de mayor precedencia)
-            # Para otros, el operando es también una expresión unaria.
-            operando_nodo = self._parse_expresion_unaria_js() 
-            # Necesitaríamos un NodoExpresionUnariaJS (que ya tenemos definido)
-            # return NodoExpresionUnariaJS(op_token, operando_nodo) # Si es prefijo
-            print(f"INFO (ParserJS): Operador unario PREFIJO '{op_token.lexema}' parseado.")
-            # Para que el AST sea correcto, necesitamos construir el nodo unario.
-            # Por ahora, solo devolvemos el operando para evitar errores, pero el operador se pierde.
-            # Esta es una simplificación importante.
-            return operando_nodo # Esto es incorrecto para la semántica, pero evita error de estructura.
-                                # Debería ser: return NodoExpresionUnaria(op_token, operando_nodo, es_prefijo=True)
-        
-        # Si no es un operador unario prefijo, parsear una expresión izquierda (que puede tener postfijos)
-        return self._parse_expresion_izquierda_js()
+        # Asignación, operadores binarios y prefijos (ver TABLA_EXPRESIONES_JS)
+        return analizar_expresion(self, TABLA_EXPRESIONES_JS, self._parse_expresion_izquierda_js)
 
     def _parse_expresion_izquierda_js(self): 
         nodo_expr = self._parse_expresion_primaria_js()
@@ -726,19 +661,15 @@ class ParserJavaScript:
         if token.tipo == TT_IDENTIFICADOR:
             if token.lexema in ['true', 'false', 'null', 'undefined']:
                 consumido = self._consumir(TT_IDENTIFICADOR)
-                if consumido.lexema == 'true': consumido.valor = True
-                elif consumido.lexema == 'false': consumido.valor = False
-                elif consumido.lexema == 'null' or consumido.lexema == 'undefined': consumido.valor = None
-                return NodoLiteralJS(consumido)
+                return NodoLiteralJS(consumido, VALORES_LITERALES_JS[consumido.lexema])
             return NodoIdentificadorJS(self._consumir(TT_IDENTIFICADOR))
         elif token.tipo in [TT_LITERAL_NUMERICO, TT_LITERAL_CADENA]:
             return NodoLiteralJS(self._consumir(token.tipo))
+        elif token.tipo == TT_LITERAL_PLANTILLA:
+            return self._parse_plantilla_js(self._consumir(TT_LITERAL_PLANTILLA))
         elif token.tipo == TT_PALABRA_CLAVE and token.lexema in ['true', 'false', 'null']:
             consumido = self._consumir(TT_PALABRA_CLAVE, token.lexema)
-            if consumido.lexema == 'true': consumido.valor = True
-            elif consumido.lexema == 'false': consumido.valor = False
-            elif consumido.lexema == 'null': consumido.valor = None
-            return NodoLiteralJS(consumido)
+            return NodoLiteralJS(consumido, VALORES_LITERALES_JS[consumido.lexema])
         elif token.tipo == TT_PARENTESIS_IZQ:
             self._consumir(TT_PARENTESIS_IZQ)
             nodo_expr = self._parse_expresion_js() 
@@ -829,6 +760,80 @@ class ParserJavaScript:
         self._consumir(TT_LLAVE_DER) # Consume '}'
         return NodoObjetoLiteralJS(propiedades)
 
+    def _parse_plantilla_js(self, token_plantilla):
+        """
+        Construye un NodoPlantillaJS a partir de los textos y expresiones que el lexer separó
+        (valor del token). Cada expresión se tokeniza y analiza aquí una sola vez; si no es una
+        expresión válida, su `${...}` se queda como texto.
+        """
+        textos, expresiones = token_plantilla.valor
+        partes = []
+        texto_pendiente = textos[0]
+        for codigo_expresion, texto in zip(expresiones, textos[1:]):
+            expresion_nodo = _parse_expresion_plantilla(codigo_expresion, token_plantilla)
+            if expresion_nodo is None:
+                texto_pendiente += "${" + codigo_expresion + "}" + texto
+                continue
+            if texto_pendiente:
+                partes.append(texto_pendiente)
+            partes.append(NodoInterpolacionJS(expresion_nodo, "${" + codigo_expresion + "}"))
+            texto_pendiente = texto
+        if texto_pendiente:
+            partes.append(texto_pendiente)
+        return NodoPlantillaJS(token_plantilla, partes)
+
     
 
 # Fin de la clase ParserJavaScript
+
+
+def _prefijo_sin_nodo_js(operador_token, operando_nodo):
+    print(f"INFO (ParserJS): Operador unario PREFIJO '{operador_token.lexema}' parseado.")
+    # Simplificación: el operador se pierde y solo se conserva el operando. Debería ser
+    # NodoExpresionUnaria(operador_token, operando_nodo, es_prefijo=True).
+    return operando_nodo
+
+# Operadores de las expresiones JavaScript por nivel de precedencia (mayor = se agrupa antes)
+TABLA_EXPRESIONES_JS = TablaPratt()
+TABLA_EXPRESIONES_JS.infijo(1, TT_OPERADOR_ASIGNACION, None, NodoAsignacionExpresion, asociatividad=DERECHA)
+TABLA_EXPRESIONES_JS.infijo(2, TT_OPERADOR_LOGICO, ['||'], NodoExpresionBinariaJS)
+TABLA_EXPRESIONES_JS.infijo(3, TT_OPERADOR_LOGICO, ['&&'], NodoExpresionBinariaJS)
+TABLA_EXPRESIONES_JS.infijo(4, TT_OPERADOR_BITWISE, ['|'], NodoExpresionBinariaJS)
+TABLA_EXPRESIONES_JS.infijo(5, TT_OPERADOR_BITWISE, ['^'], NodoExpresionBinariaJS)
+TABLA_EXPRESIONES_JS.infijo(6, TT_OPERADOR_BITWISE, ['&'], NodoExpresionBinariaJS)
+TABLA_EXPRESIONES_JS.infijo(7, TT_OPERADOR_COMPARACION, ['==', '!=', '===', '!=='], NodoExpresionBinariaJS)
+TABLA_EXPRESIONES_JS.infijo(8, TT_OPERADOR_COMPARACION, ['<', '<=', '>', '>='], NodoExpresionBinariaJS)
+TABLA_EXPRESIONES_JS.infijo(8, TT_PALABRA_CLAVE, ['in', 'instanceof'], NodoExpresionBinariaJS)
+TABLA_EXPRESIONES_JS.infijo(9, TT_OPERADOR_ARITMETICO, ['+', '-'], NodoExpresionBinariaJS)
+TABLA_EXPRESIONES_JS.infijo(10, TT_OPERADOR_ARITMETICO, ['*', '/', '%'], NodoExpresionBinariaJS)
+TABLA_EXPRESIONES_JS.prefijo(11, TT_OPERADOR_LOGICO, ['!'], _prefijo_sin_nodo_js)
+TABLA_EXPRESIONES_JS.prefijo(11, TT_OPERADOR_ARITMETICO, ['+', '-', '++', '--'], _prefijo_sin_nodo_js)
+TABLA_EXPRESIONES_JS.prefijo(11, TT_PALABRA_CLAVE, ['typeof', 'void', 'delete'], _prefijo_sin_nodo_js)
+
+
+class _ParserExpresionPlantilla(ParserJavaScript):
+    """ParserJavaScript para la expresión de un `${...}`: los errores no se imprimen."""
+    def _error_lexico(self, token_error):
+        raise SyntaxError(token_error.lexema)
+
+    def _error_sintactico(self, mensaje_esperado):
+        raise SyntaxError(mensaje_esperado)
+
+
+def _parse_expresion_plantilla(codigo_expresion, token_plantilla):
+    """
+    Analiza el código de un `${...}`. Sus tokens se sitúan en la posición de la plantilla.
+    Devuelve None si no es una única expresión válida.
+    """
+    if not codigo_expresion.strip() or LexerJavaScript is None:
+        return None
+    tokens = [Token(t.tipo, t.lexema, token_plantilla.linea, token_plantilla.columna, t.valor)
+              for t in LexerJavaScript(codigo_expresion).tokenizar()]
+    parser = _ParserExpresionPlantilla(tokens)
+    try:
+        expresion_nodo = parser._parse_expresion_js()
+    except SyntaxError:
+        return None
+    if parser.token_actual is None or parser.token_actual.tipo != TT_EOF_JS:
+        return None
+    return expresion_nodo
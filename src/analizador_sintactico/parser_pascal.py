@@ -20,8 +20,12 @@ except ImportError:
     TT_OPERADOR_ASIGNACION = "OPERADOR_ASIGNACION"
     TT_PARENTESIS_IZQ, TT_PARENTESIS_DER, TT_COMA = "PARENTESIS_IZQ", "PARENTESIS_DER", "COMA"
     TT_NUMERO_ENTERO, TT_NUMERO_REAL, TT_CADENA_LITERAL = "NUMERO_ENTERO", "NUMERO_REAL", "CADENA_LITERAL"
+    TT_OPERADOR_ARITMETICO, TT_OPERADOR_RELACIONAL = "OPERADOR_ARITMETICO", "OPERADOR_RELACIONAL"
     pass
 
+from src.nucleo_compilador.flujo_tokens import FlujoTokens
+from src.nucleo_compilador.pratt import TablaPratt, analizar_expresion, NO_ASOCIATIVO
+
 # NUEVA IMPORTACIÓN para la Tabla de Símbolos
 try:
     from nucleo_compilador.tabla_simbolos import TablaSimbolos
@@ -35,6 +39,8 @@ except ImportError:
         def entrar_alcance(self): pass
         def salir_alcance(self): pass
 
+from src.nucleo_compilador.internado import internar
+
 
 
 # --- Definiciones de Nodos del AST para Pascal ---
@@ -47,6 +53,7 @@ except ImportError:
 
 class NodoAST:
     """Clase base para todos los nodos del AST."""
+    __slots__ = ()
     def __repr__(self, indent=0):
         # Representación base que muestra el nombre de la clase y su ID.
         # La indentación se controla con espacios.
@@ -55,6 +62,7 @@ class NodoAST:
 
 class NodoPrograma(NodoAST):
     """Representa la estructura completa de un programa Pascal."""
+    __slots__ = ("nombre_programa_token", "bloque_nodo")
     def __init__(self, nombre_programa_token, bloque_nodo):
         self.nombre_programa_token = nombre_programa_token
         self.bloque_nodo = bloque_nodo
@@ -69,6 +77,7 @@ class NodoPrograma(NodoAST):
 
 class NodoBloque(NodoAST):
     """Representa un bloque de código con declaraciones y un cuerpo de sentencias."""
+    __slots__ = ("declaraciones_var_nodo", "cuerpo_nodo")
     def __init__(self, declaraciones_var_nodo, cuerpo_nodo):
         self.declaraciones_var_nodo = declaraciones_var_nodo
         self.cuerpo_nodo = cuerpo_nodo
@@ -85,6 +94,7 @@ class NodoBloque(NodoAST):
 
 class NodoDeclaracionesVar(NodoAST):
     """Contiene una lista de nodos NodoDeclaracionVar."""
+    __slots__ = ("declaraciones",)
     def __init__(self, declaraciones):
         self.declaraciones = declaraciones
 
@@ -101,6 +111,7 @@ class NodoDeclaracionesVar(NodoAST):
 
 class NodoDeclaracionVar(NodoAST):
     """Representa una única línea de declaración de variable (ej: a, b : integer;)."""
+    __slots__ = ("lista_identificadores_tokens", "tipo_nodo")
     def __init__(self, lista_identificadores_tokens, tipo_nodo):
         self.lista_identificadores_tokens = lista_identificadores_tokens
         self.tipo_nodo = tipo_nodo
@@ -116,9 +127,10 @@ class NodoDeclaracionVar(NodoAST):
 
 class NodoTipo(NodoAST):
     """Representa un tipo de dato en Pascal."""
+    __slots__ = ("tipo_token", "nombre_tipo", "tamaño")
     def __init__(self, tipo_token):
         self.tipo_token = tipo_token
-        self.nombre_tipo = tipo_token.lexema.lower()
+        self.nombre_tipo = internar(tipo_token.lexema.lower())
         self.tamaño = None
 
     def __repr__(self, indent=0):
@@ -127,6 +139,7 @@ class NodoTipo(NodoAST):
 
 class NodoCuerpoPrograma(NodoAST): # También para bloques begin-end anidados
     """Representa un bloque 'begin ... end' con una lista de sentencias."""
+    __slots__ = ("lista_sentencias_nodos",)
     def __init__(self, lista_sentencias_nodos):
         self.lista_sentencias_nodos = lista_sentencias_nodos
 
@@ -144,10 +157,11 @@ class NodoCuerpoPrograma(NodoAST): # También para bloques begin-end anidados
 class NodoSentencia(NodoAST):
     """Clase base para todas las sentencias."""
     # Hereda __repr__ de NodoAST si no se redefine en clases hijas.
-    pass
+    __slots__ = ()
 
 class NodoAsignacion(NodoSentencia):
     """Representa una sentencia de asignación (variable := expresion)."""
+    __slots__ = ("variable_token_id", "expresion_nodo")
     def __init__(self, variable_token_id, expresion_nodo):
         self.variable_token_id = variable_token_id
         self.expresion_nodo = expresion_nodo
@@ -162,6 +176,7 @@ class NodoAsignacion(NodoSentencia):
 
 class NodoLlamadaProcedimiento(NodoSentencia):
     """Representa una llamada a un procedimiento."""
+    __slots__ = ("nombre_proc_token", "argumentos_nodos")
     def __init__(self, nombre_proc_token, argumentos_nodos):
         self.nombre_proc_token = nombre_proc_token
         self.argumentos_nodos = argumentos_nodos
@@ -174,6 +189,7 @@ class NodoLlamadaProcedimiento(NodoSentencia):
 
 class NodoIf(NodoSentencia):
     """Representa una sentencia condicional if-then-else."""
+    __slots__ = ("condicion_nodo", "then_sentencia_nodo", "else_sentencia_nodo")
     def __init__(self, condicion_nodo, then_sentencia_nodo, else_sentencia_nodo=None):
         self.condicion_nodo = condicion_nodo
         self.then_sentencia_nodo = then_sentencia_nodo
@@ -198,6 +214,7 @@ class NodoIf(NodoSentencia):
     
 class NodoWhile(NodoSentencia):
     """Representa una sentencia de bucle 'while ... do ...'."""
+    __slots__ = ("condicion_nodo", "cuerpo_sentencia_nodo")
     def __init__(self, condicion_nodo, cuerpo_sentencia_nodo):
         self.condicion_nodo = condicion_nodo           # Nodo de la expresión booleana (condición del bucle).
         self.cuerpo_sentencia_nodo = cuerpo_sentencia_nodo # Nodo de la sentencia que forma el cuerpo del bucle.
@@ -214,6 +231,7 @@ class NodoWhile(NodoSentencia):
     
 class NodoRepeat(NodoSentencia):
     """Representa una sentencia de bucle 'repeat ... until ...'."""
+    __slots__ = ("lista_sentencias_cuerpo", "condicion_nodo")
     def __init__(self, lista_sentencias_cuerpo, condicion_nodo):
         # El cuerpo de un repeat-until es una lista de sentencias.
         self.lista_sentencias_cuerpo = lista_sentencias_cuerpo # Lista de nodos de sentencia.
@@ -239,13 +257,14 @@ class NodoRepeat(NodoSentencia):
 class NodoExpresion(NodoAST):
     """Clase base para todas las expresiones."""
     # Hereda __repr__ de NodoAST.
-    pass
+    __slots__ = ()
 
 class NodoIdentificador(NodoExpresion):
     """Representa un identificador usado en una expresión."""
+    __slots__ = ("id_token", "nombre")
     def __init__(self, id_token):
         self.id_token = id_token
-        self.nombre = id_token.lexema
+        self.nombre = internar(id_token.lexema)
 
     def __repr__(self, indent=0):
         indent_str = "  " * indent
@@ -253,6 +272,7 @@ class NodoIdentificador(NodoExpresion):
 
 class NodoLiteral(NodoExpresion):
     """Representa un valor literal (número, cadena, booleano)."""
+    __slots__ = ("literal_token", "valor")
     def __init__(self, literal_token):
         self.literal_token = literal_token
         self.valor = literal_token.valor 
@@ -264,6 +284,7 @@ class NodoLiteral(NodoExpresion):
 
 class NodoExpresionBinaria(NodoExpresion):
     """Representa una expresión binaria (ej: operando_izq operador operando_der)."""
+    __slots__ = ("operador_token", "operando_izq_nodo", "operando_der_nodo")
     def __init__(self, operador_token, operando_izq_nodo, operando_der_nodo):
         self.operador_token = operador_token
         self.operando_izq_nodo = operando_izq_nodo
@@ -281,6 +302,7 @@ class NodoExpresionBinaria(NodoExpresion):
     
 class NodoExpresionUnaria(NodoExpresion):
     """Representa una expresión unaria (ej: 'not' operando)."""
+    __slots__ = ("operador_token", "operando_nodo")
     def __init__(self, operador_token, operando_nodo):
         self.operador_token = operador_token # Token del operador unario (ej: 'not').
         self.operando_nodo = operando_nodo   # Nodo de la expresión sobre la que opera.
@@ -299,7 +321,8 @@ class NodoExpresionUnaria(NodoExpresion):
 
 class ParserPascal:
     def __init__(self, tokens):
-        self.tokens = [token for token in tokens if token.tipo != 'WHITESPACE_PASCAL'] # Ignorar whitespace
+        # Lista de tokens o generador (`LexerPascal.generar_tokens()`), ver FlujoTokens
+        self.tokens = FlujoTokens(tokens, ignorar=('WHITESPACE_PASCAL',)) # Ignorar whitespace
         self.posicion_actual = 0
         self.token_actual = self.tokens[self.posicion_actual] if self.tokens else None
         self.errores_sintacticos = []
@@ -314,7 +337,7 @@ class ParserPascal:
     def _avanzar(self):
         """Avanza al siguiente token en la lista."""
         self.posicion_actual += 1
-        if self.posicion_actual < len(self.tokens):
+        if self.tokens.hay(self.posicion_actual):
             self.token_actual = self.tokens[self.posicion_actual]
 
 
@@ -322,7 +345,8 @@ class ParserPascal:
             # Si hemos avanzado más allá del último token real (que debería ser EOF),
             # establecemos token_actual a un valor que indique el final.
             # Podríamos usar el mismo token EOF si está al final, o None.
-            self.token_actual = self.tokens[-1] if self.tokens and self.tokens[-1].tipo == TT_EOF_PASCAL else None
+            ultimo = self.tokens.ultimo()
+            self.token_actual = ultimo if ultimo and ultimo.tipo == TT_EOF_PASCAL else None
 
 
     def _error_lexico(self, token_error):
@@ -343,7 +367,7 @@ class ParserPascal:
                        f"Se esperaba {mensaje_esperado}.")
         else: # No hay más tokens, pero se esperaba algo
             # Intentar obtener la posición del último token antes del EOF
-            last_token = self.tokens[-2] if len(self.tokens) > 1 else (self.tokens[-1] if self.tokens else None)
+            last_token = self.tokens.ultimo_antes_de(TT_EOF_PASCAL)
             linea_aprox = last_token.linea if last_token else 'desconocida'
             col_aprox = last_token.columna if last_token else 'desconocida'
             mensaje = (f"Error Sintáctico: Final inesperado de la entrada (aprox. L{linea_aprox}:C{col_aprox}). "
@@ -690,7 +714,7 @@ class ParserPascal:
      if token_tipo == TT_IDENTIFICADOR:
          # Podría ser una asignación (IDENTIFICADOR := ...) 
          # o una llamada a procedimiento (IDENTIFICADOR; o IDENTIFICADOR(...);)
-         if self.posicion_actual + 1 < len(self.tokens) and \
+         if self.tokens.hay(self.posicion_actual + 1) and \
             self.tokens[self.posicion_actual + 1].tipo == TT_OPERADOR_ASIGNACION:
              nodo_sentencia_actual = self.parse_asignacion()
          else:
@@ -913,112 +937,8 @@ class ParserPascal:
                  self._error_sintactico("una expresión después de la coma en la lista de argumentos")
         return lista_nodos_arg
     
-    #NUEVOS METODOS
-    def parse_factor(self):
-        # Gramática: factor ::= IDENTIFICADOR | NUMERO_ENTERO | NUMERO_REAL | CADENA_LITERAL |
-        #                     '(' expresion ')' | "true" | "false"
-        # El operador 'not' ahora se maneja en parse_factor_logico.
-        token_actual_val = self.token_actual 
-        if token_actual_val is None:
-            self._error_sintactico("un factor (identificador, número, cadena, booleano, o expresión entre paréntesis)")
-
-        tipo_actual = token_actual_val.tipo
-        lexema_actual_lower = token_actual_val.lexema.lower() if token_actual_val.lexema else ""
-
-        if tipo_actual == TT_IDENTIFICADOR:
-            token_id_consumido = self._consumir(TT_IDENTIFICADOR)
-            # No validar aquí si el identificador está declarado, solo construir el nodo
-            return NodoIdentificador(token_id_consumido)
-        
-        elif tipo_actual in [TT_NUMERO_ENTERO, TT_NUMERO_REAL, TT_CADENA_LITERAL]:
-            token_literal_consumido = self._consumir(tipo_actual)
-            return NodoLiteral(token_literal_consumido)
-        
-        elif tipo_actual == TT_PALABRA_RESERVADA and lexema_actual_lower in ["true", "false"]:
-            token_booleano_consumido = self._consumir(TT_PALABRA_RESERVADA, lexema_actual_lower)
-            return NodoLiteral(token_booleano_consumido)
-            
-        elif tipo_actual == TT_PARENTESIS_IZQ:
-            self._consumir(TT_PARENTESIS_IZQ)
-            nodo_expr_interna = self.parse_expresion() # Llamada al nivel más alto de expresiones
-            self._consumir(TT_PARENTESIS_DER)
-            return nodo_expr_interna
-            
-        else:
-            self._error_sintactico(
-                f"un factor válido (identificador, número, cadena, 'true', 'false', o '('). "
-                f"Se encontró '{token_actual_val.lexema}' (tipo: {tipo_actual})"
-            )
-        return None
-    
-    def parse_termino_aritmetico(self):
-        # Gramática: termino_aritmetico ::= factor (('*' | '/' | 'div' | 'mod') factor)*
-        nodo = self.parse_factor()
-        while self.token_actual and \
-              self.token_actual.tipo == TT_OPERADOR_ARITMETICO and \
-              self.token_actual.lexema.lower() in ['*', '/', 'div', 'mod']:
-            token_operador = self._consumir(TT_OPERADOR_ARITMETICO)
-            nodo_derecho = self.parse_factor()
-            nodo = NodoExpresionBinaria(token_operador, nodo, nodo_derecho)
-        return nodo
-
-    def parse_factor_logico(self):
-        # Gramática: factor_logico ::= ["not"] expresion_comparativa
-        # Maneja el operador 'not' que tiene la precedencia más alta entre los lógicos.
-        token_op_not = None
-        if self.token_actual and \
-           self.token_actual.tipo == TT_PALABRA_RESERVADA and \
-           self.token_actual.lexema.lower() == 'not':
-            token_op_not = self._consumir(TT_PALABRA_RESERVADA, 'not')
-        
-        nodo_operando = self.parse_expresion_comparativa()
-
-        if token_op_not:
-            return NodoExpresionUnaria(token_op_not, nodo_operando)
-        else:
-            return nodo_operando
-    
-    def parse_termino_logico(self):
-        # Gramática: termino_logico ::= factor_logico ("and" factor_logico)*
-        # Maneja el operador 'and'.
-        nodo = self.parse_factor_logico()
-
-        while self.token_actual and \
-              self.token_actual.tipo == TT_PALABRA_RESERVADA and \
-              self.token_actual.lexema.lower() == 'and':
-            token_operador_and = self._consumir(TT_PALABRA_RESERVADA, 'and')
-            nodo_derecho = self.parse_factor_logico()
-            nodo = NodoExpresionBinaria(token_operador_and, nodo, nodo_derecho)
-        return nodo
-    
-    def parse_expresion_simple(self):
-        # Gramática: expresion_simple ::= ['+'|'-'] termino_aritmetico (('+' | '-') termino_aritmetico)*
-        # (Manejo de unario +/- se podría añadir aquí si se desea mayor complejidad)
-        nodo = self.parse_termino_aritmetico()
-        while self.token_actual and \
-              self.token_actual.tipo == TT_OPERADOR_ARITMETICO and \
-              self.token_actual.lexema in ['+', '-']:
-            token_operador = self._consumir(TT_OPERADOR_ARITMETICO)
-            nodo_derecho = self.parse_termino_aritmetico()
-            nodo = NodoExpresionBinaria(token_operador, nodo, nodo_derecho)
-        return nodo
-    
-
     def parse_expresion_logica(self): # Anteriormente llamado parse_expresion
-        # Gramática: expresion_logica ::= expresion_simple [OPERADOR_RELACIONAL expresion_simple]
-        # Devuelve: NodoExpresion (el resultado de expresion_simple o un NodoExpresionBinaria para la comparación).
-        
-        nodo = self.parse_termino_logico() # Parsea la primera parte (que puede incluir 'not' y 'and').
-
-        while self.token_actual and \
-              self.token_actual.tipo == TT_PALABRA_RESERVADA and \
-              self.token_actual.lexema.lower() == 'or':
-            
-            token_operador_or = self._consumir(TT_PALABRA_RESERVADA, 'or')
-            nodo_derecho = self.parse_termino_logico() # Parsea el siguiente operando.
-            nodo = NodoExpresionBinaria(token_operador_or, nodo, nodo_derecho)
-            
-        return nodo
+        return self.parse_expresion()
 
     
     def parse_factor(self):
@@ -1063,50 +983,23 @@ class ParserPascal:
 
 
 
-    def parse_termino(self):
-        # Gramática: termino ::= factor (('*' | '/' | 'div' | 'mod') factor)*
-        # Devuelve: NodoExpresion (el factor inicial o un NodoExpresionBinaria).
-        # Por ahora, solo implementaremos '*'
-        
-        nodo = self.parse_factor() # Parsea el primer factor.
-
-        # Mientras el token actual sea un operador de multiplicación o división.
-        while self.token_actual and \
-              self.token_actual.tipo == TT_OPERADOR_ARITMETICO and \
-              self.token_actual.lexema in ['*', '/', 'div', 'mod']: # Añadir '/', 'div', 'mod' aquí si se implementan
-            
-            token_operador = self._consumir(TT_OPERADOR_ARITMETICO) # Consume el operador.
-            nodo_derecho = self.parse_factor() # Parsea el siguiente factor.
-            # Crea un nodo de expresión binaria con el nodo actual como izquierdo.
-            nodo = NodoExpresionBinaria(token_operador, nodo, nodo_derecho)
-            
-        return nodo
-
-    def parse_expresion_comparativa(self): 
-        # Gramática: expresion_comparativa ::= expresion_simple [OPERADOR_RELACIONAL expresion_simple]
-        nodo_izquierdo = self.parse_expresion_simple()
-        if self.token_actual and self.token_actual.tipo == TT_OPERADOR_RELACIONAL:
-            token_operador = self._consumir(TT_OPERADOR_RELACIONAL)
-            nodo_derecho = self.parse_expresion_simple()
-            return NodoExpresionBinaria(token_operador, nodo_izquierdo, nodo_derecho)
-        else:
-            return nodo_izquierdo
-
     def parse_expresion(self): # Punto de entrada principal para expresiones
-            # Gramática: expresion ::= termino_logico ("or" termino_logico)*
-            # Maneja el operador 'or', que tiene la precedencia más baja entre los lógicos.
-            
-            nodo = self.parse_termino_logico() # Parsea la primera parte (que puede incluir 'not' y 'and').
-
-
-            while self.token_actual and \
-                self.token_actual.tipo == TT_PALABRA_RESERVADA and \
-                self.token_actual.lexema.lower() == 'or':
-
-
-                token_operador_or = self._consumir(TT_PALABRA_RESERVADA, 'or')
-                nodo_derecho = self.parse_termino_logico() # Parsea el siguiente operando.
-                nodo = NodoExpresionBinaria(token_operador_or, nodo, nodo_derecho)
-
-                
-            return nodo
\ No newline at end of file
+        # Gramática: expresion ::= termino_logico ("or" termino_logico)*
+        #   termino_logico ::= factor_logico ("and" factor_logico)*
+        #   factor_logico ::= ["not"] expresion_comparativa
+        #   expresion_comparativa ::= expresion_simple [OPERADOR_RELACIONAL expresion_simple]
+        #   expresion_simple ::= termino (('+' | '-') termino)*
+        #   termino ::= factor (('*' | '/' | 'div' | 'mod') factor)*
+        # Los niveles están en TABLA_EXPRESIONES_PASCAL.
+        return analizar_expresion(self, TABLA_EXPRESIONES_PASCAL, self.parse_factor)
+
+
+# Operadores de las expresiones Pascal por nivel de precedencia (mayor = se agrupa antes).
+# 'not' no se repite ('not not a' es un error) y las comparaciones no se encadenan.
+TABLA_EXPRESIONES_PASCAL = TablaPratt(insensible_mayusculas=True)
+TABLA_EXPRESIONES_PASCAL.infijo(1, TT_PALABRA_RESERVADA, ['or'], NodoExpresionBinaria)
+TABLA_EXPRESIONES_PASCAL.infijo(2, TT_PALABRA_RESERVADA, ['and'], NodoExpresionBinaria)
+TABLA_EXPRESIONES_PASCAL.prefijo(3, TT_PALABRA_RESERVADA, ['not'], NodoExpresionUnaria, nivel_operando=4)
+TABLA_EXPRESIONES_PASCAL.infijo(4, TT_OPERADOR_RELACIONAL, None, NodoExpresionBinaria, asociatividad=NO_ASOCIATIVO)
+TABLA_EXPRESIONES_PASCAL.infijo(5, TT_OPERADOR_ARITMETICO, ['+', '-'], NodoExpresionBinaria)
+TABLA_EXPRESIONES_PASCAL.infijo(6, TT_OPERADOR_ARITMETICO, ['*', '/', 'div', 'mod'], NodoExpresionBinaria)
@@ -40,11 +40,17 @@ except ImportError:
     IDENTIFIER_LIKE_KEYWORDS_PLSQL = {'sqlcode', 'sqlerrm', 'sysdate', 'user', 'uid', 'rownum'}
     class Token: pass
 
+from src.nucleo_compilador.flujo_tokens import FlujoTokens
+from src.nucleo_compilador.pratt import TablaPratt, analizar_expresion, DERECHA, NO_ASOCIATIVO
+from src.nucleo_compilador.nodos_ast import atributos_nodo
+from src.nucleo_compilador.internado import internar
+
 # --- Definiciones de Nodos del AST para PL/SQL ---
 class NodoAST_PLSQL:
+    __slots__ = ()
     def __repr__(self, indent=0):
         indent_str = "  " * indent
-        attrs = {k: v for k, v in self.__dict__.items() if not k.startswith('_') and not isinstance(v, list) and not isinstance(v, NodoAST_PLSQL) and v is not None}
+        attrs = {k: v for k, v in atributos_nodo(self) if not k.startswith('_') and not isinstance(v, list) and not isinstance(v, NodoAST_PLSQL) and v is not None}
         attr_str_parts = []
         for k,v_item in attrs.items(): 
             if isinstance(v_item, Token): attr_str_parts.append(f"{k}='{v_item.lexema}'")
@@ -52,7 +58,7 @@ class NodoAST_PLSQL:
             else: attr_str_parts.append(f"{k}={v_item}")
         attr_str = ", ".join(attr_str_parts)
         children_repr_list = []
-        for k, v_child in self.__dict__.items(): 
+        for k, v_child in atributos_nodo(self): 
             if isinstance(v_child, NodoAST_PLSQL):
                 children_repr_list.append(f"\n{v_child.__repr__(indent + 1)}")
             elif isinstance(v_child, list) and all(isinstance(item, (NodoAST_PLSQL, Token)) for item in v_child): 
@@ -67,111 +73,137 @@ class NodoAST_PLSQL:
         elif not attr_str : base_repr += "()"
         return base_repr
 class NodoScriptPLSQL(NodoAST_PLSQL):
+    __slots__ = ("elementos",)
     def __init__(self, elementos): self.elementos = elementos
 class NodoBloquePLSQL(NodoAST_PLSQL):
+    __slots__ = ("seccion_declaracion", "seccion_ejecutable", "seccion_excepcion")
     def __init__(self, seccion_declaracion, seccion_ejecutable, seccion_excepcion=None):
         self.seccion_declaracion = seccion_declaracion 
         self.seccion_ejecutable = seccion_ejecutable   
         self.seccion_excepcion = seccion_excepcion     
 class NodoDeclaracionVariablePLSQL(NodoAST_PLSQL):
+    __slots__ = ("nombre_variable_token", "tipo_dato_nodo", "valor_inicial_nodo")
     def __init__(self, nombre_variable_token, tipo_dato_nodo, valor_inicial_nodo=None):
         self.nombre_variable_token = nombre_variable_token
         self.tipo_dato_nodo = tipo_dato_nodo 
         self.valor_inicial_nodo = valor_inicial_nodo 
 class NodoTipoDatoPLSQL(NodoAST_PLSQL):
+    __slots__ = ("tokens_tipo", "nombre_tipo_str")
     def __init__(self, tokens_tipo): 
         self.tokens_tipo = tokens_tipo
-        self.nombre_tipo_str = "".join([t.lexema for t in tokens_tipo])
-class NodoSentenciaPLSQL(NodoAST_PLSQL): pass
+        self.nombre_tipo_str = internar("".join([t.lexema for t in tokens_tipo]))
+class NodoSentenciaPLSQL(NodoAST_PLSQL):
+    __slots__ = ()
 class NodoSentenciaAsignacionPLSQL(NodoSentenciaPLSQL):
+    __slots__ = ("variable_nodo", "expresion_nodo")
     def __init__(self, variable_nodo, expresion_nodo):
         self.variable_nodo = variable_nodo 
         self.expresion_nodo = expresion_nodo 
 class NodoLlamadaProcedimientoPLSQL(NodoSentenciaPLSQL):
+    __slots__ = ("callee_nodo", "argumentos_nodos")
     def __init__(self, callee_nodo, argumentos_nodos=None):
         self.callee_nodo = callee_nodo 
         self.argumentos_nodos = argumentos_nodos if argumentos_nodos is not None else []
 class NodoSentenciaLoopPLSQL(NodoSentenciaPLSQL):
+    __slots__ = ("cuerpo_sentencias",)
     def __init__(self, cuerpo_sentencias):
         self.cuerpo_sentencias = cuerpo_sentencias
 class NodoSentenciaExitWhenPLSQL(NodoSentenciaPLSQL):
+    __slots__ = ("condicion_nodo",)
     def __init__(self, condicion_nodo):
         self.condicion_nodo = condicion_nodo
 class NodoSentenciaIfPLSQL(NodoSentenciaPLSQL):
+    __slots__ = ("casos_if_elsif", "cuerpo_else")
     def __init__(self, casos_if_elsif, cuerpo_else=None):
         self.casos_if_elsif = casos_if_elsif
         self.cuerpo_else = cuerpo_else 
 class NodoSelect(NodoSentenciaPLSQL): 
+    __slots__ = ("columnas_select_nodos", "tabla_from_token", "where_condicion_nodo", "into_clausula_nodos")
     def __init__(self, columnas_select_nodos, tabla_from_token, where_condicion_nodo=None, into_clausula_nodos=None):
         self.columnas_select_nodos = columnas_select_nodos 
         self.tabla_from_token = tabla_from_token         
         self.where_condicion_nodo = where_condicion_nodo 
         self.into_clausula_nodos = into_clausula_nodos   
 class NodoSeccionExcepcionPLSQL(NodoAST_PLSQL):
+    __slots__ = ("clausulas_when",)
     def __init__(self, clausulas_when):
         self.clausulas_when = clausulas_when 
 class NodoClausulaWhenPLSQL(NodoAST_PLSQL):
+    __slots__ = ("nombres_excepcion_tokens", "cuerpo_sentencias_nodos")
     def __init__(self, nombres_excepcion_tokens, cuerpo_sentencias_nodos):
         self.nombres_excepcion_tokens = nombres_excepcion_tokens
         self.cuerpo_sentencias_nodos = cuerpo_sentencias_nodos
 class NodoSentenciaForLoopPLSQL(NodoSentenciaPLSQL):
+    __slots__ = ("variable_iteracion_token", "es_reverse", "expresion_inicio_nodo", "expresion_fin_nodo",
+                 "cuerpo_sentencias_nodos")
     def __init__(self, variable_iteracion_token, es_reverse, expresion_inicio_nodo, expresion_fin_nodo, cuerpo_sentencias_nodos):
         self.variable_iteracion_token = variable_iteracion_token 
         self.es_reverse = es_reverse                         
         self.expresion_inicio_nodo = expresion_inicio_nodo     
         self.expresion_fin_nodo = expresion_fin_nodo         
         self.cuerpo_sentencias_nodos = cuerpo_sentencias_nodos 
-class NodoExpresionSQL(NodoAST_PLSQL): pass
+class NodoExpresionSQL(NodoAST_PLSQL):
+    __slots__ = ()
 NodoExpresionPLSQL = NodoExpresionSQL 
 class NodoIdentificadorPLSQL(NodoExpresionPLSQL):
+    __slots__ = ("id_token", "nombre")
     def __init__(self, id_token):
         self.id_token = id_token
-        self.nombre = id_token.lexema 
+        self.nombre = internar(id_token.lexema) 
 class NodoLiteralPLSQL(NodoExpresionPLSQL):
+    __slots__ = ("literal_token", "valor")
     def __init__(self, literal_token):
         self.literal_token = literal_token
         self.valor = literal_token.valor 
 class NodoExpresionBinariaPLSQL(NodoExpresionPLSQL):
+    __slots__ = ("operador_token", "izquierda_nodo", "derecha_nodo", "operador")
     def __init__(self, operador_token, izquierda_nodo, derecha_nodo):
         self.operador_token = operador_token
         self.izquierda_nodo = izquierda_nodo
         self.derecha_nodo = derecha_nodo
-        self.operador = operador_token.lexema
+        self.operador = internar(operador_token.lexema)
 class NodoMiembroExpresionPLSQL(NodoExpresionPLSQL):
+    __slots__ = ("objeto_nodo", "miembro_token", "nombre_miembro")
     def __init__(self, objeto_nodo, miembro_token):
         self.objeto_nodo = objeto_nodo 
         self.miembro_token = miembro_token 
-        self.nombre_miembro = miembro_token.lexema
+        self.nombre_miembro = internar(miembro_token.lexema)
 class NodoFuncionSQL(NodoExpresionPLSQL): 
+    __slots__ = ("nombre_funcion_token", "argumentos_nodos", "nombre_funcion")
     def __init__(self, nombre_funcion_token, argumentos_nodos=None):
         self.nombre_funcion_token = nombre_funcion_token 
         self.argumentos_nodos = argumentos_nodos if argumentos_nodos is not None else [] 
-        self.nombre_funcion = nombre_funcion_token.lexema
+        self.nombre_funcion = internar(nombre_funcion_token.lexema)
 class NodoAsteriscoSQL(NodoExpresionPLSQL): 
+    __slots__ = ("asterisco_token",)
     def __init__(self, asterisco_token):
         self.asterisco_token = asterisco_token
 class NodoExpresionUnariaPLSQL(NodoExpresionPLSQL): 
+    __slots__ = ("operador_token", "operando_nodo", "operador")
     def __init__(self, operador_token, operando_nodo):
         self.operador_token = operador_token
         self.operando_nodo = operando_nodo
-        self.operador = operador_token.lexema
+        self.operador = internar(operador_token.lexema)
 class NodoSentenciaRaisePLSQL(NodoSentenciaPLSQL):
+    __slots__ = ("exception_name_token",)
     def __init__(self, exception_name_token=None):
         self.exception_name_token = exception_name_token
 # --- Clase ParserPLSQL ---
 class ParserPLSQL:
     def __init__(self, tokens):
-        self.tokens = [token for token in tokens if token.tipo != TT_WHITESPACE_PLSQL]
+        # Lista de tokens o generador (`LexerPLSQL.generar_tokens()`), ver FlujoTokens
+        self.tokens = FlujoTokens(tokens, ignorar=(TT_WHITESPACE_PLSQL,))
         self.posicion_actual = 0
         self.token_actual = self.tokens[self.posicion_actual] if self.tokens else None
         self.errores_sintacticos = []
 
     def _avanzar(self):
         self.posicion_actual += 1
-        if self.posicion_actual < len(self.tokens):
+        if self.tokens.hay(self.posicion_actual):
             self.token_actual = self.tokens[self.posicion_actual]
         else:
-            self.token_actual = self.tokens[-1] if self.tokens and self.tokens[-1].tipo == TT_EOF_PLSQL else None
+            ultimo = self.tokens.ultimo()
+            self.token_actual = ultimo if ultimo and ultimo.tipo == TT_EOF_PLSQL else None
 
     def _error_sintactico(self, mensaje_esperado):
         mensaje = "Error Sintáctico Desconocido en PL/SQL"
@@ -182,8 +214,7 @@ class ParserPLSQL:
             mensaje = (f"Error Sintáctico PL/SQL: Final inesperado del archivo (L{self.token_actual.linea}:C{self.token_actual.columna}). "
                        f"Se esperaba {mensaje_esperado}.")
         else: 
-            last_token_info = self.tokens[self.posicion_actual -1] if self.posicion_actual > 0 and self.posicion_actual <= len(self.tokens) else \
-                              (self.tokens[-1] if self.tokens else None) 
+            last_token_info = self.tokens.ultimo()
             linea_aprox = last_token_info.linea if last_token_info else 'desconocida'
             col_aprox = last_token_info.columna if last_token_info else 'desconocida'
             mensaje = (f"Error Sintáctico PL/SQL: Final inesperado de la entrada (cerca de L{linea_aprox}:C{col_aprox}). "
@@ -212,6 +243,32 @@ class ParserPLSQL:
                 self._error_sintactico(f"un token de tipo '{tipo_token_esperado}', pero se encontró '{lexema_encontrado}' (tipo: {tipo_encontrado})")
         return None 
 
+    @staticmethod
+    def cortes_lotes(tokens):
+        """
+        Límites de los lotes del script para `nucleo_compilador.lotes_paralelos`:
+        [0, c1, ..., índice del EOF] sobre `tokens` (el AlmacenTokens completo). Como en
+        SQL*Plus, un lote termina en una barra '/' sola en su línea; con más tokens en la
+        línea es una división y no corta.
+        """
+        fin = len(tokens) - 1 # EOF
+        cortes = [0]
+        linea_anterior = 0 # Línea del último token significativo
+        for indice in range(fin):
+            tipo = tokens.tipo(indice)
+            if tipo == TT_WHITESPACE_PLSQL:
+                continue
+            linea = tokens.posicion(indice)[0]
+            if tipo == TT_OPERADOR_ARITMETICO_PLSQL and linea > linea_anterior and tokens.lexema(indice) == '/':
+                siguiente = indice + 1
+                while siguiente < fin and tokens.tipo(siguiente) == TT_WHITESPACE_PLSQL:
+                    siguiente += 1
+                if siguiente < fin and tokens.posicion(siguiente)[0] > linea:
+                    cortes.append(indice + 1)
+            linea_anterior = linea
+        cortes.append(fin)
+        return cortes
+
     def parse(self):
         ast_script_nodo = None
         try:
@@ -366,7 +423,7 @@ class ParserPLSQL:
         if self.token_actual is None: return None
         if self.token_actual.tipo == TT_IDENTIFICADOR_PLSQL:
             siguiente_token_pos = self.posicion_actual + 1
-            if siguiente_token_pos < len(self.tokens):
+            if self.tokens.hay(siguiente_token_pos):
                 siguiente_token = self.tokens[siguiente_token_pos]
                 if siguiente_token.tipo == TT_OPERADOR_ASIGNACION_PLSQL: 
                     return self._parse_sentencia_asignacion_plsql()
@@ -542,97 +599,8 @@ class ParserPLSQL:
         return elementos
 
     def _parse_expresion_plsql(self):
-        return self._parse_expresion_logica_or_plsql()
-
-    def _parse_expresion_logica_or_plsql(self):
-        nodo = self._parse_expresion_logica_and_plsql()
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR_LOGICO_PLSQL and \
-              self.token_actual.lexema.lower() == 'or':
-            op_token = self._consumir(TT_OPERADOR_LOGICO_PLSQL)
-            nodo_der = self._parse_expresion_logica_and_plsql()
-            nodo = NodoExpresionBinariaPLSQL(op_token, nodo, nodo_der)
-        return nodo
-
-    def _parse_expresion_logica_and_plsql(self):
-        nodo = self._parse_expresion_unaria_logica_plsql() 
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR_LOGICO_PLSQL and \
-              self.token_actual.lexema.lower() == 'and':
-            op_token = self._consumir(TT_OPERADOR_LOGICO_PLSQL)
-            nodo_der = self._parse_expresion_unaria_logica_plsql()
-            nodo = NodoExpresionBinariaPLSQL(op_token, nodo, nodo_der)
-        return nodo
-
-    def _parse_expresion_unaria_logica_plsql(self): 
-        if self.token_actual and self.token_actual.tipo == TT_OPERADOR_LOGICO_PLSQL and \
-           self.token_actual.lexema.lower() == 'not':
-            op_token = self._consumir(TT_OPERADOR_LOGICO_PLSQL)
-            operando_nodo = self._parse_expresion_unaria_logica_plsql() 
-            return NodoExpresionUnariaPLSQL(op_token, operando_nodo)
-        return self._parse_expresion_comparativa_plsql()
-
-    def _parse_expresion_comparativa_plsql(self):
-        nodo_izq = self._parse_expresion_concatenacion_plsql()
-        if self.token_actual and self.token_actual.tipo == TT_OPERADOR_COMPARACION_PLSQL:
-            if self.token_actual.lexema.lower() == 'is':
-                op_is_token = self._consumir(TT_OPERADOR_COMPARACION_PLSQL)
-                op_not_null_token = None
-                if self.token_actual and self.token_actual.tipo == TT_OPERADOR_LOGICO_PLSQL and \
-                   self.token_actual.lexema.lower() == 'not':
-                    op_not_null_token = self._consumir(TT_OPERADOR_LOGICO_PLSQL)
-                self._consumir(TT_PALABRA_CLAVE_PLSQL, 'null')
-                lexema_op_is = op_is_token.lexema + (" " + op_not_null_token.lexema if op_not_null_token else "") + " NULL"
-                token_is_null_completo = Token(TT_OPERADOR_COMPARACION_PLSQL, lexema_op_is, op_is_token.linea, op_is_token.columna)
-                return NodoExpresionBinariaPLSQL(token_is_null_completo, nodo_izq, NodoLiteralPLSQL(Token(TT_LITERAL_NULL_PLSQL, "NULL",0,0, None)))
-            while self.token_actual and self.token_actual.tipo == TT_OPERADOR_COMPARACION_PLSQL:
-                op_token = self._consumir(TT_OPERADOR_COMPARACION_PLSQL)
-                nodo_der = self._parse_expresion_concatenacion_plsql()
-                nodo_izq = NodoExpresionBinariaPLSQL(op_token, nodo_izq, nodo_der)
-        return nodo_izq
-
-    def _parse_expresion_concatenacion_plsql(self):
-        nodo = self._parse_expresion_aditiva_plsql()
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR_CONCATENACION_PLSQL:
-            op_token = self._consumir(TT_OPERADOR_CONCATENACION_PLSQL)
-            nodo_der = self._parse_expresion_aditiva_plsql()
-            nodo = NodoExpresionBinariaPLSQL(op_token, nodo, nodo_der)
-        return nodo
-
-    def _parse_expresion_aditiva_plsql(self):
-        nodo = self._parse_expresion_multiplicativa_plsql()
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR_ARITMETICO_PLSQL and \
-              self.token_actual.lexema in ['+', '-']:
-            op_token = self._consumir(TT_OPERADOR_ARITMETICO_PLSQL)
-            nodo_der = self._parse_expresion_multiplicativa_plsql()
-            nodo = NodoExpresionBinariaPLSQL(op_token, nodo, nodo_der)
-        return nodo
-
-    def _parse_expresion_multiplicativa_plsql(self):
-        nodo = self._parse_expresion_exponencial_plsql() 
-        while self.token_actual and \
-              ( (self.token_actual.tipo == TT_OPERADOR_ARITMETICO_PLSQL and self.token_actual.lexema in ['/', '%']) or \
-                (self.token_actual.tipo == TT_ASTERISCO and self.token_actual.lexema == '*') ): 
-            op_token = self._consumir(self.token_actual.tipo) 
-            nodo_der = self._parse_expresion_exponencial_plsql()
-            nodo = NodoExpresionBinariaPLSQL(op_token, nodo, nodo_der)
-        return nodo
-
-    def _parse_expresion_exponencial_plsql(self):
-        nodo = self._parse_expresion_unaria_plsql()
-        if self.token_actual and self.token_actual.tipo == TT_OPERADOR_ARITMETICO_PLSQL and \
-           self.token_actual.lexema == '**':
-            op_token = self._consumir(TT_OPERADOR_ARITMETICO_PLSQL)
-            nodo_der = self._parse_expresion_exponencial_plsql() 
-            nodo = NodoExpresionBinariaPLSQL(op_token, nodo, nodo_der)
-        return nodo
-
-    def _parse_expresion_unaria_plsql(self):
-        # Maneja operadores unarios + y -
-        if self.token_actual and self.token_actual.tipo == TT_OPERADOR_ARITMETICO_PLSQL and \
-           self.token_actual.lexema in ['+', '-']:
-            op_token = self._consumir(TT_OPERADOR_ARITMETICO_PLSQL)
-            operando_nodo = self._parse_expresion_unaria_plsql()
-            return NodoExpresionUnariaPLSQL(op_token, operando_nodo)
-        return self._parse_expresion_primaria_plsql()
+        # Niveles de operadores en TABLA_EXPRESIONES_PLSQL.
+        return analizar_expresion(self, TABLA_EXPRESIONES_PLSQL, self._parse_expresion_primaria_plsql)
 
     def _parse_expresion_primaria_plsql(self):
         token = self.token_actual
@@ -702,3 +670,41 @@ class ParserPLSQL:
         return NodoSentenciaRaisePLSQL(exception_name_token)
 
 # Fin de la clase ParserPLSQL
+
+
+def _analizar_comparacion_plsql(parser, op_token, nodo_izq):
+    """
+    Comparaciones tras un operando: `IS [NOT] NULL` si la primera es `is` (y ahí termina
+    la comparación); si no, una cadena `a = b <> c ...` agrupada por la izquierda.
+    """
+    if op_token.lexema.lower() == 'is':
+        op_is_token = parser._consumir(TT_OPERADOR_COMPARACION_PLSQL)
+        op_not_null_token = None
+        if parser.token_actual and parser.token_actual.tipo == TT_OPERADOR_LOGICO_PLSQL and \
+           parser.token_actual.lexema.lower() == 'not':
+            op_not_null_token = parser._consumir(TT_OPERADOR_LOGICO_PLSQL)
+        parser._consumir(TT_PALABRA_CLAVE_PLSQL, 'null')
+        lexema_op_is = op_is_token.lexema + (" " + op_not_null_token.lexema if op_not_null_token else "") + " NULL"
+        token_is_null_completo = Token(TT_OPERADOR_COMPARACION_PLSQL, lexema_op_is, op_is_token.linea, op_is_token.columna)
+        return NodoExpresionBinariaPLSQL(token_is_null_completo, nodo_izq, NodoLiteralPLSQL(Token(TT_LITERAL_NULL_PLSQL, "NULL",0,0, None)))
+    while parser.token_actual and parser.token_actual.tipo == TT_OPERADOR_COMPARACION_PLSQL:
+        op_token = parser._consumir(TT_OPERADOR_COMPARACION_PLSQL)
+        nodo_der = analizar_expresion(parser, TABLA_EXPRESIONES_PLSQL, parser._parse_expresion_primaria_plsql, _NIVEL_CONCATENACION_PLSQL)
+        nodo_izq = NodoExpresionBinariaPLSQL(op_token, nodo_izq, nodo_der)
+    return nodo_izq
+
+
+# Operadores de las expresiones PL/SQL por nivel de precedencia (mayor = se agrupa antes).
+_NIVEL_CONCATENACION_PLSQL = 5
+TABLA_EXPRESIONES_PLSQL = TablaPratt(insensible_mayusculas=True)
+TABLA_EXPRESIONES_PLSQL.infijo(1, TT_OPERADOR_LOGICO_PLSQL, ['or'], NodoExpresionBinariaPLSQL)
+TABLA_EXPRESIONES_PLSQL.infijo(2, TT_OPERADOR_LOGICO_PLSQL, ['and'], NodoExpresionBinariaPLSQL)
+TABLA_EXPRESIONES_PLSQL.prefijo(3, TT_OPERADOR_LOGICO_PLSQL, ['not'], NodoExpresionUnariaPLSQL)
+TABLA_EXPRESIONES_PLSQL.infijo(4, TT_OPERADOR_COMPARACION_PLSQL, None, NodoExpresionBinariaPLSQL,
+                               asociatividad=NO_ASOCIATIVO, analizar=_analizar_comparacion_plsql)
+TABLA_EXPRESIONES_PLSQL.infijo(_NIVEL_CONCATENACION_PLSQL, TT_OPERADOR_CONCATENACION_PLSQL, None, NodoExpresionBinariaPLSQL)
+TABLA_EXPRESIONES_PLSQL.infijo(6, TT_OPERADOR_ARITMETICO_PLSQL, ['+', '-'], NodoExpresionBinariaPLSQL)
+TABLA_EXPRESIONES_PLSQL.infijo(7, TT_OPERADOR_ARITMETICO_PLSQL, ['/', '%'], NodoExpresionBinariaPLSQL)
+TABLA_EXPRESIONES_PLSQL.infijo(7, TT_ASTERISCO, ['*'], NodoExpresionBinariaPLSQL)
+TABLA_EXPRESIONES_PLSQL.infijo(8, TT_OPERADOR_ARITMETICO_PLSQL, ['**'], NodoExpresionBinariaPLSQL, asociatividad=DERECHA)
+TABLA_EXPRESIONES_PLSQL.prefijo(9, TT_OPERADOR_ARITMETICO_PLSQL, ['+', '-'], NodoExpresionUnariaPLSQL)
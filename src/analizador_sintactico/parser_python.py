@@ -7,7 +7,7 @@ try:
         TT_CADENA, TT_OPERADOR, TT_DELIMITADOR, TT_EOF, TT_ERROR_LEXICO,
         TT_INDENT, TT_DEDENT, TT_NUEVA_LINEA 
     )
-    from analizador_lexico.lexer_python import Token
+    from analizador_lexico.lexer_python import Token, LexerPython
 except ImportError:
     print("ADVERTENCIA CRÍTICA (ParserPython): No se pudieron importar los tipos de token de LexerPython.")
     # Definir placeholders
@@ -17,13 +17,19 @@ except ImportError:
     TT_ERROR_LEXICO = "ERROR_LEXICO_PYTHON"
     TT_INDENT, TT_DEDENT, TT_NUEVA_LINEA = "INDENT", "DEDENT", "NUEVA_LINEA"
     class Token: pass
+    LexerPython = None
+
+from src.nucleo_compilador.pratt import TablaPratt, analizar_expresion, DERECHA, NO_ASOCIATIVO
+from src.nucleo_compilador.nodos_ast import atributos_nodo
+from src.nucleo_compilador.internado import internar
 
 # --- Definiciones de Nodos del AST para Python ---
 class NodoAST_Python:
     """Clase base para todos los nodos del AST de Python."""
+    __slots__ = ()
     def __repr__(self, indent=0):
         indent_str = "  " * indent
-        attrs = {k: v for k, v in self.__dict__.items() if not k.startswith('_') and not isinstance(v, list) and not isinstance(v, NodoAST_Python) and v is not None}
+        attrs = {k: v for k, v in atributos_nodo(self) if not k.startswith('_') and not isinstance(v, list) and not isinstance(v, NodoAST_Python) and v is not None}
         attr_str_parts = []
         for k,v_item in attrs.items(): 
             if isinstance(v_item, Token): attr_str_parts.append(f"{k}='{v_item.lexema}'")
@@ -32,7 +38,7 @@ class NodoAST_Python:
         attr_str = ", ".join(attr_str_parts)
         
         children_repr_list = []
-        for k, v_child in self.__dict__.items(): 
+        for k, v_child in atributos_nodo(self): 
             if isinstance(v_child, NodoAST_Python):
                 children_repr_list.append(f"\n{v_child.__repr__(indent + 1)}")
             elif isinstance(v_child, list) and all(isinstance(item, (NodoAST_Python, Token)) for item in v_child): 
@@ -50,47 +56,58 @@ class NodoAST_Python:
         return base_repr
 
 class NodoModulo(NodoAST_Python):
+    __slots__ = ("cuerpo_sentencias",)
     def __init__(self, cuerpo_sentencias):
         self.cuerpo_sentencias = cuerpo_sentencias 
 
-class NodoSentencia(NodoAST_Python): pass
-class NodoExpresion(NodoAST_Python): pass
+class NodoSentencia(NodoAST_Python):
+    __slots__ = ()
+class NodoExpresion(NodoAST_Python):
+    __slots__ = ()
 
 class NodoDefinicionFuncion(NodoSentencia):
+    __slots__ = ("nombre_funcion_token", "parametros_tokens", "cuerpo_bloque_nodo")
     def __init__(self, nombre_funcion_token, parametros_tokens, cuerpo_bloque_nodo):
         self.nombre_funcion_token = nombre_funcion_token
         self.parametros_tokens = parametros_tokens 
         self.cuerpo_bloque_nodo = cuerpo_bloque_nodo 
 
 class NodoBloque(NodoAST_Python): 
+    __slots__ = ("sentencias",)
     def __init__(self, sentencias):
         self.sentencias = sentencias
 
 class NodoSentenciaExpresion(NodoSentencia):
+    __slots__ = ("expresion_nodo",)
     def __init__(self, expresion_nodo):
         self.expresion_nodo = expresion_nodo
 
 class NodoAsignacion(NodoSentencia):
+    __slots__ = ("objetivo_nodo", "valor_nodo")
     def __init__(self, objetivo_nodo, valor_nodo):
         self.objetivo_nodo = objetivo_nodo 
         self.valor_nodo = valor_nodo     
 
 class NodoSentenciaIf(NodoSentencia):
+    __slots__ = ("prueba_nodo", "cuerpo_then_nodo", "cuerpo_else_nodo")
     def __init__(self, prueba_nodo, cuerpo_then_nodo, cuerpo_else_nodo=None):
         self.prueba_nodo = prueba_nodo
         self.cuerpo_then_nodo = cuerpo_then_nodo
         self.cuerpo_else_nodo = cuerpo_else_nodo 
 
 class NodoSentenciaReturn(NodoSentencia):
+    __slots__ = ("valor_retorno_nodo",)
     def __init__(self, valor_retorno_nodo=None): 
         self.valor_retorno_nodo = valor_retorno_nodo
 
 class NodoSentenciaWhile(NodoSentencia):
+    __slots__ = ("condicion_nodo", "cuerpo_bloque_nodo")
     def __init__(self, condicion_nodo, cuerpo_bloque_nodo):
         self.condicion_nodo = condicion_nodo
         self.cuerpo_bloque_nodo = cuerpo_bloque_nodo
 
 class NodoSentenciaFor(NodoSentencia):
+    __slots__ = ("variable_iteracion_token", "expresion_iterable_nodo", "cuerpo_bloque_nodo")
     def __init__(self, variable_iteracion_token, expresion_iterable_nodo, cuerpo_bloque_nodo):
         self.variable_iteracion_token = variable_iteracion_token 
         self.expresion_iterable_nodo = expresion_iterable_nodo 
@@ -99,42 +116,72 @@ class NodoSentenciaFor(NodoSentencia):
 # --- NODOS AST PARA BREAK Y CONTINUE ACTUALIZADOS ---
 class NodoSentenciaBreak(NodoSentencia):
     """Representa una sentencia 'break'."""
+    __slots__ = ("token",)
     def __init__(self, token): # Almacena el token 'break'
         self.token = token
 
 class NodoSentenciaContinue(NodoSentencia):
     """Representa una sentencia 'continue'."""
+    __slots__ = ("token",)
     def __init__(self, token): # Almacena el token 'continue'
         self.token = token
 # --- FIN DE NODOS AST ACTUALIZADOS ---
 
 class NodoLlamadaFuncion(NodoExpresion):
+    __slots__ = ("callee_nodo", "argumentos_nodos")
     def __init__(self, callee_nodo, argumentos_nodos):
         self.callee_nodo = callee_nodo         
         self.argumentos_nodos = argumentos_nodos 
 
 class NodoIdentificador(NodoExpresion):
+    __slots__ = ("id_token", "nombre")
     def __init__(self, id_token):
         self.id_token = id_token
-        self.nombre = id_token.lexema
+        self.nombre = internar(id_token.lexema)
 
 class NodoLiteral(NodoExpresion):
+    __slots__ = ("literal_token", "valor")
     def __init__(self, literal_token):
         self.literal_token = literal_token
         self.valor = literal_token.valor 
 
+class NodoCadenaFormateada(NodoLiteral):
+    """
+    f-string dividida por el parser: `partes` es una lista de textos (str, con `{{` y `}}`
+    ya reducidos) y NodoInterpolacion, en orden.
+    """
+    __slots__ = ("partes",)
+    def __init__(self, literal_token, partes):
+        super().__init__(literal_token)
+        self.partes = partes
+
+class NodoInterpolacion(NodoExpresion):
+    """
+    Un `{expresion!conversion:formato}` de una f-string. `formato` tiene la misma forma que
+    `NodoCadenaFormateada.partes` (admite `{...}` anidados); `texto` es el original, que se
+    muestra tal cual si la evaluación falla.
+    """
+    __slots__ = ("expresion_nodo", "conversion", "formato", "texto")
+    def __init__(self, expresion_nodo, conversion, formato, texto):
+        self.expresion_nodo = expresion_nodo
+        self.conversion = conversion # 'r', 's', 'a' o None
+        self.formato = formato
+        self.texto = texto
+
 class NodoExpresionBinaria(NodoExpresion):
+    __slots__ = ("izquierda_nodo", "operador_token", "derecha_nodo", "operador")
     def __init__(self, izquierda_nodo, operador_token, derecha_nodo):
         self.izquierda_nodo = izquierda_nodo
         self.operador_token = operador_token
         self.derecha_nodo = derecha_nodo
-        self.operador = operador_token.lexema
+        self.operador = internar(operador_token.lexema)
 
 class NodoExpresionUnaria(NodoExpresion): 
+    __slots__ = ("operador_token", "operando_nodo", "operador")
     def __init__(self, operador_token, operando_nodo):
         self.operador_token = operador_token
         self.operando_nodo = operando_nodo
-        self.operador = operador_token.lexema
+        self.operador = internar(operador_token.lexema)
 # --- Fin de Definiciones de Nodos del AST ---
 
 
@@ -409,93 +456,16 @@ class ParserPython:
             self._avanzar() 
 
     def _parse_expresion_python(self):
-        return self._parse_expresion_logica_or_python()
-
-    def _parse_expresion_logica_or_python(self):
-        nodo = self._parse_expresion_logica_and_python()
-        while self.token_actual and self.token_actual.tipo == TT_PALABRA_CLAVE and self.token_actual.lexema == 'or':
-            operador_token = self._consumir(TT_PALABRA_CLAVE, 'or')
-            nodo_derecha = self._parse_expresion_logica_and_python()
-            nodo = NodoExpresionBinaria(nodo, operador_token, nodo_derecha)
-        return nodo
-
-    def _parse_expresion_logica_and_python(self):
-        nodo = self._parse_expresion_not_python()
-        while self.token_actual and self.token_actual.tipo == TT_PALABRA_CLAVE and self.token_actual.lexema == 'and':
-            operador_token = self._consumir(TT_PALABRA_CLAVE, 'and')
-            nodo_derecha = self._parse_expresion_not_python()
-            nodo = NodoExpresionBinaria(nodo, operador_token, nodo_derecha)
-        return nodo
-
-    def _parse_expresion_not_python(self):
-        if self.token_actual and self.token_actual.tipo == TT_PALABRA_CLAVE and self.token_actual.lexema == 'not':
-            operador_token = self._consumir(TT_PALABRA_CLAVE, 'not')
-            operando_nodo = self._parse_expresion_not_python() 
-            return NodoExpresionUnaria(operador_token, operando_nodo)
-        return self._parse_expresion_comparativa_python()
-
-    def _parse_expresion_comparativa_python(self):
-        nodo = self._parse_expresion_aditiva_python()
-        ops_comparacion = ['<', '>', '==', '!=', '<=', '>=', 'in', 'is'] 
-        
-        while self.token_actual and \
-              ((self.token_actual.tipo == TT_OPERADOR and self.token_actual.lexema in ops_comparacion) or \
-               (self.token_actual.tipo == TT_PALABRA_CLAVE and self.token_actual.lexema in ['in', 'is'])):
-            
-            operador_token = self.token_actual
-            self._avanzar() 
-
-            if operador_token.lexema == 'not' and self.token_actual and self.token_actual.lexema == 'in':
-                operador_token = Token(TT_OPERADOR, "not in", operador_token.linea, operador_token.columna) # Crear un nuevo token combinado
-                self._consumir(TT_PALABRA_CLAVE, 'in') 
-            elif operador_token.lexema == 'is' and self.token_actual and self.token_actual.lexema == 'not':
-                operador_token = Token(TT_OPERADOR, "is not", operador_token.linea, operador_token.columna) # Crear un nuevo token combinado
-                self._consumir(TT_PALABRA_CLAVE, 'not') 
-
-            nodo_derecha = self._parse_expresion_aditiva_python()
-            nodo = NodoExpresionBinaria(nodo, operador_token, nodo_derecha)
-            break 
-        return nodo
-
-    def _parse_expresion_aditiva_python(self):
-        nodo = self._parse_termino_multiplicativo_python() 
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR and \
-              self.token_actual.lexema in ['+', '-']:
-            operador_token = self._consumir(TT_OPERADOR)
-            nodo_derecha = self._parse_termino_multiplicativo_python()
-            nodo = NodoExpresionBinaria(nodo, operador_token, nodo_derecha)
-        return nodo
-
-    def _parse_termino_multiplicativo_python(self):
-        nodo = self._parse_factor_potencia_python()
-        while self.token_actual and self.token_actual.tipo == TT_OPERADOR and \
-              self.token_actual.lexema in ['*', '/', '//', '%']:
-            operador_token = self._consumir(TT_OPERADOR)
-            nodo_derecha = self._parse_factor_potencia_python()
-            nodo = NodoExpresionBinaria(nodo, operador_token, nodo_derecha)
-        return nodo
-
-    def _parse_factor_potencia_python(self):
-        nodo = self._parse_expresion_unaria_python() 
-        if self.token_actual and self.token_actual.tipo == TT_OPERADOR and \
-           self.token_actual.lexema == '**':
-            operador_token = self._consumir(TT_OPERADOR)
-            nodo_derecha = self._parse_factor_potencia_python() 
-            nodo = NodoExpresionBinaria(nodo, operador_token, nodo_derecha)
-        return nodo
-
-    def _parse_expresion_unaria_python(self):
-        if self.token_actual and self.token_actual.tipo == TT_OPERADOR and \
-           self.token_actual.lexema in ['+', '-', '~']: 
-            operador_token = self._consumir(TT_OPERADOR)
-            operando_nodo = self._parse_expresion_unaria_python() 
-            return NodoExpresionUnaria(operador_token, operando_nodo)
-        return self._parse_expresion_primaria_python()
+        # Operadores lógicos, de comparación, aritméticos y unarios (ver TABLA_EXPRESIONES_PYTHON)
+        return analizar_expresion(self, TABLA_EXPRESIONES_PYTHON, self._parse_expresion_primaria_python)
 
     def _parse_expresion_primaria_python(self):
         token = self.token_actual
         if token is None: self._error_sintactico("una expresión")
 
+        if token.tipo == TT_CADENA and token.lexema.lower().startswith(PREFIJOS_CADENA_FORMATEADA):
+            cadena_token = self._consumir(TT_CADENA)
+            return NodoCadenaFormateada(cadena_token, self._dividir_cadena_formateada(str(cadena_token.valor), cadena_token))
         if token.tipo in [TT_ENTERO, TT_FLOTANTE, TT_CADENA]:
             return NodoLiteral(self._consumir(token.tipo))
         elif token.tipo == TT_PALABRA_CLAVE and token.lexema in ['True', 'False', 'None']:
@@ -544,4 +514,162 @@ class ParserPython:
         else:
             self._consumir_hasta_nueva_linea_o_eof()
             return None 
+
+    # --- f-strings ---
+    def _dividir_cadena_formateada(self, texto, cadena_token):
+        """
+        Divide el contenido de una f-string en textos y NodoInterpolacion. Un `{` sin cierre o
+        un `{...}` cuya expresión no se puede analizar se quedan como texto.
+        """
+        partes = []
+        literal = []
+        i, n = 0, len(texto)
+        while i < n:
+            caracter = texto[i]
+            if caracter in '{}' and texto.startswith(caracter * 2, i):
+                literal.append(caracter)
+                i += 2
+                continue
+            if caracter == '{':
+                fin, pos_conversion, pos_formato = _fin_interpolacion(texto, i + 1)
+                if fin == -1:
+                    literal.append(texto[i:])
+                    break
+                interpolacion = self._parse_interpolacion(texto, i, fin, pos_conversion, pos_formato, cadena_token)
+                if interpolacion is None:
+                    literal.append(texto[i:fin + 1])
+                else:
+                    if literal:
+                        partes.append("".join(literal))
+                        literal = []
+                    partes.append(interpolacion)
+                i = fin + 1
+                continue
+            literal.append(caracter)
+            i += 1
+        if literal:
+            partes.append("".join(literal))
+        return partes
+
+    def _parse_interpolacion(self, texto, inicio, fin, pos_conversion, pos_formato, cadena_token):
+        fin_expresion = pos_conversion if pos_conversion != -1 else (pos_formato if pos_formato != -1 else fin)
+        conversion = None
+        if pos_conversion != -1:
+            conversion = texto[pos_conversion + 1:pos_formato if pos_formato != -1 else fin].strip()
+            if conversion not in ('r', 's', 'a'):
+                return None
+        formato = []
+        if pos_formato != -1:
+            formato = self._dividir_cadena_formateada(texto[pos_formato + 1:fin], cadena_token)
+        expresion_nodo = _parse_expresion_interpolada(texto[inicio + 1:fin_expresion], cadena_token)
+        if expresion_nodo is None:
+            return None
+        return NodoInterpolacion(expresion_nodo, conversion, formato, texto[inicio:fin + 1])
 # Fin de la clase ParserPython
+
+
+PREFIJOS_CADENA_FORMATEADA = ('f"', "f'", 'rf"', "rf'", 'fr"', "fr'")
+
+
+def _binaria_python(operador_token, izquierda_nodo, derecha_nodo):
+    return NodoExpresionBinaria(izquierda_nodo, operador_token, derecha_nodo)
+
+
+def _analizar_is_python(parser, operador_token, izquierda_nodo):
+    """`is` / `is not`: el segundo caso se une en un único token de operador."""
+    parser._avanzar()
+    if parser.token_actual and parser.token_actual.lexema == 'not':
+        operador_token = Token(TT_OPERADOR, "is not", operador_token.linea, operador_token.columna) # Crear un nuevo token combinado
+        parser._consumir(TT_PALABRA_CLAVE, 'not')
+    derecha_nodo = analizar_expresion(parser, TABLA_EXPRESIONES_PYTHON, parser._parse_expresion_primaria_python, _NIVEL_ADITIVO_PYTHON)
+    return NodoExpresionBinaria(izquierda_nodo, operador_token, derecha_nodo)
+
+
+# Operadores de las expresiones Python por nivel de precedencia (mayor = se agrupa antes).
+# Las comparaciones no se encadenan: `a < b < c` deja `< c` sin consumir.
+_NIVEL_ADITIVO_PYTHON = 5
+TABLA_EXPRESIONES_PYTHON = TablaPratt()
+TABLA_EXPRESIONES_PYTHON.infijo(1, TT_PALABRA_CLAVE, ['or'], _binaria_python)
+TABLA_EXPRESIONES_PYTHON.infijo(2, TT_PALABRA_CLAVE, ['and'], _binaria_python)
+TABLA_EXPRESIONES_PYTHON.prefijo(3, TT_PALABRA_CLAVE, ['not'], NodoExpresionUnaria)
+TABLA_EXPRESIONES_PYTHON.infijo(4, TT_OPERADOR, ['<', '>', '==', '!=', '<=', '>=', 'in'], _binaria_python, asociatividad=NO_ASOCIATIVO)
+TABLA_EXPRESIONES_PYTHON.infijo(4, TT_PALABRA_CLAVE, ['in'], _binaria_python, asociatividad=NO_ASOCIATIVO)
+TABLA_EXPRESIONES_PYTHON.infijo(4, TT_OPERADOR, ['is'], _binaria_python, asociatividad=NO_ASOCIATIVO, analizar=_analizar_is_python)
+TABLA_EXPRESIONES_PYTHON.infijo(4, TT_PALABRA_CLAVE, ['is'], _binaria_python, asociatividad=NO_ASOCIATIVO, analizar=_analizar_is_python)
+TABLA_EXPRESIONES_PYTHON.infijo(_NIVEL_ADITIVO_PYTHON, TT_OPERADOR, ['+', '-'], _binaria_python)
+TABLA_EXPRESIONES_PYTHON.infijo(6, TT_OPERADOR, ['*', '/', '//', '%'], _binaria_python)
+TABLA_EXPRESIONES_PYTHON.infijo(7, TT_OPERADOR, ['**'], _binaria_python, asociatividad=DERECHA)
+TABLA_EXPRESIONES_PYTHON.prefijo(8, TT_OPERADOR, ['+', '-', '~'], NodoExpresionUnaria)
+
+
+class _ParserInterpolacion(ParserPython):
+    """ParserPython para la expresión de un `{...}`: los errores no se imprimen."""
+    def _error_sintactico(self, mensaje_esperado):
+        raise SyntaxError(mensaje_esperado)
+
+
+def _fin_interpolacion(texto, desde):
+    """
+    Busca el `}` que cierra el `{` anterior a `desde`, saltando paréntesis, corchetes, llaves y
+    cadenas de la expresión.
+
+    Returns:
+        tuple: (posición del `}`, del `!` de conversión, del `:` de formato); -1 si no hay.
+    """
+    profundidad = 0
+    comilla = None
+    pos_conversion = pos_formato = -1
+    i, n = desde, len(texto)
+    while i < n:
+        caracter = texto[i]
+        if comilla:
+            if caracter == comilla:
+                comilla = None
+        elif pos_formato != -1:
+            # Dentro del formato solo cuentan las llaves (campos anidados)
+            if caracter == '{':
+                profundidad += 1
+            elif caracter == '}':
+                if profundidad == 0:
+                    return i, pos_conversion, pos_formato
+                profundidad -= 1
+        elif caracter in '\'"':
+            comilla = caracter
+        elif caracter in '([{':
+            profundidad += 1
+        elif caracter in ')]}':
+            if profundidad == 0:
+                return (i, pos_conversion, pos_formato) if caracter == '}' else (-1, -1, -1)
+            profundidad -= 1
+        elif profundidad == 0:
+            if caracter == '!' and not texto.startswith('!=', i) and pos_conversion == -1:
+                pos_conversion = i
+            elif caracter == ':':
+                pos_formato = i
+        i += 1
+    return -1, -1, -1
+
+
+def _parse_expresion_interpolada(expresion_texto, cadena_token):
+    """
+    Analiza la expresión de un `{...}` con el lexer y el parser de Python. Sus tokens se sitúan
+    en la posición de la f-string. Devuelve None si no es una única expresión válida.
+    """
+    expresion_texto = expresion_texto.strip()
+    if not expresion_texto or LexerPython is None:
+        return None
+    tokens = []
+    for token in LexerPython(expresion_texto).tokenizar():
+        if token.tipo == TT_ERROR_LEXICO:
+            return None
+        tokens.append(Token(token.tipo, token.lexema, cadena_token.linea, cadena_token.columna, token.valor))
+    parser = _ParserInterpolacion(tokens)
+    try:
+        expresion_nodo = parser._parse_expresion_python()
+        while parser.token_actual and parser.token_actual.tipo == TT_NUEVA_LINEA:
+            parser._avanzar()
+        if parser.token_actual is None or parser.token_actual.tipo != TT_EOF:
+            return None
+    except SyntaxError:
+        return None
+    return expresion_nodo
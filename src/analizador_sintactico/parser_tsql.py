@@ -24,16 +24,22 @@ except ImportError:
     TT_PUNTO_Y_COMA, TT_PUNTO, TT_ASTERISCO = "PUNTO_Y_COMA", "PUNTO", "ASTERISCO"
     class Token: pass
 
+from src.nucleo_compilador.flujo_tokens import FlujoTokens
+from src.nucleo_compilador.pratt import TablaPratt, analizar_expresion, NO_ASOCIATIVO
+from src.nucleo_compilador.internado import internar
+
 # --- Definiciones de Nodos del AST para T-SQL ---
 
 class NodoAST_SQL:
     """Clase base para todos los nodos del AST de SQL."""
+    __slots__ = ()
     def __repr__(self, indent=0):
         indent_str = "  " * indent
         return f"{indent_str}{self.__class__.__name__}"
 
 class NodoScriptSQL(NodoAST_SQL):
     """Representa un script SQL completo, que puede contener múltiples lotes o sentencias."""
+    __slots__ = ("lotes_o_sentencias",)
     def __init__(self, lotes_o_sentencias):
         # Puede ser una lista de NodoLoteSQL o directamente una lista de NodoSentenciaSQL.
         self.lotes_o_sentencias = lotes_o_sentencias
@@ -47,6 +53,7 @@ class NodoScriptSQL(NodoAST_SQL):
 
 class NodoLoteSQL(NodoAST_SQL):
     """Representa un lote de sentencias T-SQL, usualmente separado por GO."""
+    __slots__ = ("sentencias",)
     def __init__(self, sentencias):
         self.sentencias = sentencias # Lista de NodoSentenciaSQL
 
@@ -59,11 +66,12 @@ class NodoLoteSQL(NodoAST_SQL):
 
 class NodoSentenciaSQL(NodoAST_SQL):
     """Clase base para todas las sentencias SQL."""
-    pass
+    __slots__ = ()
 
 # --- Nodos para DDL (Data Definition Language) ---
 class NodoCreateTable(NodoSentenciaSQL):
     """Representa una sentencia CREATE TABLE."""
+    __slots__ = ("nombre_tabla_token", "definiciones_columna")
     def __init__(self, nombre_tabla_token, definiciones_columna):
         self.nombre_tabla_token = nombre_tabla_token # Token IDENTIFICADOR
         self.definiciones_columna = definiciones_columna # Lista de NodoDefinicionColumna
@@ -78,6 +86,7 @@ class NodoCreateTable(NodoSentenciaSQL):
 
 class NodoDefinicionColumna(NodoAST_SQL):
     """Representa la definición de una columna en CREATE TABLE."""
+    __slots__ = ("nombre_columna_token", "tipo_dato_token", "restricciones_tokens")
     def __init__(self, nombre_columna_token, tipo_dato_token, restricciones_tokens=None):
         self.nombre_columna_token = nombre_columna_token # Token IDENTIFICADOR
         self.tipo_dato_token = tipo_dato_token       # Token del tipo de dato (puede ser PALABRA_CLAVE o TIPO_DATO)
@@ -94,6 +103,7 @@ class NodoDefinicionColumna(NodoAST_SQL):
 # --- Nodos para DML (Data Manipulation Language) ---
 class NodoInsert(NodoSentenciaSQL):
     """Representa una sentencia INSERT INTO."""
+    __slots__ = ("nombre_tabla_token", "columnas_lista_tokens", "filas_valores_lista_nodos")
     def __init__(self, nombre_tabla_token, columnas_lista_tokens, valores_lista_nodos):
         self.nombre_tabla_token = nombre_tabla_token # Token IDENTIFICADOR
         # Lista de tokens IDENTIFICADOR para las columnas, o None/lista vacía si no se especifican.
@@ -119,6 +129,7 @@ class NodoInsert(NodoSentenciaSQL):
 
 class NodoSelect(NodoSentenciaSQL):
     """Representa una sentencia SELECT (simplificada)."""
+    __slots__ = ("columnas_select_nodos", "tabla_from_token", "where_condicion_nodo")
     def __init__(self, columnas_select_nodos, tabla_from_token, where_condicion_nodo=None):
         # columnas_select_nodos puede ser una lista de NodoIdentificador/NodoExpresion o un NodoAsterisco.
         self.columnas_select_nodos = columnas_select_nodos
@@ -137,6 +148,7 @@ class NodoSelect(NodoSentenciaSQL):
 
 class NodoUpdate(NodoSentenciaSQL):
     """Representa una sentencia UPDATE (simplificada)."""
+    __slots__ = ("nombre_tabla_token", "asignaciones_set", "where_condicion_nodo")
     def __init__(self, nombre_tabla_token, asignaciones_set, where_condicion_nodo=None):
         self.nombre_tabla_token = nombre_tabla_token # Token IDENTIFICADOR
         self.asignaciones_set = asignaciones_set     # Lista de tuplas (TokenColumna, NodoExpresionSQL)
@@ -157,6 +169,7 @@ class NodoUpdate(NodoSentenciaSQL):
 
 class NodoUpdate(NodoSentenciaSQL):
     """Representa una sentencia UPDATE."""
+    __slots__ = ("nombre_tabla_token", "asignaciones_set", "where_condicion_nodo")
     def __init__(self, nombre_tabla_token, asignaciones_set, where_condicion_nodo=None):
         self.nombre_tabla_token = nombre_tabla_token # Token IDENTIFICADOR de la tabla.
         self.asignaciones_set = asignaciones_set     # Lista de tuplas (TokenColumna, NodoExpresionSQL).
@@ -180,6 +193,7 @@ class NodoUpdate(NodoSentenciaSQL):
     
 class NodoDelete(NodoSentenciaSQL):
     """Representa una sentencia DELETE FROM (simplificada)."""
+    __slots__ = ("nombre_tabla_token", "where_condicion_nodo")
     def __init__(self, nombre_tabla_token, where_condicion_nodo=None):
         self.nombre_tabla_token = nombre_tabla_token # Token IDENTIFICADOR de la tabla.
         self.where_condicion_nodo = where_condicion_nodo # NodoExpresionBinariaSQL (opcional).
@@ -194,6 +208,7 @@ class NodoDelete(NodoSentenciaSQL):
 # --- Nodos para T-SQL específico y Expresiones ---
 class NodoPrint(NodoSentenciaSQL):
     """Representa una sentencia PRINT de T-SQL."""
+    __slots__ = ("expresion_nodo",)
     def __init__(self, expresion_nodo):
         self.expresion_nodo = expresion_nodo # NodoExpresionSQL
 
@@ -204,6 +219,7 @@ class NodoPrint(NodoSentenciaSQL):
 
 class NodoDeclareVariable(NodoSentenciaSQL):
     """Representa una declaración de variable DECLARE @var TIPO."""
+    __slots__ = ("nombre_variable_token", "tipo_dato_token", "valor_inicial_nodo")
     def __init__(self, nombre_variable_token, tipo_dato_token, valor_inicial_nodo=None):
         self.nombre_variable_token = nombre_variable_token # Token IDENTIFICADOR (ej: @MiVar)
         self.tipo_dato_token = tipo_dato_token         # Token del tipo de dato
@@ -219,6 +235,7 @@ class NodoDeclareVariable(NodoSentenciaSQL):
 
 class NodoSetVariable(NodoSentenciaSQL):
     """Representa una asignación SET @var = expresion."""
+    __slots__ = ("nombre_variable_token", "expresion_nodo")
     def __init__(self, nombre_variable_token, expresion_nodo):
         self.nombre_variable_token = nombre_variable_token # Token IDENTIFICADOR (ej: @MiVar)
         self.expresion_nodo = expresion_nodo             # NodoExpresionSQL
@@ -231,25 +248,28 @@ class NodoSetVariable(NodoSentenciaSQL):
 
 class NodoGo(NodoSentenciaSQL):
     """Representa un separador de lotes GO (T-SQL)."""
+    __slots__ = ()
     def __repr__(self, indent=0):
         return f"{'  ' * indent}NodoGo()"
 
 # Nodos para Expresiones SQL (pueden ser similares a los de Pascal, pero con semántica SQL)
 class NodoExpresionSQL(NodoAST_SQL):
     """Clase base para expresiones SQL."""
-    pass
+    __slots__ = ()
 
 class NodoIdentificadorSQL(NodoExpresionSQL):
     """Identificador en SQL (nombre de columna, variable @var, nombre de tabla)."""
+    __slots__ = ("id_token", "nombre")
     def __init__(self, id_token):
         self.id_token = id_token
-        self.nombre = id_token.lexema # Puede incluir @, #, [], ""
+        self.nombre = internar(id_token.lexema) # Puede incluir @, #, [], ""
 
     def __repr__(self, indent=0):
         return f"{'  ' * indent}NodoIdentificadorSQL(nombre='{self.nombre}')"
 
 class NodoLiteralSQL(NodoExpresionSQL):
     """Literal en SQL (cadena, número)."""
+    __slots__ = ("literal_token", "valor")
     def __init__(self, literal_token):
         self.literal_token = literal_token
         self.valor = literal_token.valor 
@@ -259,6 +279,7 @@ class NodoLiteralSQL(NodoExpresionSQL):
 
 class NodoExpresionBinariaSQL(NodoExpresionSQL):
     """Expresión binaria en SQL (ej: col = 'valor', precio > 100, cantidad + 1)."""
+    __slots__ = ("operador_token", "operando_izq_nodo", "operando_der_nodo")
     def __init__(self, operador_token, operando_izq_nodo, operando_der_nodo):
         self.operador_token = operador_token
         self.operando_izq_nodo = operando_izq_nodo
@@ -274,6 +295,7 @@ class NodoExpresionBinariaSQL(NodoExpresionSQL):
                 f"{indent_str})")
 
 class NodoFuncionSQL(NodoExpresionSQL): # Para funciones como GETDATE(), COUNT(*)
+    __slots__ = ("nombre_funcion_token", "argumentos_nodos")
     def __init__(self, nombre_funcion_token, argumentos_nodos=None):
         self.nombre_funcion_token = nombre_funcion_token
         self.argumentos_nodos = argumentos_nodos if argumentos_nodos is not None else []
@@ -290,6 +312,7 @@ class NodoFuncionSQL(NodoExpresionSQL): # Para funciones como GETDATE(), COUNT(*
                 f"{indent_str})")
 
 class NodoAsteriscoSQL(NodoExpresionSQL): # Para SELECT *
+    __slots__ = ("asterisco_token",)
     def __init__(self, asterisco_token):
         self.asterisco_token = asterisco_token
 
@@ -300,10 +323,11 @@ class NodoAsteriscoSQL(NodoExpresionSQL): # Para SELECT *
 class ParserTSQL:
     def __init__(self, tokens):
         """
-        Inicializa el parser con la lista de tokens generada por el LexerTSQL.
+        Inicializa el parser con la lista de tokens generada por el LexerTSQL, o con el
+        generador `LexerTSQL.generar_tokens()` para leerlos bajo demanda (ver FlujoTokens).
         Filtra los tokens de WHITESPACE_SQL ya que no son relevantes para el análisis sintáctico.
         """
-        self.tokens = [token for token in tokens if token.tipo != 'WHITESPACE_SQL']
+        self.tokens = FlujoTokens(tokens, ignorar=('WHITESPACE_SQL',))
         self.posicion_actual = 0
         self.token_actual = self.tokens[self.posicion_actual] if self.tokens else None
         self.errores_sintacticos = []
@@ -314,12 +338,13 @@ class ParserTSQL:
     def _avanzar(self):
         """Avanza al siguiente token en la lista."""
         self.posicion_actual += 1
-        if self.posicion_actual < len(self.tokens):
+        if self.tokens.hay(self.posicion_actual):
             self.token_actual = self.tokens[self.posicion_actual]
         else:
             # Si se llega al final, el token actual podría ser el último token EOF
             # o None si la lista de tokens estaba vacía o se avanzó más allá del EOF.
-            self.token_actual = self.tokens[-1] if self.tokens and self.tokens[-1].tipo == TT_EOF_SQL else None
+            ultimo = self.tokens.ultimo()
+            self.token_actual = ultimo if ultimo and ultimo.tipo == TT_EOF_SQL else None
 
     def _error_sintactico(self, mensaje_esperado):
         """Registra un error sintáctico y lanza una excepción para detener el parsing."""
@@ -333,8 +358,7 @@ class ParserTSQL:
         else: 
             # Intentar obtener la posición del último token significativo si token_actual es None
             # Esto puede ocurrir si se esperaba algo después del último token real.
-            last_meaningful_token = self.tokens[-2] if len(self.tokens) > 1 and self.tokens[-1].tipo == TT_EOF_SQL else \
-                                  (self.tokens[-1] if self.tokens else None)
+            last_meaningful_token = self.tokens.ultimo_antes_de(TT_EOF_SQL)
             linea_aprox = last_meaningful_token.linea if last_meaningful_token else 'desconocida'
             col_aprox = last_meaningful_token.columna if last_meaningful_token else 'desconocida'
             mensaje = (f"Error Sintáctico: Final inesperado de la entrada (cerca de L{linea_aprox}:C{col_aprox}). "
@@ -367,6 +391,34 @@ class ParserTSQL:
         # No se debería llegar aquí si _error_sintactico siempre lanza excepción.
         return None 
 
+    @staticmethod
+    def cortes_lotes(tokens):
+        """
+        Límites de los lotes del script para `nucleo_compilador.lotes_paralelos`:
+        [0, c1, ..., índice del EOF] sobre `tokens` (el AlmacenTokens completo). Cada lote
+        termina en un 'GO' y en el ';' opcional que lo sigue, igual que los consume
+        `parse_sentencia_o_go`; si tras el último 'GO' no queda nada, no se abre otro lote.
+        """
+        fin = len(tokens) - 1 # EOF
+        cortes = [0]
+        indice = 0
+        while indice < fin:
+            if tokens.tipo(indice) == TT_PALABRA_CLAVE and tokens.lexema(indice).lower() == 'go':
+                indice += 1
+                while indice < fin and tokens.tipo(indice) == 'WHITESPACE_SQL':
+                    indice += 1
+                if indice < fin and tokens.tipo(indice) == TT_PUNTO_Y_COMA:
+                    indice += 1
+                siguiente = indice
+                while siguiente < fin and tokens.tipo(siguiente) == 'WHITESPACE_SQL':
+                    siguiente += 1
+                if siguiente < fin:
+                    cortes.append(indice)
+            else:
+                indice += 1
+        cortes.append(fin)
+        return cortes
+
     def parse(self):
         """
         Punto de entrada principal para el análisis sintáctico del script T-SQL.
@@ -681,7 +733,7 @@ class ParserTSQL:
         if nodo_sentencia and self.token_actual and self.token_actual.tipo == TT_PUNTO_Y_COMA:
             # Verificar que lo que sigue no sea GO, ya que GO puede ir sin ;
             siguiente_token_es_go = False
-            if self.posicion_actual + 1 < len(self.tokens):
+            if self.tokens.hay(self.posicion_actual + 1):
                 token_siguiente = self.tokens[self.posicion_actual + 1]
                 if token_siguiente.tipo == TT_PALABRA_CLAVE and token_siguiente.lexema.lower() == 'go':
                     siguiente_token_es_go = True
@@ -915,7 +967,7 @@ class ParserTSQL:
         elif tipo_actual == TT_IDENTIFICADOR:
             # Podría ser nombre de columna, variable @, o función como GETDATE()
             # Si es una función, se necesitaría lookahead para '('
-            if self.posicion_actual + 1 < len(self.tokens) and \
+            if self.tokens.hay(self.posicion_actual + 1) and \
                self.tokens[self.posicion_actual + 1].tipo == TT_PARENTESIS_IZQ:
                 # Asumir que es una llamada a función
                 return self._parse_funcion_sql()
@@ -932,79 +984,12 @@ class ParserTSQL:
             self._error_sintactico(f"un factor SQL válido. Se encontró '{lexema_actual}'")
         return None
 
-    def _parse_termino_multiplicativo_sql(self):
-        """Parsea términos multiplicativos: factor (('*' | '/' | '%') factor)*."""
-        nodo = self._parse_factor_sql()
-        while self.token_actual and \
-              ( (self.token_actual.tipo == TT_OPERADOR_ARITMETICO and self.token_actual.lexema in ['/', '%']) or \
-                (self.token_actual.tipo == TT_ASTERISCO and self.token_actual.lexema == '*') ): # Acepta TT_ASTERISCO para '*'
-            
-            token_operador = self._consumir(self.token_actual.tipo) 
-            
-            nodo_derecho = self._parse_factor_sql()
-            nodo = NodoExpresionBinariaSQL(token_operador, nodo, nodo_derecho)
-        return nodo
-
-    def _parse_expresion_aditiva_sql(self):
-        """Parsea expresiones aditivas: termino_multiplicativo (('+' | '-') termino_multiplicativo)*."""
-        nodo = self._parse_termino_multiplicativo_sql()
-        while self.token_actual and \
-              self.token_actual.tipo == TT_OPERADOR_ARITMETICO and \
-              self.token_actual.lexema in ['+', '-']:
-            token_operador = self._consumir(TT_OPERADOR_ARITMETICO)
-            nodo_derecho = self._parse_termino_multiplicativo_sql()
-            nodo = NodoExpresionBinariaSQL(token_operador, nodo, nodo_derecho)
-        return nodo
-
-    def _parse_expresion_comparativa_sql(self):
-        """Parsea expresiones comparativas: expresion_aditiva [OPERADOR_COMPARACION expresion_aditiva]."""
-        nodo_izquierdo = self._parse_expresion_aditiva_sql()
-        if self.token_actual and self.token_actual.tipo == TT_OPERADOR_COMPARACION:
-            token_operador = self._consumir(TT_OPERADOR_COMPARACION)
-            nodo_derecho = self._parse_expresion_aditiva_sql()
-            return NodoExpresionBinariaSQL(token_operador, nodo_izquierdo, nodo_derecho)
-        else:
-            return nodo_izquierdo
-    
-    def _parse_expresion_unaria_logica_sql(self):
-        """Parsea factores lógicos con NOT: [NOT] expresion_comparativa."""
-        token_op_not = None
-        if self.token_actual and self.token_actual.tipo == TT_PALABRA_CLAVE and \
-           self.token_actual.lexema.lower() == 'not':
-            token_op_not = self._consumir(TT_PALABRA_CLAVE, 'not')
-        
-        nodo_operando = self._parse_expresion_comparativa_sql() # El operando de NOT es una comparación o algo de mayor precedencia
-
-        if token_op_not:
-            # Necesitaríamos un NodoExpresionUnariaSQL
-            # Por ahora, no lo creamos, pero la lógica está aquí.
-            # return NodoExpresionUnariaSQL(token_op_not, nodo_operando)
-            print(f"INFO: Operador NOT parseado pero NodoExpresionUnariaSQL no implementado completamente para AST.")
-            return nodo_operando # Devolver el operando por ahora
-        else:
-            return nodo_operando
-
-    def _parse_termino_logico_sql(self): # Para AND
-        """Parsea términos lógicos: expresion_unaria_logica (AND expresion_unaria_logica)*."""
-        nodo = self._parse_expresion_unaria_logica_sql()
-        while self.token_actual and \
-              self.token_actual.tipo == TT_PALABRA_CLAVE and \
-              self.token_actual.lexema.lower() == 'and':
-            token_operador_and = self._consumir(TT_PALABRA_CLAVE, 'and')
-            nodo_derecho = self._parse_expresion_unaria_logica_sql()
-            nodo = NodoExpresionBinariaSQL(token_operador_and, nodo, nodo_derecho)
-        return nodo
-
     def _parse_expresion_sql(self): # Punto de entrada para expresiones SQL
-        """Parsea expresiones lógicas con OR: termino_logico (OR termino_logico)*."""
-        nodo = self._parse_termino_logico_sql()
-        while self.token_actual and \
-              self.token_actual.tipo == TT_PALABRA_CLAVE and \
-              self.token_actual.lexema.lower() == 'or':
-            token_operador_or = self._consumir(TT_PALABRA_CLAVE, 'or')
-            nodo_derecho = self._parse_termino_logico_sql()
-            nodo = NodoExpresionBinariaSQL(token_operador_or, nodo, nodo_derecho)
-        return nodo
+        """
+        Parsea expresiones SQL con los niveles de TABLA_EXPRESIONES_TSQL:
+        OR < AND < [NOT] comparación < ('+' | '-') < ('*' | '/' | '%') < factor.
+        """
+        return analizar_expresion(self, TABLA_EXPRESIONES_TSQL, self._parse_factor_sql)
 
     def _parse_funcion_sql(self):
         """Parsea una llamada a función SQL simple como GETDATE() o COUNT(*)."""
@@ -1021,4 +1006,24 @@ class ParserTSQL:
         self._consumir(TT_PARENTESIS_DER)
         return NodoFuncionSQL(nombre_funcion_token, argumentos_nodos)
 
-# Fin de la clase ParserTSQL
\ No newline at end of file
+# Fin de la clase ParserTSQL
+
+
+def _not_sql(token_op_not, nodo_operando):
+    # Necesitaríamos un NodoExpresionUnariaSQL
+    # Por ahora, no lo creamos, pero la lógica está aquí.
+    # return NodoExpresionUnariaSQL(token_op_not, nodo_operando)
+    print(f"INFO: Operador NOT parseado pero NodoExpresionUnariaSQL no implementado completamente para AST.")
+    return nodo_operando # Devolver el operando por ahora
+
+
+# Operadores de las expresiones T-SQL por nivel de precedencia (mayor = se agrupa antes).
+# El operando de NOT es una comparación (NOT no se repite) y las comparaciones no se encadenan.
+TABLA_EXPRESIONES_TSQL = TablaPratt(insensible_mayusculas=True)
+TABLA_EXPRESIONES_TSQL.infijo(1, TT_PALABRA_CLAVE, ['or'], NodoExpresionBinariaSQL)
+TABLA_EXPRESIONES_TSQL.infijo(2, TT_PALABRA_CLAVE, ['and'], NodoExpresionBinariaSQL)
+TABLA_EXPRESIONES_TSQL.prefijo(3, TT_PALABRA_CLAVE, ['not'], _not_sql, nivel_operando=4)
+TABLA_EXPRESIONES_TSQL.infijo(4, TT_OPERADOR_COMPARACION, None, NodoExpresionBinariaSQL, asociatividad=NO_ASOCIATIVO)
+TABLA_EXPRESIONES_TSQL.infijo(5, TT_OPERADOR_ARITMETICO, ['+', '-'], NodoExpresionBinariaSQL)
+TABLA_EXPRESIONES_TSQL.infijo(6, TT_OPERADOR_ARITMETICO, ['/', '%'], NodoExpresionBinariaSQL)
+TABLA_EXPRESIONES_TSQL.infijo(6, TT_ASTERISCO, ['*'], NodoExpresionBinariaSQL)
@@ -0,0 +1,89 @@
+# src/detector_lenguaje/cache_deteccion.py
+from collections import OrderedDict
+
+from .detector import DETECTOR_POR_DEFECTO, MODO_COMPLETO, MODO_ESCALONADO
+
+CAPACIDAD_POR_DEFECTO = 128
+
+
+class CacheDeteccion:
+    """
+    Caché LRU acotada de resultados de detección, pensada para el bucle del editor,
+    donde `detectar_lenguaje` se llama en cada pulsación sobre un texto que casi nunca
+    cambia en lo que el detector mira.
+
+    La clave no es el texto completo sino lo que determina el resultado: las líneas de la
+    muestra tal cual (los espacios finales cuentan: de ellos depende, por ejemplo, la pista
+    de `function` seguida de espacio), la presencia de `end.` y las estadísticas de punto y
+    coma del código completo, junto con el modo y la extensión. Así, añadir líneas en blanco
+    o tocar código más allá de la muestra que no cambie esas estadísticas reutiliza el
+    resultado ya calculado. La clave es la propia tupla (el diccionario compara por igualdad
+    tras el hash), por lo que un acierto nunca devuelve el resultado de otra muestra.
+
+    Los resultados se comparten entre aciertos: quien los reciba no debe modificarlos.
+    """
+
+    def __init__(self, capacidad=CAPACIDAD_POR_DEFECTO, detector=None):
+        if capacidad < 1:
+            raise ValueError("La capacidad de la caché debe ser al menos 1.")
+        self.capacidad = capacidad
+        self.detector = detector if detector is not None else DETECTOR_POR_DEFECTO
+        self._resultados = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def detectar(self, codigo_lineas_o_texto, n_lineas_muestra=20, modo=MODO_COMPLETO, extension=None):
+        """Misma interfaz y mismo resultado que `DetectorLenguaje.detectar`, con caché."""
+        entrada, resultado_inmediato = self.detector.preparar_entrada(codigo_lineas_o_texto, n_lineas_muestra)
+        if entrada is None:
+            return resultado_inmediato
+        return self.detectar_entrada(entrada, n_lineas_muestra, modo, extension)
+
+    def detectar_entrada(self, entrada, n_lineas_muestra=20, modo=MODO_COMPLETO, extension=None):
+        """Como `detectar`, pero a partir de una EntradaDeteccion ya preparada."""
+        clave = self._clave(entrada, n_lineas_muestra, modo, extension)
+        resultado = self._resultados.get(clave)
+        if resultado is not None:
+            self._resultados.move_to_end(clave)
+            self.aciertos += 1
+            return resultado
+
+        self.fallos += 1
+        resultado = self.detector.detectar_entrada(entrada, modo, extension)
+        self._resultados[clave] = resultado
+        if len(self._resultados) > self.capacidad:
+            self._resultados.popitem(last=False)
+            self.desalojos += 1
+        return resultado
+
+    def _clave(self, entrada, n_lineas_muestra, modo, extension):
+        muestra = tuple(entrada.lineas_relevantes)
+        # La primera línea (shebang) y la extensión solo intervienen en el modo escalonado.
+        if modo == MODO_ESCALONADO:
+            primera_linea = entrada.primera_linea
+            extension = extension.lower() if extension else None
+        else:
+            primera_linea = extension = None
+        return (muestra, entrada.tiene_end_punto(), entrada.estadisticas_punto_coma(),
+                n_lineas_muestra, modo, primera_linea, extension)
+
+    def estadisticas(self):
+        """Contadores para instrumentación: aciertos, fallos, desalojos, tamaño y capacidad."""
+        consultas = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "desalojos": self.desalojos,
+            "tamanio": len(self._resultados),
+            "capacidad": self.capacidad,
+            "tasa_aciertos": (self.aciertos / consultas) if consultas else 0.0,
+        }
+
+    def limpiar(self):
+        """Vacía la caché y reinicia los contadores."""
+        self._resultados.clear()
+        self.aciertos = self.fallos = self.desalojos = 0
+
+    def __len__(self):
+        return len(self._resultados)
@@ -1,8 +1,548 @@
 # src/detector_lenguaje/detector.py
+import mmap
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
 from .pistas_lenguaje import LENGUAJES_SOPORTADOS, PISTAS_LENGUAJE
+from .motor_estadistico import motor_por_defecto
 
-def detectar_lenguaje(codigo_lineas_o_texto, n_lineas_muestra=20):
+try:
+    from re import _parser as sre_parse # Python 3.11+
+except ImportError:
+    import sre_parse
+
+# Banderas con las que se evalúan todas las pistas de PISTAS_LENGUAJE.
+# re.MULTILINE permite que ^ y $ funcionen por línea si se usan en el regex
+# re.IGNORECASE hace que la búsqueda no distinga mayúsculas/minúsculas
+FLAGS_PISTAS = re.IGNORECASE | re.MULTILINE
+
+# Pistas fuertes que se evalúan antes del diccionario general (ya compiladas).
+REGEX_DOCTYPE_HTML = re.compile(r'<!DOCTYPE\s+html>', re.IGNORECASE)
+REGEX_PROGRAMA_PASCAL = re.compile(r'\bprogram\s+\w+;', re.IGNORECASE)
+REGEX_END_PUNTO_PASCAL = re.compile(r'end\.', re.IGNORECASE | re.MULTILINE)
+REGEX_DEF_PYTHON = re.compile(r'\bdef\s+[a-zA-Z_]\w*\s*\(.*\)\s*:')
+REGEX_FUNCTION_JS = re.compile(r'\bfunction\s', re.IGNORECASE)
+
+# Únicos caracteres no ASCII que re.IGNORECASE empareja con letras ASCII
+# (İ, ı, ſ y el signo Kelvin). Si la muestra no los contiene, `literal in muestra.lower()`
+# es un prefiltro exacto para las pistas insensibles a mayúsculas.
+CARACTERES_PLEGADO_ESPECIAL = ('\u0130', '\u0131', '\u017f', '\u212a')
+
+# Lenguajes afectados por la lógica de refinamiento global
+LENGUAJES_CON_PUNTO_Y_COMA = ["C++", "JavaScript", "PL/SQL", "T-SQL", "Pascal"]
+LENGUAJES_CON_LLAVES = ["C++", "JavaScript"]
+
+# Ajustes del refinamiento por ratio de punto y coma (sobre todo el código).
+EFECTOS_RATIO_PUNTO_COMA_ALTO = dict({lang: 15 for lang in LENGUAJES_CON_PUNTO_Y_COMA}, **{"Python": -50, "HTML": -30})
+EFECTOS_RATIO_PUNTO_COMA_BAJO = dict({lang: -10 for lang in LENGUAJES_CON_PUNTO_Y_COMA}, **{"Python": 25, "HTML": 10})
+
+# --- Modos de detección ---
+MODO_COMPLETO = "completo"     # Evalúa todas las pistas y todo el refinamiento (comportamiento clásico)
+MODO_ESCALONADO = "escalonado" # Cascada con salida temprana (ver DetectorLenguaje._detectar_escalonado)
+MODO_ESTADISTICO = "estadistico" # Motor de n-gramas con pesos entrenados (ver motor_estadistico.py)
+
+# En modo escalonado, cada cuántas pistas sin coincidencia se vuelve a comprobar el margen del líder.
+INTERVALO_COMPROBACION_MARGEN = 8
+
+# Extensiones que en modo escalonado deciden el lenguaje sin mirar el contenido.
+# '.sql' se omite a propósito: puede ser tanto T-SQL como PL/SQL.
+EXTENSIONES_DECISIVAS = {
+    '.py': "Python", '.pyw': "Python",
+    '.pas': "Pascal", '.pp': "Pascal", '.dpr': "Pascal",
+    '.cpp': "C++", '.cc': "C++", '.cxx': "C++", '.hpp': "C++", '.hh': "C++", '.h': "C++",
+    '.js': "JavaScript", '.mjs': "JavaScript", '.cjs': "JavaScript",
+    '.html': "HTML", '.htm': "HTML",
+}
+# Intérpretes de shebang (#!) que deciden el lenguaje en modo escalonado.
+INTERPRETES_SHEBANG = {'python': "Python", 'node': "JavaScript", 'nodejs': "JavaScript"}
+
+# --- Umbrales de confianza ---
+# Estos umbrales son empíricos y pueden necesitar ajuste.
+UMBRAL_CONFIANZA_MINIMO_PUNTOS_ABSOLUTOS = 35 # El ganador debe tener al menos esta puntuación.
+UMBRAL_CONFIANZA_MINIMO_PORCENTAJE_RELATIVO = 30 # El ganador debe representar al menos este % del total de puntos positivos.
+
+
+def _literal_requerido(patron_regex):
+    """
+    Devuelve el fragmento literal más largo que toda coincidencia de `patron_regex`
+    debe contener (en minúsculas), o "" si no se puede garantizar ninguno.
+    Solo se consideran literales del nivel superior del patrón (fuera de grupos,
+    alternativas o repeticiones), que son obligatorios para cualquier coincidencia.
+    """
+    try:
+        arbol = sre_parse.parse(patron_regex, FLAGS_PISTAS)
+    except re.error:
+        return ""
+    mejor = ""
+    actual = []
+    for operador, argumento in arbol:
+        if operador == sre_parse.LITERAL:
+            actual.append(chr(argumento))
+            continue
+        candidato = "".join(actual)
+        if len(candidato) > len(mejor):
+            mejor = candidato
+        actual = []
+    candidato = "".join(actual)
+    if len(candidato) > len(mejor):
+        mejor = candidato
+    # Solo se usan literales ASCII como prefiltro (ver CARACTERES_PLEGADO_ESPECIAL).
+    return mejor.lower() if mejor.isascii() else ""
+
+
+class PistaCompilada:
+    """Una entrada de PISTAS_LENGUAJE con su regex ya compilado y su prefiltro literal."""
+    __slots__ = ("patron", "regex", "literal", "efectos")
+
+    def __init__(self, patron, regex, literal, efectos):
+        self.patron = patron    # Cadena original (se usa en los mensajes de depuración)
+        self.regex = regex      # Patrón compilado con FLAGS_PISTAS
+        self.literal = literal  # Fragmento obligatorio en minúsculas ("" si no hay)
+        self.efectos = efectos  # {lenguaje: puntaje_modificador}
+
+
+def contar_lineas_punto_y_coma(codigo_lineas):
+    """
+    Recorre las líneas una sola vez y cuenta cuántas son "significativas"
+    (no vacías, no comentarios, no bloques de una línea) y cuántas de ellas
+    terminan en punto y coma.
+
+    Returns:
+        tuple: (total_lineas_significativas, lineas_terminadas_en_punto_y_coma)
+    """
+    total = 0
+    con_punto_coma = 0
+    for l in map(str.strip, codigo_lineas):
+        if not l or l.startswith(('#', '//', '--')):
+            continue
+        if l.startswith('/*') and l.endswith('*/'):
+            continue
+        if l.startswith('{') and l.endswith('}'): # Excluir líneas que son solo un bloque
+            continue
+        total += 1
+        if l.endswith(';'):
+            con_punto_coma += 1
+    return total, con_punto_coma
+
+
+class EntradaDeteccion:
+    """
+    Lo que el detector necesita de un código fuente: la muestra de líneas relevantes,
+    la primera línea física (para el shebang) y dos datos globales, la presencia de
+    `end.` y las estadísticas de punto y coma. Los datos globales se calculan de forma
+    perezosa la primera vez que se piden (o se reciben ya calculados, por ejemplo desde
+    un estado incremental o desde ventanas de un archivo).
+    """
+    __slots__ = ("lineas_relevantes", "primera_linea", "_codigo_lineas", "_texto",
+                 "_end_punto", "_estadisticas_punto_coma")
+
+    def __init__(self, lineas_relevantes, primera_linea="", codigo_lineas=None, texto=None,
+                 end_punto=None, estadisticas_punto_coma=None):
+        self.lineas_relevantes = lineas_relevantes
+        self.primera_linea = primera_linea
+        self._codigo_lineas = codigo_lineas
+        self._texto = texto
+        self._end_punto = end_punto
+        self._estadisticas_punto_coma = estadisticas_punto_coma
+
+    def tiene_end_punto(self):
+        """True si `end.` aparece en el código completo."""
+        if self._end_punto is None:
+            # Si la entrada ya era texto se busca sobre él directamente en lugar de volver a unir las líneas.
+            if self._texto is not None:
+                self._end_punto = REGEX_END_PUNTO_PASCAL.search(self._texto) is not None
+            else:
+                self._end_punto = any(REGEX_END_PUNTO_PASCAL.search(l) for l in self._codigo_lineas)
+        return self._end_punto
+
+    def estadisticas_punto_coma(self):
+        """(lineas_significativas, terminadas_en_punto_y_coma) del código completo."""
+        if self._estadisticas_punto_coma is None:
+            self._estadisticas_punto_coma = contar_lineas_punto_y_coma(self._codigo_lineas)
+        return self._estadisticas_punto_coma
+
+
+def _interprete_shebang(primera_linea):
+    """Devuelve el nombre del intérprete de una línea `#!` (sin versión), o None."""
+    if not primera_linea.startswith('#!'):
+        return None
+    partes = primera_linea[2:].split()
+    if not partes:
+        return None
+    nombre = partes[0].rsplit('/', 1)[-1]
+    if nombre == 'env': # #!/usr/bin/env [-S] python3
+        argumentos = [p for p in partes[1:] if not p.startswith('-')]
+        if not argumentos:
+            return None
+        nombre = argumentos[0].rsplit('/', 1)[-1]
+    return nombre.rstrip('0123456789.') # python3.11 -> python
+
+
+class DetectorLenguaje:
+    """
+    Detector de lenguaje con las pistas precompiladas.
+
+    Las expresiones regulares de PISTAS_LENGUAJE se compilan una sola vez al crear
+    el detector (en lugar de en cada llamada) y cada pista lleva un prefiltro literal:
+    si el fragmento obligatorio no aparece en la muestra, el regex ni se evalúa.
+    Las estadísticas globales (ratio de punto y coma) se calculan en una única pasada
+    sobre las líneas, sin construir listas intermedias ni volver a unir el texto.
+
+    Para el modo escalonado se guardan además las pistas ordenadas por peso descendente
+    y, para cada posición de ese orden, cuánto pueden subir o bajar como máximo las
+    puntuaciones de cada lenguaje con las pistas que quedan por evaluar.
+    """
+
+    def __init__(self, pistas=None, lenguajes=None, motor_estadistico=None):
+        self.lenguajes = list(lenguajes if lenguajes is not None else LENGUAJES_SOPORTADOS)
+        # Motor de MODO_ESTADISTICO; si no se indica, se carga la tabla distribuida al usarlo por primera vez.
+        self.motor_estadistico = motor_estadistico
+        self.pistas = []
+        for patron, efectos in (pistas if pistas is not None else PISTAS_LENGUAJE).items():
+            try:
+                regex = re.compile(patron, FLAGS_PISTAS)
+            except re.error as e:
+                # Esto no debería ocurrir si todas las expresiones regulares en PISTAS_LENGUAJE son válidas.
+                # Es una salvaguarda durante el desarrollo: la pista inválida se descarta.
+                print(f"ADVERTENCIA: Error de Expresión Regular en PISTAS_LENGUAJE: '{patron}' - {e}")
+                continue
+            self.pistas.append(PistaCompilada(patron, regex, _literal_requerido(patron), efectos))
+
+        # Orden de evaluación del modo escalonado: primero las pistas de mayor peso absoluto.
+        self.pistas_por_peso = sorted(self.pistas, key=lambda p: -max((abs(v) for v in p.efectos.values()), default=0))
+        # cota_sube[i][lang] / cota_baja[i][lang]: máximo aumento / disminución posible de la
+        # puntuación de `lang` si se evalúan las pistas pistas_por_peso[i:] y el ratio de punto y coma.
+        sube = {lang: max(0, EFECTOS_RATIO_PUNTO_COMA_ALTO.get(lang, 0), EFECTOS_RATIO_PUNTO_COMA_BAJO.get(lang, 0)) for lang in self.lenguajes}
+        baja = {lang: min(0, EFECTOS_RATIO_PUNTO_COMA_ALTO.get(lang, 0), EFECTOS_RATIO_PUNTO_COMA_BAJO.get(lang, 0)) for lang in self.lenguajes}
+        self.cota_sube = [dict(sube)]
+        self.cota_baja = [dict(baja)]
+        for pista in reversed(self.pistas_por_peso):
+            for lenguaje, puntaje in pista.efectos.items():
+                if lenguaje in sube:
+                    if puntaje > 0: sube[lenguaje] += puntaje
+                    else: baja[lenguaje] += puntaje
+            self.cota_sube.append(dict(sube))
+            self.cota_baja.append(dict(baja))
+        self.cota_sube.reverse()
+        self.cota_baja.reverse()
+
+        # Contadores acumulados del modo escalonado (para medir el ahorro).
+        self.estadisticas_cascada = {
+            "llamadas": 0,
+            "decididas_nivel_1": 0,    # Resueltas por extensión, shebang, DOCTYPE o program/end.
+            "decididas_por_margen": 0, # Resueltas antes de evaluar todas las pistas
+            "pistas_consideradas": 0,  # Pistas resueltas (por prefiltro o por regex)
+            "regex_evaluados": 0,      # Pistas cuyo regex llegó a ejecutarse
+            "pistas_totales": 0,       # len(pistas) por cada llamada que pasó del nivel 1
+        }
+
+    def detectar(self, codigo_lineas_o_texto, n_lineas_muestra=20, modo=MODO_COMPLETO, extension=None):
+        """
+        Detecta el lenguaje de programación de un fragmento de código.
+        Misma interfaz y mismo resultado que `detectar_lenguaje`.
+        """
+        entrada, resultado_inmediato = self.preparar_entrada(codigo_lineas_o_texto, n_lineas_muestra)
+        if entrada is None:
+            return resultado_inmediato
+        return self.detectar_entrada(entrada, modo, extension)
+
+    def preparar_entrada(self, codigo_lineas_o_texto, n_lineas_muestra=20):
+        """
+        Extrae la muestra de un código (texto o lista de líneas).
+
+        Returns:
+            tuple: (EntradaDeteccion, None), o (None, resultado) cuando la entrada no admite
+                   detección (vacía, solo espacios o de un tipo no válido).
+        """
+        if not codigo_lineas_o_texto:
+            return None, ("Desconocido (sin entrada)", 0, {})
+
+        texto = None
+        if isinstance(codigo_lineas_o_texto, str):
+            texto = codigo_lineas_o_texto
+            codigo_lineas = codigo_lineas_o_texto.splitlines()
+        elif isinstance(codigo_lineas_o_texto, list):
+            codigo_lineas = codigo_lineas_o_texto
+        else:
+            return None, ("Desconocido (entrada no válida)", 0, {})
+
+        lineas_relevantes = self._muestrear_lineas(codigo_lineas, n_lineas_muestra)
+        if not lineas_relevantes:
+            if n_lineas_muestra <= 0 and any(l.strip() for l in codigo_lineas):
+                return None, ("Desconocido (código completamente vacío o solo espacios)", 0, {})
+            return None, ("Desconocido (código vacío o solo espacios)", 0, {})
+
+        primera_linea = codigo_lineas[0] if codigo_lineas else ""
+        return EntradaDeteccion(lineas_relevantes, primera_linea, codigo_lineas, texto), None
+
+    def detectar_entrada(self, entrada, modo=MODO_COMPLETO, extension=None):
+        """Detecta el lenguaje a partir de una EntradaDeteccion ya preparada."""
+        if modo == MODO_ESCALONADO:
+            return self._detectar_escalonado(entrada, extension)
+        if modo == MODO_ESTADISTICO:
+            if self.motor_estadistico is None:
+                self.motor_estadistico = motor_por_defecto()
+            return self.motor_estadistico.detectar("\n".join(entrada.lineas_relevantes))
+        return self._puntuar(entrada)
+
+    def _muestrear_lineas(self, codigo_lineas, n_lineas_muestra):
+        """Devuelve las primeras `n_lineas_muestra` líneas no vacías, sin recorrer el resto."""
+        if n_lineas_muestra <= 0: # Se conserva la semántica de slicing de listas ([:0], [:-1], ...)
+            return [linea for linea in codigo_lineas if linea.strip()][:n_lineas_muestra]
+        lineas_relevantes = []
+        for linea in codigo_lineas:
+            if linea.strip():
+                lineas_relevantes.append(linea)
+                if len(lineas_relevantes) >= n_lineas_muestra:
+                    break
+        return lineas_relevantes
+
+    def _puntuar(self, entrada):
+        """Aplica las pistas sobre la muestra y el refinamiento global, y decide el ganador."""
+        lineas_relevantes = entrada.lineas_relevantes
+        muestra_texto_completo = "\n".join(lineas_relevantes)
+        muestra_minusculas = self._minusculas_para_prefiltro(muestra_texto_completo)
+
+        puntuaciones = {lang: 0 for lang in self.lenguajes}
+        # Para depuración: qué pistas se activaron para cada lenguaje
+        pistas_activadas_debug = {lang: [] for lang in self.lenguajes}
+
+        # --- Pistas directas y muy fuertes ---
+        if REGEX_DOCTYPE_HTML.search(muestra_texto_completo):
+            puntuaciones["HTML"] += 200 # Bonificación muy alta
+            pistas_activadas_debug["HTML"].append("PISTA_FUERTE: DOCTYPE_HTML_DETECTED")
+
+        if REGEX_PROGRAMA_PASCAL.search(muestra_texto_completo) and entrada.tiene_end_punto():
+            puntuaciones["Pascal"] += 150
+            pistas_activadas_debug["Pascal"].append("PISTA_FUERTE: PASCAL_PROGRAM_END_DOT")
+
+        self._aplicar_pista_def_python(puntuaciones, pistas_activadas_debug, muestra_texto_completo, lineas_relevantes)
+
+        # --- Aplicar todas las pistas precompiladas ---
+        for pista in self.pistas:
+            self._aplicar_pista(pista, puntuaciones, pistas_activadas_debug, muestra_texto_completo, muestra_minusculas)
+
+        # --- Lógica de refinamiento post-pistas ---
+        self._refinar_punto_coma(puntuaciones, pistas_activadas_debug, entrada.estadisticas_punto_coma())
+        self._refinar_llaves(puntuaciones, pistas_activadas_debug, muestra_texto_completo)
+        return self._decidir(puntuaciones, pistas_activadas_debug)
+
+    def _detectar_escalonado(self, entrada, extension):
+        """
+        Detección en cascada con salida temprana.
+
+        Nivel 1: señales decisivas y baratas (extensión conocida, shebang, `<!DOCTYPE html>`,
+                 `program X;` + `end.`). Si alguna aparece, se devuelve con confianza 100.
+        Nivel 2: pista `def` de Python y balance de llaves de la muestra; luego las pistas de
+                 PISTAS_LENGUAJE por peso descendente. Tras cada una se comprueba si el líder
+                 ya no puede ser alcanzado aunque las pistas restantes y el ratio de punto y
+                 coma le fueran en contra y a favor de los demás; en ese caso se para.
+        Nivel 3: si no hubo decisión, ratio de punto y coma sobre todo el código (mismas
+                 puntuaciones que el modo completo).
+
+        Con salida temprana el lenguaje ganador es el mismo que daría el modo completo, pero
+        la confianza se calcula solo con las pistas evaluadas. El diccionario de depuración
+        incluye la entrada "CASCADA" con el número de pistas evaluadas.
+        """
+        estadisticas = self.estadisticas_cascada
+        estadisticas["llamadas"] += 1
+
+        # --- Nivel 1: señales decisivas ---
+        lineas_relevantes = entrada.lineas_relevantes
+        muestra_texto_completo = "\n".join(lineas_relevantes)
+        decision = self._senal_decisiva(entrada, muestra_texto_completo, extension)
+        if decision:
+            lenguaje, motivo = decision
+            estadisticas["decididas_nivel_1"] += 1
+            pistas_activadas_debug = {lang: [] for lang in self.lenguajes}
+            pistas_activadas_debug.setdefault(lenguaje, []).append(f"PISTA_DECISIVA: {motivo}")
+            pistas_activadas_debug["CASCADA"] = [f"NIVEL_1 ({motivo})", f"PISTAS_EVALUADAS (0/{len(self.pistas)})"]
+            return lenguaje, 100.0, pistas_activadas_debug
+
+        # --- Nivel 2: pistas por peso descendente ---
+        muestra_minusculas = self._minusculas_para_prefiltro(muestra_texto_completo)
+        puntuaciones = {lang: 0 for lang in self.lenguajes}
+        pistas_activadas_debug = {lang: [] for lang in self.lenguajes}
+        self._aplicar_pista_def_python(puntuaciones, pistas_activadas_debug, muestra_texto_completo, lineas_relevantes)
+        self._refinar_llaves(puntuaciones, pistas_activadas_debug, muestra_texto_completo)
+
+        consideradas = 0
+        regex_evaluados = 0
+        decidido = self._lider_inalcanzable(puntuaciones, 0)
+        while not decidido and consideradas < len(self.pistas_por_peso):
+            pista = self.pistas_por_peso[consideradas]
+            activada = self._aplicar_pista(pista, puntuaciones, pistas_activadas_debug, muestra_texto_completo, muestra_minusculas)
+            if activada is not None:
+                regex_evaluados += 1
+            consideradas += 1
+            # La comprobación del margen se hace tras cada pista que cambió puntuaciones y, si no,
+            # cada INTERVALO_COMPROBACION_MARGEN pistas (las cotas solo bajan al avanzar).
+            if activada or consideradas % INTERVALO_COMPROBACION_MARGEN == 0:
+                decidido = self._lider_inalcanzable(puntuaciones, consideradas)
+
+        estadisticas["pistas_consideradas"] += consideradas
+        estadisticas["regex_evaluados"] += regex_evaluados
+        estadisticas["pistas_totales"] += len(self.pistas_por_peso)
+        resumen = [f"PISTAS_EVALUADAS ({consideradas}/{len(self.pistas_por_peso)})", f"REGEX_EVALUADOS ({regex_evaluados})"]
+
+        if decidido:
+            estadisticas["decididas_por_margen"] += 1
+            resumen.append("DECISION: MARGEN_INALCANZABLE")
+        else:
+            # --- Nivel 3: refinamiento global sobre todo el código ---
+            self._refinar_punto_coma(puntuaciones, pistas_activadas_debug, entrada.estadisticas_punto_coma())
+            resumen.append("DECISION: EVALUACION_COMPLETA")
+        pistas_activadas_debug["CASCADA"] = resumen
+        return self._decidir(puntuaciones, pistas_activadas_debug)
+
+    def _senal_decisiva(self, entrada, muestra_texto_completo, extension):
+        """Nivel 1 del modo escalonado. Devuelve (lenguaje, motivo) o None."""
+        if extension:
+            extension = extension.lower()
+            if not extension.startswith('.'):
+                extension = '.' + extension
+            lenguaje = EXTENSIONES_DECISIVAS.get(extension)
+            if lenguaje in self.lenguajes:
+                return lenguaje, f"EXTENSION ({extension})"
+        if entrada.primera_linea:
+            interprete = _interprete_shebang(entrada.primera_linea)
+            lenguaje = INTERPRETES_SHEBANG.get(interprete)
+            if lenguaje in self.lenguajes:
+                return lenguaje, f"SHEBANG ({interprete})"
+        if "HTML" in self.lenguajes and REGEX_DOCTYPE_HTML.search(muestra_texto_completo):
+            return "HTML", "DOCTYPE_HTML_DETECTED"
+        if "Pascal" in self.lenguajes and REGEX_PROGRAMA_PASCAL.search(muestra_texto_completo) and entrada.tiene_end_punto():
+            return "Pascal", "PASCAL_PROGRAM_END_DOT"
+        return None
+
+    def _lider_inalcanzable(self, puntuaciones, indice_siguiente_pista):
+        """
+        Devuelve True si el líder actual seguirá siendo el ganador (y superará los umbrales
+        absoluto y relativo) por mucho que sumen o resten las pistas pistas_por_peso[indice:]
+        y el refinamiento por punto y coma.
+        """
+        cota_sube = self.cota_sube[indice_siguiente_pista]
+        cota_baja = self.cota_baja[indice_siguiente_pista]
+        lider = max(puntuaciones, key=puntuaciones.get)
+        minimo_lider = puntuaciones[lider] + cota_baja[lider]
+        if minimo_lider < UMBRAL_CONFIANZA_MINIMO_PUNTOS_ABSOLUTOS:
+            return False
+        maximo_resto_positivo = 0 # Lo más que pueden sumar los demás al total positivo de _decidir
+        for lenguaje, puntuacion in puntuaciones.items():
+            if lenguaje != lider:
+                maximo = puntuacion + cota_sube[lenguaje]
+                if maximo >= minimo_lider:
+                    return False
+                if maximo > 0:
+                    maximo_resto_positivo += maximo
+        # El porcentaje del líder es mínimo con su cota baja y las cotas altas de los demás.
+        return minimo_lider * 100 >= UMBRAL_CONFIANZA_MINIMO_PORCENTAJE_RELATIVO * (minimo_lider + maximo_resto_positivo)
+
+    def _minusculas_para_prefiltro(self, muestra_texto_completo):
+        """
+        Muestra en minúsculas para el prefiltro literal, o None si el prefiltro no sería
+        exacto (ver CARACTERES_PLEGADO_ESPECIAL).
+        """
+        if muestra_texto_completo.isascii() or \
+           not any(c in muestra_texto_completo for c in CARACTERES_PLEGADO_ESPECIAL):
+            return muestra_texto_completo.lower()
+        return None
+
+    def _aplicar_pista(self, pista, puntuaciones, pistas_activadas_debug, muestra_texto_completo, muestra_minusculas):
+        """
+        Evalúa una pista precompilada y suma sus efectos si coincide.
+        Devuelve None si el prefiltro la descartó sin ejecutar el regex, y si no True/False
+        según haya coincidido o no.
+        """
+        if pista.literal and muestra_minusculas is not None and pista.literal not in muestra_minusculas:
+            return None # El fragmento obligatorio no aparece: el regex no puede coincidir
+        if not pista.regex.search(muestra_texto_completo):
+            return False
+        for lenguaje, puntaje_modificador in pista.efectos.items():
+            if lenguaje in puntuaciones: # Asegurarse de que el lenguaje de la pista está soportado
+                puntuaciones[lenguaje] += puntaje_modificador
+                pistas_activadas_debug[lenguaje].append(f"PISTA_GENERAL: '{pista.patron}' -> {puntaje_modificador:+}")
+        return True
+
+    def _aplicar_pista_def_python(self, puntuaciones, pistas_activadas_debug, muestra_texto_completo, lineas_relevantes):
+        """Pista fuerte de Python: `def f(...):` sin `function` y con pocos o ningún punto y coma."""
+        if "Python" not in puntuaciones:
+            return
+        if REGEX_DEF_PYTHON.search(muestra_texto_completo) and \
+           not REGEX_FUNCTION_JS.search(muestra_texto_completo): # `def` sin `function` cerca
+            # Verificar si hay pocos o ningún punto y coma en las líneas significativas
+            lineas_con_codigo = [l.strip() for l in lineas_relevantes if l.strip() and not l.strip().startswith('#')]
+            if lineas_con_codigo:
+                conteo_punto_coma = sum(1 for l_cod in lineas_con_codigo if l_cod.endswith(';'))
+                if (len(lineas_con_codigo) > 2 and conteo_punto_coma / len(lineas_con_codigo) < 0.2) or \
+                   (len(lineas_con_codigo) <= 2 and conteo_punto_coma == 0):
+                    puntuaciones["Python"] += 120
+                    pistas_activadas_debug["Python"].append("PISTA_FUERTE: PYTHON_DEF_POCOS_O_NINGUN_SEMICOLON")
+
+    def _refinar_punto_coma(self, puntuaciones, pistas_activadas_debug, estadisticas_punto_coma):
+        """Refinamiento 1: punto y coma al final de las líneas significativas de todo el código."""
+        total_significativas, punto_y_comas_final_total = estadisticas_punto_coma
+        if not total_significativas: # Solo si hay algo que contar
+            return
+        ratio_punto_coma_total = punto_y_comas_final_total / total_significativas
+
+        # Si la mayoría de las líneas terminan en punto y coma
+        if ratio_punto_coma_total > 0.6:
+            efectos, etiqueta = EFECTOS_RATIO_PUNTO_COMA_ALTO, "ALTO_RATIO_PUNTO_COMA"
+        # Si muy pocas líneas o ninguna terminan en punto y coma (y hay al menos unas pocas líneas significativas)
+        elif ratio_punto_coma_total < 0.1 and total_significativas > 2:
+            efectos, etiqueta = EFECTOS_RATIO_PUNTO_COMA_BAJO, "BAJO_RATIO_PUNTO_COMA"
+        else:
+            return
+        for lenguaje, ajuste in efectos.items():
+            if lenguaje in puntuaciones: puntuaciones[lenguaje] += ajuste
+        pistas_activadas_debug.setdefault("REFINAMIENTO_GLOBAL", []).append(f"{etiqueta} ({ratio_punto_coma_total:.2f})")
+
+    def _refinar_llaves(self, puntuaciones, pistas_activadas_debug, muestra_texto_completo):
+        """Refinamiento 2: uso de llaves { } (si son balanceadas y frecuentes en la muestra)."""
+        llaves_abiertas = muestra_texto_completo.count('{')
+        llaves_cerradas = muestra_texto_completo.count('}')
+        if llaves_abiertas > 0 and llaves_abiertas == llaves_cerradas:
+            # El factor de llaves limita el impacto si hay muchísimas llaves
+            factor_llaves = min(llaves_abiertas, 5) # Considerar hasta 5 pares de llaves para el ajuste
+            for lang_llaves in LENGUAJES_CON_LLAVES:
+                if lang_llaves in puntuaciones: puntuaciones[lang_llaves] += 10 * factor_llaves
+            # Penalizar lenguajes que no usan llaves o las usan de forma muy diferente
+            if "Python" in puntuaciones: puntuaciones["Python"] -= 20 * factor_llaves
+            if "Pascal" in puntuaciones: puntuaciones["Pascal"] -= 15 * factor_llaves
+            if "HTML" in puntuaciones: puntuaciones["HTML"] -= 10 * factor_llaves
+            pistas_activadas_debug.setdefault("REFINAMIENTO_GLOBAL", []).append(f"LLAVES_BALANCEADAS_EN_MUESTRA (abiertas: {llaves_abiertas})")
+
+    def _decidir(self, puntuaciones, pistas_activadas_debug):
+        """Determina el lenguaje ganador y su porcentaje de confianza."""
+        # Suelo en 0 para que las penalizaciones no dejen puntuaciones negativas.
+        puntuaciones_finales = {lang: max(0, score) for lang, score in puntuaciones.items()}
+
+        if not any(p > 0 for p in puntuaciones_finales.values()):
+            return "Desconocido (sin pistas claras o puntuaciones negativas)", 0, pistas_activadas_debug
+
+        lenguaje_ganador = max(puntuaciones_finales, key=puntuaciones_finales.get)
+        puntuacion_ganadora = puntuaciones_finales[lenguaje_ganador]
+
+        # Porcentaje de confianza respecto a la suma de todas las puntuaciones positivas.
+        total_puntuacion_positiva_acumulada = sum(p for p in puntuaciones_finales.values() if p > 0)
+        certeza_porcentaje = 0
+        if total_puntuacion_positiva_acumulada > 0:
+            certeza_porcentaje = (puntuacion_ganadora / total_puntuacion_positiva_acumulada) * 100
+
+        if puntuacion_ganadora < UMBRAL_CONFIANZA_MINIMO_PUNTOS_ABSOLUTOS or \
+           (total_puntuacion_positiva_acumulada > 0 and certeza_porcentaje < UMBRAL_CONFIANZA_MINIMO_PORCENTAJE_RELATIVO):
+            mensaje_resultado = f"Desconocido (Baja Confianza: {lenguaje_ganador}? {puntuacion_ganadora:.0f}pts, {certeza_porcentaje:.1f}%)"
+            return mensaje_resultado, certeza_porcentaje, pistas_activadas_debug
+
+        return lenguaje_ganador, certeza_porcentaje, pistas_activadas_debug
+
+
+# Instancia compartida: las pistas se compilan una única vez al importar el módulo.
+DETECTOR_POR_DEFECTO = DetectorLenguaje()
+
+
+def detectar_lenguaje(codigo_lineas_o_texto, n_lineas_muestra=20, modo=MODO_COMPLETO, extension=None):
     """
     Detecta el lenguaje de programación de un fragmento de código.
 
@@ -11,6 +551,13 @@ def detectar_lenguaje(codigo_lineas_o_texto, n_lineas_muestra=20):
                                             o una única cadena de texto con el código.
         n_lineas_muestra (int): Número máximo de líneas a considerar del inicio del código
                                 para la detección.
+        modo (str): MODO_COMPLETO (por defecto) evalúa todas las pistas. MODO_ESCALONADO usa
+                    la cascada con salida temprana; en ese modo el diccionario de pistas
+                    incluye la entrada "CASCADA" con cuántas pistas se evaluaron.
+                    MODO_ESTADISTICO puntúa la muestra con el motor de n-gramas
+                    (motor_estadistico.py) en lugar de con las pistas.
+        extension (str): Extensión del archivo de origen (ej. ".py"), si se conoce. Solo se
+                         usa en MODO_ESCALONADO como señal decisiva.
 
     Returns:
         tuple: (lenguaje_detectado_str, confianza_float, pistas_activadas_dict)
@@ -20,189 +567,179 @@ def detectar_lenguaje(codigo_lineas_o_texto, n_lineas_muestra=20):
                - pistas_activadas_dict: Un diccionario para depuración que muestra qué pistas
                                         se activaron para cada lenguaje.
     """
-    if not codigo_lineas_o_texto:
-        return "Desconocido (sin entrada)", 0, {}
-
-    if isinstance(codigo_lineas_o_texto, str):
-        codigo_lineas = codigo_lineas_o_texto.splitlines()
-    elif isinstance(codigo_lineas_o_texto, list):
-        codigo_lineas = codigo_lineas_o_texto
-    else:
-        return "Desconocido (entrada no válida)", 0, {}
-
-    # Tomar una muestra de líneas no vacías para el análisis
-    lineas_relevantes = [linea for linea in codigo_lineas if linea.strip()][:n_lineas_muestra]
-
-    if not lineas_relevantes:
-        # Si después de filtrar las primeras n_lineas_muestra no queda nada (ej. solo espacios/saltos)
-        # podríamos intentar con todo el código si es corto, o devolver desconocido.
-        todas_lineas_relevantes = [linea for linea in codigo_lineas if linea.strip()]
-        if not todas_lineas_relevantes:
-            return "Desconocido (código vacío o solo espacios)", 0, {}
-        # Tomar una muestra de todas las líneas relevantes si las primeras 'n' estaban vacías
-        lineas_relevantes = todas_lineas_relevantes[:n_lineas_muestra]
-        
-    if not lineas_relevantes: # Doble chequeo por si acaso todo el código está vacío
-        return "Desconocido (código completamente vacío o solo espacios)", 0, {}
-
-    muestra_texto_completo = "\n".join(lineas_relevantes)
-
-    puntuaciones = {lang: 0 for lang in LENGUAJES_SOPORTADOS}
-    # Para depuración: qué pistas se activaron para cada lenguaje
-    pistas_activadas_debug = {lang: [] for lang in LENGUAJES_SOPORTADOS}
-
-
-    # --- Pistas directas y muy fuertes (pueden dar una detección temprana o alta prioridad) ---
-    # Estas se pueden manejar antes del bucle principal o dándoles un peso muy alto.
-    if re.search(r'<!DOCTYPE\s+html>', muestra_texto_completo, re.IGNORECASE):
-        puntuaciones["HTML"] += 200 # Bonificación muy alta
-        pistas_activadas_debug["HTML"].append("PISTA_FUERTE: DOCTYPE_HTML_DETECTED")
-
-    if re.search(r'\bprogram\s+\w+;', muestra_texto_completo, re.IGNORECASE) and \
-       re.search(r'end\.', "\n".join(codigo_lineas), re.IGNORECASE | re.MULTILINE): # `end.` en todo el código
-        puntuaciones["Pascal"] += 150
-        pistas_activadas_debug["Pascal"].append("PISTA_FUERTE: PASCAL_PROGRAM_END_DOT")
-
-    if re.search(r'\bdef\s+[a-zA-Z_]\w*\s*\(.*\)\s*:', muestra_texto_completo) and \
-       not re.search(r'\bfunction\s', muestra_texto_completo, re.IGNORECASE): # `def` sin `function` cerca
-        # Verificar si hay pocos o ningún punto y coma en las líneas significativas
-        lineas_con_codigo = [l.strip() for l in lineas_relevantes if l.strip() and not l.strip().startswith('#')]
-        if lineas_con_codigo: # Solo si hay líneas con código para analizar
-            conteo_punto_coma = sum(1 for l_cod in lineas_con_codigo if l_cod.endswith(';'))
-            # Si hay muy pocos punto y coma, es más probable que sea Python
-            if (len(lineas_con_codigo) > 2 and conteo_punto_coma / len(lineas_con_codigo) < 0.2) or \
-               (len(lineas_con_codigo) <= 2 and conteo_punto_coma == 0):
-                puntuaciones["Python"] += 120
-                pistas_activadas_debug["Python"].append("PISTA_FUERTE: PYTHON_DEF_POCOS_O_NINGUN_SEMICOLON")
-
-    
-    # --- Aplicar todas las pistas del diccionario PISTAS_LENGUAJE ---
-    for pista_regex_str, efectos_lenguaje in PISTAS_LENGUAJE.items():
+    return DETECTOR_POR_DEFECTO.detectar(codigo_lineas_o_texto, n_lineas_muestra, modo, extension)
+
+
+# --- Detección sobre archivos (lectura acotada) ---
+
+BYTES_VENTANA_ARCHIVO = 64 * 1024 # Tamaño de cada ventana (cabeza, centro y cola) de un archivo grande
+
+
+def _lineas_ventana(mapa, inicio, fin, recortar_inicio, recortar_final):
+    """
+    Decodifica mapa[inicio:fin] y lo divide en líneas, descartando la primera y/o la
+    última línea si la ventana las corta a la mitad. Como se corta por b'\n', nunca se
+    parte un carácter UTF-8 multibyte.
+    """
+    datos = mapa[inicio:fin]
+    if recortar_inicio:
+        salto = datos.find(b'\n')
+        datos = datos[salto + 1:] if salto != -1 else b''
+    if recortar_final:
+        salto = datos.rfind(b'\n')
+        datos = datos[:salto] if salto != -1 else b''
+    return datos.decode('utf-8', errors='replace').splitlines()
+
+
+def detectar_lenguaje_archivo(ruta, n_lineas_muestra=20, modo=MODO_COMPLETO, bytes_ventana=BYTES_VENTANA_ARCHIVO, detector=None):
+    """
+    Detecta el lenguaje de un archivo sin leerlo entero.
+
+    Si el archivo cabe en tres ventanas se lee completo y el resultado es el mismo que
+    `detectar_lenguaje` sobre su contenido. Si es mayor, se proyecta en memoria (mmap) y
+    solo se decodifican tres ventanas de `bytes_ventana` bytes alineadas a líneas (cabeza,
+    centro y cola): la muestra sale de la cabeza, y el ratio de punto y coma y la búsqueda
+    de `end.` se calculan sobre las tres ventanas en lugar de sobre todo el archivo.
+
+    Args:
+        ruta (str): Ruta del archivo (se decodifica como UTF-8, reemplazando bytes inválidos).
+        n_lineas_muestra (int): Se pasa tal cual a `detectar_lenguaje`.
+        modo (str): Modo de detección; en MODO_ESCALONADO la extensión de la ruta se usa
+                    como señal decisiva.
+        bytes_ventana (int): Tamaño de cada ventana.
+        detector (DetectorLenguaje): Detector a usar (por defecto, DETECTOR_POR_DEFECTO).
+
+    Returns:
+        tuple: (lenguaje_detectado, porcentaje_confianza, pistas_activadas_debug).
+
+    Raises:
+        OSError: Si el archivo no se puede abrir o leer.
+    """
+    detector = detector if detector is not None else DETECTOR_POR_DEFECTO
+    extension = os.path.splitext(ruta)[1] if modo == MODO_ESCALONADO else None
+    with open(ruta, 'rb') as archivo:
+        tamanio = os.fstat(archivo.fileno()).st_size
+        if tamanio <= 3 * bytes_ventana:
+            codigo = archivo.read().decode('utf-8', errors='replace')
+            return detector.detectar(codigo, n_lineas_muestra, modo, extension)
+        with mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            inicio_centro = (tamanio - bytes_ventana) // 2
+            lineas_ventanas = (
+                _lineas_ventana(mapa, 0, bytes_ventana, False, True)
+                + _lineas_ventana(mapa, inicio_centro, inicio_centro + bytes_ventana, True, True)
+                + _lineas_ventana(mapa, tamanio - bytes_ventana, tamanio, True, False)
+            )
+
+    # Las líneas de las tres ventanas hacen de código completo: la muestra sale de la cabeza
+    # (o de las siguientes ventanas si la cabeza solo tiene espacios).
+    entrada, resultado_inmediato = detector.preparar_entrada(lineas_ventanas, n_lineas_muestra)
+    if entrada is None:
+        return resultado_inmediato
+    return detector.detectar_entrada(entrada, modo, extension)
+
+
+# --- Detección por lotes de archivos ---
+
+BYTES_POR_LOTE = 256 * 1024     # Tamaño acumulado objetivo de cada lote enviado a un proceso
+MAX_ARCHIVOS_POR_LOTE = 64      # Número máximo de archivos pequeños agrupados en un mismo lote
+LOTES_EN_VUELO_POR_PROCESO = 4  # Lotes pendientes por proceso (limita la memoria con árboles enormes)
+
+
+def _detectar_archivos(rutas, n_lineas_muestra, incluir_pistas, modo=MODO_COMPLETO):
+    """
+    Lee y clasifica una lista de archivos en el proceso actual.
+    Es la unidad de trabajo que se envía a cada proceso del pool.
+
+    Returns:
+        list: Tuplas (ruta, lenguaje, confianza) o (ruta, lenguaje, confianza, pistas).
+    """
+    resultados = []
+    for ruta in rutas:
         try:
-            # Usamos re.search para encontrar la pista en cualquier parte de la muestra
-            # re.MULTILINE permite que ^ y $ funcionen por línea si se usan en el regex
-            # re.IGNORECASE hace que la búsqueda no distinga mayúsculas/minúsculas
-            if re.search(pista_regex_str, muestra_texto_completo, re.IGNORECASE | re.MULTILINE):
-                for lenguaje, puntaje_modificador in efectos_lenguaje.items():
-                    if lenguaje in puntuaciones: # Asegurarse de que el lenguaje de la pista está soportado
-                        puntuaciones[lenguaje] += puntaje_modificador
-                        # Guardar información de depuración
-                        pistas_activadas_debug[lenguaje].append(f"PISTA_GENERAL: '{pista_regex_str}' -> {puntaje_modificador:+}") # el :+ fuerza a mostrar el signo
-        except re.error as e:
-            # Esto no debería ocurrir si todas las expresiones regulares en PISTAS_LENGUAJE son válidas.
-            # Es una salvaguarda durante el desarrollo.
-            print(f"ADVERTENCIA: Error de Expresión Regular en PISTAS_LENGUAJE: '{pista_regex_str}' - {e}")
-            # Podríamos decidir si continuar o detenernos si una pista es inválida.
-            # Por ahora, solo imprimimos una advertencia y continuamos con las demás pistas.
-            continue
+            with open(ruta, 'r', encoding='utf-8', errors='replace') as archivo:
+                codigo = archivo.read()
+            extension = os.path.splitext(ruta)[1] if modo == MODO_ESCALONADO else None
+            lenguaje, confianza, pistas = detectar_lenguaje(codigo, n_lineas_muestra, modo, extension)
+        except OSError as e:
+            lenguaje, confianza, pistas = f"Desconocido (error de lectura: {e})", 0, {}
+        if incluir_pistas:
+            resultados.append((ruta, lenguaje, confianza, pistas))
+        else:
+            resultados.append((ruta, lenguaje, confianza))
+    return resultados
 
-    
-    # --- Lógica de refinamiento post-pistas ---
-    # Analizar características más generales del código para ajustar puntuaciones.
 
-    # 1. Contar punto y coma al final de líneas no vacías y no comentarios (más globalmente)
-    #    Usamos todas las `codigo_lineas` para este análisis, no solo la muestra,
-    #    para tener una mejor idea del estilo general si el código es más largo.
-    lineas_significativas_completas = [
-        l.strip() for l in codigo_lineas 
-        if l.strip() and not l.strip().startswith(('#', '//', '--')) and 
-           not (l.strip().startswith('/*') and l.strip().endswith('*/')) and
-           not (l.strip().startswith('{') and l.strip().endswith('}')) # Excluir líneas que son solo un bloque
-    ]
+def _agrupar_en_lotes(rutas, bytes_por_lote, max_archivos_por_lote):
+    """
+    Agrupa las rutas en lotes para amortizar el coste de comunicación entre procesos:
+    los archivos pequeños se juntan hasta `bytes_por_lote` (o `max_archivos_por_lote`),
+    y un archivo que por sí solo supera el límite va en su propio lote.
+    """
+    lote = []
+    bytes_lote = 0
+    for ruta in rutas:
+        try:
+            tamanio = os.path.getsize(ruta)
+        except OSError:
+            tamanio = 0 # El error se reportará al intentar leerlo
+        if lote and (bytes_lote + tamanio > bytes_por_lote or len(lote) >= max_archivos_por_lote):
+            yield lote
+            lote = []
+            bytes_lote = 0
+        lote.append(ruta)
+        bytes_lote += tamanio
+    if lote:
+        yield lote
 
-    if lineas_significativas_completas: # Solo si hay algo que contar
-        punto_y_comas_final_total = sum(1 for linea_str in lineas_significativas_completas if linea_str.endswith(';'))
-        ratio_punto_coma_total = punto_y_comas_final_total / len(lineas_significativas_completas)
 
-        # Si la mayoría de las líneas terminan en punto y coma
-        if ratio_punto_coma_total > 0.6: 
-            for lang_pc in ["C++", "JavaScript", "PL/SQL", "T-SQL", "Pascal"]: # Lenguajes que usan ;
-                if lang_pc in puntuaciones: puntuaciones[lang_pc] += 15
-            if "Python" in puntuaciones: puntuaciones["Python"] -= 50 # Fuerte penalización para Python
-            if "HTML" in puntuaciones: puntuaciones["HTML"] -= 30 # HTML no usa ; así
-            # Registrar esta pista global para depuración
-            pistas_activadas_debug.setdefault("REFINAMIENTO_GLOBAL", []).append(f"ALTO_RATIO_PUNTO_COMA ({ratio_punto_coma_total:.2f})")
-        # Si muy pocas líneas o ninguna terminan en punto y coma (y hay al menos unas pocas líneas significativas)
-        elif ratio_punto_coma_total < 0.1 and len(lineas_significativas_completas) > 2: 
-            if "Python" in puntuaciones: puntuaciones["Python"] += 25 # Bonificación para Python
-            if "HTML" in puntuaciones: puntuaciones["HTML"] += 10 # HTML no usa ;
-            for lang_pc in ["C++", "JavaScript", "PL/SQL", "T-SQL", "Pascal"]:
-                if lang_pc in puntuaciones: puntuaciones[lang_pc] -= 10 # Penalización leve
-            pistas_activadas_debug.setdefault("REFINAMIENTO_GLOBAL", []).append(f"BAJO_RATIO_PUNTO_COMA ({ratio_punto_coma_total:.2f})")
-
-    # 2. Ajuste por uso de llaves { } (si son balanceadas y frecuentes en la muestra)
-    #    Usamos `muestra_texto_completo` para esto, ya que las llaves definen bloques locales.
-    llaves_abiertas = muestra_texto_completo.count('{')
-    llaves_cerradas = muestra_texto_completo.count('}')
-    
-    # Si hay llaves y están balanceadas (mismo número de apertura que de cierre)
-    if llaves_abiertas > 0 and llaves_abiertas == llaves_cerradas:
-        # El factor de llaves limita el impacto si hay muchísimas llaves
-        factor_llaves = min(llaves_abiertas, 5) # Considerar hasta 5 pares de llaves para el ajuste
-        
-        for lang_llaves in ["C++", "JavaScript"]: # Lenguajes que usan mucho { }
-            if lang_llaves in puntuaciones: puntuaciones[lang_llaves] += 10 * factor_llaves
-        
-        # Penalizar lenguajes que no usan llaves o las usan de forma muy diferente
-        if "Python" in puntuaciones: puntuaciones["Python"] -= 20 * factor_llaves
-        if "Pascal" in puntuaciones: puntuaciones["Pascal"] -= 15 * factor_llaves
-        if "HTML" in puntuaciones: puntuaciones["HTML"] -= 10 * factor_llaves # HTML las usa para CSS/JS inline, pero no como bloques primarios
-        
-        pistas_activadas_debug.setdefault("REFINAMIENTO_GLOBAL", []).append(f"LLAVES_BALANCEADAS_EN_MUESTRA (abiertas: {llaves_abiertas})")
-
-    
-    # --- Determinar el lenguaje ganador ---
-    
-    # Poner un suelo a las puntuaciones (ej. 0) para que no haya negativos al final,
-    # ya que algunos puntajes podrían haber bajado mucho debido a penalizaciones.
-    # Esto simplifica el cálculo de la "confianza" si la definimos como un porcentaje del total positivo.
-    puntuaciones_finales = {lang: max(0, score) for lang, score in puntuaciones.items()}
-
-    # Si todas las puntuaciones finales son 0 (o fueron negativas y se ajustaron a 0),
-    # significa que no se encontró ninguna pista lo suficientemente fuerte.
-    if not any(p > 0 for p in puntuaciones_finales.values()):
-        return "Desconocido (sin pistas claras o puntuaciones negativas)", 0, pistas_activadas_debug
-
-    # Encontrar el lenguaje con la puntuación más alta
-    lenguaje_ganador = max(puntuaciones_finales, key=puntuaciones_finales.get)
-    puntuacion_ganadora = puntuaciones_finales[lenguaje_ganador]
-
-    # Calcular un porcentaje de confianza (opcional, pero puede ser más intuitivo que la puntuación bruta)
-    # Suma de todas las puntuaciones positivas finales.
-    total_puntuacion_positiva_acumulada = sum(p for p in puntuaciones_finales.values() if p > 0)
-    
-    certeza_porcentaje = 0
-    if total_puntuacion_positiva_acumulada > 0:
-        certeza_porcentaje = (puntuacion_ganadora / total_puntuacion_positiva_acumulada) * 100
-    else:
-        # Esto no debería ocurrir si ya pasamos el chequeo de 'any(p > 0 ...)'
-        # pero es una salvaguarda. Si el ganador tiene 0 y el total es 0.
-        certeza_porcentaje = 0
+def detectar_lenguajes_lote(rutas, workers=None, incluir_pistas=False, n_lineas_muestra=20,
+                            bytes_por_lote=BYTES_POR_LOTE, max_archivos_por_lote=MAX_ARCHIVOS_POR_LOTE,
+                            modo=MODO_COMPLETO):
+    """
+    Detecta el lenguaje de muchos archivos repartiendo el trabajo en un ProcessPoolExecutor.
+
+    Los resultados se devuelven en streaming (generador) a medida que terminan los lotes,
+    por lo que el orden no coincide necesariamente con el de `rutas`.
+
+    Args:
+        rutas (iterable): Rutas de los archivos a clasificar. Se consumen de forma perezosa.
+        workers (int): Número de procesos. None usa os.cpu_count(); 1 o menos clasifica
+                       en el proceso actual, sin pool.
+        incluir_pistas (bool): Si es True, cada resultado incluye el diccionario de pistas
+                               de depuración (aumenta mucho el volumen transferido).
+        n_lineas_muestra (int): Se pasa tal cual a `detectar_lenguaje`.
+        bytes_por_lote (int): Tamaño acumulado objetivo de cada lote de archivos pequeños.
+        max_archivos_por_lote (int): Máximo de archivos por lote.
+        modo (str): Modo de detección; en MODO_ESCALONADO la extensión de cada ruta se usa
+                    como señal decisiva.
+
+    Yields:
+        tuple: (ruta, lenguaje, confianza), o (ruta, lenguaje, confianza, pistas) si
+               `incluir_pistas` es True.
+    """
+    lotes = _agrupar_en_lotes(rutas, bytes_por_lote, max_archivos_por_lote)
+    if workers is None:
+        workers = os.cpu_count() or 1
 
+    if workers <= 1:
+        for lote in lotes:
+            yield from _detectar_archivos(lote, n_lineas_muestra, incluir_pistas, modo)
+        return
 
-    # --- Umbrales de confianza ---
-    # Estos umbrales son empíricos y pueden necesitar ajuste.
-    UMBRAL_CONFIANZA_MINIMO_PUNTOS_ABSOLUTOS = 35 # El ganador debe tener al menos esta puntuación.
-    UMBRAL_CONFIANZA_MINIMO_PORCENTAJE_RELATIVO = 30 # El ganador debe representar al menos este % del total de puntos positivos.
-
-    # Si la puntuación ganadora es muy baja o su porcentaje relativo es bajo,
-    # consideramos la detección como de baja confianza.
-    if puntuacion_ganadora < UMBRAL_CONFIANZA_MINIMO_PUNTOS_ABSOLUTOS or \
-       (total_puntuacion_positiva_acumulada > 0 and certeza_porcentaje < UMBRAL_CONFIANZA_MINIMO_PORCENTAJE_RELATIVO):
-        
-        # Creamos un mensaje que indica la baja confianza y cuál podría ser el lenguaje.
-        # Podríamos también incluir los N mejores candidatos si quisiéramos.
-        # Por ejemplo:
-        # sorted_puntuaciones = sorted(puntuaciones_finales.items(), key=lambda item: item[1], reverse=True)
-        # top_candidatos_str = ", ".join([f"{lang}({score:.0f}pts)" for lang, score in sorted_puntuaciones if score > 10][:3])
-        # mensaje_resultado = f"Desconocido (Baja Confianza. Posibles: {top_candidatos_str})"
-        
-        mensaje_resultado = f"Desconocido (Baja Confianza: {lenguaje_ganador}? {puntuacion_ganadora:.0f}pts, {certeza_porcentaje:.1f}%)"
-        
-        # Devolvemos el mensaje de baja confianza, la certeza calculada (que será baja) y las pistas para depuración.
-        return mensaje_resultado, certeza_porcentaje, pistas_activadas_debug
-
-    # Si se superan los umbrales de confianza, devolvemos el lenguaje ganador.
-    # Se puede elegir devolver la puntuacion_ganadora bruta o el certeza_porcentaje.
-    # El porcentaje puede ser más fácil de interpretar para el usuario.
-    return lenguaje_ganador, certeza_porcentaje, pistas_activadas_debug
+    max_en_vuelo = workers * LOTES_EN_VUELO_POR_PROCESO
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pendientes = set()
+        try:
+            for lote in lotes:
+                pendientes.add(pool.submit(_detectar_archivos, lote, n_lineas_muestra, incluir_pistas, modo))
+                if len(pendientes) >= max_en_vuelo:
+                    terminados, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                    for futuro in terminados:
+                        yield from futuro.result()
+            for futuro in as_completed(pendientes):
+                pendientes.discard(futuro)
+                yield from futuro.result()
+        finally:
+            # Si el consumidor abandona el generador, no seguir procesando lotes en cola.
+            for futuro in pendientes:
+                futuro.cancel()
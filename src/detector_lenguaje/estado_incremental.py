@@ -0,0 +1,125 @@
+# src/detector_lenguaje/estado_incremental.py
+from .detector import (
+    DETECTOR_POR_DEFECTO, EntradaDeteccion, MODO_COMPLETO, REGEX_END_PUNTO_PASCAL, contar_lineas_punto_y_coma
+)
+
+
+class EstadoDeteccionIncremental:
+    """
+    Estado de detección por línea para el editor.
+
+    Para cada línea se guarda si es significativa y si termina en punto y coma (para el
+    ratio de punto y coma) y si contiene `end.`. Los totales globales se ajustan al
+    reemplazar líneas, de modo que una edición cuesta lo que miden las líneas cambiadas y
+    no el tamaño del archivo. La muestra (primeras `n_lineas_muestra` líneas no vacías)
+    solo se vuelve a extraer si la edición la toca.
+
+    Las pistas se siguen evaluando sobre el texto unido de la muestra, igual que en
+    `detectar_lenguaje` (hay pistas que abarcan varias líneas), así que el resultado es
+    idéntico al de `detectar_lenguaje(lineas, n_lineas_muestra, modo, extension)`.
+    """
+
+    def __init__(self, codigo="", n_lineas_muestra=20, detector=None, cache=None):
+        if n_lineas_muestra < 1:
+            raise ValueError("El estado incremental necesita una muestra de al menos una línea.")
+        self.n_lineas_muestra = n_lineas_muestra
+        self.detector = detector if detector is not None else DETECTOR_POR_DEFECTO
+        self.cache = cache # CacheDeteccion opcional que se consulta con la entrada ya preparada
+        self._lineas = []
+        self._significativa = []
+        self._punto_coma = []
+        self._end_punto = []
+        self._total_significativas = 0
+        self._total_punto_coma = 0
+        self._total_end_punto = 0
+        self._muestra = []
+        self._fin_muestra = 0 # Índice de la línea siguiente a la última de la muestra
+        self._version_muestra = 0
+        self._ultimo_resultado = None # (clave, resultado) de la última detección
+        if codigo:
+            self.reemplazar_lineas(0, 0, codigo.splitlines() if isinstance(codigo, str) else list(codigo))
+
+    @property
+    def numero_lineas(self):
+        return len(self._lineas)
+
+    def reemplazar_lineas(self, inicio, fin, nuevas_lineas):
+        """Sustituye las líneas [inicio, fin) por `nuevas_lineas` y ajusta los totales."""
+        if not 0 <= inicio <= fin <= len(self._lineas):
+            raise IndexError(f"Rango de líneas fuera del documento: [{inicio}, {fin}) con {len(self._lineas)} líneas.")
+        self._total_significativas -= sum(self._significativa[inicio:fin])
+        self._total_punto_coma -= sum(self._punto_coma[inicio:fin])
+        self._total_end_punto -= sum(self._end_punto[inicio:fin])
+
+        significativa, punto_coma, end_punto = [], [], []
+        for linea in nuevas_lineas:
+            # Contar una línea sola da su aportación exacta a las estadísticas globales.
+            es_significativa, termina_en_punto_coma = contar_lineas_punto_y_coma((linea,))
+            significativa.append(es_significativa)
+            punto_coma.append(termina_en_punto_coma)
+            end_punto.append(REGEX_END_PUNTO_PASCAL.search(linea) is not None)
+        self._total_significativas += sum(significativa)
+        self._total_punto_coma += sum(punto_coma)
+        self._total_end_punto += sum(end_punto)
+
+        self._lineas[inicio:fin] = nuevas_lineas
+        self._significativa[inicio:fin] = significativa
+        self._punto_coma[inicio:fin] = punto_coma
+        self._end_punto[inicio:fin] = end_punto
+
+        # Una edición posterior a una muestra ya completa no la cambia.
+        if inicio < self._fin_muestra or len(self._muestra) < self.n_lineas_muestra:
+            self._actualizar_muestra()
+
+    def actualizar_texto(self, codigo):
+        """
+        Sincroniza el estado con el código completo (texto o lista de líneas), reemplazando
+        solo el tramo de líneas que difiere (prefijo y sufijo comunes se conservan).
+        """
+        nuevas = codigo.splitlines() if isinstance(codigo, str) else list(codigo)
+        actuales = self._lineas
+        limite = min(len(actuales), len(nuevas))
+        inicio = 0
+        while inicio < limite and actuales[inicio] == nuevas[inicio]:
+            inicio += 1
+        sufijo = 0
+        while sufijo < limite - inicio and actuales[-1 - sufijo] == nuevas[-1 - sufijo]:
+            sufijo += 1
+        if inicio == len(actuales) == len(nuevas):
+            return
+        self.reemplazar_lineas(inicio, len(actuales) - sufijo, nuevas[inicio:len(nuevas) - sufijo])
+
+    def _actualizar_muestra(self):
+        muestra = []
+        fin = len(self._lineas)
+        for indice, linea in enumerate(self._lineas):
+            if linea.strip():
+                muestra.append(linea)
+                if len(muestra) >= self.n_lineas_muestra:
+                    fin = indice + 1
+                    break
+        self._fin_muestra = fin
+        if muestra != self._muestra:
+            self._muestra = muestra
+            self._version_muestra += 1
+
+    def detectar(self, modo=MODO_COMPLETO, extension=None):
+        """Mismo resultado que `detectar_lenguaje` sobre las líneas actuales."""
+        if not self._lineas:
+            return "Desconocido (sin entrada)", 0, {}
+        if not self._muestra:
+            return "Desconocido (código vacío o solo espacios)", 0, {}
+
+        estadisticas_punto_coma = (self._total_significativas, self._total_punto_coma)
+        clave = (self._version_muestra, self._lineas[0], self._total_end_punto > 0, estadisticas_punto_coma, modo, extension)
+        if self._ultimo_resultado is not None and self._ultimo_resultado[0] == clave:
+            return self._ultimo_resultado[1]
+
+        entrada = EntradaDeteccion(self._muestra, self._lineas[0], end_punto=self._total_end_punto > 0,
+                                   estadisticas_punto_coma=estadisticas_punto_coma)
+        if self.cache is not None:
+            resultado = self.cache.detectar_entrada(entrada, self.n_lineas_muestra, modo, extension)
+        else:
+            resultado = self.detector.detectar_entrada(entrada, modo, extension)
+        self._ultimo_resultado = (clave, resultado)
+        return resultado
@@ -0,0 +1,250 @@
+# src/detector_lenguaje/motor_estadistico.py
+"""
+Motor estadístico de detección: alternativa a las pistas ponderadas a mano.
+
+La muestra se convierte en un vector de características (trigramas de caracteres y
+palabras/operadores) proyectadas por hash a DIMENSION_CARACTERISTICAS posiciones, y se
+puntúan todos los lenguajes a la vez con un producto matriz-vector contra una tabla de
+pesos (Bayes ingenuo multinomial en espacio logarítmico) entrenada aparte. El coste por
+muestra no depende del número de pistas ni de lenguajes más allá de ese producto.
+
+Con NumPy instalado la puntuación es un `np.bincount` + producto matricial; sin NumPy se
+usa una suma dispersa en Python puro con los mismos pesos (más lenta, mismo resultado).
+
+Si el ganador apenas supera al segundo (menos de MARGEN_MINIMO_POR_CARACTERISTICA de
+log-verosimilitud por característica) el resultado es "Desconocido (Baja Confianza ...)",
+como con los umbrales del detector de pistas.
+
+Entrenamiento (fuera de línea):
+    python -m src.detector_lenguaje.motor_estadistico pesos.json [corpus ...]
+Cada corpus es un directorio con un subdirectorio por lenguaje (ver DIRECTORIOS_CORPUS);
+los archivos de `ejemplos_Codigo` se incluyen siempre. La tabla que usa el motor por
+defecto (RUTA_PESOS_POR_DEFECTO) se genera así con el corpus de variantes de los ejemplos:
+    python -m benchmarks.regresion_detector --exportar-corpus /tmp/corpus_detector
+    python -m src.detector_lenguaje.motor_estadistico src/detector_lenguaje/pesos_estadistico.json /tmp/corpus_detector
+"""
+import json
+import math
+import os
+import re
+import sys
+import zlib
+from collections import Counter
+from functools import lru_cache
+
+from .pistas_lenguaje import LENGUAJES_SOPORTADOS
+
+try:
+    import numpy as np
+except ImportError: # NumPy es opcional: sin él se usa la suma dispersa en Python puro
+    np = None
+
+DIMENSION_CARACTERISTICAS = 1 << 14 # Posiciones del espacio de características (hash)
+SUAVIZADO_LAPLACE = 1.0
+MAX_CARACTERES_MUESTRA = 4096 # Límite de texto por muestra: coste casi constante por archivo
+# Diferencia mínima de log-verosimilitud media por característica entre el ganador y el
+# segundo. Con menos, la muestra no se parece claramente a ningún lenguaje (texto en prosa,
+# fragmentos de una o dos palabras...). Empírico: ver benchmarks/regresion_detector.py.
+MARGEN_MINIMO_POR_CARACTERISTICA = 0.1
+
+RUTA_PESOS_POR_DEFECTO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pesos_estadistico.json")
+
+# Palabras (identificadores y palabras clave) y grupos de hasta 3 signos (`:=`, `=>`, `</`, ...)
+REGEX_PALABRA = re.compile(r'[a-z_][a-z0-9_]*|[^\w\s]{1,3}')
+
+DIRECTORIO_EJEMPLOS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "ejemplos_Codigo"
+)
+# Etiquetas de los archivos de `ejemplos_Codigo` (la extensión .sql no distingue T-SQL de PL/SQL).
+ETIQUETAS_EJEMPLOS = {
+    "prueba_cpp.cpp": "C++",
+    "prueba_html.html": "HTML",
+    "prueba_javascript.js": "JavaScript",
+    "prueba_pascal.pas": "Pascal",
+    "prueba_pascal_tipo_invalido.pas": "Pascal",
+    "prueba_plsql.sql": "PL/SQL",
+    "prueba_python.py": "Python",
+    "prueba_tsql.sql": "T-SQL",
+}
+# Nombre del subdirectorio de un corpus de entrenamiento -> lenguaje.
+DIRECTORIOS_CORPUS = {
+    "cpp": "C++", "html": "HTML", "javascript": "JavaScript", "pascal": "Pascal",
+    "plsql": "PL/SQL", "python": "Python", "tsql": "T-SQL",
+}
+
+
+@lru_cache(maxsize=1 << 16)
+def _indice_caracteristica(caracteristica):
+    """Posición de una característica en el espacio hash (crc32: estable entre procesos)."""
+    return zlib.crc32(caracteristica.encode('utf-8')) & (DIMENSION_CARACTERISTICAS - 1)
+
+
+def extraer_caracteristicas(texto):
+    """
+    Devuelve la lista de índices de características de `texto` (con repeticiones):
+    una por cada palabra u operador y una por cada trigrama de caracteres.
+    """
+    texto = texto[:MAX_CARACTERES_MUESTRA].lower()
+    indices = [_indice_caracteristica('p:' + palabra) for palabra in REGEX_PALABRA.findall(texto)]
+    # Los espacios se colapsan para que la indentación no domine los trigramas
+    compacto = ' '.join(texto.split())
+    indices.extend(_indice_caracteristica(compacto[i:i + 3]) for i in range(len(compacto) - 2))
+    return indices
+
+
+class MotorEstadistico:
+    """
+    Tabla de pesos log P(característica | lenguaje) y su evaluación.
+
+    Los pesos se guardan de forma dispersa: una fila por cada característica vista en el
+    entrenamiento y una fila por defecto (la de las no vistas) por lenguaje.
+    """
+
+    def __init__(self, lenguajes, pesos_dispersos, pesos_por_defecto):
+        self.lenguajes = list(lenguajes)
+        self.pesos_dispersos = pesos_dispersos   # {indice: [peso por lenguaje]}
+        self.pesos_por_defecto = pesos_por_defecto # [peso por lenguaje]
+        self.matriz = None
+        if np is not None:
+            self.matriz = np.tile(np.asarray(pesos_por_defecto, dtype=np.float64), (DIMENSION_CARACTERISTICAS, 1))
+            if pesos_dispersos:
+                indices = np.fromiter(pesos_dispersos.keys(), dtype=np.int64)
+                self.matriz[indices] = np.asarray(list(pesos_dispersos.values()), dtype=np.float64)
+
+    @classmethod
+    def entrenar(cls, muestras, lenguajes=None):
+        """
+        Entrena la tabla a partir de pares (texto, lenguaje).
+        Los lenguajes sin muestras quedan con pesos uniformes (no ganan nunca por sí solos).
+        """
+        lenguajes = list(lenguajes if lenguajes is not None else LENGUAJES_SOPORTADOS)
+        conteos = {lang: Counter() for lang in lenguajes}
+        for texto, lenguaje in muestras:
+            if lenguaje in conteos:
+                conteos[lenguaje].update(extraer_caracteristicas(texto))
+
+        denominadores = [
+            math.log(sum(conteos[lang].values()) + SUAVIZADO_LAPLACE * DIMENSION_CARACTERISTICAS) for lang in lenguajes
+        ]
+        log_suavizado = math.log(SUAVIZADO_LAPLACE)
+        pesos_por_defecto = [log_suavizado - d for d in denominadores]
+        vistas = set()
+        for conteo in conteos.values():
+            vistas.update(conteo)
+        pesos_dispersos = {
+            indice: [math.log(conteos[lang][indice] + SUAVIZADO_LAPLACE) - d for lang, d in zip(lenguajes, denominadores)]
+            for indice in sorted(vistas)
+        }
+        return cls(lenguajes, pesos_dispersos, pesos_por_defecto)
+
+    @classmethod
+    def desde_archivo(cls, ruta):
+        """Carga una tabla guardada con `guardar`."""
+        with open(ruta, 'r', encoding='utf-8') as archivo:
+            datos = json.load(archivo)
+        if datos.get("dimension") != DIMENSION_CARACTERISTICAS:
+            raise ValueError(f"La tabla de pesos '{ruta}' usa otra dimensión de características ({datos.get('dimension')}).")
+        pesos_dispersos = {int(indice): fila for indice, fila in datos["pesos"].items()}
+        return cls(datos["lenguajes"], pesos_dispersos, datos["por_defecto"])
+
+    def guardar(self, ruta):
+        datos = {
+            "dimension": DIMENSION_CARACTERISTICAS,
+            "lenguajes": self.lenguajes,
+            "por_defecto": self.pesos_por_defecto,
+            "pesos": {str(indice): fila for indice, fila in self.pesos_dispersos.items()},
+        }
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump(datos, archivo)
+
+    def puntuar(self, texto):
+        """
+        Devuelve ({lenguaje: log-verosimilitud}, numero_de_caracteristicas).
+        Con 0 características todas las puntuaciones son 0.
+        """
+        indices = extraer_caracteristicas(texto)
+        if not indices:
+            return {lang: 0.0 for lang in self.lenguajes}, 0
+        if self.matriz is not None:
+            vector = np.bincount(np.asarray(indices, dtype=np.int64), minlength=DIMENSION_CARACTERISTICAS)
+            totales = (vector @ self.matriz).tolist()
+        else:
+            totales = [0.0] * len(self.lenguajes)
+            for indice, repeticiones in Counter(indices).items():
+                fila = self.pesos_dispersos.get(indice, self.pesos_por_defecto)
+                for i, peso in enumerate(fila):
+                    totales[i] += repeticiones * peso
+        return dict(zip(self.lenguajes, totales)), len(indices)
+
+    def detectar(self, texto):
+        """
+        Clasifica `texto`. La confianza es la probabilidad a posteriori del ganador (en %)
+        con una distribución a priori uniforme entre lenguajes. Si el margen sobre el segundo
+        no llega a MARGEN_MINIMO_POR_CARACTERISTICA, devuelve "Desconocido (Baja Confianza ...)".
+
+        Returns:
+            tuple: (lenguaje, porcentaje_confianza, pistas_activadas_debug)
+        """
+        puntuaciones, n_caracteristicas = self.puntuar(texto)
+        pistas_activadas_debug = {lang: [] for lang in self.lenguajes}
+        pistas_activadas_debug["ESTADISTICO"] = [f"CARACTERISTICAS ({n_caracteristicas})"]
+        if not n_caracteristicas:
+            return "Desconocido (sin pistas claras o puntuaciones negativas)", 0, pistas_activadas_debug
+
+        maximo = max(puntuaciones.values())
+        exponenciales = {lang: math.exp(p - maximo) for lang, p in puntuaciones.items()}
+        suma = sum(exponenciales.values())
+        lenguaje_ganador = max(puntuaciones, key=puntuaciones.get)
+        for lang, p in puntuaciones.items():
+            pistas_activadas_debug[lang].append(f"LOG_VEROSIMILITUD: {p:.1f}")
+        certeza_porcentaje = exponenciales[lenguaje_ganador] / suma * 100
+
+        segunda = max((p for lang, p in puntuaciones.items() if lang != lenguaje_ganador), default=maximo)
+        margen = (maximo - segunda) / n_caracteristicas
+        pistas_activadas_debug["ESTADISTICO"].append(f"MARGEN_POR_CARACTERISTICA ({margen:.3f})")
+        if len(puntuaciones) > 1 and margen < MARGEN_MINIMO_POR_CARACTERISTICA:
+            mensaje_resultado = f"Desconocido (Baja Confianza: {lenguaje_ganador}? margen {margen:.3f}, {certeza_porcentaje:.1f}%)"
+            return mensaje_resultado, certeza_porcentaje, pistas_activadas_debug
+        return lenguaje_ganador, certeza_porcentaje, pistas_activadas_debug
+
+
+def muestras_de_ejemplos(directorio=DIRECTORIO_EJEMPLOS):
+    """Pares (texto, lenguaje) de los archivos etiquetados de `ejemplos_Codigo`."""
+    for nombre, lenguaje in ETIQUETAS_EJEMPLOS.items():
+        ruta = os.path.join(directorio, nombre)
+        if os.path.isfile(ruta):
+            with open(ruta, 'r', encoding='utf-8', errors='replace') as archivo:
+                yield archivo.read(), lenguaje
+
+
+def muestras_de_corpus(directorio):
+    """Pares (texto, lenguaje) de un corpus con un subdirectorio por lenguaje (DIRECTORIOS_CORPUS)."""
+    for subdirectorio, lenguaje in DIRECTORIOS_CORPUS.items():
+        raiz = os.path.join(directorio, subdirectorio)
+        for carpeta, _, archivos in os.walk(raiz):
+            for nombre in sorted(archivos):
+                with open(os.path.join(carpeta, nombre), 'r', encoding='utf-8', errors='replace') as archivo:
+                    yield archivo.read(), lenguaje
+
+
+_MOTOR_POR_DEFECTO = None
+
+
+def motor_por_defecto():
+    """Motor con la tabla de pesos distribuida (RUTA_PESOS_POR_DEFECTO), cargada la primera vez que se pide."""
+    global _MOTOR_POR_DEFECTO
+    if _MOTOR_POR_DEFECTO is None:
+        _MOTOR_POR_DEFECTO = MotorEstadistico.desde_archivo(RUTA_PESOS_POR_DEFECTO)
+    return _MOTOR_POR_DEFECTO
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python -m src.detector_lenguaje.motor_estadistico <salida.json> [corpus ...]")
+        sys.exit(1)
+    muestras = list(muestras_de_ejemplos())
+    for corpus in sys.argv[2:]:
+        muestras.extend(muestras_de_corpus(corpus))
+    motor = MotorEstadistico.entrenar(muestras)
+    motor.guardar(sys.argv[1])
+    print(f"Tabla de pesos guardada en '{sys.argv[1]}' ({len(muestras)} muestras, {len(motor.pesos_dispersos)} características).")
@@ -0,0 +1,173 @@
+# src/detector_lenguaje/segmentador.py
+"""
+Segmentación de documentos con varios lenguajes (p. ej. HTML con bloques <script>).
+
+`segmentar_html` marca las regiones incrustadas por desplazamiento (en caracteres y en
+bytes UTF-8) y `SegmentadorDocumento` entrega para cada región un `PipelineRegion` que
+solo ejecuta el lexer o el parser de su lenguaje cuando se pide su resultado. Los
+pipelines se guardan en una caché LRU indexada por (lenguaje, texto de la región), de
+modo que editar el marcado (que desplaza las regiones) no vuelve a analizar los scripts
+que no han cambiado.
+"""
+import importlib
+import re
+from collections import OrderedDict
+
+# Lenguaje -> (módulo del lexer, clase, módulo del parser, clase). Se importan al usarlos.
+PIPELINES_POR_LENGUAJE = {
+    "C++": ("src.analizador_lexico.lexer_cpp", "LexerCPP", "src.analizador_sintactico.parser_cpp", "ParserCPP"),
+    "HTML": ("src.analizador_lexico.lexer_html", "LexerHTML", "src.analizador_sintactico.parser_html", "ParserHTML"),
+    "JavaScript": ("src.analizador_lexico.lexer_javascript", "LexerJavaScript", "src.analizador_sintactico.parser_javascript", "ParserJavaScript"),
+    "Pascal": ("src.analizador_lexico.lexer_pascal", "LexerPascal", "src.analizador_sintactico.parser_pascal", "ParserPascal"),
+    "PL/SQL": ("src.analizador_lexico.lexer_plsql", "LexerPLSQL", "src.analizador_sintactico.parser_plsql", "ParserPLSQL"),
+    "Python": ("src.analizador_lexico.lexer_python", "LexerPython", "src.analizador_sintactico.parser_python", "ParserPython"),
+    "T-SQL": ("src.analizador_lexico.lexer_tsql", "LexerTSQL", "src.analizador_sintactico.parser_tsql", "ParserTSQL"),
+}
+
+# Comentarios HTML (se saltan: un <script> comentado no es código) o bloques <script>.
+REGEX_SCRIPT_O_COMENTARIO = re.compile(
+    r'<!--.*?-->|<script\b(?P<atributos>[^>]*)>(?P<cuerpo>.*?)</script\s*>', re.IGNORECASE | re.DOTALL
+)
+REGEX_ATRIBUTO_TYPE = re.compile(r'\btype\s*=\s*["\']?\s*([^"\'\s>]+)', re.IGNORECASE)
+# Valores de type="..." que siguen siendo JavaScript (sin type también lo es).
+TIPOS_SCRIPT_JAVASCRIPT = {
+    "text/javascript", "application/javascript", "module", "text/ecmascript", "application/ecmascript",
+}
+
+CAPACIDAD_CACHE_REGIONES = 64
+
+
+def _importar(modulo, nombre):
+    """Importa `nombre` de `modulo` la primera vez que una región de su lenguaje lo necesita."""
+    return getattr(importlib.import_module(modulo), nombre)
+
+
+class RegionCodigo:
+    """Tramo [inicio, fin) de un documento escrito en un lenguaje."""
+    __slots__ = ("lenguaje", "inicio", "fin", "inicio_bytes", "fin_bytes", "linea", "columna", "texto")
+
+    def __init__(self, lenguaje, inicio, fin, inicio_bytes, fin_bytes, linea, columna, texto):
+        self.lenguaje = lenguaje
+        self.inicio = inicio              # Desplazamientos en caracteres del documento
+        self.fin = fin
+        self.inicio_bytes = inicio_bytes  # Los mismos desplazamientos en bytes UTF-8
+        self.fin_bytes = fin_bytes
+        self.linea = linea                # Línea y columna del documento donde empieza la región
+        self.columna = columna
+        self.texto = texto
+
+    def posicion_en_documento(self, linea, columna):
+        """Traduce una posición (linea, columna) relativa a la región a una del documento."""
+        if linea == 1:
+            return self.linea, self.columna + columna - 1
+        return self.linea + linea - 1, columna
+
+    def __repr__(self):
+        return f"RegionCodigo({self.lenguaje}, [{self.inicio}, {self.fin}), L{self.linea}:C{self.columna})"
+
+
+def segmentar_html(codigo):
+    """
+    Divide un documento HTML en regiones: la primera es el documento completo ("HTML") y
+    le siguen los cuerpos de los bloques <script> de JavaScript, en orden.
+
+    Returns:
+        list: Objetos RegionCodigo.
+    """
+    regiones = [RegionCodigo("HTML", 0, len(codigo), 0, len(codigo.encode('utf-8')), 1, 1, codigo)]
+    # Los desplazamientos en bytes y las líneas se acumulan entre regiones consecutivas.
+    posicion, posicion_bytes, linea, inicio_linea = 0, 0, 1, 0
+    for coincidencia in REGEX_SCRIPT_O_COMENTARIO.finditer(codigo):
+        if coincidencia.group('cuerpo') is None: # Comentario HTML
+            continue
+        tipo = REGEX_ATRIBUTO_TYPE.search(coincidencia.group('atributos'))
+        if tipo and tipo.group(1).lower() not in TIPOS_SCRIPT_JAVASCRIPT:
+            continue # p. ej. type="application/json" o plantillas
+        inicio, fin = coincidencia.span('cuerpo')
+        tramo = codigo[posicion:inicio]
+        posicion_bytes += len(tramo.encode('utf-8'))
+        saltos = tramo.count('\n')
+        if saltos:
+            linea += saltos
+            inicio_linea = posicion + tramo.rfind('\n') + 1
+        cuerpo = coincidencia.group('cuerpo')
+        fin_bytes = posicion_bytes + len(cuerpo.encode('utf-8'))
+        regiones.append(RegionCodigo("JavaScript", inicio, fin, posicion_bytes, fin_bytes, linea, inicio - inicio_linea + 1, cuerpo))
+        posicion = inicio
+    return regiones
+
+
+class PipelineRegion:
+    """
+    Análisis perezoso del texto de una región: el lexer se ejecuta la primera vez que se
+    piden los tokens y el parser la primera vez que se pide el AST.
+    """
+    __slots__ = ("lenguaje", "texto", "_tokens", "_ast", "_errores_sintacticos")
+
+    def __init__(self, lenguaje, texto):
+        if lenguaje not in PIPELINES_POR_LENGUAJE:
+            raise ValueError(f"No hay analizadores para el lenguaje '{lenguaje}'.")
+        self.lenguaje = lenguaje
+        self.texto = texto
+        self._tokens = None
+        self._ast = None
+        self._errores_sintacticos = None
+
+    @property
+    def analizado_lexicamente(self):
+        return self._tokens is not None
+
+    @property
+    def analizado_sintacticamente(self):
+        return self._errores_sintacticos is not None
+
+    def tokens(self):
+        if self._tokens is None:
+            modulo_lexer, clase_lexer, _, _ = PIPELINES_POR_LENGUAJE[self.lenguaje]
+            self._tokens = _importar(modulo_lexer, clase_lexer)(self.texto).tokenizar()
+        return self._tokens
+
+    def ast(self):
+        if self._errores_sintacticos is None:
+            _, _, modulo_parser, clase_parser = PIPELINES_POR_LENGUAJE[self.lenguaje]
+            parser = _importar(modulo_parser, clase_parser)(self.tokens())
+            self._ast = parser.parse()
+            self._errores_sintacticos = list(getattr(parser, 'errores_sintacticos', []))
+        return self._ast
+
+    def errores_sintacticos(self):
+        self.ast()
+        return self._errores_sintacticos
+
+
+class SegmentadorDocumento:
+    """Segmenta documentos y reutiliza los pipelines de las regiones que no cambian."""
+
+    def __init__(self, capacidad_cache=CAPACIDAD_CACHE_REGIONES):
+        self.capacidad_cache = capacidad_cache
+        self._pipelines = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def segmentar(self, codigo):
+        """Regiones del documento (ver `segmentar_html`)."""
+        return segmentar_html(codigo)
+
+    def pipeline(self, region):
+        """PipelineRegion de una región; si otra región con el mismo texto ya se pidió, se reutiliza."""
+        clave = (region.lenguaje, region.texto)
+        pipeline = self._pipelines.get(clave)
+        if pipeline is not None:
+            self._pipelines.move_to_end(clave)
+            self.aciertos += 1
+            return pipeline
+        self.fallos += 1
+        pipeline = PipelineRegion(region.lenguaje, region.texto)
+        self._pipelines[clave] = pipeline
+        if len(self._pipelines) > self.capacidad_cache:
+            self._pipelines.popitem(last=False)
+        return pipeline
+
+    def regiones_con_pipeline(self, codigo):
+        """Lista de pares (RegionCodigo, PipelineRegion) del documento."""
+        return [(region, self.pipeline(region)) for region in self.segmentar(codigo)]
@@ -13,6 +13,26 @@ ARCHIVO_ESPECIFICO_A_PROBAR = "prueba_pascal_tipo_invalido.pas" # Ejemplo para p
 # ARCHIVO_ESPECIFICO_A_PROBAR = "prueba_tsql.sql" # Ejemplo para probar solo T-SQL
 # ARCHIVO_ESPECIFICO_A_PROBAR = "prueba_pascal.pas" # Ejemplo para probar solo Pascal
 
+# Lenguajes que escanean con la tabla AFD precompilada en lugar de la expresión maestra
+# (ver nucleo_compilador/automata_lexico.py). Solo admiten tabla: javascript, pascal, python, tsql.
+LEXERS_CON_AUTOMATA = () # Ej.: ("pascal", "tsql")
+
+# Caché en disco de tokens y AST (ver nucleo_compilador/cache_ast.py): un archivo que no cambió
+# desde el último análisis sin errores no se vuelve a tokenizar ni a analizar.
+USAR_CACHE_AST = True
+
+# Scripts T-SQL y PL/SQL con muchos lotes (separados por GO o por '/'): los lotes se analizan
+# en varios procesos (ver nucleo_compilador/lotes_paralelos.py). Desactivado por defecto: solo
+# compensa con varios núcleos y scripts de cientos de miles de tokens por proceso; con lotes
+# cortos el coste del pool supera lo que se gana (ver benchmarks/bench_lotes_paralelos.py).
+ANALISIS_POR_LOTES = False
+
+# Archivos Pascal, T-SQL y PL/SQL de al menos este tamaño: el parser lee los tokens del
+# generador del lexer (`generar_tokens()`, ver nucleo_compilador/flujo_tokens.py) en lugar de
+# la lista completa, así que la memoria de tokens no crece con el archivo. En ese modo no se
+# listan los tokens, no se reparten los lotes y el resultado no se guarda en la caché de AST.
+BYTES_ANALISIS_EN_FLUJO = 8 * 1024 * 1024
+
 
 # Configuración de codificación para stdout
 if hasattr(sys.stdout, 'reconfigure') and sys.stdout.encoding != 'utf-8':
@@ -21,7 +41,7 @@ if hasattr(sys.stderr, 'reconfigure') and sys.stderr.encoding != 'utf-8':
     sys.stderr.reconfigure(encoding='utf-8')
 
 try:
-    from detector_lenguaje.detector import detectar_lenguaje
+    from detector_lenguaje.detector import detectar_lenguaje_archivo
     # IMPORTACIÓN PARA PYTHON ---
     from analizador_lexico.lexer_python import LexerPython, TT_ERROR_LEXICO as TT_ERROR_PYTHON, TT_EOF as TT_EOF_PYTHON, TT_INDENT, TT_DEDENT, TT_NUEVA_LINEA
     from analizador_sintactico.parser_python import ParserPython #PYTHON
@@ -44,6 +64,7 @@ try:
     from simulador_ejecucion.interprete_javascript import InterpreteJavaScript #JAVASCRIPT
     # IMPORTACIÓN PARA C++ ---
     from analizador_lexico.lexer_cpp import LexerCPP, TT_ERROR_CPP, TT_EOF_CPP
+    from analizador_lexico.preprocesador_cpp import PreprocesadorCPP
     from analizador_sintactico.parser_cpp import ParserCPP
     from src.simulador_ejecucion.interprete_cpp import InterpreteCPP
     # IMPORTACION PARA PL/SQL ---
@@ -63,6 +84,9 @@ try:
     from analizador_semantico.semantico_plsql import AnalizadorSemanticoPLSQL
     # --- NUEVA IMPORTACIÓN PARA ANALIZADOR SEMÁNTICO T-SQL ---
     from analizador_semantico.semantico_tsql import AnalizadorSemanticoTSQL
+    from src.nucleo_compilador.motor_lexico import MOTORES_LEXICOS
+    from src.nucleo_compilador.cache_ast import AnalisisGuardado, CacheAST
+    from src.nucleo_compilador.lotes_paralelos import AnalisisPorLotes, analizar_por_lotes
 
 
 except ImportError as e_import:
@@ -75,6 +99,11 @@ except Exception as e_general:
     traceback.print_exc()
     sys.exit(1)
 
+for nombre_lexer in LEXERS_CON_AUTOMATA:
+    MOTORES_LEXICOS[nombre_lexer].usar_automata()
+
+CACHE_AST = CacheAST() if USAR_CACHE_AST else None
+
 DIRECTORIO_EJEMPLOS = "ejemplos_Codigo"
 
 def crear_directorio_si_no_existe(nombre_directorio):
@@ -96,6 +125,66 @@ def obtener_fecha_hora_actual_formateada():
         return datetime.now().strftime("%A, %d de %B de %Y, %I:%M:%S %p (Hora Local - pytz o zona no disponible)")
 
 
+def analisis_en_cache(codigo, clases, contexto=""):
+    """Análisis guardado (tokens y AST) de `codigo` en la caché de AST, o None."""
+    if CACHE_AST is None:
+        return None
+    analisis = CACHE_AST.obtener(codigo, clases, contexto)
+    if analisis is not None:
+        print("Tokens y AST recuperados de la caché de AST (se omiten los análisis léxico y sintáctico).")
+    return analisis
+
+
+def guardar_analisis(codigo, clases, tokens, parser, ast, contexto="", dependencias=()):
+    """Guarda en la caché de AST el resultado de un análisis sintáctico sin errores."""
+    if CACHE_AST is None or ast is None or getattr(parser, 'errores_sintacticos', None):
+        return
+    analisis = AnalisisGuardado(tokens, ast, getattr(parser, 'tabla_simbolos', None))
+    CACHE_AST.guardar(codigo, clases, analisis, contexto, dependencias)
+
+
+def analisis_por_lotes(tokens, clase_parser, clase_semantico):
+    """AnalisisPorLotes del script de `tokens`, o None si no tiene lotes suficientes para repartirlos."""
+    if not ANALISIS_POR_LOTES:
+        return None
+    analisis = analizar_por_lotes(tokens, clase_parser, clase_semantico)
+    if analisis is not None:
+        print(f"Análisis sintáctico y semántico de {analisis.lotes} lotes en paralelo.")
+        for error in analisis.errores_sintacticos:
+            print(error)
+    return analisis
+
+
+def analizar_en_flujo(lexer, clase_parser, tipo_error, nombre_lenguaje):
+    """
+    Análisis léxico y sintáctico de un archivo grande sin guardar sus tokens: el parser los
+    lee de `lexer.generar_tokens()` a medida que los necesita. Los tokens y los errores
+    léxicos se cuentan al pasar. Devuelve (parser, ast, tiene_errores_lexicos); con errores
+    léxicos el AST se descarta, como cuando no se llega a analizar la lista de tokens.
+    """
+    conteo = {"tokens": 0, "errores": 0}
+    def tokens_contados():
+        for token in lexer.generar_tokens():
+            conteo["tokens"] += 1
+            if token.tipo == tipo_error:
+                conteo["errores"] += 1
+            yield token
+
+    print(f"Archivo de {len(lexer.codigo)} caracteres: los tokens se leen en flujo durante el análisis sintáctico.")
+    print(f"\n--- Análisis Sintáctico ({nombre_lenguaje}) ---")
+    parser = clase_parser(tokens_contados())
+    ast = None
+    try:
+        ast = parser.parse()
+    except Exception as e_parse:
+        print(f"ERROR CRÍTICO en la ejecución del Parser de {nombre_lenguaje}: {e_parse}")
+    print(f"Total de tokens leídos ({nombre_lenguaje}): {conteo['tokens']}")
+    if conteo["errores"]:
+        print(f">>> Se encontraron errores léxicos en el código {nombre_lenguaje}. <<<")
+    print(f"--- Fin Análisis Sintáctico ({nombre_lenguaje}) ---")
+    return parser, (None if conteo["errores"] else ast), bool(conteo["errores"])
+
+
 def analizar_archivo_y_mostrar(ruta_archivo, nombre_archivo_simple):
     """
     Analiza un archivo de código: detecta el lenguaje, realiza análisis léxico,
@@ -104,48 +193,62 @@ def analizar_archivo_y_mostrar(ruta_archivo, nombre_archivo_simple):
     print(f"\n--- Analizando archivo: {nombre_archivo_simple} ---")
     codigo_completo_str = None
     try:
-        with open(ruta_archivo, 'r', encoding='utf-8') as archivo:
-            codigo_completo_str = archivo.read()
-
-        if not codigo_completo_str.strip():
+        # La detección lee como mucho unas ventanas del archivo (ver detectar_lenguaje_archivo);
+        # el contenido completo solo se carga después, para las fases de análisis.
+        lenguaje_detectado, confianza, pistas_detectadas = detectar_lenguaje_archivo(ruta_archivo)
+        if not pistas_detectadas: # No hubo nada que puntuar
             print("Resultado: El archivo está vacío o solo contiene espacios/saltos de línea.")
             print("--------------------------------------")
             return
-        
-        lenguaje_detectado, confianza, _ = detectar_lenguaje(codigo_completo_str)
+
         print(f"Lenguaje Detectado: {lenguaje_detectado}")
         print(f"Confianza         : {confianza:.2f}%")
 
+        with open(ruta_archivo, 'r', encoding='utf-8') as archivo:
+            codigo_completo_str = archivo.read()
+
         if lenguaje_detectado == "Pascal":
             print("\n--- Análisis Léxico (Pascal) ---")
             ast_generado_pascal = None 
             parser_pascal_instancia = None 
             try:
-                lexer_pas = LexerPascal(codigo_completo_str)
-                tokens_obtenidos = lexer_pas.tokenizar()
-                print(f"Total de tokens generados (Pascal): {len(tokens_obtenidos)}")
-                tiene_errores_lexicos_pascal = any(t.tipo == TT_ERROR_PASCAL for t in tokens_obtenidos)
-                # Descomentar para imprimir todos los tokens de Pascal
-                for i, token_obj in enumerate(tokens_obtenidos):
-                    print(f"  {i+1:03d}: {token_obj}")
-                if tiene_errores_lexicos_pascal:
-                    print(">>> Se encontraron errores léxicos en el código Pascal. <<<")
-                elif tokens_obtenidos and tokens_obtenidos[-1].tipo == TT_EOF_PASCAL:
-                    print(">>> Análisis léxico de Pascal completado sin errores aparentes (finalizado con EOF). <<<")
+                analisis_guardado_pascal = analisis_en_cache(codigo_completo_str, (LexerPascal, ParserPascal))
+                if analisis_guardado_pascal is None and len(codigo_completo_str) >= BYTES_ANALISIS_EN_FLUJO:
+                    parser_pascal_instancia, ast_generado_pascal, tiene_errores_lexicos_pascal = analizar_en_flujo(
+                        LexerPascal(codigo_completo_str), ParserPascal, TT_ERROR_PASCAL, "Pascal")
                 else:
-                    print(">>> Problema con la salida del lexer de Pascal. <<<")
+                    if analisis_guardado_pascal:
+                        tokens_obtenidos = analisis_guardado_pascal.tokens
+                    else:
+                        lexer_pas = LexerPascal(codigo_completo_str)
+                        tokens_obtenidos = lexer_pas.tokenizar()
+                    print(f"Total de tokens generados (Pascal): {len(tokens_obtenidos)}")
+                    tiene_errores_lexicos_pascal = any(t.tipo == TT_ERROR_PASCAL for t in tokens_obtenidos)
+                    # Descomentar para imprimir todos los tokens de Pascal
+                    for i, token_obj in enumerate(tokens_obtenidos):
+                        print(f"  {i+1:03d}: {token_obj}")
+                    if tiene_errores_lexicos_pascal:
+                        print(">>> Se encontraron errores léxicos en el código Pascal. <<<")
+                    elif tokens_obtenidos and tokens_obtenidos[-1].tipo == TT_EOF_PASCAL:
+                        print(">>> Análisis léxico de Pascal completado sin errores aparentes (finalizado con EOF). <<<")
+                    else:
+                        print(">>> Problema con la salida del lexer de Pascal. <<<")
 
-                if not tiene_errores_lexicos_pascal and tokens_obtenidos and tokens_obtenidos[-1].tipo == TT_EOF_PASCAL:
-                    print("\n--- Análisis Sintáctico (Pascal) ---")
-                    try:
-                        parser_pascal_instancia = ParserPascal(tokens_obtenidos)
-                        ast_generado_pascal = parser_pascal_instancia.parse() 
-                    except Exception as e_parse_pascal:
-                        print(f"ERROR CRÍTICO en la ejecución del Parser de Pascal: {e_parse_pascal}")
-                else:
-                    print("\n--- Análisis Sintáctico (Pascal) ---")
-                    print("No se realizó el análisis sintáctico debido a errores léxicos o problemas con los tokens.")
-                print("--- Fin Análisis Sintáctico (Pascal) ---")
+                    if not tiene_errores_lexicos_pascal and tokens_obtenidos and tokens_obtenidos[-1].tipo == TT_EOF_PASCAL:
+                        print("\n--- Análisis Sintáctico (Pascal) ---")
+                        try:
+                            if analisis_guardado_pascal:
+                                parser_pascal_instancia, ast_generado_pascal = analisis_guardado_pascal, analisis_guardado_pascal.ast
+                            else:
+                                parser_pascal_instancia = ParserPascal(tokens_obtenidos)
+                                ast_generado_pascal = parser_pascal_instancia.parse()
+                                guardar_analisis(codigo_completo_str, (LexerPascal, ParserPascal), tokens_obtenidos, parser_pascal_instancia, ast_generado_pascal)
+                        except Exception as e_parse_pascal:
+                            print(f"ERROR CRÍTICO en la ejecución del Parser de Pascal: {e_parse_pascal}")
+                    else:
+                        print("\n--- Análisis Sintáctico (Pascal) ---")
+                        print("No se realizó el análisis sintáctico debido a errores léxicos o problemas con los tokens.")
+                    print("--- Fin Análisis Sintáctico (Pascal) ---")
 
                 if ast_generado_pascal:
                     print("\n--- Árbol de Sintaxis Abstracto (AST) Generado (Pascal) ---")
@@ -183,8 +286,12 @@ def analizar_archivo_y_mostrar(ruta_archivo, nombre_archivo_simple):
                 print("El código Python para el análisis léxico está vacío.")
             else:
                 try:
-                    lexer_python = LexerPython(codigo_completo_str)
-                    tokens_obtenidos_python = lexer_python.tokenizar()
+                    analisis_guardado_python = analisis_en_cache(codigo_completo_str, (LexerPython, ParserPython))
+                    if analisis_guardado_python:
+                        tokens_obtenidos_python = analisis_guardado_python.tokens
+                    else:
+                        lexer_python = LexerPython(codigo_completo_str)
+                        tokens_obtenidos_python = lexer_python.tokenizar()
                     
                     print(f"Total de tokens generados (Python): {len(tokens_obtenidos_python)}")
                     tiene_errores_lexicos_python = any(t.tipo == TT_ERROR_PYTHON for t in tokens_obtenidos_python)
@@ -205,8 +312,12 @@ def analizar_archivo_y_mostrar(ruta_archivo, nombre_archivo_simple):
                        tokens_obtenidos_python[-1].tipo == TT_EOF_PYTHON:
                         print("\n--- Análisis Sintáctico (Python) ---")
                         try:
-                            parser_python_instancia = ParserPython(tokens_obtenidos_python)
-                            ast_generado_python = parser_python_instancia.parse()
+                            if analisis_guardado_python:
+                                parser_python_instancia, ast_generado_python = analisis_guardado_python, analisis_guardado_python.ast
+                            else:
+                                parser_python_instancia = ParserPython(tokens_obtenidos_python)
+                                ast_generado_python = parser_python_instancia.parse()
+                                guardar_analisis(codigo_completo_str, (LexerPython, ParserPython), tokens_obtenidos_python, parser_python_instancia, ast_generado_python)
                         except Exception as e_parse_python:
                             print(f"ERROR CRÍTICO en la ejecución del Parser de Python: {e_parse_python}")
                             import traceback; traceback.print_exc()
@@ -266,8 +377,12 @@ def analizar_archivo_y_mostrar(ruta_archivo, nombre_archivo_simple):
                 print("El código HTML para el análisis léxico está vacío.")
             else:
                 try:
-                    lexer_html = LexerHTML(codigo_completo_str)
-                    tokens_obtenidos_html = lexer_html.tokenizar()
+                    analisis_guardado_html = analisis_en_cache(codigo_completo_str, (LexerHTML, ParserHTML))
+                    if analisis_guardado_html:
+                        tokens_obtenidos_html = analisis_guardado_html.tokens
+                    else:
+                        lexer_html = LexerHTML(codigo_completo_str)
+                        tokens_obtenidos_html = lexer_html.tokenizar()
                     
                     print(f"Total de tokens generados (HTML): {len(tokens_obtenidos_html)}")
                     tiene_errores_lexicos_html = any(t.tipo == TT_ERROR_HTML for t in tokens_obtenidos_html)
@@ -289,8 +404,12 @@ def analizar_archivo_y_mostrar(ruta_archivo, nombre_archivo_simple):
                         
                         print("\n--- Análisis Sintáctico (HTML) ---")
                         try:
-                            parser_html_instancia = ParserHTML(tokens_obtenidos_html)
-                            ast_generado_html = parser_html_instancia.parse()
+                            if analisis_guardado_html:
+                                parser_html_instancia, ast_generado_html = analisis_guardado_html, analisis_guardado_html.ast
+                            else:
+                                parser_html_instancia = ParserHTML(tokens_obtenidos_html)
+                                ast_generado_html = parser_html_instancia.parse()
+                                guardar_analisis(codigo_completo_str, (LexerHTML, ParserHTML), tokens_obtenidos_html, parser_html_instancia, ast_generado_html)
                         except Exception as e_parse_html:
                             print(f"ERROR CRÍTICO en la ejecución del Parser de HTML: {e_parse_html}")
                             import traceback; traceback.print_exc()
@@ -346,8 +465,12 @@ def analizar_archivo_y_mostrar(ruta_archivo, nombre_archivo_simple):
             else:
                 try:
                     # Fase Léxica para JavaScript
-                    lexer_js = LexerJavaScript(codigo_completo_str)
-                    tokens_obtenidos_js = lexer_js.tokenizar()
+                    analisis_guardado_js = analisis_en_cache(codigo_completo_str, (LexerJavaScript, ParserJavaScript))
+                    if analisis_guardado_js:
+                        tokens_obtenidos_js = analisis_guardado_js.tokens
+                    else:
+                        lexer_js = LexerJavaScript(codigo_completo_str)
+                        tokens_obtenidos_js = lexer_js.tokenizar()
                     
                     print(f"Total de tokens generados (JavaScript): {len(tokens_obtenidos_js)}")
                     tiene_errores_lexicos_js = any(t.tipo == TT_ERROR_JS for t in tokens_obtenidos_js)
@@ -370,8 +493,12 @@ def analizar_archivo_y_mostrar(ruta_archivo, nombre_archivo_simple):
                         
                         print("\n--- Análisis Sintáctico (JavaScript) ---")
                         try:
-                            parser_js_instancia = ParserJavaScript(tokens_obtenidos_js)
-                            ast_generado_js = parser_js_instancia.parse()
+                            if analisis_guardado_js:
+                                parser_js_instancia, ast_generado_js = analisis_guardado_js, analisis_guardado_js.ast
+                            else:
+                                parser_js_instancia = ParserJavaScript(tokens_obtenidos_js)
+                                ast_generado_js = parser_js_instancia.parse()
+                                guardar_analisis(codigo_completo_str, (LexerJavaScript, ParserJavaScript), tokens_obtenidos_js, parser_js_instancia, ast_generado_js)
                             # Los mensajes de éxito/error del parsing ya se imprimen desde parser_js_instancia.parse()
                         except Exception as e_parse_js:
                             print(f"ERROR CRÍTICO en la ejecución del Parser de JavaScript: {e_parse_js}")
@@ -431,8 +558,17 @@ def analizar_archivo_y_mostrar(ruta_archivo, nombre_archivo_simple):
             else:
                 try:
                     # Fase Léxica para C++
-                    lexer_cpp = LexerCPP(codigo_completo_str)
-                    tokens_obtenidos_cpp = lexer_cpp.tokenizar()
+                    # El resultado del preprocesado depende además de las cabeceras que se buscan
+                    # junto al archivo: su directorio forma parte de la clave de la caché de AST.
+                    clases_cpp = (LexerCPP, PreprocesadorCPP, ParserCPP)
+                    contexto_cpp = os.path.dirname(os.path.abspath(ruta_archivo))
+                    analisis_guardado_cpp = analisis_en_cache(codigo_completo_str, clases_cpp, contexto_cpp)
+                    if analisis_guardado_cpp:
+                        tokens_obtenidos_cpp = analisis_guardado_cpp.tokens
+                    else:
+                        lexer_cpp = LexerCPP(codigo_completo_str)
+                        tokens_obtenidos_cpp = lexer_cpp.tokenizar()
+                    tokens_lexicos_cpp = tokens_obtenidos_cpp
                     
                     print(f"Total de tokens generados (C++): {len(tokens_obtenidos_cpp)}")
                     tiene_errores_lexicos_cpp = any(t.tipo == TT_ERROR_CPP for t in tokens_obtenidos_cpp)
@@ -448,15 +584,41 @@ def analizar_archivo_y_mostrar(ruta_archivo, nombre_archivo_simple):
                     else:
                         print(">>> Problema con la salida del lexer de C++. <<<")
 
-                    # Fase Sintáctica para C++ (solo si la léxica fue exitosa)
+                    # Preprocesado (macros, condicionales y cabeceras de usuario)
+                    errores_preprocesador_cpp = []
+                    if not analisis_guardado_cpp and \
+                       not tiene_errores_lexicos_cpp and \
+                       tokens_obtenidos_cpp and \
+                       tokens_obtenidos_cpp[-1].tipo == TT_EOF_CPP:
+                        print("\n--- Preprocesador (C++) ---")
+                        preprocesador_cpp = PreprocesadorCPP()
+                        tokens_obtenidos_cpp = preprocesador_cpp.procesar(tokens_obtenidos_cpp, ruta_archivo)
+                        for aviso_pp in preprocesador_cpp.avisos:
+                            print(aviso_pp)
+                        for error_pp in preprocesador_cpp.errores:
+                            print(error_pp)
+                        print(preprocesador_cpp.resumen())
+                        print("--- Fin Preprocesador (C++) ---")
+                        errores_preprocesador_cpp = preprocesador_cpp.errores
+
+                    # Fase Sintáctica para C++ (solo si la léxica y el preprocesado fueron exitosos)
                     if not tiene_errores_lexicos_cpp and \
+                       not errores_preprocesador_cpp and \
                        tokens_obtenidos_cpp and \
                        tokens_obtenidos_cpp[-1].tipo == TT_EOF_CPP:
                         
                         print("\n--- Análisis Sintáctico (C++) ---")
                         try:
-                            parser_cpp_instancia = ParserCPP(tokens_obtenidos_cpp)
-                            ast_generado_cpp = parser_cpp_instancia.parse()
+                            if analisis_guardado_cpp:
+                                parser_cpp_instancia, ast_generado_cpp = analisis_guardado_cpp, analisis_guardado_cpp.ast
+                            else:
+                                parser_cpp_instancia = ParserCPP(tokens_obtenidos_cpp)
+                                ast_generado_cpp = parser_cpp_instancia.parse()
+                                print(parser_cpp_instancia.resumen_especulacion())
+                                # Con una cabecera que no se encontró, el análisis cambiaría al crearla
+                                if not preprocesador_cpp.avisos:
+                                    guardar_analisis(codigo_completo_str, clases_cpp, tokens_lexicos_cpp, parser_cpp_instancia,
+                                                     ast_generado_cpp, contexto_cpp, preprocesador_cpp.rutas_incluidas)
                         except Exception as e_parse_cpp:
                             print(f"ERROR CRÍTICO en la ejecución del Parser de C++: {e_parse_cpp}")
                             import traceback; traceback.print_exc()
@@ -476,7 +638,10 @@ def analizar_archivo_y_mostrar(ruta_archivo, nombre_archivo_simple):
                             print("--- Fin Análisis Semántico (C++) ---")
                     else:
                         print("\n--- Análisis Sintáctico (C++) ---")
-                        print("No se realizó el análisis sintáctico debido a errores léxicos o problemas con los tokens.")
+                        if errores_preprocesador_cpp:
+                            print(f"No se realizó el análisis sintáctico debido a {len(errores_preprocesador_cpp)} error(es) del preprocesador.")
+                        else:
+                            print("No se realizó el análisis sintáctico debido a errores léxicos o problemas con los tokens.")
                         print("--- Fin Análisis Sintáctico (C++) ---")
 
                     # Visualización del AST de C++ (si se generó)
@@ -493,7 +658,7 @@ def analizar_archivo_y_mostrar(ruta_archivo, nombre_archivo_simple):
                             print(f"ERROR CRÍTICO durante la simulación de C++: {e_interp_cpp}")
                             import traceback; traceback.print_exc() 
 
-                    elif not tiene_errores_lexicos_cpp and \
+                    elif not tiene_errores_lexicos_cpp and not errores_preprocesador_cpp and \
                          (parser_cpp_instancia is None or (hasattr(parser_cpp_instancia, 'errores_sintacticos') and not parser_cpp_instancia.errores_sintacticos)):
                         print("\nNo se generó un AST para C++, aunque no se reportaron errores explícitos (revisar lógica del parser).")
 
@@ -513,40 +678,56 @@ def analizar_archivo_y_mostrar(ruta_archivo, nombre_archivo_simple):
                 print("El código PL/SQL para el análisis léxico está vacío.")
             else:
                 try:
-                    lexer_plsql = LexerPLSQL(codigo_completo_str)
-                    tokens_obtenidos_plsql = lexer_plsql.tokenizar()
+                    analisis_guardado_plsql = analisis_en_cache(codigo_completo_str, (LexerPLSQL, ParserPLSQL))
+                    if analisis_guardado_plsql is None and len(codigo_completo_str) >= BYTES_ANALISIS_EN_FLUJO:
+                        parser_plsql_instancia, ast_generado_plsql, tiene_errores_lexicos_plsql = analizar_en_flujo(
+                            LexerPLSQL(codigo_completo_str), ParserPLSQL, TT_ERROR_PLSQL, "PL/SQL")
+                    else:
+                        if analisis_guardado_plsql:
+                            tokens_obtenidos_plsql = analisis_guardado_plsql.tokens
+                        else:
+                            lexer_plsql = LexerPLSQL(codigo_completo_str)
+                            tokens_obtenidos_plsql = lexer_plsql.tokenizar()
                     
-                    print(f"Total de tokens generados (PL/SQL): {len(tokens_obtenidos_plsql)}")
-                    print(f"[DEBUG] Total de tokens generados (PL/SQL): {len(tokens_obtenidos_plsql)}")
-                    print(f"[DEBUG] Primeros tokens: {tokens_obtenidos_plsql[:5]}")
-                    tiene_errores_lexicos_plsql = any(t.tipo == TT_ERROR_PLSQL for t in tokens_obtenidos_plsql)
+                        print(f"Total de tokens generados (PL/SQL): {len(tokens_obtenidos_plsql)}")
+                        print(f"[DEBUG] Total de tokens generados (PL/SQL): {len(tokens_obtenidos_plsql)}")
+                        print(f"[DEBUG] Primeros tokens: {tokens_obtenidos_plsql[:5]}")
+                        tiene_errores_lexicos_plsql = any(t.tipo == TT_ERROR_PLSQL for t in tokens_obtenidos_plsql)
                     
-                    # Descomentar para imprimir todos los tokens de PL/SQL
-                    # for i, token_obj in enumerate(tokens_obtenidos_plsql): 
-                    #     print(f"  {i+1:03d}: {token_obj}") 
+                        # Descomentar para imprimir todos los tokens de PL/SQL
+                        # for i, token_obj in enumerate(tokens_obtenidos_plsql): 
+                        #     print(f"  {i+1:03d}: {token_obj}") 
                     
-                    if tiene_errores_lexicos_plsql:
-                        print(">>> Se encontraron errores léxicos en el código PL/SQL. <<<")
-                    elif tokens_obtenidos_plsql and tokens_obtenidos_plsql[-1].tipo == TT_EOF_PLSQL:
-                        print(">>> Análisis léxico de PL/SQL completado sin errores aparentes (finalizado con EOF). <<<")
-                    else:
-                        print(">>> Problema con la salida del lexer de PL/SQL. <<<")
-
-                    if not tiene_errores_lexicos_plsql and \
-                       tokens_obtenidos_plsql and \
-                       tokens_obtenidos_plsql[-1].tipo == TT_EOF_PLSQL:
+                        if tiene_errores_lexicos_plsql:
+                            print(">>> Se encontraron errores léxicos en el código PL/SQL. <<<")
+                        elif tokens_obtenidos_plsql and tokens_obtenidos_plsql[-1].tipo == TT_EOF_PLSQL:
+                            print(">>> Análisis léxico de PL/SQL completado sin errores aparentes (finalizado con EOF). <<<")
+                        else:
+                            print(">>> Problema con la salida del lexer de PL/SQL. <<<")
+
+                        if not tiene_errores_lexicos_plsql and \
+                           tokens_obtenidos_plsql and \
+                           tokens_obtenidos_plsql[-1].tipo == TT_EOF_PLSQL:
                         
-                        print("\n--- Análisis Sintáctico (PL/SQL) ---")
-                        try:
-                            parser_plsql_instancia = ParserPLSQL(tokens_obtenidos_plsql)
-                            ast_generado_plsql = parser_plsql_instancia.parse()
-                        except Exception as e_parse_plsql:
-                            print(f"ERROR CRÍTICO en la ejecución del Parser de PL/SQL: {e_parse_plsql}")
-                            import traceback; traceback.print_exc()
-                    else:
-                        print("\n--- Análisis Sintáctico (PL/SQL) ---")
-                        print("No se realizó el análisis sintáctico debido a errores léxicos o problemas con los tokens.")
-                    print("--- Fin Análisis Sintáctico (PL/SQL) ---")
+                            print("\n--- Análisis Sintáctico (PL/SQL) ---")
+                            try:
+                                if analisis_guardado_plsql:
+                                    parser_plsql_instancia, ast_generado_plsql = analisis_guardado_plsql, analisis_guardado_plsql.ast
+                                else:
+                                    parser_plsql_instancia = analisis_por_lotes(tokens_obtenidos_plsql, ParserPLSQL, AnalizadorSemanticoPLSQL)
+                                    if parser_plsql_instancia is not None:
+                                        ast_generado_plsql = parser_plsql_instancia.ast
+                                    else:
+                                        parser_plsql_instancia = ParserPLSQL(tokens_obtenidos_plsql)
+                                        ast_generado_plsql = parser_plsql_instancia.parse()
+                                    guardar_analisis(codigo_completo_str, (LexerPLSQL, ParserPLSQL), tokens_obtenidos_plsql, parser_plsql_instancia, ast_generado_plsql)
+                            except Exception as e_parse_plsql:
+                                print(f"ERROR CRÍTICO en la ejecución del Parser de PL/SQL: {e_parse_plsql}")
+                                import traceback; traceback.print_exc()
+                        else:
+                            print("\n--- Análisis Sintáctico (PL/SQL) ---")
+                            print("No se realizó el análisis sintáctico debido a errores léxicos o problemas con los tokens.")
+                        print("--- Fin Análisis Sintáctico (PL/SQL) ---")
 
                     if ast_generado_plsql:
                         print("\n--- Árbol de Sintaxis Abstracto (AST) Generado (PL/SQL) ---")
@@ -557,8 +738,12 @@ def analizar_archivo_y_mostrar(ruta_archivo, nombre_archivo_simple):
                         # Solo si el parser no reportó errores sintácticos y se generó AST, se hace análisis semántico
                         if ast_generado_plsql and (not hasattr(parser_plsql_instancia, 'errores_sintacticos') or not parser_plsql_instancia.errores_sintacticos):
                             try:
-                                analizador_semantico_plsql = AnalizadorSemanticoPLSQL()
-                                analizador_semantico_plsql.analizar(ast_generado_plsql)
+                                if isinstance(parser_plsql_instancia, AnalisisPorLotes):
+                                    # Los lotes ya se analizaron en los procesos: solo se unen sus resultados
+                                    analizador_semantico_plsql = parser_plsql_instancia.analizador_semantico()
+                                else:
+                                    analizador_semantico_plsql = AnalizadorSemanticoPLSQL()
+                                    analizador_semantico_plsql.analizar(ast_generado_plsql)
                                 analizador_semantico_plsql.mostrar_resultado()
                             except Exception as e_sem_plsql:
                                 print(f"ERROR CRÍTICO durante el análisis semántico de PL/SQL: {e_sem_plsql}")
@@ -592,33 +777,49 @@ def analizar_archivo_y_mostrar(ruta_archivo, nombre_archivo_simple):
                 print("El código T-SQL para el análisis léxico está vacío.")
             else:
                 try:
-                    lexer_tsql = LexerTSQL(codigo_completo_str)
-                    tokens_obtenidos_tsql = lexer_tsql.tokenizar()
-
-                    print(f"Total de tokens generados (T-SQL): {len(tokens_obtenidos_tsql)}")
-                    tiene_errores_lexicos_tsql = any(t.tipo == TT_ERROR_SQL for t in tokens_obtenidos_tsql)
-
-                    if tiene_errores_lexicos_tsql:
-                        print(">>> Se encontraron errores léxicos en el código T-SQL. <<<")
-                    elif tokens_obtenidos_tsql and tokens_obtenidos_tsql[-1].tipo == TT_EOF_SQL:
-                        print(">>> Análisis léxico de T-SQL completado sin errores aparentes (finalizado con EOF). <<<")
+                    analisis_guardado_tsql = analisis_en_cache(codigo_completo_str, (LexerTSQL, ParserTSQL))
+                    if analisis_guardado_tsql is None and len(codigo_completo_str) >= BYTES_ANALISIS_EN_FLUJO:
+                        parser_tsql_instancia, ast_generado_tsql, tiene_errores_lexicos_tsql = analizar_en_flujo(
+                            LexerTSQL(codigo_completo_str), ParserTSQL, TT_ERROR_SQL, "T-SQL")
                     else:
-                        print(">>> Problema con la salida del lexer de T-SQL. <<<")
-
-                    if not tiene_errores_lexicos_tsql and \
-                       tokens_obtenidos_tsql and \
-                       tokens_obtenidos_tsql[-1].tipo == TT_EOF_SQL:
-                        print("\n--- Análisis Sintáctico (T-SQL) ---")
-                        try:
-                            parser_tsql_instancia = ParserTSQL(tokens_obtenidos_tsql)
-                            ast_generado_tsql = parser_tsql_instancia.parse()
-                        except Exception as e_parse_tsql:
-                            print(f"ERROR CRÍTICO en la ejecución del Parser de T-SQL: {e_parse_tsql}")
-                            import traceback; traceback.print_exc()
-                    else:
-                        print("\n--- Análisis Sintáctico (T-SQL) ---")
-                        print("No se realizó el análisis sintáctico debido a errores léxicos o problemas con los tokens.")
-                    print("--- Fin Análisis Sintáctico (T-SQL) ---")
+                        if analisis_guardado_tsql:
+                            tokens_obtenidos_tsql = analisis_guardado_tsql.tokens
+                        else:
+                            lexer_tsql = LexerTSQL(codigo_completo_str)
+                            tokens_obtenidos_tsql = lexer_tsql.tokenizar()
+
+                        print(f"Total de tokens generados (T-SQL): {len(tokens_obtenidos_tsql)}")
+                        tiene_errores_lexicos_tsql = any(t.tipo == TT_ERROR_SQL for t in tokens_obtenidos_tsql)
+
+                        if tiene_errores_lexicos_tsql:
+                            print(">>> Se encontraron errores léxicos en el código T-SQL. <<<")
+                        elif tokens_obtenidos_tsql and tokens_obtenidos_tsql[-1].tipo == TT_EOF_SQL:
+                            print(">>> Análisis léxico de T-SQL completado sin errores aparentes (finalizado con EOF). <<<")
+                        else:
+                            print(">>> Problema con la salida del lexer de T-SQL. <<<")
+
+                        if not tiene_errores_lexicos_tsql and \
+                           tokens_obtenidos_tsql and \
+                           tokens_obtenidos_tsql[-1].tipo == TT_EOF_SQL:
+                            print("\n--- Análisis Sintáctico (T-SQL) ---")
+                            try:
+                                if analisis_guardado_tsql:
+                                    parser_tsql_instancia, ast_generado_tsql = analisis_guardado_tsql, analisis_guardado_tsql.ast
+                                else:
+                                    parser_tsql_instancia = analisis_por_lotes(tokens_obtenidos_tsql, ParserTSQL, AnalizadorSemanticoTSQL)
+                                    if parser_tsql_instancia is not None:
+                                        ast_generado_tsql = parser_tsql_instancia.ast
+                                    else:
+                                        parser_tsql_instancia = ParserTSQL(tokens_obtenidos_tsql)
+                                        ast_generado_tsql = parser_tsql_instancia.parse()
+                                    guardar_analisis(codigo_completo_str, (LexerTSQL, ParserTSQL), tokens_obtenidos_tsql, parser_tsql_instancia, ast_generado_tsql)
+                            except Exception as e_parse_tsql:
+                                print(f"ERROR CRÍTICO en la ejecución del Parser de T-SQL: {e_parse_tsql}")
+                                import traceback; traceback.print_exc()
+                        else:
+                            print("\n--- Análisis Sintáctico (T-SQL) ---")
+                            print("No se realizó el análisis sintáctico debido a errores léxicos o problemas con los tokens.")
+                        print("--- Fin Análisis Sintáctico (T-SQL) ---")
 
                     if ast_generado_tsql:
                         print("\n--- Árbol de Sintaxis Abstracto (AST) Generado (T-SQL) ---")
@@ -628,8 +829,12 @@ def analizar_archivo_y_mostrar(ruta_archivo, nombre_archivo_simple):
                         # Solo si el parser no reportó errores sintácticos y se generó AST, se hace análisis semántico
                         if ast_generado_tsql and (not hasattr(parser_tsql_instancia, 'errores_sintacticos') or not parser_tsql_instancia.errores_sintacticos):
                             try:
-                                analizador_semantico_tsql = AnalizadorSemanticoTSQL()
-                                analizador_semantico_tsql.analizar(ast_generado_tsql)
+                                if isinstance(parser_tsql_instancia, AnalisisPorLotes):
+                                    # Los lotes ya se analizaron en los procesos: solo se unen sus resultados
+                                    analizador_semantico_tsql = parser_tsql_instancia.analizador_semantico()
+                                else:
+                                    analizador_semantico_tsql = AnalizadorSemanticoTSQL()
+                                    analizador_semantico_tsql.analizar(ast_generado_tsql)
                                 analizador_semantico_tsql.mostrar_resultado()
                             except Exception as e_sem_tsql:
                                 print(f"ERROR CRÍTICO durante el análisis semántico de T-SQL: {e_sem_tsql}")
@@ -0,0 +1,344 @@
+# src/nucleo_compilador/almacen_tokens.py
+"""
+Almacén compacto de tokens compartido por todos los lexers.
+
+En lugar de un objeto `Token` (con su `__dict__`) por token, `AlmacenTokens` guarda
+cada campo en una columna:
+
+    tipos              array('H')  Identificador pequeño del tipo (ver `id_tipo_token`)
+    inicios / fines    array('I')  Desplazamientos del lexema en el código fuente
+    simbolos           array('I')  Nombre internado de los identificadores (ver `internado`)
+
+La línea y la columna no se guardan por token: se calculan al pedirlas a partir de
+`inicio` con el MapaFuente del código, que se construye la primera vez que hace falta.
+Solo los tokens cuya posición no sale de su `inicio` (los sintéticos, o un lexer que la
+indique expresamente) la guardan, en unas columnas dispersas ordenadas por índice.
+
+El lexema no se copia: se obtiene cortando el código fuente. Los lexemas que no son un
+tramo del código (EOF, INDENT, ...) se guardan una sola vez en una tabla y el token
+apunta a ellos; los valores solo se guardan cuando no son el propio lexema (literales
+numéricos, cadenas sin comillas, ...). Cuando el lexema de un identificador coincide con
+su nombre canónico, el lexema se devuelve ya internado.
+
+Al indexar el almacén se obtiene una vista (`VistaToken`, con `__slots__`) que ofrece
+la misma interfaz `.tipo/.lexema/.linea/.columna/.valor` que las clases `Token` de los
+lexers, así que los parsers no necesitan cambios. Las vistas se crean al pedirlas y no
+se guardan.
+"""
+import sys
+from array import array
+from bisect import bisect_left
+
+from .internado import TABLA_INTERNADO
+from .mapa_fuente import MapaFuente
+
+# `inicio` de los tokens cuyo lexema no es un tramo del código; su `fin` es la posición
+# del lexema en la tabla de lexemas sintéticos del almacén.
+INICIO_SINTETICO = 0xFFFFFFFF
+
+# Registro global de tipos de token: cadena <-> entero pequeño.
+_TIPOS_TOKEN = []
+_ID_POR_TIPO = {}
+
+
+def id_tipo_token(tipo):
+    """Identificador entero de un tipo de token (se registra la primera vez que se pide)."""
+    identificador = _ID_POR_TIPO.get(tipo)
+    if identificador is None:
+        identificador = len(_TIPOS_TOKEN)
+        _TIPOS_TOKEN.append(tipo)
+        _ID_POR_TIPO[tipo] = identificador
+    return identificador
+
+
+def tipo_token(identificador):
+    """Tipo de token (cadena) de un identificador devuelto por `id_tipo_token`."""
+    return _TIPOS_TOKEN[identificador]
+
+
+class VistaToken:
+    """
+    Token `indice` de un AlmacenTokens. Las subclases creadas con `clase_vista` heredan
+    además de la clase `Token` del lexer, de modo que `isinstance(vista, Token)` y su
+    `__repr__`/`__str__` siguen funcionando.
+    """
+    __slots__ = ("_almacen", "_indice")
+
+    def __init__(self, almacen, indice):
+        self._almacen = almacen
+        self._indice = indice
+
+    @property
+    def tipo(self):
+        return _TIPOS_TOKEN[self._almacen.tipos[self._indice]]
+
+    @property
+    def lexema(self):
+        return self._almacen.lexema(self._indice)
+
+    @property
+    def linea(self):
+        return self._almacen.posicion(self._indice)[0]
+
+    @property
+    def columna(self):
+        return self._almacen.posicion(self._indice)[1]
+
+    @property
+    def valor(self):
+        return self._almacen.valor(self._indice)
+
+    @property
+    def simbolo(self):
+        """Nombre canónico (internado) del identificador, o None si el token no es un nombre."""
+        return self._almacen.simbolo(self._indice)
+
+    @property
+    def inicio(self):
+        """Desplazamiento del token en el código fuente (None si es sintético)."""
+        inicio = self._almacen.inicios[self._indice]
+        return None if inicio == INICIO_SINTETICO else inicio
+
+    def __eq__(self, otro):
+        if isinstance(otro, VistaToken):
+            return self._almacen is otro._almacen and self._indice == otro._indice
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((id(self._almacen), self._indice))
+
+
+_CLASES_VISTA = {}
+
+
+def clase_vista(clase_token):
+    """Subclase de VistaToken que también es subclase de `clase_token` (se crea una sola vez)."""
+    clase = _CLASES_VISTA.get(clase_token)
+    if clase is None:
+        clase = type(f"Vista{clase_token.__name__}", (VistaToken, clase_token), {"__slots__": ()})
+        _CLASES_VISTA[clase_token] = clase
+    return clase
+
+
+class AlmacenTokens:
+    """
+    Secuencia de tokens de un código fuente guardada por columnas.
+
+    Args:
+        codigo (str): Código fuente del que se cortan los lexemas.
+        clase_token (type): Clase Token del lexer (para las vistas y `materializar`).
+    """
+    __slots__ = ("codigo", "clase_token", "_clase_vista", "tipos", "inicios", "fines", "simbolos", "_valores",
+                 "_sinteticos", "_indice_sintetico", "_mapa", "_fijos", "_lineas_fijas", "_columnas_fijas")
+
+    def __init__(self, codigo, clase_token):
+        self.codigo = codigo
+        self.clase_token = clase_token
+        self._clase_vista = clase_vista(clase_token)
+        self.tipos = array('H')
+        self.inicios = array('I')
+        self.fines = array('I')
+        # 0 si el token no tiene símbolo; si no, (id_simbolo + 1) * 2, +1 si el lexema es el propio símbolo
+        self.simbolos = array('I')
+        self._valores = {}  # indice -> valor, solo si el valor no es el propio lexema
+        self._sinteticos = [] # Lexemas que no son un tramo del código, sin repetir
+        self._indice_sintetico = {}
+        self._mapa = None
+        # Posiciones guardadas expresamente: índices de token (crecientes) y su línea/columna
+        self._fijos = array('I')
+        self._lineas_fijas = array('I')
+        self._columnas_fijas = array('I')
+
+    @property
+    def mapa(self):
+        """MapaFuente del código (se construye la primera vez que se pide)."""
+        if self._mapa is None:
+            self._mapa = MapaFuente(self.codigo)
+        return self._mapa
+
+    def agregar(self, tipo, lexema, linea=None, columna=None, valor=None, inicio=None, simbolo=None):
+        """
+        Añade un token. Si `inicio` se indica, el lexema debe ser `codigo[inicio:inicio+len(lexema)]`;
+        si no, el lexema se guarda aparte (tokens sintéticos como EOF o INDENT). `simbolo` es el
+        nombre canónico de los identificadores (`internar`/`plegar` del módulo internado).
+
+        Si `linea` es None la posición se calcula a partir de `inicio` cuando se pida; los
+        tokens sintéticos deben indicarla.
+        """
+        indice = len(self.tipos)
+        if linea is not None:
+            self._fijos.append(indice)
+            self._lineas_fijas.append(linea)
+            self._columnas_fijas.append(columna)
+        elif inicio is None:
+            raise ValueError(f"El token sintético '{lexema}' necesita línea y columna.")
+        self.tipos.append(id_tipo_token(tipo))
+        if inicio is None:
+            inicio = INICIO_SINTETICO
+            fin = self._indice_sintetico.get(lexema)
+            if fin is None:
+                fin = self._indice_sintetico[lexema] = len(self._sinteticos)
+                self._sinteticos.append(lexema)
+        else:
+            fin = inicio + len(lexema)
+        self.inicios.append(inicio)
+        self.fines.append(fin)
+        if simbolo is None:
+            self.simbolos.append(0)
+        else:
+            self.simbolos.append((TABLA_INTERNADO.id_simbolo(simbolo) + 1) << 1 | (simbolo == lexema))
+        if valor is not None and not (type(valor) is str and valor == lexema):
+            self._valores[indice] = valor
+
+    def derivar(self, codigo):
+        """
+        Almacén vacío para `codigo` que parte de la tabla de lexemas sintéticos de este,
+        de modo que `copiar_tramo` puede copiar tokens de este almacén sin traducirlos.
+        """
+        nuevo = AlmacenTokens(codigo, self.clase_token)
+        nuevo._sinteticos = list(self._sinteticos)
+        nuevo._indice_sintetico = dict(self._indice_sintetico)
+        return nuevo
+
+    def copiar_tramo(self, origen, desde, hasta, delta_lineas=0, delta_inicio=0):
+        """
+        Añade los tokens [desde, hasta) de `origen` (este almacén debe venir de `origen.derivar`),
+        sumando `delta_lineas` a sus líneas y `delta_inicio` a sus desplazamientos. Sirve para
+        reutilizar los tokens de un tramo de código que no cambió pero se movió.
+        """
+        base = len(self.tipos)
+        inicios = origen.inicios[desde:hasta]
+        fines = origen.fines[desde:hasta]
+        # Solo las posiciones fijas se desplazan; las demás salen del nuevo código.
+        primero, ultimo = bisect_left(origen._fijos, desde), bisect_left(origen._fijos, hasta)
+        self._fijos.extend(map((base - desde).__add__, origen._fijos[primero:ultimo]))
+        self._lineas_fijas.extend(map(delta_lineas.__add__, origen._lineas_fijas[primero:ultimo]))
+        self._columnas_fijas.extend(origen._columnas_fijas[primero:ultimo])
+        if delta_inicio:
+            # Los tokens sintéticos guardan en `fin` su lexema, no una posición: no se desplazan.
+            fines = array('I', [fin if inicio == INICIO_SINTETICO else fin + delta_inicio
+                                for inicio, fin in zip(inicios, fines)])
+            inicios = array('I', [inicio if inicio == INICIO_SINTETICO else inicio + delta_inicio
+                                  for inicio in inicios])
+        self.tipos.extend(origen.tipos[desde:hasta])
+        self.inicios.extend(inicios)
+        self.fines.extend(fines)
+        self.simbolos.extend(origen.simbolos[desde:hasta])
+        for indice, valor in origen._valores.items():
+            if desde <= indice < hasta:
+                self._valores[indice - desde + base] = valor
+
+    def __getstate__(self):
+        """
+        Estado para enviar el almacén a otro proceso (ver `lexico_paralelo`). No incluye el
+        código ni el MapaFuente; los tipos y los símbolos viajan por nombre, porque sus
+        identificadores solo valen en el proceso que los registró.
+        """
+        locales, nombres_simbolos = {}, []
+        simbolos = array('I')
+        agregar = simbolos.append
+        for simbolo in self.simbolos:
+            if simbolo:
+                identificador = (simbolo >> 1) - 1
+                local = locales.get(identificador)
+                if local is None:
+                    local = locales[identificador] = len(nombres_simbolos)
+                    nombres_simbolos.append(TABLA_INTERNADO.simbolo(identificador))
+                agregar((local + 1) << 1 | simbolo & 1)
+            else:
+                agregar(0)
+        return {
+            "clase_token": self.clase_token, "tipos": self.tipos, "nombres_tipos": _TIPOS_TOKEN[:max(self.tipos, default=-1) + 1],
+            "inicios": self.inicios, "fines": self.fines, "simbolos": simbolos, "nombres_simbolos": nombres_simbolos,
+            "valores": self._valores, "sinteticos": self._sinteticos,
+            "fijos": (self._fijos, self._lineas_fijas, self._columnas_fijas),
+        }
+
+    def __setstate__(self, estado):
+        self.__init__(None, estado["clase_token"])
+        traduccion = [id_tipo_token(tipo) for tipo in estado["nombres_tipos"]]
+        tipos = estado["tipos"]
+        if traduccion != list(range(len(traduccion))):
+            tipos = array('H', map(traduccion.__getitem__, tipos))
+        self.tipos = tipos
+        self.inicios, self.fines = estado["inicios"], estado["fines"]
+        ids = [TABLA_INTERNADO.id_simbolo(nombre) for nombre in estado["nombres_simbolos"]]
+        self.simbolos = array('I', [(ids[(simbolo >> 1) - 1] + 1) << 1 | simbolo & 1 if simbolo else 0
+                                    for simbolo in estado["simbolos"]])
+        self._valores = estado["valores"]
+        self._sinteticos = estado["sinteticos"]
+        self._indice_sintetico = {lexema: i for i, lexema in enumerate(self._sinteticos)}
+        self._fijos, self._lineas_fijas, self._columnas_fijas = estado["fijos"]
+
+    def lexema(self, indice):
+        simbolo = self.simbolos[indice]
+        if simbolo & 1:
+            return TABLA_INTERNADO.simbolo((simbolo >> 1) - 1)
+        inicio = self.inicios[indice]
+        if inicio == INICIO_SINTETICO:
+            return self._sinteticos[self.fines[indice]]
+        return self.codigo[inicio:self.fines[indice]]
+
+    def posicion(self, indice):
+        """(linea, columna) del token `indice`."""
+        fijos = self._fijos
+        posicion_fija = bisect_left(fijos, indice)
+        if posicion_fija < len(fijos) and fijos[posicion_fija] == indice:
+            return self._lineas_fijas[posicion_fija], self._columnas_fijas[posicion_fija]
+        return self.mapa.posicion(self.inicios[indice])
+
+    def simbolo(self, indice):
+        simbolo = self.simbolos[indice]
+        return TABLA_INTERNADO.simbolo((simbolo >> 1) - 1) if simbolo else None
+
+    def valor(self, indice):
+        valor = self._valores.get(indice)
+        return self.lexema(indice) if valor is None else valor
+
+    def tipo(self, indice):
+        """Tipo del token `indice` sin crear una vista."""
+        return _TIPOS_TOKEN[self.tipos[indice]]
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self._clase_vista(self, i) for i in range(*indice.indices(len(self.tipos)))]
+        if indice < 0:
+            indice += len(self.tipos)
+        if not 0 <= indice < len(self.tipos):
+            raise IndexError("índice de token fuera de rango")
+        return self._clase_vista(self, indice)
+
+    def __iter__(self):
+        clase = self._clase_vista
+        for indice in range(len(self.tipos)):
+            yield clase(self, indice)
+
+    def __bool__(self):
+        return len(self.tipos) > 0
+
+    def materializar(self):
+        """Lista de objetos Token del lexer con el mismo contenido (para código que los modifique)."""
+        clase = self.clase_token
+        tokens = [clase(self.tipo(i), self.lexema(i), *self.posicion(i), self._valores.get(i))
+                  for i in range(len(self.tipos))]
+        for i, simbolo in enumerate(self.simbolos):
+            if simbolo:
+                tokens[i].simbolo = self.simbolo(i)
+        return tokens
+
+    def memoria_bytes(self):
+        """
+        Bytes ocupados por las columnas, las posiciones fijas, el MapaFuente (si se construyó),
+        los valores y los lexemas sintéticos (sin el código).
+        """
+        columnas = (self.tipos, self.inicios, self.fines, self.simbolos,
+                    self._fijos, self._lineas_fijas, self._columnas_fijas)
+        total = sum(c.itemsize * len(c) for c in columnas)
+        if self._mapa is not None:
+            total += self._mapa.memoria_bytes()
+        total += sys.getsizeof(self._valores) + sum(sys.getsizeof(v) for v in self._valores.values())
+        total += sys.getsizeof(self._sinteticos) + sys.getsizeof(self._indice_sintetico)
+        return total + sum(sys.getsizeof(l) for l in self._sinteticos)
@@ -0,0 +1,610 @@
+# src/nucleo_compilador/automata_lexico.py
+"""
+Motor léxico alternativo: tabla de estados de un autómata finito determinista (AFD).
+
+`compilar_automata` convierte una tabla ESPECIFICACIONES_TOKEN_* en un AFD que reproduce
+exactamente el resultado de la expresión maestra de `MotorLexico` (la primera
+especificación que coincide, con la longitud que daría `re`):
+
+  1. Cada patrón se analiza con el analizador de `re` y se traduce a un AFN de Thompson
+     cuyas bifurcaciones están ordenadas por prioridad (la alternativa izquierda, o la
+     repetición en los cuantificadores voraces, va primero).
+  2. La construcción por subconjuntos usa listas *ordenadas* de estados del AFN; al llegar
+     a un estado de aceptación se descartan los hilos de menor prioridad. Es la semántica
+     "primera coincidencia por la izquierda" de `re` sin retroceso.
+  3. Los caracteres se agrupan en clases (los que ningún patrón distingue comparten
+     columna), así que la tabla ocupa estados x clases.
+
+Solo se admiten tablas regulares: sin referencias a grupos, sin anticipaciones y sin
+IGNORECASE; con cualquiera de ellos se lanza `TablaNoRegular` y el lenguaje sigue con la
+expresión maestra. El autómata no conserva grupos: `escanear` genera la coincidencia como
+None, así que solo sirve a los lexers que no la usan.
+
+La tabla se guarda en un archivo de caché (ver `guardar`/`desde_archivo`) y se carga al
+arrancar sin compilar ninguna expresión regular. Para generarlas de antemano:
+
+    python -m src.nucleo_compilador.automata_lexico [pascal tsql ...]
+"""
+import hashlib
+import importlib
+import json
+import os
+import sys
+from array import array
+
+try: # Python 3.11+
+    from re import _constants as sre_constantes, _parser as sre_analizador
+except ImportError:
+    import sre_constants as sre_constantes
+    import sre_parse as sre_analizador
+
+VERSION_FORMATO = 1
+CABECERA_ARCHIVO = b"AFDLEX\n"
+MAX_ESTADOS = 0xFFFF # Las transiciones se guardan en un array('H')
+DIRECTORIO_AUTOMATAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "automatas")
+
+# Caracteres no ASCII: los patrones solo nombran caracteres ASCII, así que un carácter no
+# ASCII se distingue únicamente por las categorías \d, \s y \w. Hay cuatro combinaciones
+# posibles y cada una tiene un representante.
+REPRESENTANTES_NO_ASCII = ("٣", "é", "　", "€") # dígito, letra, espacio, otro
+
+# Nodos del AFN
+_CARACTER, _BIFURCACION, _ACEPTACION = 0, 1, 2
+
+
+class TablaNoRegular(ValueError):
+    """La tabla de especificaciones usa construcciones que un AFD no puede representar."""
+    pass
+
+
+def indice_no_ascii(caracter):
+    """Índice en REPRESENTANTES_NO_ASCII del grupo de un carácter no ASCII."""
+    if caracter.isdecimal():
+        return 0
+    if caracter.isalnum() or caracter == '_':
+        return 1
+    if caracter.isspace():
+        return 2
+    return 3
+
+
+def huella_especificaciones(especificaciones, ignorar=(), flags=0):
+    """Resumen que identifica una tabla (sirve para invalidar el archivo de caché)."""
+    texto = json.dumps([VERSION_FORMATO, list(especificaciones), sorted(ignorar, key=str), flags])
+    return hashlib.sha1(texto.encode('utf-8')).hexdigest()
+
+
+# --- Construcción -----------------------------------------------------------------------
+
+_CATEGORIAS = {
+    sre_constantes.CATEGORY_DIGIT: str.isdecimal,
+    sre_constantes.CATEGORY_SPACE: str.isspace,
+    sre_constantes.CATEGORY_WORD: lambda c: c.isalnum() or c == '_',
+}
+_CATEGORIAS_NEGADAS = {
+    sre_constantes.CATEGORY_NOT_DIGIT: sre_constantes.CATEGORY_DIGIT,
+    sre_constantes.CATEGORY_NOT_SPACE: sre_constantes.CATEGORY_SPACE,
+    sre_constantes.CATEGORY_NOT_WORD: sre_constantes.CATEGORY_WORD,
+}
+
+
+class _ConstructorAFN:
+    """AFN de Thompson con bifurcaciones ordenadas por prioridad."""
+
+    def __init__(self, patron):
+        self.patron = patron
+        self.tipos = []      # _CARACTER / _BIFURCACION / _ACEPTACION
+        self.argumentos = [] # Conjunto (función de pertenencia) o índice de especificación
+        self.siguientes = [] # [siguiente] o [preferido, alternativo]
+        self.conjuntos = []  # Funciones de pertenencia distintas, en orden de aparición
+
+    def _nodo(self, tipo, argumento, siguientes):
+        self.tipos.append(tipo)
+        self.argumentos.append(argumento)
+        self.siguientes.append(siguientes)
+        return len(self.tipos) - 1
+
+    def _conjunto(self, pertenece):
+        self.conjuntos.append(pertenece)
+        return len(self.conjuntos) - 1
+
+    def _no_regular(self, motivo):
+        raise TablaNoRegular(f"El patrón '{self.patron}' {motivo}.")
+
+    # Un fragmento es (nodo_inicial, salidas); cada salida es (nodo, posición en `siguientes`)
+    # pendiente de conectar con lo que venga después.
+
+    def _caracteres(self, pertenece):
+        nodo = self._nodo(_CARACTER, self._conjunto(pertenece), [None])
+        return nodo, [(nodo, 0)]
+
+    def _vacio(self):
+        nodo = self._nodo(_BIFURCACION, None, [None])
+        return nodo, [(nodo, 0)]
+
+    def _conectar(self, salidas, destino):
+        for nodo, posicion in salidas:
+            self.siguientes[nodo][posicion] = destino
+
+    def _secuencia(self, fragmentos):
+        if not fragmentos:
+            return self._vacio()
+        inicio, salidas = fragmentos[0]
+        for siguiente_inicio, siguientes_salidas in fragmentos[1:]:
+            self._conectar(salidas, siguiente_inicio)
+            salidas = siguientes_salidas
+        return inicio, salidas
+
+    def _alternativa(self, fragmentos):
+        """Bifurcaciones encadenadas: la primera alternativa tiene la prioridad más alta."""
+        inicio, salidas = fragmentos[-1]
+        salidas = list(salidas)
+        for fragmento_inicio, fragmento_salidas in reversed(fragmentos[:-1]):
+            inicio = self._nodo(_BIFURCACION, None, [fragmento_inicio, inicio])
+            salidas = list(fragmento_salidas) + salidas
+        return inicio, salidas
+
+    def _opcional(self, fragmento, voraz):
+        interior, salidas = fragmento
+        if voraz:
+            nodo = self._nodo(_BIFURCACION, None, [interior, None])
+            return nodo, list(salidas) + [(nodo, 1)]
+        nodo = self._nodo(_BIFURCACION, None, [None, interior])
+        return nodo, [(nodo, 0)] + list(salidas)
+
+    def _estrella(self, fragmento, voraz):
+        interior, salidas = fragmento
+        if voraz:
+            nodo = self._nodo(_BIFURCACION, None, [interior, None])
+            self._conectar(salidas, nodo)
+            return nodo, [(nodo, 1)]
+        nodo = self._nodo(_BIFURCACION, None, [None, interior])
+        self._conectar(salidas, nodo)
+        return nodo, [(nodo, 0)]
+
+    def _conjunto_de_clase(self, elementos):
+        negado = False
+        partes = []
+        for operacion, valor in elementos:
+            if operacion is sre_constantes.NEGATE:
+                negado = True
+            elif operacion is sre_constantes.LITERAL:
+                if valor >= 128:
+                    self._no_regular("usa caracteres no ASCII")
+                partes.append(lambda c, v=valor: ord(c) == v)
+            elif operacion is sre_constantes.RANGE:
+                bajo, alto = valor
+                if alto >= 128:
+                    self._no_regular("usa caracteres no ASCII")
+                partes.append(lambda c, b=bajo, a=alto: b <= ord(c) <= a)
+            elif operacion is sre_constantes.CATEGORY:
+                if valor in _CATEGORIAS:
+                    partes.append(_CATEGORIAS[valor])
+                elif valor in _CATEGORIAS_NEGADAS:
+                    positiva = _CATEGORIAS[_CATEGORIAS_NEGADAS[valor]]
+                    partes.append(lambda c, p=positiva: not p(c))
+                else:
+                    self._no_regular(f"usa una categoría no admitida ({valor})")
+            else:
+                self._no_regular(f"usa una clase no admitida ({operacion})")
+        return lambda c: any(parte(c) for parte in partes) != negado
+
+    def fragmento(self, subpatron):
+        """Fragmento del AFN de un subpatrón devuelto por el analizador de `re`."""
+        fragmentos = []
+        for operacion, valor in subpatron:
+            if operacion is sre_constantes.LITERAL:
+                if valor >= 128:
+                    self._no_regular("usa caracteres no ASCII")
+                fragmentos.append(self._caracteres(lambda c, v=valor: ord(c) == v))
+            elif operacion is sre_constantes.NOT_LITERAL:
+                if valor >= 128:
+                    self._no_regular("usa caracteres no ASCII")
+                fragmentos.append(self._caracteres(lambda c, v=valor: ord(c) != v))
+            elif operacion is sre_constantes.ANY:
+                fragmentos.append(self._caracteres(lambda c: c != '\n'))
+            elif operacion is sre_constantes.IN:
+                fragmentos.append(self._caracteres(self._conjunto_de_clase(valor)))
+            elif operacion is sre_constantes.BRANCH:
+                fragmentos.append(self._alternativa([self.fragmento(rama) for rama in valor[1]]))
+            elif operacion is sre_constantes.SUBPATTERN:
+                _, flags_agregados, flags_quitados, interior = valor
+                if flags_agregados or flags_quitados:
+                    self._no_regular("cambia flags dentro de un grupo")
+                fragmentos.append(self.fragmento(interior))
+            elif operacion in (sre_constantes.MAX_REPEAT, sre_constantes.MIN_REPEAT):
+                minimo, maximo, interior = valor
+                voraz = operacion is sre_constantes.MAX_REPEAT
+                partes = [self.fragmento(interior) for _ in range(minimo)]
+                if maximo == sre_constantes.MAXREPEAT:
+                    partes.append(self._estrella(self.fragmento(interior), voraz))
+                else:
+                    # x{0,n} = (x(x(...)?)?)? anidado, para que cada repetición extra sea opcional
+                    opcional = None
+                    for _ in range(maximo - minimo):
+                        cuerpo = self.fragmento(interior)
+                        if opcional is not None:
+                            cuerpo = self._secuencia([cuerpo, opcional])
+                        opcional = self._opcional(cuerpo, voraz)
+                    if opcional is not None:
+                        partes.append(opcional)
+                fragmentos.append(self._secuencia(partes))
+            else:
+                self._no_regular(f"usa una construcción no regular ({operacion})")
+        return self._secuencia(fragmentos)
+
+
+class _ConstructorAFD:
+    """Construcción por subconjuntos ordenados a partir de un _ConstructorAFN."""
+
+    def __init__(self, afn, inicio, max_estados):
+        self.afn = afn
+        self.max_estados = max_estados
+        self._clasificar_caracteres()
+        self.estados = [((), -1)] # El estado 0 es el estado muerto
+        self.indice_estado = {((), -1): 0}
+        self.filas = []
+        self.inicial = self._estado(self._clausura([inicio]))
+
+    def _clasificar_caracteres(self):
+        """Agrupa los caracteres ASCII y los representantes no ASCII según los conjuntos que los contienen."""
+        conjuntos = self.afn.conjuntos
+        firmas = {}
+        self.clases_ascii = bytearray(128)
+        self.clases_no_ascii = []
+        caracteres = [chr(o) for o in range(128)] + list(REPRESENTANTES_NO_ASCII)
+        self.miembros_por_clase = [] # clase -> conjuntos que la contienen
+        for posicion, caracter in enumerate(caracteres):
+            firma = tuple(pertenece(caracter) for pertenece in conjuntos)
+            clase = firmas.get(firma)
+            if clase is None:
+                clase = firmas[firma] = len(firmas)
+                self.miembros_por_clase.append(frozenset(i for i, dentro in enumerate(firma) if dentro))
+            if posicion < 128:
+                self.clases_ascii[posicion] = clase
+            else:
+                self.clases_no_ascii.append(clase)
+        self.num_clases = len(firmas)
+        if self.num_clases > 255:
+            raise TablaNoRegular("La tabla distingue demasiadas clases de caracteres.")
+
+    def _clausura(self, nodos):
+        """
+        Estados del AFN alcanzables sin consumir caracteres, en orden de prioridad. Al encontrar
+        una aceptación se descartan los de menor prioridad.
+        Returns:
+            tuple: (nodos que consumen un carácter, índice de la especificación aceptada o -1)
+        """
+        tipos, argumentos, siguientes = self.afn.tipos, self.afn.argumentos, self.afn.siguientes
+        visitados = set()
+        consumidores = []
+        for nodo in nodos:
+            pila = [nodo]
+            while pila:
+                actual = pila.pop()
+                if actual in visitados:
+                    continue
+                visitados.add(actual)
+                tipo = tipos[actual]
+                if tipo == _CARACTER:
+                    consumidores.append(actual)
+                elif tipo == _BIFURCACION:
+                    pila.extend(reversed(siguientes[actual])) # El preferido se explora primero
+                else: # _ACEPTACION: los hilos de menor prioridad no pueden ganar
+                    return tuple(consumidores), argumentos[actual]
+        return tuple(consumidores), -1
+
+    def _estado(self, clave):
+        indice = self.indice_estado.get(clave)
+        if indice is None:
+            indice = self.indice_estado[clave] = len(self.estados)
+            if indice > self.max_estados:
+                raise TablaNoRegular(f"El autómata supera los {self.max_estados} estados.")
+            self.estados.append(clave)
+        return indice
+
+    def construir(self):
+        argumentos, siguientes = self.afn.argumentos, self.afn.siguientes
+        pendiente = 0
+        while pendiente < len(self.estados):
+            consumidores, _ = self.estados[pendiente]
+            fila = []
+            for miembros in self.miembros_por_clase:
+                destinos = [siguientes[nodo][0] for nodo in consumidores if argumentos[nodo] in miembros]
+                fila.append(self._estado(self._clausura(destinos)) if destinos else 0)
+            self.filas.append(fila)
+            pendiente += 1
+        return self
+
+
+def compilar_automata(especificaciones, ignorar=(), flags=0, max_estados=MAX_ESTADOS):
+    """
+    Construye el AutomataLexico de una tabla de especificaciones (el paso previo que se
+    guarda en caché). Lanza TablaNoRegular si la tabla no se puede representar con un AFD.
+    """
+    if flags & (sre_constantes.SRE_FLAG_IGNORECASE | sre_constantes.SRE_FLAG_MULTILINE |
+                sre_constantes.SRE_FLAG_DOTALL | sre_constantes.SRE_FLAG_VERBOSE):
+        raise TablaNoRegular("El autómata no admite flags de expresión regular.")
+    afn = _ConstructorAFN("")
+    alternativas = []
+    for indice, (patron, _) in enumerate(especificaciones):
+        afn.patron = patron
+        analizado = sre_analizador.parse(patron, flags)
+        if analizado.state.flags & sre_constantes.SRE_FLAG_IGNORECASE:
+            afn._no_regular("usa IGNORECASE")
+        inicio, salidas = afn.fragmento(analizado)
+        afn._conectar(salidas, afn._nodo(_ACEPTACION, indice, []))
+        alternativas.append((inicio, []))
+    inicio, _ = afn._alternativa(alternativas)
+    afd = _ConstructorAFD(afn, inicio, max_estados).construir()
+
+    # Se renumeran los estados para que los de aceptación queden al final: el bucle de
+    # escaneo distingue "aceptación" con una comparación.
+    orden = sorted(range(len(afd.estados)), key=lambda e: (afd.estados[e][1] >= 0, e))
+    nuevo = {anterior: posicion for posicion, anterior in enumerate(orden)}
+    transiciones = array('H')
+    for anterior in orden:
+        transiciones.extend(nuevo[destino] for destino in afd.filas[anterior])
+    aceptacion = array('h', (afd.estados[anterior][1] for anterior in orden))
+    primer_aceptador = sum(1 for clave in afd.estados if clave[1] < 0)
+    ignorar = frozenset(ignorar)
+    tipos = [(tipo, tipo in ignorar) for _, tipo in especificaciones]
+    return AutomataLexico(tipos, bytes(afd.clases_ascii), afd.clases_no_ascii, afd.num_clases,
+                          transiciones, aceptacion, nuevo[afd.inicial], primer_aceptador,
+                          huella_especificaciones(especificaciones, ignorar, flags))
+
+
+# --- Ejecución --------------------------------------------------------------------------
+
+class _TablaClases(dict):
+    """Tabla para `str.translate`: código de carácter -> clase (los no ASCII se calculan al verlos)."""
+
+    def __init__(self, clases_ascii, clases_no_ascii):
+        super().__init__((codigo, clase) for codigo, clase in enumerate(clases_ascii))
+        self.clases_no_ascii = clases_no_ascii
+
+    def __missing__(self, codigo):
+        clase = self[codigo] = self.clases_no_ascii[indice_no_ascii(chr(codigo))]
+        return clase
+
+
+class AutomataLexico:
+    """
+    Tabla de estados de un AFD léxico.
+
+    Args:
+        tipos (list): (tipo, se_ignora) de cada especificación, en orden.
+        clases_ascii (bytes): Clase de cada carácter ASCII.
+        clases_no_ascii (list): Clase de cada grupo de `indice_no_ascii`.
+        num_clases (int): Columnas de la tabla.
+        transiciones (array): estados x clases -> estado siguiente (0 = muerto).
+        aceptacion (array): Especificación aceptada en cada estado (-1 si ninguna).
+        inicial (int): Estado inicial.
+        primer_aceptador (int): Los estados >= este aceptan.
+        huella (str): `huella_especificaciones` de la tabla de origen.
+    """
+
+    def __init__(self, tipos, clases_ascii, clases_no_ascii, num_clases, transiciones, aceptacion,
+                 inicial, primer_aceptador, huella):
+        self.tipos = tipos
+        self.clases_ascii = clases_ascii
+        self.clases_no_ascii = list(clases_no_ascii)
+        self.num_clases = num_clases
+        self.transiciones = transiciones
+        self.aceptacion = aceptacion
+        self.inicial = inicial
+        self.primer_aceptador = primer_aceptador
+        self.huella = huella
+        self._tabla_clases = _TablaClases(clases_ascii, self.clases_no_ascii)
+        # Una tupla por estado: `filas[estado][clase]` es la transición.
+        self._filas = [tuple(transiciones[e * num_clases:(e + 1) * num_clases]) for e in range(len(aceptacion))]
+
+    @property
+    def num_estados(self):
+        return len(self.aceptacion)
+
+    def clases(self, codigo, pos=0, fin=None):
+        """Clase de cada carácter de `codigo[pos:fin]` (bytes), traducida en C con `str.translate`."""
+        return codigo[pos:fin].translate(self._tabla_clases).encode('latin-1')
+
+    def coincidir(self, codigo, pos=0, fin=None):
+        """(índice de especificación, fin) de la coincidencia en `pos`, o None."""
+        if fin is None:
+            fin = len(codigo)
+        resultado = self._recorrer(self.clases(codigo, pos, fin), 0)
+        if resultado is None:
+            return None
+        return resultado[0], pos + resultado[1]
+
+    def _recorrer(self, clases, i):
+        """Recorre el AFD desde `clases[i]`; (especificación, fin relativo) de la última aceptación."""
+        filas = self._filas
+        primer_aceptador = self.primer_aceptador
+        estado = self.inicial
+        aceptado, fin_aceptado = (estado, i) if estado >= primer_aceptador else (0, i)
+        for clase in memoryview(clases)[i:]:
+            estado = filas[estado][clase]
+            if estado < primer_aceptador:
+                if not estado:
+                    break
+                i += 1
+            else:
+                i += 1
+                aceptado, fin_aceptado = estado, i
+        if not aceptado:
+            return None
+        return self.aceptacion[aceptado], fin_aceptado
+
+    def escanear(self, motor, codigo, pos, fin, linea=1, columna=1, posiciones=True):
+        """
+        Igual que `MotorLexico.escanear` (tuplas tipo, lexema, linea, columna, inicio, None),
+        con el AFD en lugar de la expresión maestra. `motor` aporta la reclasificación de
+        identificadores.
+        """
+        clases = self.clases(codigo, pos, fin)
+        vista = memoryview(clases)
+        filas = self._filas
+        aceptacion = self.aceptacion
+        primer_aceptador = self.primer_aceptador
+        inicial = self.inicial
+        tipos = self.tipos
+        tipo_identificador = motor.tipo_identificador
+        base = pos
+        if not posiciones:
+            linea = columna = None
+        i, n = 0, len(clases)
+        while i < n:
+            # Bucle del AFD (en línea: es el camino caliente)
+            estado = inicial
+            aceptado, j = 0, i
+            fin_token = i
+            for clase in vista[i:]:
+                estado = filas[estado][clase]
+                if estado < primer_aceptador:
+                    if not estado:
+                        break
+                    j += 1
+                else:
+                    j += 1
+                    aceptado, fin_token = estado, j
+            inicio = base + i
+            if not aceptado or fin_token == i:
+                caracter = codigo[inicio]
+                yield None, caracter, linea, columna, inicio, None
+                i += 1
+                if posiciones:
+                    if caracter == '\n':
+                        linea, columna = linea + 1, 1
+                    else:
+                        columna += 1
+                continue
+            tipo, se_ignora = tipos[aceptacion[aceptado]]
+            if se_ignora and not posiciones:
+                i = fin_token
+                continue
+            lexema = codigo[inicio:base + fin_token]
+            if not se_ignora:
+                if tipo == tipo_identificador:
+                    tipo = motor.reclasificar(lexema)
+                yield tipo, lexema, linea, columna, inicio, None
+            i = fin_token
+            if posiciones:
+                saltos = lexema.count('\n')
+                if saltos:
+                    linea += saltos
+                    columna = len(lexema) - lexema.rfind('\n')
+                else:
+                    columna += len(lexema)
+
+    # --- Archivo de caché ---
+
+    def guardar(self, ruta):
+        """Guarda la tabla: una cabecera JSON en una línea y después los arrays en binario."""
+        datos = {
+            "version": VERSION_FORMATO,
+            "huella": self.huella,
+            "orden_bytes": sys.byteorder,
+            "tipos": self.tipos,
+            "clases_no_ascii": self.clases_no_ascii,
+            "num_clases": self.num_clases,
+            "num_estados": self.num_estados,
+            "inicial": self.inicial,
+            "primer_aceptador": self.primer_aceptador,
+        }
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, 'wb') as archivo:
+            archivo.write(CABECERA_ARCHIVO)
+            archivo.write(json.dumps(datos).encode('utf-8') + b"\n")
+            archivo.write(self.clases_ascii)
+            archivo.write(self.transiciones.tobytes())
+            archivo.write(self.aceptacion.tobytes())
+        os.replace(temporal, ruta) # Otro proceso nunca ve un archivo a medio escribir
+
+    @classmethod
+    def desde_archivo(cls, ruta, huella=None):
+        """
+        Carga una tabla guardada con `guardar`. Con `huella`, lanza ValueError si el archivo
+        se generó a partir de otra tabla de especificaciones.
+        """
+        with open(ruta, 'rb') as archivo:
+            contenido = archivo.read()
+        if not contenido.startswith(CABECERA_ARCHIVO):
+            raise ValueError(f"'{ruta}' no es una tabla de autómata léxico.")
+        fin_cabecera = contenido.index(b"\n", len(CABECERA_ARCHIVO))
+        datos = json.loads(contenido[len(CABECERA_ARCHIVO):fin_cabecera])
+        if datos.get("version") != VERSION_FORMATO or (huella is not None and datos.get("huella") != huella):
+            raise ValueError(f"La tabla '{ruta}' está desactualizada.")
+        posicion = fin_cabecera + 1
+        clases_ascii = contenido[posicion:posicion + 128]
+        posicion += 128
+        transiciones = array('H')
+        tamanio = datos["num_estados"] * datos["num_clases"] * transiciones.itemsize
+        transiciones.frombytes(contenido[posicion:posicion + tamanio])
+        posicion += tamanio
+        aceptacion = array('h')
+        aceptacion.frombytes(contenido[posicion:posicion + datos["num_estados"] * aceptacion.itemsize])
+        if datos["orden_bytes"] != sys.byteorder:
+            transiciones.byteswap()
+            aceptacion.byteswap()
+        tipos = [(tipo, se_ignora) for tipo, se_ignora in datos["tipos"]]
+        return cls(tipos, clases_ascii, datos["clases_no_ascii"], datos["num_clases"], transiciones,
+                   aceptacion, datos["inicial"], datos["primer_aceptador"], datos["huella"])
+
+
+def ruta_automata(nombre):
+    return os.path.join(DIRECTORIO_AUTOMATAS, f"{nombre}.afd")
+
+
+def cargar_automata(motor):
+    """
+    AutomataLexico de `motor` (un MotorLexico con nombre): se lee de su archivo de caché si
+    está al día y, si no, se construye y se guarda para el próximo arranque.
+    """
+    huella = huella_especificaciones(motor.especificaciones, motor.ignorar, motor.flags)
+    ruta = ruta_automata(motor.nombre)
+    try:
+        return AutomataLexico.desde_archivo(ruta, huella)
+    except (OSError, ValueError):
+        pass
+    automata = compilar_automata(motor.especificaciones, motor.ignorar, motor.flags)
+    try:
+        automata.guardar(ruta)
+    except OSError:
+        pass # Sin caché (p. ej. directorio de solo lectura): se reconstruirá la próxima vez
+    return automata
+
+
+# Lexers cuya tabla se puede precompilar: nombre del motor -> módulo del lexer
+MODULOS_LEXERS = {
+    "cpp": "analizador_lexico.lexer_cpp",
+    "html": "analizador_lexico.lexer_html",
+    "javascript": "analizador_lexico.lexer_javascript",
+    "pascal": "analizador_lexico.lexer_pascal",
+    "plsql": "analizador_lexico.lexer_plsql",
+    "python": "analizador_lexico.lexer_python",
+    "tsql": "analizador_lexico.lexer_tsql",
+}
+
+
+def main():
+    from .motor_lexico import MOTORES_LEXICOS
+    for nombre in sys.argv[1:] or MODULOS_LEXERS:
+        try:
+            importlib.import_module(MODULOS_LEXERS[nombre])
+        except ImportError:
+            importlib.import_module("src." + MODULOS_LEXERS[nombre])
+        motor = MOTORES_LEXICOS[nombre]
+        try:
+            automata = compilar_automata(motor.especificaciones, motor.ignorar, motor.flags)
+        except TablaNoRegular as error:
+            print(f"{nombre}: se queda con la expresión maestra ({error})")
+            continue
+        automata.guardar(ruta_automata(nombre))
+        print(f"{nombre}: {automata.num_estados} estados x {automata.num_clases} clases -> {ruta_automata(nombre)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+# src/nucleo_compilador/cache_ast.py
+"""
+Caché en disco de los análisis léxico y sintáctico, indexada por el contenido del código.
+
+Tras un análisis sin errores se guardan los tokens, el AST y, si el parser la construye
+(Pascal), la tabla de símbolos. La clave es el resumen SHA-256 del código junto con la
+huella del analizador (el texto de los módulos del lexer y del parser y los de
+`nucleo_compilador`), así que cambiar el código fuente del compilador invalida las
+entradas sin tener que numerar versiones a mano. Al volver a analizar el mismo texto,
+`obtener` devuelve el análisis guardado y no se tokeniza ni se analiza nada.
+
+Formato de archivo (`<clave>.ast`): la cabecera CABECERA_ARCHIVO, una línea JSON con la
+versión del formato, la clave y las dependencias, y después el análisis serializado con
+pickle. Los almacenes de tokens viajan con su propio estado (`AlmacenTokens.__getstate__`)
+y las vistas como (clase, almacén, índice); el código fuente no se guarda, porque quien
+consulta la caché ya lo tiene: se vuelve a enlazar al cargar. Las dependencias son archivos
+(p. ej. las cabeceras de C++) cuya fecha de modificación se comprueba antes de usar la
+entrada.
+
+La caché vive en el directorio de caché del usuario (no en el árbol del código) y está
+acotada: al guardar se borran las entradas usadas hace más tiempo (por fecha de
+modificación, que `obtener` actualiza en cada acierto) hasta quedar dentro de
+`maximo_entradas` y `maximo_bytes`.
+"""
+import gc
+import glob
+import hashlib
+import io
+import json
+import os
+import pickle
+import sys
+
+from .almacen_tokens import AlmacenTokens, VistaToken, clase_vista
+
+VERSION_FORMATO = 1
+CABECERA_ARCHIVO = b"ASTCACHE\n"
+MAXIMO_ENTRADAS_CACHE_AST = 512
+MAXIMO_BYTES_CACHE_AST = 256 * 1024 * 1024
+
+
+def _directorio_cache_usuario():
+    """Directorio de caché del usuario: %LOCALAPPDATA%, ~/Library/Caches o $XDG_CACHE_HOME (~/.cache)."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    elif sys.platform == "darwin":
+        base = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "CompilaSim")
+
+
+DIRECTORIO_CACHE_AST = os.path.join(_directorio_cache_usuario(), "cache_ast")
+_DIRECTORIO_NUCLEO = os.path.dirname(os.path.abspath(__file__))
+
+# Errores con los que una entrada se trata como ausente (archivo truncado, de otra versión
+# del compilador, con una clase que ya no existe, ...).
+_ERRORES_CARGA = (OSError, ValueError, EOFError, pickle.UnpicklingError, AttributeError, ImportError,
+                  IndexError, KeyError, TypeError)
+
+_HUELLAS = {}
+
+
+def huella_analizador(clases):
+    """Resumen del código fuente de los módulos de `clases` y de `nucleo_compilador`."""
+    huella = _HUELLAS.get(clases)
+    if huella is None:
+        rutas = sorted(glob.glob(os.path.join(_DIRECTORIO_NUCLEO, "*.py")))
+        rutas += [os.path.abspath(sys.modules[clase.__module__].__file__) for clase in clases]
+        nombres = [f"{clase.__module__}.{clase.__qualname__}" for clase in clases]
+        resumen = hashlib.sha1(json.dumps([VERSION_FORMATO, nombres]).encode('utf-8'))
+        for ruta in rutas:
+            with open(ruta, 'rb') as archivo:
+                resumen.update(archivo.read())
+        huella = _HUELLAS[clases] = resumen.hexdigest()
+    return huella
+
+
+def _almacen_desde_estado(estado, codigo):
+    almacen = AlmacenTokens.__new__(AlmacenTokens)
+    almacen.__setstate__(estado)
+    almacen.codigo = codigo
+    return almacen
+
+
+class _SerializadorAnalisis(pickle.Pickler):
+    """Pickler que guarda los almacenes con su estado y sustituye el código por una referencia."""
+
+    def __init__(self, archivo, codigo):
+        super().__init__(archivo, protocol=pickle.HIGHEST_PROTOCOL)
+        self._codigo = codigo
+
+    def persistent_id(self, objeto):
+        codigo = self._codigo
+        if objeto is codigo or (type(objeto) is str and len(objeto) == len(codigo) and objeto == codigo):
+            return "codigo"
+        return None
+
+    def reducer_override(self, objeto):
+        if isinstance(objeto, VistaToken):
+            return type(objeto), (objeto._almacen, objeto._indice)
+        if isinstance(objeto, type) and issubclass(objeto, VistaToken) and objeto is not VistaToken:
+            # Las clases de vista se crean al vuelo (ver `clase_vista`): se guardan por su Token
+            return clase_vista, (objeto.__bases__[1],)
+        if isinstance(objeto, AlmacenTokens):
+            return _almacen_desde_estado, (objeto.__getstate__(), objeto.codigo)
+        return NotImplemented
+
+
+class _LectorAnalisis(pickle.Unpickler):
+    def __init__(self, archivo, codigo):
+        super().__init__(archivo)
+        self._codigo = codigo
+
+    def persistent_load(self, identificador):
+        if identificador != "codigo":
+            raise pickle.UnpicklingError(f"Referencia desconocida en la caché de AST: {identificador!r}")
+        return self._codigo
+
+
+class AnalisisGuardado:
+    """
+    Resultado de un análisis sin errores. Tiene los mismos atributos que se consultan del
+    parser (`errores_sintacticos`, `tabla_simbolos`), así que puede ocupar su lugar.
+    """
+    __slots__ = ("tokens", "ast", "tabla_simbolos", "errores_sintacticos")
+
+    def __init__(self, tokens, ast, tabla_simbolos=None):
+        self.tokens = tokens
+        self.ast = ast
+        self.tabla_simbolos = tabla_simbolos
+        self.errores_sintacticos = []
+
+
+class CacheAST:
+    """
+    Args:
+        directorio (str): Carpeta de los archivos de la caché (se crea al guardar).
+        maximo_entradas (int): Número de archivos a partir del cual se desalojan los más antiguos.
+        maximo_bytes (int): Tamaño total a partir del cual se desalojan los más antiguos.
+    """
+
+    def __init__(self, directorio=DIRECTORIO_CACHE_AST, maximo_entradas=MAXIMO_ENTRADAS_CACHE_AST,
+                 maximo_bytes=MAXIMO_BYTES_CACHE_AST):
+        self.directorio = directorio
+        self.maximo_entradas = maximo_entradas
+        self.maximo_bytes = maximo_bytes
+        self.aciertos = 0
+        self.fallos = 0
+
+    def clave(self, codigo, clases, contexto=""):
+        """
+        Clave de `codigo` analizado con `clases` (lexer, parser y, si hay, las fases
+        intermedias). `contexto` distingue análisis del mismo texto que dependen de algo
+        más (p. ej. el directorio desde el que el preprocesador de C++ busca cabeceras).
+        """
+        resumen = hashlib.sha256(json.dumps([huella_analizador(tuple(clases)), contexto]).encode('utf-8'))
+        resumen.update(codigo.encode('utf-8', 'surrogatepass'))
+        return resumen.hexdigest()
+
+    def ruta(self, clave):
+        return os.path.join(self.directorio, f"{clave}.ast")
+
+    def obtener(self, codigo, clases, contexto=""):
+        """AnalisisGuardado de `codigo`, o None si no está en la caché o está desactualizado."""
+        clave = self.clave(codigo, clases, contexto)
+        ruta = self.ruta(clave)
+        try:
+            with open(ruta, 'rb') as archivo:
+                contenido = archivo.read()
+            if not contenido.startswith(CABECERA_ARCHIVO):
+                raise ValueError("no es un archivo de la caché de AST")
+            fin_cabecera = contenido.index(b"\n", len(CABECERA_ARCHIVO))
+            datos = json.loads(contenido[len(CABECERA_ARCHIVO):fin_cabecera])
+            if datos.get("version") != VERSION_FORMATO or datos.get("clave") != clave:
+                raise ValueError("entrada de otra versión")
+            for ruta, mtime in datos["dependencias"].items():
+                if os.stat(ruta).st_mtime_ns != mtime:
+                    raise ValueError(f"'{ruta}' cambió")
+            analisis = self._cargar(contenido[fin_cabecera + 1:], codigo)
+        except _ERRORES_CARGA:
+            self.fallos += 1
+            return None
+        try:
+            os.utime(ruta) # Usada ahora: es la última en desalojarse
+        except OSError:
+            pass
+        self.aciertos += 1
+        return analisis
+
+    @staticmethod
+    def _cargar(cuerpo, codigo):
+        # Cargar crea de golpe un objeto por nodo y por token del AST, ninguno de ellos basura:
+        # con el recolector activo, sus pasadas sobre esos objetos ocupan dos tercios del tiempo.
+        recolector_activo = gc.isenabled()
+        gc.disable()
+        try:
+            return _LectorAnalisis(io.BytesIO(cuerpo), codigo).load()
+        finally:
+            if recolector_activo:
+                gc.enable()
+
+    def guardar(self, codigo, clases, analisis, contexto="", dependencias=()):
+        """
+        Guarda `analisis` (un AnalisisGuardado) para `codigo`. Devuelve False si no se pudo
+        (el AST no se puede serializar o el directorio no admite escritura): el análisis
+        simplemente se repetirá la próxima vez.
+        """
+        clave = self.clave(codigo, clases, contexto)
+        try:
+            datos = {
+                "version": VERSION_FORMATO,
+                "clave": clave,
+                "dependencias": {ruta: os.stat(ruta).st_mtime_ns for ruta in dependencias},
+            }
+            cuerpo = io.BytesIO()
+            _SerializadorAnalisis(cuerpo, codigo).dump(analisis)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            return False
+        ruta = self.ruta(clave)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            with open(temporal, 'wb') as archivo:
+                archivo.write(CABECERA_ARCHIVO)
+                archivo.write(json.dumps(datos).encode('utf-8') + b"\n")
+                archivo.write(cuerpo.getbuffer())
+            os.replace(temporal, ruta) # Otro proceso nunca ve un archivo a medio escribir
+        except OSError:
+            return False
+        self._desalojar()
+        return True
+
+    def _desalojar(self):
+        """Borra las entradas menos usadas recientemente hasta quedar dentro de los límites."""
+        entradas = []
+        for ruta in glob.glob(os.path.join(self.directorio, "*.ast")):
+            try:
+                estado = os.stat(ruta)
+            except OSError:
+                continue
+            entradas.append((estado.st_mtime_ns, estado.st_size, ruta))
+        entradas.sort()
+        restantes = len(entradas)
+        total = sum(tamanio for _, tamanio, _ in entradas)
+        for _, tamanio, ruta in entradas:
+            if restantes <= self.maximo_entradas and total <= self.maximo_bytes:
+                break
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+            restantes -= 1
+            total -= tamanio
+
+    def tasa_aciertos(self):
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas else 0.0
+
+    def vaciar(self):
+        """Borra los archivos de la caché y reinicia los contadores."""
+        for ruta in glob.glob(os.path.join(self.directorio, "*.ast")):
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+        self.aciertos = self.fallos = 0
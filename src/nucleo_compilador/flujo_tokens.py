@@ -0,0 +1,130 @@
+# src/nucleo_compilador/flujo_tokens.py
+"""
+Secuencia de tokens que los parsers leen por índice absoluto (`tokens[i]`).
+
+Un parser puede recibir tokens de dos formas:
+
+  - una secuencia completa (la lista o el `AlmacenTokens` que devuelve `tokenizar()`):
+    se filtran los tipos ignorados una vez y se puede acceder a cualquier índice, como
+    con la lista de siempre. De un AlmacenTokens solo se guardan los índices de los tokens
+    no ignorados y la vista de cada uno se crea al leerlo;
+  - un iterador (p. ej. `lexer.generar_tokens()`): los tokens se piden al lexer a medida
+    que el parser los necesita y se guardan en un buffer circular de `ventana` tokens.
+    El parser puede mirar hacia delante y hacia atrás dentro de la ventana; los tokens
+    más antiguos se descartan. La memoria de tokens no depende del tamaño del archivo.
+
+En ambos casos `hay(i)` sustituye a `i < len(tokens)` (un flujo no conoce su longitud
+hasta agotarse) y los índices negativos se refieren a los últimos tokens, como en una
+lista; en un flujo eso obliga a leerlo hasta el final. Los parsers, que solo necesitan el
+último token al pasar del final (EOF) o al informar de un error allí, usan `ultimo()` y
+`ultimo_antes_de()`, que miran lo ya leído sin leer más.
+"""
+from array import array
+from collections import deque
+
+from .almacen_tokens import AlmacenTokens, id_tipo_token
+
+# Tokens que se conservan en modo flujo. Los parsers que lo admiten miran como mucho un
+# token por delante del actual y uno por detrás al informar de errores.
+VENTANA_POR_DEFECTO = 16
+
+
+class FlujoTokens:
+    """
+    Args:
+        tokens (iterable): Secuencia de tokens o iterador que los genera.
+        ignorar (iterable): Tipos de token que se descartan (p. ej. espacios en blanco).
+        ventana (int): Tamaño del buffer circular en modo flujo (mínimo 2).
+    """
+    __slots__ = ("_buffer", "_siguiente", "_fuente", "_ignorar", "_almacen", "ventana")
+
+    def __init__(self, tokens, ignorar=(), ventana=VENTANA_POR_DEFECTO):
+        self._ignorar = frozenset(ignorar)
+        self._almacen = None
+        if isinstance(tokens, AlmacenTokens):
+            # Copiar las vistas traería de vuelta un objeto por token: se filtra por la
+            # columna de tipos y `_buffer` guarda índices del almacén (un `range` si no
+            # hay nada que descartar, lo habitual porque los lexers ya omiten los espacios).
+            ignorados = {id_tipo_token(tipo) for tipo in self._ignorar}
+            self._buffer = range(len(tokens))
+            if not ignorados.isdisjoint(tokens.tipos):
+                self._buffer = array('I', [indice for indice, tipo in enumerate(tokens.tipos) if tipo not in ignorados])
+            self._siguiente = len(self._buffer)
+            self._fuente = None
+            self._almacen = tokens
+            self.ventana = None
+        elif hasattr(tokens, '__len__'):
+            # Secuencia completa: se comporta como la lista filtrada de siempre.
+            self._buffer = [token for token in tokens if token.tipo not in self._ignorar]
+            self._siguiente = len(self._buffer)
+            self._fuente = None
+            self.ventana = None
+        else:
+            if ventana < 2:
+                raise ValueError("La ventana de un flujo de tokens debe admitir al menos 2 tokens.")
+            self._buffer = deque(maxlen=ventana)
+            self._siguiente = 0  # Índice absoluto del próximo token que se leerá
+            self._fuente = iter(tokens)
+            self.ventana = ventana
+
+    @property
+    def es_flujo(self):
+        """True si los tokens se leen bajo demanda (y solo se conserva la ventana)."""
+        return self.ventana is not None
+
+    def _leer(self):
+        """Lee el siguiente token no ignorado de la fuente. Devuelve False si se agotó."""
+        if self._fuente is None:
+            return False
+        for token in self._fuente:
+            if token.tipo not in self._ignorar:
+                self._buffer.append(token)
+                self._siguiente += 1
+                return True
+        self._fuente = None
+        return False
+
+    def hay(self, indice):
+        """True si existe el token `indice` (equivale a `indice < len(tokens)` en una lista)."""
+        while self._siguiente <= indice:
+            if not self._leer():
+                return False
+        return True
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            while self._leer():
+                pass
+            elemento = self._buffer[indice]
+        else:
+            if not self.hay(indice):
+                raise IndexError("índice de token fuera de rango")
+            relativo = indice - (self._siguiente - len(self._buffer))
+            if relativo < 0:
+                raise IndexError(f"El token {indice} ya salió de la ventana de {self.ventana} tokens del flujo.")
+            elemento = self._buffer[relativo]
+        return elemento if self._almacen is None else self._almacen[elemento]
+
+    def __bool__(self):
+        return self.hay(0)
+
+    def ultimo(self):
+        """
+        Último token leído, o None si no se ha leído ninguno. No lee más de la fuente: una
+        vez que `hay(i)` devolvió False (el parser pasó del final) es el último token.
+        """
+        if not self._buffer:
+            return None
+        elemento = self._buffer[-1]
+        return elemento if self._almacen is None else self._almacen[elemento]
+
+    def ultimo_antes_de(self, tipo_eof):
+        """
+        Como `ultimo()`, pero si el último es de tipo `tipo_eof` y hay otro antes, devuelve
+        ese (el último token con contenido, para situar los errores de fin de entrada).
+        """
+        ultimo = self.ultimo()
+        if ultimo is not None and ultimo.tipo == tipo_eof and len(self._buffer) > 1:
+            elemento = self._buffer[-2]
+            return elemento if self._almacen is None else self._almacen[elemento]
+        return ultimo
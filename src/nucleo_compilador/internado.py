@@ -0,0 +1,66 @@
+# src/nucleo_compilador/internado.py
+"""
+Tabla global de símbolos internados (identificadores y palabras clave).
+
+Cada ocurrencia de un identificador en el código es, en principio, una subcadena nueva.
+Los lexers registran aquí el nombre y obtienen su forma canónica: una única cadena por
+nombre (internada con `sys.intern`, así que también es el mismo objeto que los literales
+del código Python) y un identificador entero pequeño. Los diccionarios de alcance de los
+intérpretes que usan estas cadenas como clave encuentran la entrada por identidad, sin
+comparar caracteres.
+
+Para los lenguajes insensibles a mayúsculas (Pascal, PL/SQL, T-SQL) `plegar` da la
+forma canónica en minúsculas; el resultado se memoriza por grafía, de modo que `X`, `x`
+y `x` de nuevo no vuelven a llamar a `lower()` ni crean cadenas nuevas.
+"""
+import sys
+
+
+class TablaInternado:
+    """Registro de nombres canónicos: texto <-> identificador entero."""
+
+    def __init__(self):
+        self._id_por_nombre = {}
+        self._nombres = []
+        self._plegados = {} # grafía -> nombre canónico en minúsculas
+
+    def internar(self, texto):
+        """Forma canónica de `texto` (la misma cadena para todas sus ocurrencias)."""
+        identificador = self._id_por_nombre.get(texto)
+        if identificador is None:
+            return self._nombres[self._registrar(texto)]
+        return self._nombres[identificador]
+
+    def plegar(self, texto):
+        """Forma canónica de `texto` sin distinguir mayúsculas (`texto.lower()` internado)."""
+        plegado = self._plegados.get(texto)
+        if plegado is None:
+            plegado = self._plegados[texto] = self.internar(texto.lower())
+        return plegado
+
+    def id_simbolo(self, texto):
+        """Identificador entero del nombre `texto` (se registra la primera vez)."""
+        identificador = self._id_por_nombre.get(texto)
+        if identificador is None:
+            identificador = self._registrar(texto)
+        return identificador
+
+    def simbolo(self, identificador):
+        """Nombre canónico de un identificador devuelto por `id_simbolo`."""
+        return self._nombres[identificador]
+
+    def _registrar(self, texto):
+        canonico = sys.intern(texto)
+        identificador = len(self._nombres)
+        self._nombres.append(canonico)
+        self._id_por_nombre[canonico] = identificador
+        return identificador
+
+    def __len__(self):
+        return len(self._nombres)
+
+
+# Tabla compartida por todos los lexers e intérpretes.
+TABLA_INTERNADO = TablaInternado()
+internar = TABLA_INTERNADO.internar
+plegar = TABLA_INTERNADO.plegar
@@ -0,0 +1,158 @@
+# src/nucleo_compilador/lexico_paralelo.py
+"""
+Tokenización en paralelo de un único archivo muy grande (T-SQL, PL/SQL, Pascal, C++).
+
+El código se parte en tramos por saltos de línea que un pre-escaneo barato sitúa fuera de
+cadenas y comentarios: el pre-escaneo solo busca (con `finditer`, en C) las
+especificaciones del lexer que pueden contener un salto de línea o esconder el comienzo
+de otro token (comentarios, literales de cadena...). Cada tramo se tokeniza en un proceso
+de un ProcessPoolExecutor (el lexer recorre el código completo desde el inicio del tramo
+y se detiene en la primera coincidencia que empieza después de su final, ver
+`motor_lexico.TramoEscaneo`) y los almacenes de tokens se concatenan en orden. Las líneas
+y columnas no hay que corregirlas: los tokens guardan su desplazamiento en el código
+completo y el MapaFuente del almacén final las calcula.
+
+El pre-escaneo solo decide dónde cortar; la corrección no depende de él. Al unir, un tramo
+se acepta si el escaneo del tramo anterior terminó justo donde empieza el suyo o en su
+primera coincidencia: a partir de esa posición los dos escaneos son idénticos porque el
+motor léxico no guarda estado entre tokens. Si no (un corte dentro de un literal que el
+pre-escaneo no vio), ese tramo se vuelve a tokenizar en este proceso desde la posición
+correcta.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .motor_lexico import MotorLexico, TramoEscaneo, avanzar_posicion
+
+# Tamaño (en caracteres) a partir del cual `tokenizar()` reparte el archivo entre procesos
+UMBRAL_LEXICO_PARALELO = 16 * 1024 * 1024
+# Tramos por proceso: con algo más de uno, un tramo lento no deja a los demás esperando
+TRAMOS_POR_PROCESO = 2
+
+# Expresiones de pre-escaneo ya compiladas: (nombre del motor, tipos) -> regex
+_PRECORTES = {}
+
+# Código completo en cada proceso del pool (lo fija `_iniciar_trabajador`)
+_CODIGO_TRABAJADOR = None
+
+
+def expresion_precorte(motor, tipos):
+    """
+    Expresión del pre-escaneo: las especificaciones de `motor` cuyo tipo está en `tipos`,
+    en el mismo orden (y con los mismos flags) que en la expresión maestra.
+    """
+    clave = (motor.nombre, tipos)
+    expresion = _PRECORTES.get(clave)
+    if expresion is None:
+        especificaciones = [(patron, tipo) for patron, tipo in motor.especificaciones if tipo in tipos]
+        expresion = MotorLexico(especificaciones, flags=motor.flags, flags_por_tipo=motor.flags_por_tipo).regex
+        _PRECORTES[clave] = expresion
+    return expresion
+
+
+def cortes_seguros(codigo, expresion, desde=0, tramos=2):
+    """
+    Desplazamientos [desde, c1, ..., len(codigo)] que parten `codigo[desde:]` en (como mucho)
+    `tramos` tramos de tamaño parecido. Cada corte está justo después del primer salto de
+    línea a partir de su objetivo que no queda dentro de una coincidencia de `expresion`.
+    """
+    fin = len(codigo)
+    tamanio = (fin - desde) // tramos
+    if tamanio <= 0:
+        return [desde, fin]
+    cortes = [desde]
+    objetivos = iter(range(desde + tamanio, fin - tamanio // 2, tamanio))
+    objetivo = next(objetivos, fin)
+    previo = desde
+
+    def cortar_hueco(hasta):
+        # Cortes en el hueco [previo, hasta), que no está dentro de ninguna coincidencia
+        nonlocal objetivo
+        while objetivo < hasta:
+            salto = codigo.find('\n', max(objetivo, previo), hasta)
+            if salto == -1:
+                return
+            cortes.append(salto + 1)
+            objetivo = next(objetivos, fin)
+            while objetivo <= salto:
+                objetivo = next(objetivos, fin)
+
+    if expresion is not None:
+        for coincidencia in expresion.finditer(codigo, desde):
+            cortar_hueco(coincidencia.start())
+            if objetivo >= fin:
+                break
+            previo = coincidencia.end()
+    cortar_hueco(fin)
+    if cortes[-1] != fin:
+        cortes.append(fin)
+    return cortes
+
+
+def _iniciar_trabajador(codigo):
+    global _CODIGO_TRABAJADOR
+    _CODIGO_TRABAJADOR = codigo
+
+
+def _tokenizar_tramo(clase_lexer, desde, hasta, codigo=None):
+    """
+    Tokeniza el tramo [desde, hasta) de `codigo` (el del proceso si es None).
+
+    Returns:
+        tuple: (AlmacenTokens del tramo sin EOF, primero, siguiente); ver TramoEscaneo.
+    """
+    lexer = clase_lexer(_CODIGO_TRABAJADOR if codigo is None else codigo)
+    lexer.posicion_actual = desde
+    tramo = TramoEscaneo(hasta)
+    tokens = lexer.tokenizar(tramo)
+    return tokens, tramo.primero, tramo.siguiente
+
+
+def tokenizar_en_paralelo(lexer, tokens, motor, tipos_precorte, trabajadores=None):
+    """
+    Añade a `tokens` los tokens de `lexer.codigo` desde `lexer.posicion_actual` hasta el final
+    (sin EOF) repartiendo el trabajo en procesos, y deja el lexer al final del código con su
+    línea y columna, listo para generar el EOF.
+
+    El lexer debe aceptar `tokenizar(tramo)` con un TramoEscaneo (no añade EOF en ese caso) y
+    su clase debe poder construirse solo con el código.
+
+    Args:
+        lexer: Lexer de T-SQL, PL/SQL, Pascal o C++ (en su posición inicial).
+        tokens (AlmacenTokens): Almacén vacío del lexer.
+        motor (MotorLexico): Motor del lexer (para el pre-escaneo).
+        tipos_precorte (tuple): Tipos de token que pueden contener saltos de línea.
+        trabajadores (int): Número de procesos. None usa os.cpu_count(); con 1 o menos no se
+                            hace nada y el lexer sigue en serie.
+
+    Returns:
+        bool: True si el código se tokenizó en paralelo.
+    """
+    if trabajadores is None:
+        trabajadores = os.cpu_count() or 1
+    if trabajadores <= 1:
+        return False
+    codigo = lexer.codigo
+    desde = lexer.posicion_actual
+    expresion = expresion_precorte(motor, tipos_precorte) if tipos_precorte else None
+    cortes = cortes_seguros(codigo, expresion, desde, trabajadores * TRAMOS_POR_PROCESO)
+    if len(cortes) < 3:
+        return False
+
+    clase_lexer = type(lexer)
+    with ProcessPoolExecutor(max_workers=trabajadores, initializer=_iniciar_trabajador, initargs=(codigo,)) as pool:
+        futuros = [pool.submit(_tokenizar_tramo, clase_lexer, inicio_tramo, fin_tramo)
+                   for inicio_tramo, fin_tramo in zip(cortes, cortes[1:])]
+        # `sincronizado`: posición del escaneo completo hasta la que ya están todos los tokens
+        sincronizado = desde
+        for inicio_tramo, fin_tramo, futuro in zip(cortes, cortes[1:], futuros):
+            parcial, primero, siguiente = futuro.result()
+            if sincronizado not in (inicio_tramo, primero):
+                # El corte cayó dentro de un token: se repite el tramo desde donde debe empezar
+                parcial, primero, siguiente = _tokenizar_tramo(clase_lexer, sincronizado, fin_tramo, codigo)
+            tokens.copiar_tramo(parcial, 0, len(parcial))
+            sincronizado = siguiente
+
+    lexer.linea_actual, lexer.columna_actual = avanzar_posicion(codigo[desde:], lexer.linea_actual, lexer.columna_actual)
+    lexer.posicion_actual = len(codigo)
+    return True
@@ -0,0 +1,60 @@
+# src/nucleo_compilador/mapa_fuente.py
+"""
+Índice de líneas de un código fuente.
+
+`MapaFuente` recorre el código una sola vez buscando los saltos de línea (`str.find`,
+que avanza en C) y guarda el desplazamiento donde empieza cada línea. A partir de ahí la
+línea y la columna de cualquier desplazamiento se obtienen con una búsqueda binaria, de
+modo que los lexers solo necesitan recordar dónde empieza cada token: la posición se
+calcula cuando un mensaje de error o la interfaz la piden.
+
+Las líneas y columnas empiezan en 1 y la columna cuenta caracteres, igual que
+`motor_lexico.avanzar_posicion`.
+"""
+import sys
+from array import array
+from bisect import bisect_right
+
+
+class MapaFuente:
+    """
+    Desplazamientos de inicio de línea de `codigo`.
+
+    Args:
+        codigo (str): Código fuente.
+    """
+    __slots__ = ("inicios_linea",)
+
+    def __init__(self, codigo):
+        inicios = array('I', [0])
+        agregar = inicios.append
+        buscar = codigo.find
+        salto = buscar('\n')
+        while salto != -1:
+            agregar(salto + 1)
+            salto = buscar('\n', salto + 1)
+        self.inicios_linea = inicios
+
+    def posicion(self, desplazamiento):
+        """(linea, columna) del carácter en `desplazamiento`."""
+        indice = bisect_right(self.inicios_linea, desplazamiento) - 1
+        return indice + 1, desplazamiento - self.inicios_linea[indice] + 1
+
+    def linea(self, desplazamiento):
+        return bisect_right(self.inicios_linea, desplazamiento)
+
+    def columna(self, desplazamiento):
+        return self.posicion(desplazamiento)[1]
+
+    def desplazamiento(self, linea, columna):
+        """Desplazamiento de la posición (linea, columna); operación inversa de `posicion`."""
+        if not 1 <= linea <= len(self.inicios_linea):
+            raise IndexError(f"línea {linea} fuera del código ({len(self.inicios_linea)} líneas)")
+        return self.inicios_linea[linea - 1] + columna - 1
+
+    def __len__(self):
+        """Número de líneas."""
+        return len(self.inicios_linea)
+
+    def memoria_bytes(self):
+        return sys.getsizeof(self.inicios_linea)
@@ -0,0 +1,261 @@
+# src/nucleo_compilador/motor_lexico.py
+"""
+Motor léxico común basado en tablas.
+
+Cada lexer define su tabla ESPECIFICACIONES_TOKEN_* como una lista ordenada de pares
+(expresión_regular, TIPO_TOKEN). `MotorLexico` une la tabla en una sola expresión maestra
+con un grupo con nombre por especificación:
+
+    (?P<T0>patrón_0)|(?P<T1>patrón_1)|...
+
+El módulo `re` prueba las alternativas en orden y se queda con la primera que coincide,
+que es exactamente la semántica de recorrer la tabla a mano, pero con una sola llamada
+a `match` por token en lugar de una por especificación. El código se recorre por
+posición (`match(codigo, pos)`), sin copiar el resto del texto en cada token, y la
+línea/columna se actualizan contando saltos de línea en el lexema en vez de carácter
+a carácter (o no se calculan: ver `escanear(posiciones=False)` y `mapa_fuente`). La
+reclasificación de identificadores en palabras clave es una consulta a un diccionario.
+"""
+import re
+
+from .automata_lexico import TablaNoRegular, cargar_automata
+from .internado import plegar
+
+# Motores con nombre (uno por lenguaje): nombre -> MotorLexico
+MOTORES_LEXICOS = {}
+
+# Referencias numéricas (\1, \2, ...) dentro de un patrón; las barras escapadas se respetan.
+_REGEX_REFERENCIA = re.compile(r'\\(\\|[1-9][0-9]?)')
+
+
+def _renumerar_referencias(patron, desplazamiento):
+    """
+    Ajusta las referencias numéricas de `patron` a la numeración de grupos de la
+    expresión maestra, donde los grupos del patrón empiezan en `desplazamiento + 1`.
+    """
+    def reemplazar(coincidencia):
+        texto = coincidencia.group(1)
+        if texto == '\\':
+            return coincidencia.group(0)
+        numero = int(texto) + desplazamiento
+        if numero > 99:
+            raise ValueError(f"El patrón '{patron}' usa una referencia a un grupo que no cabe en la expresión maestra.")
+        return f'(?:\\{numero})'
+    return _REGEX_REFERENCIA.sub(reemplazar, patron)
+
+
+def avanzar_posicion(texto, linea, columna):
+    """(linea, columna) tras consumir `texto` desde (linea, columna)."""
+    saltos = texto.count('\n')
+    if saltos:
+        return linea + saltos, len(texto) - texto.rfind('\n')
+    return linea, columna + len(texto)
+
+
+def tabla_palabras_clave(palabras, tipo):
+    """Diccionario {palabra: tipo} para un conjunto de palabras clave que comparten tipo."""
+    return dict.fromkeys(palabras, tipo)
+
+
+class MotorLexico:
+    """
+    Expresión maestra de una tabla de especificaciones de tokens.
+
+    Args:
+        especificaciones (list): Pares (expresión_regular, TIPO_TOKEN), en orden de prioridad.
+        ignorar (iterable): Tipos que se consumen sin producir token (espacios, comentarios).
+        tipo_identificador (str): Tipo que se reclasifica con `palabras_clave`.
+        palabras_clave (dict): {palabra: tipo} para reclasificar identificadores.
+        sin_mayusculas (bool): Si la búsqueda en `palabras_clave` usa el lexema en minúsculas.
+        flags (int): Flags de `re` para toda la expresión.
+        flags_por_tipo (dict): Flags adicionales de las especificaciones de un tipo
+            (solo se admiten los que `re` permite en un grupo, p. ej. re.IGNORECASE).
+        nombre (str): Nombre del lenguaje en MOTORES_LEXICOS (y del archivo de su autómata).
+
+    La expresión maestra se compila la primera vez que se usa; si el motor pasa a usar el
+    autómata precalculado (`usar_automata`) no llega a compilarse.
+    """
+
+    def __init__(self, especificaciones, ignorar=(), tipo_identificador=None, palabras_clave=None,
+                 sin_mayusculas=False, flags=0, flags_por_tipo=None, nombre=None):
+        self.especificaciones = list(especificaciones)
+        self.ignorar = frozenset(ignorar)
+        self.tipo_identificador = tipo_identificador
+        self.palabras_clave = palabras_clave or {}
+        self.sin_mayusculas = sin_mayusculas
+        self.flags = flags
+        self.flags_por_tipo = flags_por_tipo or {}
+        self.nombre = nombre
+        self.automata = None
+        self._regex = None
+        self._tipos_por_grupo = None
+        if nombre is not None:
+            MOTORES_LEXICOS[nombre] = self
+
+    @property
+    def regex(self):
+        if self._regex is None:
+            self._compilar()
+        return self._regex
+
+    def _compilar(self):
+        alternativas = []
+        # Índice del grupo exterior de cada especificación -> (tipo, se_ignora)
+        tipos_por_grupo = {}
+        grupo = 0
+        for indice, (patron, tipo) in enumerate(self.especificaciones):
+            grupos_patron = re.compile(patron, self.flags).groups
+            patron = _renumerar_referencias(patron, grupo + 1)
+            flags_tipo = self.flags_por_tipo.get(tipo, 0)
+            if flags_tipo:
+                patron = f'(?{self._letras_flags(flags_tipo)}:{patron})'
+            alternativas.append(f'(?P<T{indice}>{patron})')
+            grupo += 1
+            tipos_por_grupo[grupo] = (tipo, tipo in self.ignorar)
+            grupo += grupos_patron
+        self._tipos_por_grupo = tipos_por_grupo
+        self._regex = re.compile('|'.join(alternativas), self.flags)
+
+    def usar_automata(self, activar=True):
+        """
+        Escanea con la tabla de estados precalculada (ver `automata_lexico`) en lugar de la
+        expresión maestra, o vuelve a la expresión con `activar=False`. Lanza TablaNoRegular
+        si la tabla de este motor no se puede convertir en autómata.
+        """
+        if not activar:
+            self.automata = None
+            return
+        if self.flags_por_tipo:
+            raise TablaNoRegular(f"El motor '{self.nombre}' usa flags por tipo de token.")
+        self.automata = cargar_automata(self)
+
+    @staticmethod
+    def _letras_flags(flags):
+        letras = ''
+        for flag, letra in ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x')):
+            if flags & flag:
+                letras += letra
+        return letras
+
+    def reclasificar(self, lexema):
+        """Tipo de un identificador: el de su palabra clave o `tipo_identificador`."""
+        clave = plegar(lexema) if self.sin_mayusculas else lexema # `plegar` memoriza el lower()
+        return self.palabras_clave.get(clave, self.tipo_identificador)
+
+    @staticmethod
+    def grupo(coincidencia, numero):
+        """
+        Grupo `numero` del patrón que produjo `coincidencia`, numerado como si el patrón
+        se hubiera compilado solo (equivale a `re.match(patron, ...).group(numero)`).
+        """
+        # El grupo exterior de la alternativa que coincide es el último en cerrarse.
+        return coincidencia.group(coincidencia.lastindex + numero)
+
+    def coincidir(self, codigo, pos, fin=None):
+        """
+        Primera especificación que coincide en `pos`.
+
+        Returns:
+            tuple: (tipo, coincidencia, se_ignora), o None si ninguna coincide.
+        """
+        regex = self.regex
+        coincidencia = regex.match(codigo, pos) if fin is None else regex.match(codigo, pos, fin)
+        if coincidencia is None or coincidencia.end() == pos:
+            return None
+        tipo, se_ignora = self._tipos_por_grupo[coincidencia.lastindex]
+        return tipo, coincidencia, se_ignora
+
+    def escanear(self, codigo, pos=0, fin=None, linea=1, columna=1, posiciones=True):
+        """
+        Recorre `codigo[pos:fin]` y genera tuplas (tipo, lexema, linea, columna, inicio, coincidencia)
+        por cada token no ignorado (`inicio` es el desplazamiento del lexema en `codigo`). Los
+        identificadores ya vienen reclasificados. Un carácter que no coincide con ninguna
+        especificación se genera con tipo None (y coincidencia None) para que el lexer construya
+        su token de error.
+
+        Con `posiciones=False` no se lleva la cuenta de líneas y columnas (se generan None):
+        quien guarde los tokens las calcula después a partir de `inicio` con un MapaFuente.
+        """
+        if fin is None:
+            fin = len(codigo)
+        if self.automata is not None:
+            return self.automata.escanear(self, codigo, pos, fin, linea, columna, posiciones)
+        if posiciones:
+            return self._escanear_con_posiciones(codigo, pos, fin, linea, columna)
+        return self._escanear_sin_posiciones(codigo, pos, fin)
+
+    def _escanear_sin_posiciones(self, codigo, pos, fin):
+        match = self.regex.match
+        tipos_por_grupo = self._tipos_por_grupo
+        tipo_identificador = self.tipo_identificador
+        while pos < fin:
+            coincidencia = match(codigo, pos, fin)
+            if coincidencia is None or coincidencia.end() == pos:
+                yield None, codigo[pos], None, None, pos, None
+                pos += 1
+                continue
+            tipo, se_ignora = tipos_por_grupo[coincidencia.lastindex]
+            if not se_ignora:
+                lexema = coincidencia.group()
+                if tipo == tipo_identificador:
+                    tipo = self.reclasificar(lexema)
+                yield tipo, lexema, None, None, pos, coincidencia
+            pos = coincidencia.end()
+
+    def _escanear_con_posiciones(self, codigo, pos, fin, linea, columna):
+        match = self.regex.match
+        tipos_por_grupo = self._tipos_por_grupo
+        tipo_identificador = self.tipo_identificador
+        while pos < fin:
+            coincidencia = match(codigo, pos, fin)
+            if coincidencia is None or coincidencia.end() == pos:
+                caracter = codigo[pos]
+                yield None, caracter, linea, columna, pos, None
+                pos += 1
+                if caracter == '\n':
+                    linea, columna = linea + 1, 1
+                else:
+                    columna += 1
+                continue
+            tipo, se_ignora = tipos_por_grupo[coincidencia.lastindex]
+            lexema = coincidencia.group()
+            if not se_ignora:
+                if tipo == tipo_identificador:
+                    tipo = self.reclasificar(lexema)
+                yield tipo, lexema, linea, columna, pos, coincidencia
+            pos = coincidencia.end()
+            saltos = lexema.count('\n')
+            if saltos:
+                linea += saltos
+                columna = len(lexema) - lexema.rfind('\n')
+            else:
+                columna += len(lexema)
+
+
+class TramoEscaneo:
+    """
+    Límite de un escaneo para tokenizar solo un tramo del código (ver `lexico_paralelo`).
+
+    `limitar` deja pasar las tuplas de `MotorLexico.escanear` cuyo inicio es anterior a
+    `hasta` y se detiene en la primera que empieza en `hasta` o después, sin generarla.
+    Después de recorrerlo, `primero` es el inicio de la primera tupla y `siguiente` el de
+    la que cortó el tramo (ambos `fin` si el escaneo se acabó antes).
+    """
+    __slots__ = ("hasta", "primero", "siguiente")
+
+    def __init__(self, hasta):
+        self.hasta = hasta
+        self.primero = self.siguiente = None
+
+    def limitar(self, escaneo, fin):
+        self.primero = self.siguiente = fin
+        hasta = self.hasta
+        primera = True
+        for fila in escaneo:
+            inicio = fila[4]
+            if primera:
+                self.primero, primera = inicio, False
+            if inicio >= hasta:
+                self.siguiente = inicio
+                return
+            yield fila
@@ -0,0 +1,93 @@
+# src/nucleo_compilador/nodos_ast.py
+"""
+Recorrido de los nodos del AST, que declaran sus atributos con `__slots__`.
+
+Las clases `Nodo*` de los parsers no tienen `__dict__`: cada una lista en `__slots__` los
+atributos que asigna (sin repetir los de sus bases) en el orden en que los asigna, y sus
+bases declaran `__slots__ = ()`. Un nodo ocupa así unos pocos punteros en lugar de un
+diccionario por instancia. `atributos_nodo` sustituye a `vars(nodo)` en las
+representaciones y los recorridos genéricos y da los atributos en el mismo orden.
+
+De los tokens, los nodos guardan solo lo que usan las fases siguientes: el nombre o el
+operador (internados, ver `internado`) y las vistas de token (ver `almacen_tokens`) de las
+que sacan la posición. `tramo_tokens` recupera cuando se pide todos los tokens del código
+que abarca un nodo, también los que el AST no guarda (paréntesis, comas, ...), e
+`inicio_nodo` su desplazamiento en el código fuente.
+"""
+from .almacen_tokens import VistaToken
+
+_CAMPOS_POR_CLASE = {}
+
+
+def campos_nodo(clase):
+    """Nombres de los atributos de los nodos de `clase`: los de sus bases primero."""
+    campos = _CAMPOS_POR_CLASE.get(clase)
+    if campos is None:
+        campos = []
+        for base in reversed(clase.__mro__):
+            slots = base.__dict__.get("__slots__", ())
+            for nombre in (slots,) if isinstance(slots, str) else slots:
+                if nombre not in ("__dict__", "__weakref__") and nombre not in campos:
+                    campos.append(nombre)
+        campos = _CAMPOS_POR_CLASE[clase] = tuple(campos)
+    return campos
+
+
+def atributos_nodo(nodo):
+    """
+    Pares (nombre, valor) de los atributos asignados de `nodo`, como `vars(nodo).items()`
+    (los que no se asignaron no aparecen). Si el nodo tiene además `__dict__` (una subclase
+    sin `__slots__`), sus atributos van al final.
+    """
+    pares = []
+    for nombre in campos_nodo(type(nodo)):
+        try:
+            pares.append((nombre, getattr(nodo, nombre)))
+        except AttributeError:
+            pass
+    extra = getattr(nodo, "__dict__", None)
+    if extra:
+        pares.extend(extra.items())
+    return pares
+
+
+def _es_token(valor):
+    return isinstance(valor, VistaToken) or (hasattr(valor, "lexema") and hasattr(valor, "tipo") and
+                                             not campos_nodo(type(valor)))
+
+
+def tokens_nodo(nodo):
+    """Todos los tokens que guardan `nodo` y sus descendientes, en el orden del recorrido."""
+    pendientes = [nodo]
+    while pendientes:
+        actual = pendientes.pop()
+        if _es_token(actual):
+            yield actual
+        elif isinstance(actual, (list, tuple)):
+            pendientes.extend(reversed(actual))
+        elif campos_nodo(type(actual)) or hasattr(actual, "__dict__") and not isinstance(actual, type):
+            pendientes.extend(reversed([valor for _, valor in atributos_nodo(actual)]))
+
+
+def tramo_tokens(nodo):
+    """
+    Tokens del código desde el primero hasta el último que guarda `nodo` (con sus
+    descendientes), incluidos los intermedios que el AST no conserva. Solo cuentan las
+    vistas de un AlmacenTokens; lista vacía si el nodo no guarda ninguna.
+    """
+    almacen, desde, hasta = None, None, None
+    for token in tokens_nodo(nodo):
+        if not isinstance(token, VistaToken) or token.inicio is None:
+            continue
+        if almacen is None:
+            almacen, desde, hasta = token._almacen, token._indice, token._indice
+        elif token._almacen is almacen:
+            desde, hasta = min(desde, token._indice), max(hasta, token._indice)
+    return [] if almacen is None else almacen[desde:hasta + 1]
+
+
+def inicio_nodo(nodo):
+    """Desplazamiento en el código fuente del primer token de `nodo` (None si no tiene)."""
+    inicios = [token.inicio for token in tokens_nodo(nodo)
+               if isinstance(token, VistaToken) and token.inicio is not None]
+    return min(inicios) if inicios else None
@@ -0,0 +1,154 @@
+# src/nucleo_compilador/pratt.py
+"""
+Análisis de expresiones por precedencia de operadores (Pratt / precedence climbing),
+compartido por los parsers de C++, JavaScript, Python, Pascal, T-SQL y PL/SQL.
+
+Cada lenguaje describe sus operadores en una TablaPratt: a cada operador (tipo de token y
+lexema) le corresponde un nivel de precedencia (mayor = se agrupa antes) y la función que
+construye el nodo del AST. `analizar_expresion` recorre la expresión con un único bucle
+por nivel de anidamiento en lugar de una cadena de un método por nivel: un operando ya no
+pasa por una docena de llamadas antes de llegar a la expresión primaria y la recursión de
+Python crece con los operadores de la expresión, no con los niveles de la gramática.
+
+La tabla reproduce la gramática de los métodos por niveles a los que sustituye:
+  - un operador infijo se acepta si su nivel es al menos `nivel_minimo`; su operando
+    derecho se analiza con nivel + 1 (asociativo por la izquierda) o con su mismo nivel
+    (por la derecha). Tras un operador NO_ASOCIATIVO solo se aceptan operadores de nivel
+    menor, como en las reglas `a [op b]` (`a < b < c` no se agrupa);
+  - un operador prefijo solo se reconoce donde la gramática lo admitía (su nivel es al
+    menos `nivel_minimo`) y su operando se analiza con `nivel_operando`; detrás solo se
+    aceptan operadores de nivel menor que el suyo (`not a = b = c` deja `= c`). Fuera de
+    eso el token llega a la función de operando del parser, que informa del error como antes.
+"""
+
+IZQUIERDA = 'izquierda'
+DERECHA = 'derecha'
+NO_ASOCIATIVO = 'no_asociativo'
+
+
+class OperadorInfijo:
+    """
+    `construir(token, izquierda, derecha)` crea el nodo. Si hay `analizar(parser, token,
+    izquierda)`, es el que consume el operador y lo que le sigue y devuelve el nodo.
+    """
+    __slots__ = ("nivel", "asociatividad", "construir", "analizar")
+
+    def __init__(self, nivel, construir, asociatividad=IZQUIERDA, analizar=None):
+        self.nivel = nivel
+        self.construir = construir
+        self.asociatividad = asociatividad
+        self.analizar = analizar
+
+
+class OperadorPrefijo:
+    """`construir(token, operando)` crea el nodo (o devuelve el operando si el AST no lo recoge)."""
+    __slots__ = ("nivel", "nivel_operando", "construir")
+
+    def __init__(self, nivel, construir, nivel_operando=None):
+        self.nivel = nivel
+        self.construir = construir
+        self.nivel_operando = nivel if nivel_operando is None else nivel_operando
+
+
+class TablaPratt:
+    """
+    Operadores de un lenguaje, por tipo de token y lexema. `lexemas=None` al registrar un
+    operador lo aplica a cualquier token de ese tipo (p. ej. todos los de comparación).
+
+    Args:
+        insensible_mayusculas (bool): Compara los lexemas en minúsculas (SQL, Pascal).
+    """
+
+    def __init__(self, insensible_mayusculas=False):
+        self.insensible_mayusculas = insensible_mayusculas
+        # tipo de token -> {lexema (o None para cualquiera): operador}
+        self.infijos = {}
+        self.prefijos = {}
+
+    def infijo(self, nivel, tipo, lexemas, construir, asociatividad=IZQUIERDA, analizar=None):
+        operador = OperadorInfijo(nivel, construir, asociatividad, analizar)
+        self._registrar(self.infijos, tipo, lexemas, operador)
+        return operador
+
+    def prefijo(self, nivel, tipo, lexemas, construir, nivel_operando=None):
+        operador = OperadorPrefijo(nivel, construir, nivel_operando)
+        self._registrar(self.prefijos, tipo, lexemas, operador)
+        return operador
+
+    def _registrar(self, operadores, tipo, lexemas, operador):
+        por_lexema = operadores.setdefault(tipo, {})
+        if lexemas is None:
+            por_lexema[None] = operador
+            return
+        for lexema in lexemas:
+            por_lexema[lexema.lower() if self.insensible_mayusculas else lexema] = operador
+
+    def buscar(self, operadores, token):
+        por_lexema = operadores.get(token.tipo)
+        if por_lexema is None:
+            return None
+        return self._por_lexema(por_lexema, token)
+
+    def _por_lexema(self, por_lexema, token):
+        if len(por_lexema) == 1 and None in por_lexema:
+            return por_lexema[None] # Cualquier lexema del tipo: no hace falta leerlo.
+        lexema = token.lexema
+        if self.insensible_mayusculas and lexema:
+            lexema = lexema.lower()
+        operador = por_lexema.get(lexema)
+        return por_lexema.get(None) if operador is None else operador
+
+
+def analizar_expresion(parser, tabla, operando, nivel_minimo=0):
+    """
+    Analiza una expresión desde `parser.token_actual` con los operadores de `tabla`.
+
+    Args:
+        parser: Parser con `token_actual` y `_avanzar()`.
+        tabla (TablaPratt): Operadores del lenguaje.
+        operando (callable): Analiza un operando sin operadores prefijos ni infijos de la
+                             tabla (la expresión primaria con sus sufijos: llamadas,
+                             índices, miembros...).
+        nivel_minimo (int): Nivel más bajo de los operadores que se aceptan (0 = todos).
+
+    Returns:
+        El nodo de la expresión.
+    """
+    token = parser.token_actual
+    nivel_maximo = None
+    por_lexema = tabla.prefijos.get(token.tipo) if token is not None else None
+    prefijo = tabla._por_lexema(por_lexema, token) if por_lexema is not None else None
+    if prefijo is not None and prefijo.nivel >= nivel_minimo:
+        parser._avanzar()
+        izquierda = prefijo.construir(token, analizar_expresion(parser, tabla, operando, prefijo.nivel_operando))
+        nivel_maximo = prefijo.nivel - 1
+    else:
+        izquierda = operando()
+
+    # El tipo del token basta para descartar lo que no es un operador (';', ')', ',' ...)
+    # sin leer el lexema.
+    infijos, por_lexema_de = tabla.infijos, tabla._por_lexema
+    while True:
+        token = parser.token_actual
+        if token is None:
+            return izquierda
+        por_lexema = infijos.get(token.tipo)
+        if por_lexema is None:
+            return izquierda
+        operador = por_lexema_de(por_lexema, token)
+        if operador is None or operador.nivel < nivel_minimo or \
+           (nivel_maximo is not None and operador.nivel > nivel_maximo):
+            return izquierda
+        if operador.analizar is not None:
+            izquierda = operador.analizar(parser, token, izquierda)
+        else:
+            parser._avanzar()
+            nivel_derecho = operador.nivel if operador.asociatividad == DERECHA else operador.nivel + 1
+            derecha = analizar_expresion(parser, tabla, operando, nivel_derecho)
+            izquierda = operador.construir(token, izquierda, derecha)
+        # Un operador de más nivel que este ya lo habría tomado el operando derecho; si no lo
+        # tomó (lo rechazó un no asociativo, como el segundo '<' de 'a and b < c < d'), aquí
+        # tampoco vale.
+        tope = operador.nivel - 1 if operador.asociatividad == NO_ASOCIATIVO else operador.nivel
+        if nivel_maximo is None or tope < nivel_maximo:
+            nivel_maximo = tope
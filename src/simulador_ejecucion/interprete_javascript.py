@@ -9,7 +9,8 @@ try:
         NodoSentenciaExpresion, NodoSentenciaIf, NodoSentenciaReturn, NodoBucleFor,
         NodoIdentificadorJS, NodoLiteralJS, NodoAsignacionExpresion,
         NodoExpresionBinariaJS, NodoLlamadaExpresion, NodoMiembroExpresion,
-        NodoExpresionActualizacion, NodoArrayLiteralJS, NodoObjetoLiteralJS, NodoPropiedadObjetoJS
+        NodoExpresionActualizacion, NodoArrayLiteralJS, NodoObjetoLiteralJS, NodoPropiedadObjetoJS,
+        NodoPlantillaJS, NodoInterpolacionJS
         # Asegúrate de que NodoExpresionUnariaJS esté aquí si la tienes definida
     )
     # Podríamos necesitar tipos de token si el intérprete necesita verificar algo del token original.
@@ -38,6 +39,8 @@ except ImportError as e_import_ast_interprete_js:
     class NodoArrayLiteralJS: pass
     class NodoObjetoLiteralJS: pass
     class NodoPropiedadObjetoJS: pass
+    class NodoPlantillaJS: pass
+    class NodoInterpolacionJS: pass
     class Token: pass
     TT_PALABRA_CLAVE = "PALABRA_CLAVE_JS"
     TT_LITERAL_CADENA = "LITERAL_CADENA_JS"
@@ -211,6 +214,8 @@ class InterpreteJavaScript:
         # print(f"[InterpreteJS DEBUG] Evaluando Expresión: {type(nodo_expr).__name__}")
         if isinstance(nodo_expr, NodoLiteralJS):
             return self._evaluar_NodoLiteralJS(nodo_expr)
+        elif isinstance(nodo_expr, NodoPlantillaJS):
+            return self._evaluar_NodoPlantillaJS(nodo_expr)
         elif isinstance(nodo_expr, NodoIdentificadorJS):
             return self._evaluar_NodoIdentificadorJS(nodo_expr)
         elif isinstance(nodo_expr, NodoLlamadaExpresion):
@@ -233,19 +238,18 @@ class InterpreteJavaScript:
 
 
     def _evaluar_NodoLiteralJS(self, nodo_literal):
-        # Si es una template literal (backticks) y contiene ${...}, procesar interpolación
-        valor = nodo_literal.valor
-        if isinstance(valor, str) and valor.find('${') != -1 and valor.count('`') == 0:
-            # Simulación básica: solo soporta variables simples ${var} en el contexto actual
-            import re
-            def reemplazo(match):
-                expr = match.group(1).strip()
-                try:
-                    return str(self.alcance_actual.obtener_valor_variable(expr))
-                except Exception:
-                    return '${' + expr + '}'
-            valor = re.sub(r'\$\{([^}]+)\}', reemplazo, valor)
-        return valor
+        return nodo_literal.valor
+
+    def _evaluar_NodoPlantillaJS(self, nodo_plantilla):
+        # Los textos y las expresiones ya vienen separados y analizados desde el parser
+        return "".join(parte if isinstance(parte, str) else self._evaluar_NodoInterpolacionJS(parte)
+                       for parte in nodo_plantilla.partes)
+
+    def _evaluar_NodoInterpolacionJS(self, nodo_interpolacion):
+        try:
+            return str(self._evaluar_expresion(nodo_interpolacion.expresion_nodo))
+        except Exception:
+            return nodo_interpolacion.texto # Si falla, dejar la expresión literal
 
     def _evaluar_NodoIdentificadorJS(self, nodo_id):
         # Busca el valor de la variable en el sistema de alcances.
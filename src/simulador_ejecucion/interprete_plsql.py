@@ -48,6 +48,8 @@ except ImportError as e_import_ast_interprete_plsql:
     TT_OPERADOR_COMPARACION_PLSQL = "OP_COMP_PLSQL"; TT_OPERADOR_LOGICO_PLSQL = "OP_LOG_PLSQL"
     TT_LITERAL_CADENA_PLSQL, TT_LITERAL_NUMERICO_PLSQL, TT_LITERAL_BOOLEANO_PLSQL, TT_LITERAL_NULL_PLSQL = "LIT_STR", "LIT_NUM", "LIT_BOOL", "LIT_NULL"
 
+from src.nucleo_compilador.internado import plegar
+
 
 # Excepción personalizada para errores en tiempo de ejecución del intérprete de PL/SQL
 class ErrorTiempoEjecucionPLSQL(RuntimeError):
@@ -68,7 +70,7 @@ class AlcancePLSQL:
         # print(f"[AlcancePLSQL DEBUG] Alcance '{self.nombre_alcance}' creado. Padre: {id(padre) if padre else 'None'}")
 
     def declarar(self, nombre_simbolo, valor, tipo_simbolo="variable"):
-        nombre_lower = nombre_simbolo.lower() # PL/SQL es insensible a mayúsculas para identificadores
+        nombre_lower = plegar(nombre_simbolo) # PL/SQL es insensible a mayúsculas para identificadores
         # Permitir redeclaración silenciosa para variables de iteración de FOR
         if nombre_lower in self.simbolos:
             if not self.nombre_alcance.startswith("for_loop_") or nombre_lower != self.nombre_alcance.replace("for_loop_", ""):
@@ -76,7 +78,7 @@ class AlcancePLSQL:
         self.simbolos[nombre_lower] = {'valor': valor, 'tipo_simbolo': tipo_simbolo}
 
     def asignar(self, nombre_simbolo, valor):
-        nombre_lower = nombre_simbolo.lower()
+        nombre_lower = plegar(nombre_simbolo)
         # print(f"[AlcancePLSQL DEBUG ({self.nombre_alcance})] Asignando a '{nombre_lower}' = {repr(valor)}")
         alcance_busqueda = self
         while alcance_busqueda:
@@ -87,7 +89,7 @@ class AlcancePLSQL:
         raise ErrorTiempoEjecucionPLSQL(f"Variable no declarada '{nombre_simbolo}'.")
 
     def obtener(self, nombre_simbolo):
-        nombre_lower = nombre_simbolo.lower()
+        nombre_lower = plegar(nombre_simbolo)
         # print(f"[AlcancePLSQL DEBUG ({self.nombre_alcance})] Obteniendo '{nombre_lower}'")
         alcance_busqueda = self
         while alcance_busqueda:
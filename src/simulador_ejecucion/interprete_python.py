@@ -1,5 +1,4 @@
 # src/simulador_ejecucion/interprete_python.py
-import re 
 import src.analizador_sintactico
 try:
     from src.detector_lenguaje.detector import detectar_lenguaje
@@ -18,7 +17,8 @@ try:
         NodoBloque, NodoSentenciaExpresion, NodoAsignacion, NodoLlamadaFuncion,
         NodoIdentificador, NodoLiteral, NodoExpresionBinaria, NodoSentenciaIf,
         NodoSentenciaReturn, NodoSentenciaWhile, NodoSentenciaFor, 
-        NodoExpresionUnaria, NodoSentenciaBreak, NodoSentenciaContinue 
+        NodoExpresionUnaria, NodoSentenciaBreak, NodoSentenciaContinue,
+        NodoCadenaFormateada, NodoInterpolacion
     )
     from src.analizador_lexico.lexer_python import Token, TT_CADENA, TT_OPERADOR, TT_PALABRA_CLAVE 
 except ImportError as e_ip_py:
@@ -41,6 +41,8 @@ except ImportError as e_ip_py:
     class NodoExpresionUnaria: pass; 
     class NodoSentenciaBreak: pass; 
     class NodoSentenciaContinue: pass 
+    class NodoCadenaFormateada: pass
+    class NodoInterpolacion: pass
     class Token: pass; TT_CADENA = "CADENA"; TT_OPERADOR = "OPERADOR"; TT_PALABRA_CLAVE = "PALABRA_CLAVE"
 
 class ErrorTiempoEjecucionPython(RuntimeError):
@@ -244,30 +246,26 @@ class InterpretePython:
         return None
    
 
+    def _unir_partes_formateadas(self, partes):
+        # Partes de una f-string (o de su formato) ya divididas por el parser
+        return "".join(parte if isinstance(parte, str) else self._evaluar_interpolacion(parte) for parte in partes)
+
+    def _evaluar_interpolacion(self, nodo_interpolacion):
+        try:
+            valor = self._evaluar_expresion(nodo_interpolacion.expresion_nodo)
+            if nodo_interpolacion.conversion == 'r': valor = repr(valor)
+            elif nodo_interpolacion.conversion == 's': valor = str(valor)
+            elif nodo_interpolacion.conversion == 'a': valor = ascii(valor)
+            return format(valor, self._unir_partes_formateadas(nodo_interpolacion.formato))
+        except Exception:
+            return nodo_interpolacion.texto  # Si falla, dejar la expresión literal
+
     def _evaluar_expresion(self, nodo_expr):
         # (Como estaba antes)
+        if isinstance(nodo_expr, NodoCadenaFormateada):
+            return self._unir_partes_formateadas(nodo_expr.partes)
         if isinstance(nodo_expr, NodoLiteral):
-            if nodo_expr.literal_token.tipo == TT_CADENA and \
-               nodo_expr.literal_token.lexema.lower().startswith(('f"', "f'", 'rf"', "rf'", 'fr"', "fr'")):
-                formato_str = str(nodo_expr.valor)
-                def reemplazar_expresion(match):
-                    expresion = match.group(1).strip()
-                    try:
-                        # Construir un diccionario con todas las variables del alcance actual
-                        contexto = {}
-                        actual = self.alcance_actual
-                        while actual:
-                            contexto.update(actual.simbolos)
-                            actual = actual.padre
-                        # Evaluar la expresión en el contexto del alcance actual
-                        valor = eval(expresion, {"__builtins__": {}}, contexto)
-                        return str(valor)
-                    except Exception:
-                        return match.group(0)  # Si falla, dejar la expresión literal
-                resultado_interpolado = re.sub(r'\{([^{}]+)\}', reemplazar_expresion, formato_str)
-                return resultado_interpolado
-            else:
-                return nodo_expr.valor 
+            return nodo_expr.valor 
         elif isinstance(nodo_expr, NodoIdentificador):
             return self.alcance_actual.obtener(nodo_expr.nombre)
         elif isinstance(nodo_expr, NodoLlamadaFuncion):
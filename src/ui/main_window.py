@@ -1,6 +1,6 @@
 import sys
 from PyQt5.QtWidgets import QApplication, QWidget, QHBoxLayout, QVBoxLayout, QTextEdit, QLabel, QSizePolicy, QPushButton, QFrame, QSpacerItem
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont, QTextCharFormat, QTextCursor, QColor, QPalette
 
 # Importa tus analizadores y detectores
@@ -16,12 +16,47 @@ from analizador_sintactico.parser_plsql import ParserPLSQL
 from analizador_sintactico.parser_javascript import ParserJavaScript
 from analizador_sintactico.parser_cpp import ParserCPP
 from analizador_sintactico.parser_tsql import ParserTSQL
-from detector_lenguaje.detector import detectar_lenguaje
+from analizador_lexico.lexer_html import LexerHTML
+from analizador_sintactico.parser_html import ParserHTML
+from src.nucleo_compilador.cache_ast import AnalisisGuardado, CacheAST
+from detector_lenguaje.cache_deteccion import CacheDeteccion
+from detector_lenguaje.estado_incremental import EstadoDeteccionIncremental
+from detector_lenguaje.segmentador import SegmentadorDocumento
+
+# Tiempo sin editar tras el que el último análisis sin errores se guarda en la caché de AST.
+# Guardar en cada pulsación dejaría un archivo por cada estado intermedio del texto.
+ESPERA_GUARDADO_CACHE_AST_MS = 2000
+
+# Lexer y parser de cada lenguaje, para la clave de la caché de AST
+CLASES_ANALISIS = {
+    "Python": (LexerPython, ParserPython),
+    "HTML": (LexerHTML, ParserHTML),
+    "Pascal": (LexerPascal, ParserPascal),
+    "PL/SQL": (LexerPLSQL, ParserPLSQL),
+    "JavaScript": (LexerJavaScript, ParserJavaScript),
+    "C++": (LexerCPP, ParserCPP),
+    "T-SQL": (LexerTSQL, ParserTSQL),
+}
 
 class MainWindow(QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("CompilaSim Pro")
+        # analizar_codigo se ejecuta en cada cambio del editor; la caché evita repetir la detección
+        self.cache_deteccion = CacheDeteccion()
+        # Estado por línea del editor (una línea por bloque del documento, que siempre tiene al menos uno)
+        self.estado_deteccion = EstadoDeteccionIncremental([""], cache=self.cache_deteccion)
+        # Regiones incrustadas (scripts en HTML): sus análisis se reutilizan mientras no cambie su texto
+        self.segmentador = SegmentadorDocumento()
+        # Lexer de Python del último análisis, para retokenizar de forma incremental
+        self.lexer_python = LexerPython("")
+        # Tokens y AST de los textos ya analizados sin errores (en disco, compartida con main.py)
+        self.cache_ast = CacheAST()
+        self.analisis_pendiente = None # (código, clases, AnalisisGuardado) a guardar cuando el editor quede quieto
+        self.temporizador_cache_ast = QTimer(self)
+        self.temporizador_cache_ast.setSingleShot(True)
+        self.temporizador_cache_ast.setInterval(ESPERA_GUARDADO_CACHE_AST_MS)
+        self.temporizador_cache_ast.timeout.connect(self.guardar_cache_ast)
         self.setMinimumSize(950, 540)
         # Tema oscuro, sin transparencia para fondo opaco
         # self.setWindowOpacity(0.9)  # Eliminado para opacidad total
@@ -186,6 +221,8 @@ class MainWindow(QWidget):
         layout.addLayout(right_panel, 3)
         main_layout.addLayout(layout)
         self.setLayout(main_layout)
+        # contentsChange llega antes que textChanged: el estado por línea ya está al día al analizar
+        self.editor.document().contentsChange.connect(self.registrar_cambio_editor)
         self.editor.textChanged.connect(self.analizar_codigo)
 
         # Variables para almacenar tokens y AST
@@ -193,6 +230,20 @@ class MainWindow(QWidget):
         self.ast = None
         self.sim_output = ""  # Nueva variable para salida de simulación
 
+    def registrar_cambio_editor(self, posicion, caracteres_eliminados, caracteres_anadidos):
+        """Traslada una edición del documento al estado de detección, reemplazando solo los bloques afectados."""
+        documento = self.editor.document()
+        inicio = documento.findBlock(posicion).blockNumber()
+        ultimo = documento.findBlock(min(posicion + caracteres_anadidos, documento.characterCount() - 1)).blockNumber()
+        if inicio < 0 or ultimo < inicio:
+            return # analizar_codigo detectará el desajuste y resincronizará
+        fin_nuevo = ultimo + 1
+        fin_anterior = fin_nuevo - (documento.blockCount() - self.estado_deteccion.numero_lineas)
+        if not inicio <= fin_anterior <= self.estado_deteccion.numero_lineas:
+            return
+        nuevas_lineas = [documento.findBlockByNumber(i).text() for i in range(inicio, fin_nuevo)]
+        self.estado_deteccion.reemplazar_lineas(inicio, fin_anterior, nuevas_lineas)
+
     def limpiar(self):
         self.editor.clear()
         self.result_area.clear()
@@ -325,7 +376,14 @@ class MainWindow(QWidget):
         dlg.setLayout(layout)
         dlg.exec_()
 
+    def guardar_cache_ast(self):
+        """Guarda en la caché de AST el último análisis sin errores, si no se guardó ya."""
+        if self.analisis_pendiente is not None:
+            self.cache_ast.guardar(*self.analisis_pendiente)
+            self.analisis_pendiente = None
+
     def analizar_codigo(self):
+        self.analisis_pendiente = None
         codigo = self.editor.toPlainText()
         # Normaliza saltos de línea a LF para evitar errores por CR o CRLF
         codigo = codigo.replace('\r\n', '\n').replace('\r', '\n')
@@ -334,7 +392,9 @@ class MainWindow(QWidget):
             self.lang_label.setText("")
             return
         # 1. Detectar lenguaje
-        resultado_lenguaje = detectar_lenguaje(codigo)
+        if self.estado_deteccion.numero_lineas != self.editor.document().blockCount():
+            self.estado_deteccion.actualizar_texto(codigo.split('\n'))
+        resultado_lenguaje = self.estado_deteccion.detectar()
         lenguaje = resultado_lenguaje[0]
         confianza = resultado_lenguaje[1]
         # Etiqueta de lenguaje detectado con color
@@ -343,11 +403,16 @@ class MainWindow(QWidget):
         self.lang_label.setText(f"Lenguaje detectado: {lenguaje} ({confianza:.2f}%)")
         self.lang_label.setStyleSheet(f"QLabel {{ background: #393e4b; border-radius: 8px; padding: 4px 8px; color: {color}; border: 1px solid #555; }}")
         resultado = f"Lenguaje detectado: {lenguaje} (confianza: {confianza:.2f}%)\n"
-        # 2. Análisis léxico
+        # 2. Análisis léxico (se omite, junto con el sintáctico, si el texto está en la caché de AST)
+        clases_analisis = CLASES_ANALISIS.get(lenguaje)
+        analisis_guardado = self.cache_ast.obtener(codigo, clases_analisis) if clases_analisis else None
         try:
-            if lenguaje == "Python":
-                lexer = LexerPython(codigo)
-                tokens = lexer.tokenizar()
+            if analisis_guardado:
+                tokens = analisis_guardado.tokens
+                errores_lex = []
+            elif lenguaje == "Python":
+                # El lexer se conserva entre análisis: solo se vuelven a escanear las líneas editadas
+                tokens = self.lexer_python.retokenizar(codigo)
                 errores_lex = [t for t in tokens if t.tipo == 'ERROR_LEXICO']
             elif lenguaje == "HTML":
                 from analizador_lexico.lexer_html import LexerHTML
@@ -395,7 +460,9 @@ class MainWindow(QWidget):
             resultado += "Sin errores léxicos.\n"
         # 3. Análisis sintáctico
         try:
-            if lenguaje == "Python":
+            if analisis_guardado:
+                parser = analisis_guardado
+            elif lenguaje == "Python":
                 parser = ParserPython(tokens)
             elif lenguaje == "HTML":
                 from analizador_sintactico.parser_html import ParserHTML
@@ -412,9 +479,16 @@ class MainWindow(QWidget):
                 parser = ParserTSQL(tokens)
             else:
                 parser = None
-            if parser:
+            if analisis_guardado:
+                ast = analisis_guardado.ast
+                errores_sint = []
+            elif parser:
                 ast = parser.parse()
                 errores_sint = getattr(parser, 'errores_sintacticos', [])
+                if ast is not None and not errores_sint and not errores_lex:
+                    tabla = getattr(parser, 'tabla_simbolos', None)
+                    self.analisis_pendiente = (codigo, clases_analisis, AnalisisGuardado(tokens, ast, tabla))
+                    self.temporizador_cache_ast.start()
             else:
                 ast = None
                 errores_sint = ["No se pudo instanciar el parser para este lenguaje."]
@@ -588,6 +662,17 @@ class MainWindow(QWidget):
                 resultado_html += "<ol style='color:#ff5252'>" + "".join(f"<li>{str(e)}</li>" for e in errores_sem) + "</ol>"
             else:
                 resultado_html += "<span style='color:#00e676'>Sin errores semánticos.</span><br>"
+            regiones_script = [(r, p) for r, p in self.segmentador.regiones_con_pipeline(codigo) if r.lenguaje == "JavaScript"]
+            if regiones_script:
+                resultado_html += "<hr style='border:1px solid #81c784;'><b style='color:#81c784'>Scripts incrustados (JavaScript):</b><br><ol>"
+                for region, pipeline in regiones_script:
+                    errores_region = [str(t) for t in pipeline.tokens() if t.tipo == 'ERROR_JS']
+                    if not errores_region:
+                        errores_region = [str(e) for e in pipeline.errores_sintacticos()]
+                    estado_region = "<span style='color:#00e676'>sin errores</span>" if not errores_region else \
+                        "<span style='color:#ff5252'>" + "; ".join(errores_region) + "</span>"
+                    resultado_html += f"<li>L{region.linea}:C{region.columna} ({len(pipeline.tokens())} tokens): {estado_region}</li>"
+                resultado_html += "</ol>"
             if not errores_lex and not errores_sint and ast:
                 resultado_html += "<hr style='border:1px solid #00bfae;'><b style='color:#00bfae'>Visualización HTML:</b><br>"
                 if salida_ejecucion:
@@ -788,6 +873,7 @@ class MainWindow(QWidget):
                 with open(archivo, 'r', encoding='utf-8') as f:
                     contenido = f.read()
                 self.editor.setPlainText(contenido)
+                self.guardar_cache_ast() # Un archivo recién abierto se guarda sin esperar
             except Exception as e:
                 QMessageBox.critical(self, "Error al cargar archivo", f"No se pudo leer el archivo:\n{os.path.basename(archivo)}\n\nError: {e}")
 
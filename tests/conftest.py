@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Los parsers, los analizadores semánticos y los intérpretes importan `analizador_lexico.*`,
+# `analizador_sintactico.*`, ... con src/ en sys.path, igual que al ejecutar main.py. Se
+# añade aquí, antes de importar ningún test, para que todos vean los mismos módulos sea
+# cual sea el orden. El núcleo se importa siempre como `src.nucleo_compilador`.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
@@ -0,0 +1,18 @@
+import unittest
+from src.analizador_lexico.lexer_python import LexerPython, Token
+
+class TestAlmacenTokens(unittest.TestCase):
+    def test_vistas_con_la_interfaz_de_token(self):
+        tokens = LexerPython("if x:\n    y = 1.5\n").tokenizar()
+        vista = tokens[5]
+        self.assertIsInstance(vista, Token)
+        self.assertEqual((vista.tipo, vista.lexema, vista.linea, vista.columna), ('IDENTIFICADOR', 'y', 2, 5))
+        self.assertEqual(tokens[7].valor, 1.5)
+        self.assertEqual(tokens[-1].lexema, 'EOF')
+        self.assertEqual(tokens[5], tokens[5])
+        materializados = tokens.materializar()
+        self.assertEqual([repr(t) for t in tokens], [repr(t) for t in materializados])
+        self.assertEqual([t.valor for t in tokens], [t.valor for t in materializados])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+from src.analizador_lexico.lexer_pascal import LexerPascal, MOTOR_LEXICO_PASCAL
+from src.nucleo_compilador.automata_lexico import AutomataLexico, TablaNoRegular, compilar_automata, huella_especificaciones
+from src.nucleo_compilador.motor_lexico import MotorLexico
+
+class TestAutomataLexico(unittest.TestCase):
+    def test_mismos_tokens_que_la_expresion(self):
+        codigo = "program P;\nvar x: integer;\nbegin\n  x := 3.5e2 + 'a''b'; { c } x := x div 2 ñ\nend."
+        motor = MOTOR_LEXICO_PASCAL
+        esperados = [(t.tipo, t.lexema, t.linea, t.columna) for t in LexerPascal(codigo).tokenizar()]
+        motor.automata = compilar_automata(motor.especificaciones, motor.ignorar, motor.flags)
+        try:
+            obtenidos = [(t.tipo, t.lexema, t.linea, t.columna) for t in LexerPascal(codigo).tokenizar()]
+        finally:
+            motor.usar_automata(False)
+        self.assertEqual(obtenidos, esperados)
+
+    def test_primera_alternativa_gana(self):
+        # Como en `re`, la alternativa que aparece antes gana aunque otra sea más larga
+        automata = compilar_automata([(r"ab", "CORTO"), (r"abc", "LARGO"), (r"[a-z]+", "ID")], [])
+        self.assertEqual(automata.coincidir("abcd", 0), (0, 2)) # Especificación 0: "ab"
+        self.assertEqual(automata.coincidir("xyz!", 0), (2, 3))
+
+    def test_guardar_y_cargar(self):
+        especificaciones = [(r"\d+", "NUM"), (r"\w+", "ID"), (r"\s+", "ESPACIO")]
+        automata = compilar_automata(especificaciones, ["ESPACIO"])
+        huella = huella_especificaciones(especificaciones, ["ESPACIO"], 0)
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "prueba.afd")
+            automata.guardar(ruta)
+            cargado = AutomataLexico.desde_archivo(ruta, huella)
+            with self.assertRaises(ValueError):
+                AutomataLexico.desde_archivo(ruta, "otra huella")
+        motor = MotorLexico(especificaciones, ["ESPACIO"])
+        motor.automata = cargado
+        self.assertEqual([t[:4] for t in motor.escanear("ab 12 ٣4")], [("ID", "ab", 1, 1), ("NUM", "12", 1, 4), ("NUM", "٣4", 1, 7)])
+
+    def test_patron_no_regular(self):
+        with self.assertRaises(TablaNoRegular):
+            compilar_automata([(r"a(?=b)", "A")], [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.nucleo_compilador.cache_ast import AnalisisGuardado, CacheAST
+from analizador_lexico.lexer_pascal import LexerPascal
+from analizador_lexico.lexer_python import LexerPython
+from analizador_sintactico.parser_pascal import ParserPascal
+from analizador_sintactico.parser_python import ParserPython
+
+PYTHON = "def f(a, b):\n    return a * (b + 1)\n\nx = f(2, 3)\nprint(f\"{x} es el resultado\")\n"
+PASCAL = "program P;\nvar a, b: integer;\nbegin\n  a := 1;\n  b := a + 2\nend.\n"
+
+def analizar(clase_lexer, clase_parser, codigo):
+    with contextlib.redirect_stdout(io.StringIO()):
+        tokens = clase_lexer(codigo).tokenizar()
+        parser = clase_parser(tokens)
+        ast = parser.parse()
+    return AnalisisGuardado(tokens, ast, getattr(parser, "tabla_simbolos", None))
+
+class TestCacheAST(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.cache = CacheAST(self.directorio)
+        self.addCleanup(shutil.rmtree, self.directorio)
+
+    def test_ida_y_vuelta(self):
+        clases = (LexerPython, ParserPython)
+        analisis = analizar(LexerPython, ParserPython, PYTHON)
+        self.assertIsNone(self.cache.obtener(PYTHON, clases))
+        self.assertTrue(self.cache.guardar(PYTHON, clases, analisis))
+        guardado = self.cache.obtener(PYTHON, clases)
+        self.assertEqual(repr(guardado.ast), repr(analisis.ast))
+        self.assertEqual([(t.tipo, t.lexema, t.linea, t.columna) for t in guardado.tokens],
+                         [(t.tipo, t.lexema, t.linea, t.columna) for t in analisis.tokens])
+        # El código no se guarda en el archivo: las vistas lo vuelven a cortar del que se consulta.
+        self.assertIs(guardado.tokens.codigo, PYTHON)
+        self.assertEqual((self.cache.aciertos, self.cache.fallos), (1, 1))
+
+    def test_tabla_de_simbolos_pascal(self):
+        clases = (LexerPascal, ParserPascal)
+        self.cache.guardar(PASCAL, clases, analizar(LexerPascal, ParserPascal, PASCAL))
+        guardado = self.cache.obtener(PASCAL, clases)
+        self.assertEqual(guardado.errores_sintacticos, [])
+        self.assertIsNotNone(guardado.tabla_simbolos.buscar_simbolo("a"))
+
+    def test_clave_por_codigo_y_contexto(self):
+        clases = (LexerPython, ParserPython)
+        self.cache.guardar(PYTHON, clases, analizar(LexerPython, ParserPython, PYTHON))
+        self.assertIsNone(self.cache.obtener(PYTHON + "y = 1\n", clases))
+        self.assertIsNone(self.cache.obtener(PYTHON, clases, contexto="otro"))
+        self.assertIsNone(self.cache.obtener(PYTHON, (LexerPascal, ParserPascal)))
+
+    def test_dependencia_modificada_o_archivo_corrupto(self):
+        clases = (LexerPython, ParserPython)
+        cabecera = os.path.join(self.directorio, "dependencia.txt")
+        with open(cabecera, "w") as archivo:
+            archivo.write("1")
+        self.cache.guardar(PYTHON, clases, analizar(LexerPython, ParserPython, PYTHON), dependencias=[cabecera])
+        self.assertIsNotNone(self.cache.obtener(PYTHON, clases))
+        estado = os.stat(cabecera)
+        os.utime(cabecera, ns=(estado.st_atime_ns, estado.st_mtime_ns + 1_000_000_000))
+        self.assertIsNone(self.cache.obtener(PYTHON, clases))
+
+        self.cache.guardar(PYTHON, clases, analizar(LexerPython, ParserPython, PYTHON))
+        ruta = self.cache.ruta(self.cache.clave(PYTHON, clases))
+        with open(ruta, "r+b") as archivo:
+            archivo.truncate(os.path.getsize(ruta) // 2)
+        self.assertIsNone(self.cache.obtener(PYTHON, clases))
+
+    def test_desaloja_la_menos_usada(self):
+        cache = CacheAST(self.directorio, maximo_entradas=2)
+        clases = (LexerPython, ParserPython)
+        codigos = [f"x = {n}\n" for n in range(3)]
+        for antiguedad, codigo in enumerate(codigos[:2]):
+            cache.guardar(codigo, clases, analizar(LexerPython, ParserPython, codigo))
+            os.utime(cache.ruta(cache.clave(codigo, clases)), ns=(antiguedad, antiguedad))
+        self.assertIsNotNone(cache.obtener(codigos[0], clases)) # La más antigua pasa a ser la más reciente
+        cache.guardar(codigos[2], clases, analizar(LexerPython, ParserPython, codigos[2]))
+        self.assertEqual([cache.obtener(codigo, clases) is not None for codigo in codigos], [True, False, True])
+
+if __name__ == "__main__":
+    unittest.main()
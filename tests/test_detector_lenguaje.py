@@ -0,0 +1,150 @@
+import os
+import tempfile
+import unittest
+from src.detector_lenguaje.detector import (
+    DetectorLenguaje, detectar_lenguaje, detectar_lenguaje_archivo, detectar_lenguajes_lote, contar_lineas_punto_y_coma, MODO_ESCALONADO,
+    MODO_ESTADISTICO
+)
+from src.detector_lenguaje.cache_deteccion import CacheDeteccion
+from src.detector_lenguaje.estado_incremental import EstadoDeteccionIncremental
+from src.detector_lenguaje.motor_estadistico import MotorEstadistico, muestras_de_ejemplos, motor_por_defecto, RUTA_PESOS_POR_DEFECTO
+from benchmarks.regresion_detector import generar_corpus, evaluar, comprobar_regresion
+
+DIRECTORIO_EJEMPLOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ejemplos_Codigo")
+
+class TestDetectorLenguaje(unittest.TestCase):
+    def test_texto_y_lista_dan_el_mismo_resultado(self):
+        codigo = "program Hola;\nbegin\n  writeln('Hola');\nend."
+        self.assertEqual(detectar_lenguaje(codigo), detectar_lenguaje(codigo.splitlines()))
+        self.assertEqual(detectar_lenguaje(codigo)[0], "Pascal")
+
+    def test_prefiltro_no_descarta_pistas_con_mayusculas(self):
+        # El prefiltro literal compara en minúsculas; las pistas siguen siendo insensibles a mayúsculas.
+        lenguaje, _, pistas = detectar_lenguaje("BEGIN\n  DBMS_OUTPUT.PUT_LINE('x');\nEND;")
+        self.assertEqual(lenguaje, "PL/SQL")
+        self.assertTrue(any("DBMS_OUTPUT" in p for p in pistas["PL/SQL"]))
+
+    def test_conteo_punto_y_coma_ignora_comentarios_y_bloques(self):
+        lineas = ["int x = 1;", "// comentario;", "{ }", "", "return x;", "}"]
+        self.assertEqual(contar_lineas_punto_y_coma(lineas), (3, 2))
+
+    def test_entrada_vacia(self):
+        self.assertEqual(DetectorLenguaje().detectar("   \n\n")[0], "Desconocido (código vacío o solo espacios)")
+
+    def test_lote_en_pool_coincide_con_deteccion_individual(self):
+        rutas = [os.path.join(DIRECTORIO_EJEMPLOS, n) for n in ("prueba_python.py", "prueba_tsql.sql", "prueba_cpp.cpp")]
+        esperado = {}
+        for ruta in rutas:
+            with open(ruta, 'r', encoding='utf-8') as archivo:
+                esperado[ruta] = detectar_lenguaje(archivo.read())[:2]
+        resultados = list(detectar_lenguajes_lote(rutas, workers=2, max_archivos_por_lote=1))
+        self.assertEqual(len(resultados), len(rutas))
+        for ruta, lenguaje, confianza in resultados:
+            self.assertEqual((lenguaje, confianza), esperado[ruta])
+
+    def test_cascada_decide_por_extension_y_shebang(self):
+        lenguaje, confianza, pistas = detectar_lenguaje("x = 1", modo=MODO_ESCALONADO, extension=".py")
+        self.assertEqual((lenguaje, confianza), ("Python", 100.0))
+        self.assertEqual(pistas["CASCADA"][0], "NIVEL_1 (EXTENSION (.py))")
+        self.assertEqual(detectar_lenguaje("#!/usr/bin/env node\nfoo()", modo=MODO_ESCALONADO)[0], "JavaScript")
+
+    def test_cascada_con_salida_temprana_da_el_mismo_lenguaje(self):
+        with open(os.path.join(DIRECTORIO_EJEMPLOS, "prueba_cpp.cpp"), 'r', encoding='utf-8') as archivo:
+            codigo = archivo.read()
+        detector = DetectorLenguaje()
+        lenguaje, _, pistas = detector.detectar(codigo, modo=MODO_ESCALONADO)
+        self.assertEqual(lenguaje, detector.detectar(codigo)[0])
+        self.assertIn("DECISION: MARGEN_INALCANZABLE", pistas["CASCADA"])
+        self.assertLess(detector.estadisticas_cascada["pistas_consideradas"], len(detector.pistas))
+
+    def test_cascada_respeta_el_umbral_relativo(self):
+        # Tras la primera pista el líder ya no puede perder, pero los demás suman tanto que en
+        # modo completo el resultado es de baja confianza (100 de 370 puntos positivos).
+        pistas = {r'\balfa\b': {"A": 100}, r'\bbeta\b': {"B": 90}, r'\bgamma\b': {"C": 90}, r'\bdelta\b': {"D": 90}}
+        detector = DetectorLenguaje(pistas=pistas, lenguajes=["A", "B", "C", "D"])
+        codigo = "alfa beta gamma delta"
+        completo = detector.detectar(codigo)[0]
+        self.assertTrue(completo.startswith("Desconocido (Baja Confianza"))
+        lenguaje, _, pistas_activadas = detector.detectar(codigo, modo=MODO_ESCALONADO)
+        self.assertEqual(lenguaje, completo)
+        self.assertIn("DECISION: EVALUACION_COMPLETA", pistas_activadas["CASCADA"])
+
+class TestDeteccionIncremental(unittest.TestCase):
+    def test_cache_reutiliza_resultado_tras_editar_espacios(self):
+        cache = CacheDeteccion(capacidad=1)
+        codigo = "def f(x):\n    return x\n"
+        self.assertEqual(cache.detectar(codigo), detectar_lenguaje(codigo))
+        self.assertEqual(cache.detectar(codigo + "\n\n"), detectar_lenguaje(codigo))
+        self.assertEqual(cache.detectar("int x = 1;")[0], detectar_lenguaje("int x = 1;")[0])
+        self.assertEqual((cache.aciertos, cache.fallos, cache.desalojos, len(cache)), (1, 2, 1, 1))
+        # Los espacios finales cambian el resultado: `function\s` activa la pista de `def`
+        codigo = "def f(x):\n  pass\nfunction"
+        self.assertEqual(cache.detectar(codigo), detectar_lenguaje(codigo))
+        self.assertEqual(cache.detectar(codigo + " "), detectar_lenguaje(codigo + " "))
+        self.assertNotEqual(detectar_lenguaje(codigo)[1], detectar_lenguaje(codigo + " ")[1])
+
+    def test_estado_incremental_coincide_con_deteccion_completa(self):
+        with open(os.path.join(DIRECTORIO_EJEMPLOS, "prueba_tsql.sql"), 'r', encoding='utf-8') as archivo:
+            lineas = archivo.read().splitlines()
+        estado = EstadoDeteccionIncremental(lineas)
+        self.assertEqual(estado.detectar(), detectar_lenguaje(lineas))
+        # Edición fuera de la muestra: solo cambian los totales de punto y coma
+        estado.reemplazar_lineas(len(lineas) - 1, len(lineas), ["x = 1", "y = 2", "z = 3"])
+        lineas[-1:] = ["x = 1", "y = 2", "z = 3"]
+        self.assertEqual(estado.detectar(), detectar_lenguaje(lineas))
+        lineas[:3] = ["def f(x):", "    return x"]
+        estado.actualizar_texto("\n".join(lineas))
+        self.assertEqual(estado.detectar(), detectar_lenguaje(lineas))
+
+class TestDeteccionArchivo(unittest.TestCase):
+    def test_archivo_grande_por_ventanas(self):
+        with open(os.path.join(DIRECTORIO_EJEMPLOS, "prueba_plsql.sql"), 'r', encoding='utf-8') as archivo:
+            codigo = archivo.read() * 20
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "dump.sql")
+            with open(ruta, 'w', encoding='utf-8') as archivo:
+                archivo.write(codigo)
+            # Con ventanas de 1 KB el archivo se muestrea por cabeza, centro y cola
+            self.assertEqual(detectar_lenguaje_archivo(ruta, bytes_ventana=1024)[0], detectar_lenguaje(codigo)[0])
+            # Si cabe en tres ventanas, el resultado es exactamente el de detectar_lenguaje
+            self.assertEqual(detectar_lenguaje_archivo(ruta), detectar_lenguaje(codigo))
+
+class TestMotorEstadistico(unittest.TestCase):
+    def test_motor_estadistico_entrena_guarda_y_clasifica(self):
+        motor = MotorEstadistico.entrenar(muestras_de_ejemplos())
+        codigo = "SELECT nombre FROM clientes WHERE id = @id;\nPRINT 'hola';\nGO"
+        self.assertEqual(DetectorLenguaje(motor_estadistico=motor).detectar(codigo, modo=MODO_ESTADISTICO)[0], "T-SQL")
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "pesos.json")
+            motor.guardar(ruta)
+            self.assertEqual(MotorEstadistico.desde_archivo(ruta).detectar(codigo)[:2], motor.detectar(codigo)[:2])
+
+    def test_motor_estadistico_por_defecto_usa_la_tabla_distribuida(self):
+        motor = motor_por_defecto()
+        self.assertEqual(len(motor.pesos_dispersos), len(MotorEstadistico.desde_archivo(RUTA_PESOS_POR_DEFECTO).pesos_dispersos))
+        codigo = "program Hola;\nvar x: integer;\nbegin\n  x := 1;\n  writeln(x);\nend."
+        self.assertEqual(detectar_lenguaje(codigo, modo=MODO_ESTADISTICO)[0], "Pascal")
+
+    def test_motor_estadistico_sin_margen_es_desconocido(self):
+        motor = MotorEstadistico.entrenar([("begin end;", "Pascal"), ("begin end;", "PL/SQL")], lenguajes=["Pascal", "PL/SQL"])
+        lenguaje, _, pistas = motor.detectar("begin end;")
+        self.assertTrue(lenguaje.startswith("Desconocido (Baja Confianza"))
+        self.assertIn("MARGEN_POR_CARACTERISTICA (0.000)", pistas["ESTADISTICO"])
+
+class TestRegresionDetector(unittest.TestCase):
+    def test_corpus_mutado_no_pierde_precision(self):
+        corpus = generar_corpus(variantes_por_archivo=3, semilla=1, tamanios=[])
+        self.assertEqual([n for n, _, _ in corpus], [n for n, _, _ in generar_corpus(3, 1, [])]) # Determinista
+        resultado = evaluar(corpus)
+        self.assertGreaterEqual(resultado["precision_global"], 95.0, resultado["fallos"])
+        self.assertIsNone(resultado["archivos_por_segundo"]) # Sin tiempo_minimo no se mide
+
+    def test_regresion_solo_compara_rendimiento_si_se_pide(self):
+        linea_base = {"precision_global": 99.0, "archivos_por_segundo": 1000.0}
+        lento = {"precision_global": 99.0, "archivos_por_segundo": 10.0}
+        self.assertEqual(comprobar_regresion(lento, linea_base), [])
+        self.assertEqual(len(comprobar_regresion(lento, linea_base, comprobar_rendimiento=True)), 1)
+        self.assertEqual(len(comprobar_regresion({"precision_global": 90.0, "archivos_por_segundo": None}, linea_base, True)), 1)
+
+if __name__ == "__main__":
+    unittest.main()
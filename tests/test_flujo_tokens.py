@@ -0,0 +1,51 @@
+import unittest
+from src.analizador_lexico.lexer_tsql import LexerTSQL
+from src.nucleo_compilador.flujo_tokens import FlujoTokens
+
+CODIGO = "SELECT a, b FROM t WHERE a = 'x';\nGO\n"
+
+class TestFlujoTokens(unittest.TestCase):
+    def test_generador_igual_a_tokenizar(self):
+        esperados = [repr(t) for t in LexerTSQL(CODIGO).tokenizar()]
+        self.assertEqual([repr(t) for t in LexerTSQL(CODIGO).generar_tokens()], esperados)
+
+    def test_ventana_acotada(self):
+        lista = FlujoTokens(LexerTSQL(CODIGO).tokenizar())
+        flujo = FlujoTokens(LexerTSQL(CODIGO).generar_tokens(), ventana=3)
+        self.assertTrue(flujo.es_flujo)
+        self.assertEqual(flujo[1].lexema, 'a')
+        self.assertTrue(flujo.hay(6))
+        self.assertEqual(flujo[6].lexema, 'WHERE')
+        with self.assertRaises(IndexError):
+            flujo[1] # Ya salió de la ventana
+        self.assertFalse(flujo.hay(100))
+        self.assertEqual(repr(flujo[-1]), repr(lista[-1]))
+        self.assertEqual(flujo[-2].lexema, lista[-2].lexema)
+
+    def test_ultimo_no_lee_el_flujo(self):
+        lista = FlujoTokens(LexerTSQL(CODIGO).tokenizar())
+        flujo = FlujoTokens(LexerTSQL(CODIGO).generar_tokens(), ventana=3)
+        self.assertIsNone(flujo.ultimo())
+        self.assertEqual(flujo[2].lexema, ',')
+        self.assertEqual(flujo.ultimo().lexema, ',') # Lo último leído, sin agotar la fuente
+        self.assertTrue(flujo.hay(3))
+        indice = 3
+        while flujo.hay(indice):
+            indice += 1
+        self.assertEqual(repr(flujo.ultimo()), repr(lista.ultimo()))
+        self.assertEqual(lista.ultimo().tipo, 'EOF_SQL')
+        self.assertEqual(repr(flujo.ultimo_antes_de('EOF_SQL')), repr(lista[-2]))
+        self.assertIsNone(FlujoTokens([]).ultimo_antes_de('EOF_SQL'))
+
+    def test_almacen_igual_a_lista(self):
+        # Del almacén solo se guardan índices; las vistas se crean al leer cada token
+        almacen = LexerTSQL(CODIGO).tokenizar()
+        for ignorado in ('WHITESPACE_SQL', almacen.tipo(1)):
+            visibles = [token for token in almacen.materializar() if token.tipo != ignorado]
+            flujo = FlujoTokens(almacen, ignorar=(ignorado,))
+            self.assertFalse(flujo.hay(len(visibles)))
+            for i in list(range(len(visibles))) + [-1, -2]:
+                self.assertEqual(repr(flujo[i]), repr(visibles[i]))
+
+if __name__ == "__main__":
+    unittest.main()
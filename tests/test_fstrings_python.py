@@ -0,0 +1,43 @@
+import contextlib
+import io
+import unittest
+
+from analizador_lexico.lexer_python import LexerPython
+from src.analizador_sintactico.parser_python import ParserPython, NodoCadenaFormateada, NodoInterpolacion
+from src.simulador_ejecucion.interprete_python import InterpretePython
+
+def ejecutar(codigo):
+    with contextlib.redirect_stdout(io.StringIO()):
+        modulo = ParserPython(LexerPython(codigo).tokenizar()).parse()
+    salida = io.StringIO()
+    with contextlib.redirect_stdout(salida):
+        InterpretePython().interpretar_modulo(modulo)
+    return modulo, salida.getvalue().splitlines()
+
+class TestCadenasFormateadas(unittest.TestCase):
+    def test_partes_divididas_en_el_parser(self):
+        modulo, _ = ejecutar('print(f"a{x!r:>{n}}b{{c}}")\n')
+        cadena = modulo.cuerpo_sentencias[0].expresion_nodo.argumentos_nodos[0]
+        self.assertIsInstance(cadena, NodoCadenaFormateada)
+        self.assertEqual([type(p).__name__ for p in cadena.partes], ["str", "NodoInterpolacion", "str"])
+        self.assertEqual(cadena.partes[2], "b{c}")
+        interpolacion = cadena.partes[1]
+        self.assertEqual(interpolacion.conversion, "r")
+        self.assertEqual(interpolacion.formato[0], ">")
+        self.assertIsInstance(interpolacion.formato[1], NodoInterpolacion)
+
+    def test_interpolacion_en_bucle(self):
+        codigo = (
+            "x = 3.14159\n"
+            "n = 8\n"
+            "def doble(a):\n"
+            "    return a * 2\n"
+            "for i in range(2):\n"
+            "    print(f\"i={i} d={doble(i) + 1} x={x:.2f} {{i}} s={'ab'!r} {x:{n}.{n - 6}f} {falta}\")\n"
+        )
+        _, lineas = ejecutar(codigo)
+        self.assertIn("i=0 d=1 x=3.14 {i} s='ab'     3.14 {falta}", lineas)
+        self.assertIn("i=1 d=3 x=3.14 {i} s='ab'     3.14 {falta}", lineas)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+from src.analizador_lexico.lexer_javascript import LexerJavaScript
+from src.analizador_lexico.lexer_pascal import LexerPascal
+from src.nucleo_compilador.internado import TablaInternado
+
+class TestInternado(unittest.TestCase):
+    def test_tabla(self):
+        tabla = TablaInternado()
+        a = tabla.internar("".join(["to", "tal"]))
+        self.assertIs(tabla.internar("total"), a)
+        self.assertIs(tabla.plegar("TOTAL"), a)
+        self.assertEqual(tabla.simbolo(tabla.id_simbolo("Total")), "Total")
+
+    def test_identificadores_comparten_cadena(self):
+        tokens = LexerJavaScript("let x = y + x;").tokenizar()
+        x1, x2 = tokens[1], tokens[-3]
+        self.assertIs(x1.lexema, x2.lexema)
+        self.assertIs(x1.simbolo, x1.lexema)
+        self.assertIsNone(tokens[0].simbolo) # Palabra clave
+
+    def test_pascal_pliega_mayusculas(self):
+        tokens = LexerPascal("program P; var Suma: integer; begin SUMA := 1 end.").tokenizar()
+        nombres = [t for t in tokens if t.simbolo == 'suma']
+        self.assertEqual([t.lexema for t in nombres], ['Suma', 'SUMA'])
+        self.assertIs(nombres[0].simbolo, nombres[1].simbolo)
+        generados = [t for t in LexerPascal("x := X").generar_tokens() if t.simbolo]
+        self.assertEqual([t.simbolo for t in generados], ['x', 'x'])
+
+if __name__ == "__main__":
+    unittest.main()
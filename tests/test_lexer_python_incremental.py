@@ -0,0 +1,29 @@
+import unittest
+from src.analizador_lexico.lexer_python import LexerPython
+
+CODIGO = "def f(x):\n    if x:\n        return 1\n    return 2\n\ny = f(3)\nprint(y)\n"
+
+def resumen(tokens):
+    return [(repr(t), t.inicio) for t in tokens]
+
+class TestLexerPythonIncremental(unittest.TestCase):
+    def test_edicion_en_una_linea(self):
+        lexer = LexerPython(CODIGO)
+        lexer.tokenizar()
+        editado = CODIGO.replace("return 1", "return 10 + x")
+        tokens = lexer.retokenizar(editado)
+        self.assertEqual(lexer.lineas_reescaneadas, 1)
+        self.assertEqual(resumen(tokens), resumen(LexerPython(editado).tokenizar()))
+
+    def test_cambio_de_indentacion_se_propaga(self):
+        lexer = LexerPython(CODIGO)
+        lexer.tokenizar()
+        # Al insertar una línea con otra indentación cambia la pila hasta que vuelve a coincidir
+        editado = CODIGO.replace("    return 2\n", "    return 2\n  z = 0\n")
+        tokens = lexer.retokenizar(editado)
+        self.assertEqual(resumen(tokens), resumen(LexerPython(editado).tokenizar()))
+        restaurado = lexer.retokenizar(CODIGO)
+        self.assertEqual(resumen(restaurado), resumen(LexerPython(CODIGO).tokenizar()))
+
+if __name__ == "__main__":
+    unittest.main()
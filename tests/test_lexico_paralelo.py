@@ -0,0 +1,34 @@
+import unittest
+from src.analizador_lexico.lexer_tsql import LexerTSQL, MOTOR_LEXICO_SQL, TIPOS_PRECORTE_SQL, Token
+from src.nucleo_compilador.almacen_tokens import AlmacenTokens
+from src.nucleo_compilador.lexico_paralelo import cortes_seguros, expresion_precorte, tokenizar_en_paralelo
+
+CODIGO = "SELECT 'uno\ndos' AS a, [x] FROM t; /* comentario\nde varias\nlíneas */\nSELECT @v + 1.5 -- fin\n" * 40
+
+def filas(tokens):
+    return [(t.tipo, t.lexema, t.linea, t.columna, t.valor, t.simbolo) for t in tokens]
+
+class TestLexicoParalelo(unittest.TestCase):
+    def test_cortes_fuera_de_cadenas_y_comentarios(self):
+        cortes = cortes_seguros(CODIGO, expresion_precorte(MOTOR_LEXICO_SQL, TIPOS_PRECORTE_SQL), 0, 7)
+        self.assertEqual((cortes[0], cortes[-1]), (0, len(CODIGO)))
+        self.assertGreater(len(cortes), 5)
+        for corte in cortes[1:-1]:
+            self.assertTrue(CODIGO[corte:].startswith("SELECT "), CODIGO[corte - 20:corte + 10])
+
+    def _en_paralelo(self, tipos_precorte):
+        lexer = LexerTSQL(CODIGO)
+        tokens = AlmacenTokens(CODIGO, Token)
+        self.assertTrue(tokenizar_en_paralelo(lexer, tokens, MOTOR_LEXICO_SQL, tipos_precorte, trabajadores=2))
+        for fila in lexer._filas_tokens(posiciones=False): # Solo queda el EOF
+            tokens.agregar(*fila)
+        return tokens
+
+    def test_mismos_tokens_que_en_serie(self):
+        esperados = filas(LexerTSQL(CODIGO).tokenizar())
+        self.assertEqual(filas(self._en_paralelo(TIPOS_PRECORTE_SQL)), esperados)
+        # Sin pre-escaneo los cortes caen dentro de cadenas y comentarios: esos tramos se repiten
+        self.assertEqual(filas(self._en_paralelo(())), esperados)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import contextlib
+import io
+import unittest
+
+from src.nucleo_compilador.lotes_paralelos import analizar_por_lotes
+from analizador_lexico.lexer_plsql import LexerPLSQL
+from analizador_lexico.lexer_tsql import LexerTSQL
+from analizador_sintactico.parser_plsql import ParserPLSQL
+from analizador_sintactico.parser_tsql import ParserTSQL
+from analizador_semantico.semantico_tsql import AnalizadorSemanticoTSQL
+
+TSQL = ("CREATE TABLE t (a INT, b INT);\nGO\n"
+        "INSERT INTO t (a, c) VALUES (1, 2);\nGO;\n"
+        "DECLARE @x INT = 1;\nPRINT @x\nGO\n"
+        "SELECT a FROM u;\nPRINT @y;\nGO\n") * 3
+
+def en_serie(codigo):
+    with contextlib.redirect_stdout(io.StringIO()):
+        tokens = LexerTSQL(codigo).tokenizar()
+        parser = ParserTSQL(tokens)
+        ast = parser.parse()
+    return tokens, parser, ast
+
+class TestLotesParalelos(unittest.TestCase):
+    def test_mismo_resultado_que_en_serie(self):
+        tokens, parser, ast = en_serie(TSQL)
+        semantico = AnalizadorSemanticoTSQL()
+        semantico.analizar(ast)
+        analisis = analizar_por_lotes(tokens, ParserTSQL, AnalizadorSemanticoTSQL, trabajadores=2, umbral=2, minimo_por_trabajador=0)
+        self.assertEqual((analisis.lotes, analisis.errores_sintacticos), (12, []))
+        self.assertEqual(repr(analisis.ast), repr(ast))
+        # Los tokens del AST unido son los del almacén del script, no copias
+        self.assertIs(analisis.ast.lotes_o_sentencias[0].nombre_tabla_token._almacen, tokens)
+        por_lotes = analisis.analizador_semantico()
+        self.assertEqual(por_lotes.errores, semantico.errores)
+        self.assertEqual((por_lotes.tabla_tablas, por_lotes.tabla_variables), (semantico.tabla_tablas, semantico.tabla_variables))
+        # Los lotes que no consultan nada declarado antes (p. ej. el primero) se toman tal cual
+        self.assertLess(analisis.lotes_reanalizados, analisis.lotes)
+        self.assertIsNone(analizar_por_lotes(tokens, ParserTSQL, AnalizadorSemanticoTSQL, trabajadores=2, umbral=13, minimo_por_trabajador=0))
+
+    def test_errores_de_cada_lote_en_orden(self):
+        tokens, parser, _ = en_serie("PRINT 'a';\nGO\nSELECT FROM t;\nGO\nPRINT 1\nGO\nINSERT t VALUES (1);\n")
+        analisis = analizar_por_lotes(tokens, ParserTSQL, AnalizadorSemanticoTSQL, trabajadores=2, umbral=2, minimo_por_trabajador=0)
+        self.assertIsNone(analisis.ast)
+        # En serie el parser se detiene en el primer error; por lotes se ve también el del último
+        self.assertEqual(analisis.errores_sintacticos[:1], parser.errores_sintacticos)
+        self.assertEqual([error.split(".")[0] for error in analisis.errores_sintacticos],
+                         ["Error Sintáctico en L3:C8", "Error Sintáctico en L7:C8"])
+
+    def test_no_reparte_scripts_con_poco_trabajo_por_proceso(self):
+        tokens, _, _ = en_serie(TSQL)
+        # Doce lotes bastan para el umbral, pero no llegan a dos procesos con el mínimo por defecto
+        self.assertIsNone(analizar_por_lotes(tokens, ParserTSQL, AnalizadorSemanticoTSQL, trabajadores=8, umbral=2))
+        self.assertIsNone(analizar_por_lotes(tokens, ParserTSQL, AnalizadorSemanticoTSQL, trabajadores=8, umbral=2,
+                                             minimo_por_trabajador=len(tokens) // 2 + 1))
+        analisis = analizar_por_lotes(tokens, ParserTSQL, AnalizadorSemanticoTSQL, trabajadores=8, umbral=2,
+                                      minimo_por_trabajador=len(tokens) // 2)
+        self.assertEqual(analisis.lotes, 12)
+
+    def test_barra_sola_en_su_linea_separa_bloques_plsql(self):
+        codigo = "BEGIN\n  x := a\n    / b;\nEND;\n/\nBEGIN NULL; END;\n/\nBEGIN\n  y := 1 / 2;\nEND;\n/\n"
+        with contextlib.redirect_stdout(io.StringIO()):
+            tokens = LexerPLSQL(codigo).tokenizar()
+        cortes = ParserPLSQL.cortes_lotes(tokens)
+        self.assertEqual([tokens[corte - 1].linea for corte in cortes[1:-1]], [5, 7])
+        self.assertEqual(cortes[-1], len(tokens) - 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+from src.analizador_lexico.lexer_plsql import LexerPLSQL
+from src.nucleo_compilador.mapa_fuente import MapaFuente
+from src.nucleo_compilador.motor_lexico import avanzar_posicion
+
+class TestMapaFuente(unittest.TestCase):
+    def test_posiciones_como_avanzar_posicion(self):
+        codigo = "ab\n\ncd\r\nxyz\n"
+        mapa = MapaFuente(codigo)
+        self.assertEqual(len(mapa), 5)
+        for desplazamiento in range(len(codigo) + 1):
+            posicion = avanzar_posicion(codigo[:desplazamiento], 1, 1)
+            self.assertEqual(mapa.posicion(desplazamiento), posicion)
+            self.assertEqual(mapa.desplazamiento(*posicion), desplazamiento)
+
+    def test_tokens_sin_posiciones_guardadas(self):
+        codigo = 'BEGIN\n  "Mi Var" := 1;\nEND;'
+        tokens = LexerPLSQL(codigo).tokenizar()
+        # Solo se guardan la del identificador entrecomillado (es la de la comilla) y la de EOF
+        self.assertEqual(len(tokens._fijos), 2)
+        self.assertEqual([(t.lexema, t.linea, t.columna) for t in tokens][1:3], [("Mi Var", 2, 3), (":=", 2, 12)])
+        self.assertEqual([repr(t) for t in tokens], [repr(t) for t in LexerPLSQL(codigo).generar_tokens()])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,22 @@
+import unittest
+from src.nucleo_compilador.motor_lexico import MotorLexico
+from src.analizador_lexico.lexer_cpp import LexerCPP
+
+class TestMotorLexico(unittest.TestCase):
+    def test_primera_especificacion_gana_y_posiciones(self):
+        motor = MotorLexico([(r'<', 'MENOR'), (r'<=', 'MENOR_IGUAL'), (r'[a-z]+', 'ID'), (r'\s+', 'ESPACIO')],
+                            ignorar=('ESPACIO',), tipo_identificador='ID', palabras_clave={'si': 'SI'})
+        tokens = [(tipo, lexema, linea, columna) for tipo, lexema, linea, columna, _, _ in motor.escanear("a <=\n  si ?")]
+        self.assertEqual(tokens, [('ID', 'a', 1, 1), ('MENOR', '<', 1, 3), (None, '=', 1, 4),
+                                  ('SI', 'si', 2, 3), (None, '?', 2, 6)])
+
+    def test_referencias_y_grupos_renumerados_en_cpp(self):
+        tokens = LexerCPP('  #include <vector>\nauto s = R"x(a)"b)x";').tokenizar()
+        directiva = tokens[0]
+        self.assertEqual((directiva.lexema, directiva.linea, directiva.columna), ('#include <vector>', 1, 3))
+        self.assertEqual(directiva.valor['archivo'], 'vector')
+        cadena = [t for t in tokens if t.tipo == 'LITERAL_CADENA_CPP'][0]
+        self.assertEqual((cadena.lexema, cadena.valor), ('R"x(a)"b)x"', 'a)"b'))
+
+if __name__ == "__main__":
+    unittest.main()
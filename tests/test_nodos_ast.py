@@ -0,0 +1,43 @@
+import contextlib
+import importlib
+import io
+import sys
+import unittest
+
+from src.nucleo_compilador.nodos_ast import atributos_nodo, campos_nodo, inicio_nodo, tramo_tokens
+from analizador_lexico.lexer_python import LexerPython
+from analizador_sintactico.parser_python import ParserPython
+
+PARSERS = ("parser_cpp", "parser_html", "parser_javascript", "parser_pascal",
+           "parser_plsql", "parser_python", "parser_tsql")
+
+def asignacion_python(codigo):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return ParserPython(LexerPython(codigo).tokenizar()).parse().cuerpo_sentencias[0]
+
+class TestNodosAST(unittest.TestCase):
+    def test_todas_las_clases_declaran_slots(self):
+        for nombre_modulo in PARSERS:
+            with contextlib.redirect_stdout(io.StringIO()):
+                modulo = importlib.import_module(f"analizador_sintactico.{nombre_modulo}")
+            for nombre, clase in vars(modulo).items():
+                if isinstance(clase, type) and nombre.startswith("Nodo") and clase.__module__ == modulo.__name__:
+                    self.assertIn("__slots__", vars(clase), f"{nombre_modulo}.{nombre}")
+
+    def test_atributos_en_orden_de_asignacion(self):
+        suma = asignacion_python("x = (a + b) * c\n").valor_nodo.izquierda_nodo
+        self.assertFalse(hasattr(suma, "__dict__"))
+        self.assertEqual([nombre for nombre, _ in atributos_nodo(suma)],
+                         ["izquierda_nodo", "operador_token", "derecha_nodo", "operador"])
+        self.assertEqual(campos_nodo(type(suma)), ("izquierda_nodo", "operador_token", "derecha_nodo", "operador"))
+        self.assertIs(suma.operador, sys.intern("+"))
+
+    def test_tramo_de_tokens_e_inicio(self):
+        asignacion = asignacion_python("x = (a + b) * c\n")
+        producto = asignacion.valor_nodo
+        # Los paréntesis no se guardan en el AST, pero el tramo sí incluye el de cierre.
+        self.assertEqual([t.lexema for t in tramo_tokens(producto)], ["a", "+", "b", ")", "*", "c"])
+        self.assertEqual((inicio_nodo(asignacion), inicio_nodo(producto)), (0, 5))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import contextlib
+import io
+import unittest
+
+from analizador_lexico.lexer_cpp import LexerCPP
+from analizador_sintactico.parser_cpp import ParserCPP
+
+def parser_de(codigo):
+    return ParserCPP(LexerCPP(codigo).tokenizar())
+
+class TestEspeculacionCPP(unittest.TestCase):
+    def test_marcar_y_retroceder(self):
+        parser = parser_de("int a = 1;")
+        marca = parser._marcar()
+        parser._avanzar(); parser._avanzar()
+        self.assertEqual(parser.token_actual.lexema, "=")
+        parser._retroceder(marca)
+        self.assertEqual((parser.posicion_actual, parser.token_actual.lexema), (0, "int"))
+        self.assertEqual((parser.retrocesos, parser.tokens_retrocedidos), (1, 2))
+
+    def test_memo_por_regla_y_posicion(self):
+        funcion, variable = parser_de("ns::Tipo* ns::f(int a);"), parser_de("ns::Tipo* a = 0;")
+        for _ in range(3):
+            self.assertTrue(funcion._es_definicion_funcion_probable())
+            self.assertFalse(variable._es_definicion_funcion_probable())
+        self.assertEqual(funcion.posicion_actual, 0)
+        # La primera consulta recorre el tipo y la función; las otras dos salen del memo.
+        self.assertEqual((funcion.memo_fallos, funcion.memo_aciertos), (2, 2))
+        self.assertEqual((variable.memo_fallos, variable.memo_aciertos), (2, 2))
+
+    def test_parse_con_resumen(self):
+        parser = parser_de("class C { public: int m; void g(int x) { int y = x; y = y + 1; } };\n"
+                           "int f(int a);\nint v = 1;\n")
+        with contextlib.redirect_stdout(io.StringIO()):
+            ast = parser.parse()
+        self.assertIsNotNone(ast)
+        self.assertEqual(parser.errores_sintacticos, [])
+        self.assertIn("comprobación(es) especulativa(s)", parser.resumen_especulacion())
+        self.assertGreater(parser.retrocesos, 0)
+
+if __name__ == "__main__":
+    unittest.main()
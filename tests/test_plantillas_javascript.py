@@ -0,0 +1,46 @@
+import contextlib
+import io
+import unittest
+
+from analizador_lexico.lexer_javascript import LexerJavaScript, TT_LITERAL_PLANTILLA, dividir_plantilla
+from analizador_sintactico.parser_javascript import ParserJavaScript, NodoPlantillaJS
+from simulador_ejecucion.interprete_javascript import InterpreteJavaScript
+
+class TestPlantillasJavaScript(unittest.TestCase):
+    def test_lexer_separa_textos_y_expresiones(self):
+        self.assertEqual(dividir_plantilla(r'`a\n${x + 1}\`${ {b:1}.b }\${c}${d`'),
+                         (("a\n", "`", "${c}${d"), ("x + 1", " {b:1}.b ")))
+        token = LexerJavaScript("`hola ${nombre}`").tokenizar()[0]
+        self.assertEqual(token.tipo, TT_LITERAL_PLANTILLA)
+        self.assertEqual(token.valor, (("hola ", ""), ("nombre",)))
+
+    def test_evaluacion_en_bucle(self):
+        codigo = (
+            'let nombre = "Ana";\n'
+            'for (let i = 0; i < 2; i++) {\n'
+            '    console.log(`${nombre}-${i + 10} ${falta} ${)}`);\n'
+            '}\n'
+        )
+        salida = io.StringIO()
+        with contextlib.redirect_stdout(salida):
+            programa = ParserJavaScript(LexerJavaScript(codigo).tokenizar()).parse()
+            plantilla = programa.cuerpo[1].cuerpo_nodo.cuerpo_sentencias[0].expresion_nodo.argumentos_nodos[0]
+            InterpreteJavaScript().interpretar_script(programa)
+        self.assertIsInstance(plantilla, NodoPlantillaJS)
+        # `${)}` no es una expresión válida: se queda como texto
+        self.assertEqual(plantilla.partes[-1], " ${)}")
+        lineas = salida.getvalue().splitlines()
+        self.assertIn("Ana-10 ${falta} ${)}", lineas)
+        self.assertIn("Ana-11 ${falta} ${)}", lineas)
+
+    def test_literales_true_false_null(self):
+        # Los tokens del almacén son de solo lectura: el valor va en el nodo
+        codigo = 'let a = true; let b = false; let c = null;'
+        with contextlib.redirect_stdout(io.StringIO()):
+            programa = ParserJavaScript(LexerJavaScript(codigo).tokenizar()).parse()
+        self.assertIsNotNone(programa)
+        valores = [declaracion.declaraciones[0].valor_inicial_nodo.valor for declaracion in programa.cuerpo]
+        self.assertEqual(valores, [True, False, None])
+
+if __name__ == "__main__":
+    unittest.main()
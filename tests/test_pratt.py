@@ -0,0 +1,67 @@
+import contextlib
+import io
+import unittest
+
+from src.nucleo_compilador.pratt import TablaPratt, analizar_expresion, DERECHA, NO_ASOCIATIVO
+from analizador_lexico.lexer_python import LexerPython
+from analizador_sintactico.parser_python import ParserPython
+
+class Tok:
+    def __init__(self, lexema):
+        self.lexema = lexema
+        self.tipo = "OP" if not lexema.isalnum() or lexema in ("not", "and", "or") else "ID"
+
+class ParserJuguete:
+    def __init__(self, texto):
+        self.tokens = [Tok(l) for l in texto.split()]
+        self.i = 0
+        self.token_actual = self.tokens[0]
+
+    def _avanzar(self):
+        self.i += 1
+        self.token_actual = self.tokens[self.i] if self.i < len(self.tokens) else None
+
+    def operando(self):
+        token = self.token_actual
+        self._avanzar()
+        return token.lexema
+
+TABLA = TablaPratt()
+TABLA.infijo(1, "OP", ["or"], lambda t, i, d: (t.lexema, i, d))
+TABLA.infijo(2, "OP", ["and"], lambda t, i, d: (t.lexema, i, d))
+TABLA.prefijo(3, "OP", ["not"], lambda t, o: ("not", o), nivel_operando=4)
+TABLA.infijo(4, "OP", ["<"], lambda t, i, d: (t.lexema, i, d), asociatividad=NO_ASOCIATIVO)
+TABLA.infijo(5, "OP", ["+", "-"], lambda t, i, d: (t.lexema, i, d))
+TABLA.infijo(6, "OP", ["*"], lambda t, i, d: (t.lexema, i, d))
+TABLA.infijo(7, "OP", ["^"], lambda t, i, d: (t.lexema, i, d), asociatividad=DERECHA)
+
+def analizar(texto):
+    parser = ParserJuguete(texto)
+    arbol = analizar_expresion(parser, TABLA, parser.operando)
+    return arbol, parser.token_actual and parser.token_actual.lexema
+
+class TestPratt(unittest.TestCase):
+    def test_precedencia_y_asociatividad(self):
+        self.assertEqual(analizar("a - b - c * d ^ e ^ f"),
+                         (("-", ("-", "a", "b"), ("*", "c", ("^", "d", ("^", "e", "f")))), None))
+
+    def test_no_asociativo_y_prefijo(self):
+        self.assertEqual(analizar("a < b < c"), (("<", "a", "b"), "<"))
+        self.assertEqual(analizar("not a < b < c"), (("not", ("<", "a", "b")), "<"))
+        self.assertEqual(analizar("not a + b or c"), (("or", ("not", ("+", "a", "b")), "c"), None))
+        # El '<' que rechazó el operando derecho de 'and' tampoco se acepta por encima del 'and'
+        self.assertEqual(analizar("a and b < c < d"), (("and", "a", ("<", "b", "c")), "<"))
+        self.assertEqual(analizar("a and b < c or d"), (("or", ("and", "a", ("<", "b", "c")), "d"), None))
+
+    def test_anidamiento_profundo(self):
+        # Con un método por nivel de precedencia, 150 paréntesis agotaban la pila por defecto.
+        codigo = "x = " + "(" * 150 + "a + b" + ")" * 150 + " * c\n"
+        parser = ParserPython(LexerPython(codigo).tokenizar())
+        salida = io.StringIO()
+        with contextlib.redirect_stdout(salida), contextlib.redirect_stderr(salida):
+            ast = parser.parse()
+        self.assertIsNotNone(ast)
+        self.assertNotIn("RecursionError", salida.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+
+from analizador_lexico.lexer_cpp import LexerCPP, TT_EOF_CPP
+from analizador_lexico.preprocesador_cpp import PreprocesadorCPP, CacheCabecerasCPP
+
+CABECERA = (
+    "#ifndef COMUN_H\n"
+    "#define COMUN_H\n"
+    "#define MAX(a, b) ((a) > (b) ? (a) : (b))\n"
+    "#define LIMITE 10\n"
+    "int doble(int x) { return x * 2; }\n"
+    "#endif\n"
+)
+
+UNIDAD = (
+    '#include "comun.h"\n'
+    '#include "comun.h"\n'
+    "#if defined(LIMITE) && LIMITE -1 == 9\n"
+    "int valor = MAX(LIMITE, 3);\n"
+    "#else\n"
+    "int valor = 0;\n"
+    "#endif\n"
+)
+
+def lexemas(tokens):
+    return " ".join(t.lexema for t in tokens if t.tipo != TT_EOF_CPP)
+
+class TestPreprocesadorCPP(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.directorio.name, "comun.h"), "w", encoding="utf-8") as f:
+            f.write(CABECERA)
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def test_macros_condicionales_e_include(self):
+        preprocesador = PreprocesadorCPP(rutas_busqueda=[self.directorio.name], cache=CacheCabecerasCPP())
+        salida = preprocesador.procesar(LexerCPP(UNIDAD).tokenizar())
+        self.assertEqual(preprocesador.errores, [])
+        self.assertEqual(salida[-1].tipo, TT_EOF_CPP)
+        self.assertEqual(lexemas(salida),
+                         '#include "comun.h" int doble ( int x ) { return x * 2 ; } #include "comun.h" '
+                         "int valor = ( ( 10 ) > ( 3 ) ? ( 10 ) : ( 3 ) ) ;")
+
+    def test_cabecera_se_tokeniza_una_vez(self):
+        cache = CacheCabecerasCPP()
+        for _ in range(50):
+            preprocesador = PreprocesadorCPP(rutas_busqueda=[self.directorio.name], cache=cache)
+            preprocesador.procesar(LexerCPP(UNIDAD).tokenizar())
+        self.assertEqual(cache.fallos, 1)
+        self.assertEqual(cache.aciertos, 99)
+        self.assertIn("caché 99 acierto(s) / 1 fallo(s)", preprocesador.resumen())
+
+    def test_errores(self):
+        preprocesador = PreprocesadorCPP(cache=CacheCabecerasCPP())
+        salida = preprocesador.procesar(LexerCPP(
+            '#define F(x) x\n#include "no_existe.h"\nint a = F(1, 2);\n#if 1 / 0\n#endif\n#endif\n').tokenizar())
+        self.assertIn("F ( 1 , 2 )", lexemas(salida))
+        self.assertEqual(len(preprocesador.avisos), 1)
+        self.assertEqual(len(preprocesador.errores), 3)
+
+    def test_aridad_de_macro_funcion(self):
+        preprocesador = PreprocesadorCPP(cache=CacheCabecerasCPP())
+        salida = preprocesador.procesar(LexerCPP('#define F(a, b) a + b\nint x = F(1);\nint y = F(1, 2);\n').tokenizar())
+        self.assertIn("F ( 1 ) ; int y = 1 + 2", lexemas(salida))
+        self.assertEqual(len(preprocesador.errores), 1)
+        self.assertIn("L2:C9", preprocesador.errores[0])
+        self.assertIn("la macro 'F' espera 2 argumento(s) y recibió 1", preprocesador.errores[0])
+
+    def test_inclusion_circular(self):
+        for nombre, otro in (("a.h", "b.h"), ("b.h", "a.h")):
+            with open(os.path.join(self.directorio.name, nombre), "w", encoding="utf-8") as f:
+                f.write(f'#include "{otro}"\nint {nombre[0]};\n')
+        preprocesador = PreprocesadorCPP(rutas_busqueda=[self.directorio.name], cache=CacheCabecerasCPP())
+        salida = preprocesador.procesar(LexerCPP('#include "a.h"\n').tokenizar())
+        self.assertEqual(preprocesador.cabeceras_incluidas, 2) # Se detiene en la primera reentrada
+        self.assertEqual(len(preprocesador.errores), 1)
+        self.assertIn("inclusión circular: a.h -> b.h -> a.h", preprocesador.errores[0])
+        self.assertIn("int b ; int a ;", lexemas(salida))
+
+    def test_inclusion_mutua_con_guardas(self):
+        for nombre, otro in (("a.h", "b.h"), ("b.h", "a.h")):
+            guarda = nombre[0].upper() + "_H"
+            with open(os.path.join(self.directorio.name, nombre), "w", encoding="utf-8") as f:
+                f.write(f'#ifndef {guarda}\n#define {guarda}\n#include "{otro}"\nint {nombre[0]};\n#endif\n')
+        preprocesador = PreprocesadorCPP(rutas_busqueda=[self.directorio.name], cache=CacheCabecerasCPP())
+        salida = preprocesador.procesar(LexerCPP('#include "a.h"\n').tokenizar())
+        self.assertEqual(preprocesador.errores, [])
+        self.assertEqual(lexemas(salida), '#include "a.h" #include "b.h" #include "a.h" int b ; int a ;')
+
+if __name__ == "__main__":
+    unittest.main()
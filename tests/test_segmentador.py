@@ -0,0 +1,30 @@
+import unittest
+from src.detector_lenguaje.segmentador import SegmentadorDocumento, segmentar_html
+
+DOCUMENTO = (
+    "<html>\n<!-- <script>comentado()</script> -->\n<body>ñ\n"
+    "  <script>let x = 1;</script>\n"
+    "  <script type=\"application/json\">{\"a\": 1}</script>\n"
+    "</body></html>"
+)
+
+class TestSegmentador(unittest.TestCase):
+    def test_regiones_script_con_desplazamientos(self):
+        regiones = segmentar_html(DOCUMENTO)
+        self.assertEqual([r.lenguaje for r in regiones], ["HTML", "JavaScript"])
+        script = regiones[1]
+        self.assertEqual(DOCUMENTO[script.inicio:script.fin], "let x = 1;")
+        self.assertEqual(DOCUMENTO.encode('utf-8')[script.inicio_bytes:script.fin_bytes], b"let x = 1;")
+        self.assertEqual((script.linea, script.columna), (4, 11))
+
+    def test_pipeline_perezoso_y_reutilizado_al_editar_marcado(self):
+        segmentador = SegmentadorDocumento()
+        _, (_, pipeline) = segmentador.regiones_con_pipeline(DOCUMENTO)
+        self.assertFalse(pipeline.analizado_lexicamente)
+        self.assertEqual(pipeline.tokens()[0].lexema, "let")
+        _, (_, pipeline_editado) = segmentador.regiones_con_pipeline(DOCUMENTO.replace("<body>", "<body class=\"a\">"))
+        self.assertIs(pipeline_editado, pipeline)
+        self.assertEqual((segmentador.aciertos, segmentador.fallos), (1, 3))
+
+if __name__ == "__main__":
+    unittest.main()